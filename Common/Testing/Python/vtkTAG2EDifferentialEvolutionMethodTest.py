@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#
+# Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+#
+#
+# Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+#          Rene Dechow, rene.dechow@vti.bund.de
+#
+# Copyright:
+#
+# Johann Heinrich von Thuenen-Institut
+# Institut fuer Agrarrelevante Klimaforschung
+#
+# Phone: +49 (0)531 596 2601
+#
+# Fax:+49 (0)531 596 2699
+#
+# Mail: ak@vti.bund.de
+#
+# Bundesallee 50
+# 38116 Braunschweig
+# Germany
+#
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+import unittest
+import math
+from vtk import *
+from libvtkTAG2ECommonPython import *
+
+class vtkTAG2EDifferentialEvolutionMethodTest(unittest.TestCase):
+
+    def _Minimize(self, de, function):
+        de.SetNumberOfParameters(2)
+        de.SetParameter(0, -1.2, -5.0, 5.0)
+        de.SetParameter(1,  1.0, -5.0, 5.0)
+        de.Init()
+        
+        # Each batch is a whole generation
+        self.assertEqual(de.GetNumberOfProbes(), de.GetPopulationSize())
+        
+        while not de.IsFinished():
+            for probe in range(de.GetNumberOfProbes()):
+                x = de.GetProbeParameter(probe, 0)
+                y = de.GetProbeParameter(probe, 1)
+                self.assertTrue(x >= -5.0 and x <= 5.0)
+                self.assertTrue(y >= -5.0 and y <= 5.0)
+                de.SetProbeValue(probe, function(x, y))
+            de.Evaluate()
+        
+        print "Generations", de.GetGeneration(), "evaluations", de.GetNumberOfEvaluations(), \
+              "best", de.GetBestParameter(0), de.GetBestParameter(1), de.GetBestValue()
+
+    def test1Quadratic(self):
+        de = vtkTAG2EDifferentialEvolutionMethod()
+        de.SetSeed(1)
+        self._Minimize(de, self.f1)
+        
+        self.assertAlmostEqual(de.GetBestParameter(0), 1.0, 4)
+        self.assertAlmostEqual(de.GetBestParameter(1), 2.0, 4)
+
+    def test2Rastrigin(self):
+        # Many local minima, the global minimum is at (0, 0)
+        de = vtkTAG2EDifferentialEvolutionMethod()
+        de.SetSeed(1)
+        de.SetMaxNumberOfGenerations(300)
+        self._Minimize(de, self.f2)
+        
+        self.assertAlmostEqual(de.GetBestParameter(0), 0.0, 3)
+        self.assertAlmostEqual(de.GetBestParameter(1), 0.0, 3)
+
+    def test3Seed(self):
+        # Identical seeds result in identical runs
+        de1 = vtkTAG2EDifferentialEvolutionMethod()
+        de1.SetSeed(5)
+        de1.SetMaxNumberOfGenerations(10)
+        self._Minimize(de1, self.f2)
+        
+        de2 = vtkTAG2EDifferentialEvolutionMethod()
+        de2.SetSeed(5)
+        de2.SetMaxNumberOfGenerations(10)
+        self._Minimize(de2, self.f2)
+        
+        self.assertEqual(de1.GetBestValue(), de2.GetBestValue())
+        self.assertEqual(de1.GetBestParameter(0), de2.GetBestParameter(0))
+
+    def f1(self, x, y):
+        return (x - 1)*(x - 1) + (y - 2)*(y - 2)
+    
+    def f2(self, x, y):
+        return 20 + x*x - 10*math.cos(2*math.pi*x) + y*y - 10*math.cos(2*math.pi*y)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDifferentialEvolutionMethodTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
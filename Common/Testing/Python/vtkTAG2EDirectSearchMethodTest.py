@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+#
+# Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+#
+#
+# Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+#          Rene Dechow, rene.dechow@vti.bund.de
+#
+# Copyright:
+#
+# Johann Heinrich von Thuenen-Institut
+# Institut fuer Agrarrelevante Klimaforschung
+#
+# Phone: +49 (0)531 596 2601
+#
+# Fax:+49 (0)531 596 2699
+#
+# Mail: ak@vti.bund.de
+#
+# Bundesallee 50
+# 38116 Braunschweig
+# Germany
+#
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+import unittest
+from vtk import *
+from libvtkTAG2ECommonPython import *
+
+class vtkTAG2EDirectSearchMethodTest(unittest.TestCase):
+
+    def _Minimize(self, search, function):
+        search.SetNumberOfParameters(2)
+        search.SetParameter(0, -1.2, -5.0, 5.0)
+        search.SetParameter(1,  1.0, -5.0, 5.0)
+        search.Init()
+        
+        while not search.IsFinished():
+            for probe in range(search.GetNumberOfProbes()):
+                x = search.GetProbeParameter(probe, 0)
+                y = search.GetProbeParameter(probe, 1)
+                search.SetProbeValue(probe, function(x, y))
+            search.Evaluate()
+        
+        print "Evaluations", search.GetNumberOfEvaluations(), "best", \
+              search.GetBestParameter(0), search.GetBestParameter(1), search.GetBestValue()
+
+    def test1PowellQuadratic(self):
+        search = vtkTAG2EDirectSearchMethod()
+        search.SetMethodToPowell()
+        self._Minimize(search, self.f1)
+        
+        self.assertAlmostEqual(search.GetBestParameter(0), 1.0, 4)
+        self.assertAlmostEqual(search.GetBestParameter(1), 2.0, 4)
+        self.assertTrue(search.GetNumberOfEvaluations() < 100)
+
+    def test2PowellRosenbrock(self):
+        search = vtkTAG2EDirectSearchMethod()
+        search.SetMethodToPowell()
+        self._Minimize(search, self.f2)
+        
+        self.assertAlmostEqual(search.GetBestParameter(0), 1.0, 3)
+        self.assertAlmostEqual(search.GetBestParameter(1), 1.0, 3)
+
+    def test3NelderMeadQuadratic(self):
+        search = vtkTAG2EDirectSearchMethod()
+        search.SetMethodToNelderMead()
+        search.SetTolerance(0.000001)
+        self._Minimize(search, self.f1)
+        
+        self.assertAlmostEqual(search.GetBestParameter(0), 1.0, 3)
+        self.assertAlmostEqual(search.GetBestParameter(1), 2.0, 3)
+        
+    def test4NelderMeadRosenbrock(self):
+        search = vtkTAG2EDirectSearchMethod()
+        search.SetMethodToNelderMead()
+        search.SetTolerance(0.000001)
+        self._Minimize(search, self.f2)
+        
+        self.assertAlmostEqual(search.GetBestParameter(0), 1.0, 2)
+        self.assertAlmostEqual(search.GetBestParameter(1), 1.0, 2)
+
+    def test5InvalidProbes(self):
+        # The minimum is at the border of the valid region
+        search = vtkTAG2EDirectSearchMethod()
+        search.SetMethodToPowell()
+        self._Minimize(search, self.f3)
+        
+        self.assertTrue(search.GetBestParameter(0) <= 0.5)
+        self.assertAlmostEqual(search.GetBestParameter(0), 0.5, 3)
+        self.assertAlmostEqual(search.GetBestParameter(1), 2.0, 4)
+        
+    def test6Batches(self):
+        # The bracketing of the line search creates batches of several probes
+        search = vtkTAG2EDirectSearchMethod()
+        search.SetMethodToPowell()
+        search.SetNumberOfLineProbes(8)
+        search.SetNumberOfParameters(1)
+        search.SetParameter(0, 4.0, -5.0, 5.0)
+        search.Init()
+        
+        search.SetProbeValue(0, self.f1(search.GetProbeParameter(0, 0), 2.0))
+        search.Evaluate()
+        
+        self.assertEqual(search.GetNumberOfProbes(), 8)
+
+    def f1(self, x, y):
+        return (x - 1)*(x - 1) + (y - 2)*(y - 2)
+    
+    def f2(self, x, y):
+        return 100*(y - x*x)*(y - x*x) + (1 - x)*(1 - x)
+    
+    def f3(self, x, y):
+        if x > 0.5:
+            return 1.0E20
+        return (x - 1)*(x - 1) + (y - 2)*(y - 2)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDirectSearchMethodTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
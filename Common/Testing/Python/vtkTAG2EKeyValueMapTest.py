@@ -71,6 +71,34 @@ class vtkTAG2EKeyValueMapTest(unittest.TestCase):
         mymap.Clear()
         self.assertEqual(mymap.GetNumberOfKeys(), 0,"Error in Clear")
         
+    def testManyKeys(self):
+
+        mymap = vtkKeyValueMap()
+        
+        # The keys are copied and compared by content
+        for i in range(1000):
+            mymap.Add("key%i" % i, i)
+        mymap.Add("key" + str(10), 11)
+        
+        self.assertEqual(mymap.GetNumberOfKeys(), 1000, "Error in Add")
+        self.assertEqual(mymap.GetValue("key10"), 11, "Error in GetValue(key)")
+        self.assertEqual(mymap.GetValue("key999"), 999, "Error in GetValue(key)")
+        self.assertEqual(mymap.GetKey(999), "key999", "Error in GetKey(idx)")
+        
+        # The insertion order is kept when removing keys
+        mymap.Remove("key0")
+        self.assertEqual(mymap.GetKey(0), "key1", "Error in Remove")
+        self.assertEqual(mymap.GetValue(998), 999, "Error in Remove")
+        
+        keys = vtkStringArray()
+        values = vtkDoubleArray()
+        mymap.Export(keys, values)
+        
+        self.assertEqual(keys.GetNumberOfValues(), 999, "Error in Export")
+        self.assertEqual(values.GetNumberOfTuples(), 999, "Error in Export")
+        self.assertEqual(keys.GetValue(9), "key10", "Error in Export")
+        self.assertEqual(values.GetValue(9), 11, "Error in Export")
+        
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EKeyValueMapTest)
@@ -34,6 +34,7 @@
 #include <iomanip>
 #include <math.h>
 #include "tag2eFIS.h"
+#include "vtkTAG2EDefines.h"
 
 using namespace std;
 
@@ -268,6 +269,276 @@ double tag2eFIS::ComputeDOF(double *Input,
 
 //----------------------------------------------------------------------------
 
+void tag2eFIS::ComputeFISResults(double *Input, int numberOfPoints,
+  int numberOfRules, std::vector< std::vector<int> > &RuleCodeMatrix,
+  FuzzyInferenceScheme &FIS, double *Result, double *DOF)
+{
+  int numberOfFactors = FIS.Factors.size();
+  int i;
+
+#ifdef OMP_PARALLELIZED
+#pragma omp parallel for private(i) shared(Input, Result, DOF, RuleCodeMatrix, FIS)
+#endif
+  for (i = 0; i < numberOfPoints; i++) {
+    std::vector<double> DOFVector(numberOfRules);
+
+    Result[i] = tag2eFIS::ComputeFISResult(&Input[i * numberOfFactors],
+      numberOfRules, RuleCodeMatrix, FIS, DOFVector);
+
+    if (DOF) {
+      for (int k = 0; k < numberOfRules; k++)
+        DOF[i * numberOfRules + k] = DOFVector[k];
+    }
+  }
+}
+
+//----------------------------------------------------------------------------
+
+bool tag2eFIS::ComputeLookupTable(std::vector<double> &LookupTable,
+  std::vector<double> *SigmaLookupTable, int resolution, int numberOfRules,
+  std::vector< std::vector<int> > &RuleCodeMatrix, FuzzyInferenceScheme &FIS)
+{
+  int numberOfFactors = FIS.Factors.size();
+  int d, idx, size;
+
+  if (resolution < 2 || numberOfFactors < 1 ||
+      numberOfFactors > TAG2E_FIS_LOOKUP_TABLE_MAX_FACTORS)
+    return false;
+
+  // Compute the number of grid nodes and check the size limit
+  size = 1;
+  for (d = 0; d < numberOfFactors; d++) {
+    if (size > TAG2E_FIS_LOOKUP_TABLE_MAX_SIZE / resolution)
+      return false;
+    size *= resolution;
+  }
+
+  LookupTable.resize(size);
+  if (SigmaLookupTable)
+    SigmaLookupTable->resize(size);
+
+#ifdef OMP_PARALLELIZED
+#pragma omp parallel for private(idx, d) shared(LookupTable, SigmaLookupTable, RuleCodeMatrix, FIS)
+#endif
+  for (idx = 0; idx < size; idx++) {
+    double Input[TAG2E_FIS_LOOKUP_TABLE_MAX_FACTORS];
+    std::vector<double> DOFVector(numberOfRules);
+    int rest = idx;
+
+    // Decode the grid node index, the first factor varies fastest
+    for (d = 0; d < numberOfFactors; d++) {
+      FuzzyFactor &Factor = FIS.Factors[d];
+      Input[d] = Factor.min + (rest % resolution) *
+        (Factor.max - Factor.min) / (resolution - 1);
+      rest = rest / resolution;
+    }
+
+    LookupTable[idx] = tag2eFIS::ComputeFISResult(Input, numberOfRules,
+      RuleCodeMatrix, FIS, DOFVector);
+
+    if (SigmaLookupTable) {
+      double s = 0.0;
+      for (int k = 0; k < numberOfRules; k++)
+        s += DOFVector[k] * FIS.Responses.Responses[k].sd;
+      (*SigmaLookupTable)[idx] = s;
+    }
+  }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+double tag2eFIS::InterpolateLookupTable(double *Input, int resolution,
+  std::vector<double> &LookupTable, FuzzyInferenceScheme &FIS)
+{
+  int numberOfFactors = FIS.Factors.size();
+  int lower[TAG2E_FIS_LOOKUP_TABLE_MAX_FACTORS];
+  double weight[TAG2E_FIS_LOOKUP_TABLE_MAX_FACTORS];
+  int d, corner, idx, stride;
+  double t, w, result;
+
+  // Locate the grid cell and the local coordinates of the input
+  for (d = 0; d < numberOfFactors; d++) {
+    FuzzyFactor &Factor = FIS.Factors[d];
+
+    t = 0.0;
+    if (Factor.max > Factor.min)
+      t = (Input[d] - Factor.min) / (Factor.max - Factor.min) * (resolution - 1);
+
+    if (t < 0.0)
+      t = 0.0;
+    if (t > resolution - 1)
+      t = resolution - 1;
+
+    lower[d] = (int)floor(t);
+    if (lower[d] > resolution - 2)
+      lower[d] = resolution - 2;
+
+    weight[d] = t - lower[d];
+  }
+
+  // Accumulate the weighted values of all 2^n grid cell corners
+  result = 0.0;
+  for (corner = 0; corner < (1 << numberOfFactors); corner++) {
+    w = 1.0;
+    idx = 0;
+    stride = 1;
+    for (d = 0; d < numberOfFactors; d++) {
+      if ((corner >> d) & 1) {
+        w *= weight[d];
+        idx += (lower[d] + 1) * stride;
+      } else {
+        w *= 1.0 - weight[d];
+        idx += lower[d] * stride;
+      }
+      stride *= resolution;
+    }
+
+    if (w > 0.0)
+      result += w * LookupTable[idx];
+  }
+
+  return result;
+}
+
+//----------------------------------------------------------------------------
+
+double tag2eFIS::EstimateLookupTableError(int resolution,
+  std::vector<double> &LookupTable, int numberOfRules,
+  std::vector< std::vector<int> > &RuleCodeMatrix, FuzzyInferenceScheme &FIS)
+{
+  int numberOfFactors = FIS.Factors.size();
+  int d, idx, size;
+  double error = 0.0;
+
+  size = 1;
+  for (d = 0; d < numberOfFactors; d++)
+    size *= resolution - 1;
+
+  std::vector<double> Errors(size);
+
+#ifdef OMP_PARALLELIZED
+#pragma omp parallel for private(idx, d) shared(Errors, LookupTable, RuleCodeMatrix, FIS)
+#endif
+  for (idx = 0; idx < size; idx++) {
+    double Input[TAG2E_FIS_LOOKUP_TABLE_MAX_FACTORS];
+    std::vector<double> DOFVector(numberOfRules);
+    int rest = idx;
+
+    // Compute the center of the grid cell
+    for (d = 0; d < numberOfFactors; d++) {
+      FuzzyFactor &Factor = FIS.Factors[d];
+      Input[d] = Factor.min + ((rest % (resolution - 1)) + 0.5) *
+        (Factor.max - Factor.min) / (resolution - 1);
+      rest = rest / (resolution - 1);
+    }
+
+    double exact = tag2eFIS::ComputeFISResult(Input, numberOfRules,
+      RuleCodeMatrix, FIS, DOFVector);
+    double interpolated = tag2eFIS::InterpolateLookupTable(Input, resolution,
+      LookupTable, FIS);
+
+    Errors[idx] = fabs(exact - interpolated);
+  }
+
+  for (idx = 0; idx < size; idx++)
+    if (Errors[idx] > error)
+      error = Errors[idx];
+
+  return error;
+}
+
+//----------------------------------------------------------------------------
+
+bool tag2eFIS::ComputeLeastSquaresResponses(double *DOF, double *Target,
+  int numberOfPoints, int numberOfRules, FuzzyInferenceScheme &FIS,
+  std::vector<double> &Responses, int maxIterations)
+{
+  int i, r, s, iter;
+  double min = FIS.Responses.min;
+  double max = FIS.Responses.max;
+
+  if (numberOfRules < 1 || (int)FIS.Responses.Responses.size() != numberOfRules)
+    return false;
+
+  // The normal equations A x = b of the normalized deegrees of fulfillment,
+  // the contribution of constant responses is moved to the right hand side
+  std::vector<double> A(numberOfRules * numberOfRules, 0.0);
+  std::vector<double> b(numberOfRules, 0.0);
+  std::vector<double> n(numberOfRules);
+
+  for (i = 0; i < numberOfPoints; i++) {
+    double *dof = &DOF[i * numberOfRules];
+    double sum_dofs = 0.0;
+    double t = Target[i];
+
+    for (r = 0; r < numberOfRules; r++)
+      sum_dofs += dof[r];
+
+    // Points without fulfilled rules have no influence on the responses
+    if (sum_dofs == 0)
+      continue;
+
+    for (r = 0; r < numberOfRules; r++) {
+      n[r] = dof[r] / sum_dofs;
+      if (FIS.Responses.Responses[r].constant)
+        t -= n[r] * FIS.Responses.Responses[r].value;
+    }
+
+    for (r = 0; r < numberOfRules; r++) {
+      if (n[r] == 0 || FIS.Responses.Responses[r].constant)
+        continue;
+      b[r] += n[r] * t;
+      for (s = 0; s < numberOfRules; s++)
+        A[r * numberOfRules + s] += n[r] * n[s];
+    }
+  }
+
+  // Start with the current responses inside the bounds
+  Responses.resize(numberOfRules);
+  for (r = 0; r < numberOfRules; r++) {
+    double value = FIS.Responses.Responses[r].value;
+    if (!FIS.Responses.Responses[r].constant)
+      value = value < min ? min : (value > max ? max : value);
+    Responses[r] = value;
+  }
+
+  // Projected Gauss-Seidel iterations, each step minimizes the
+  // convex quadratic function exactly along a single response
+  for (iter = 0; iter < maxIterations; iter++) {
+    double change = 0.0;
+    double scale = 0.0;
+
+    for (r = 0; r < numberOfRules; r++) {
+      double diag = A[r * numberOfRules + r];
+
+      if (diag <= 0 || FIS.Responses.Responses[r].constant)
+        continue;
+
+      double sum = b[r];
+      for (s = 0; s < numberOfRules; s++) {
+        if (s != r && !FIS.Responses.Responses[s].constant)
+          sum -= A[r * numberOfRules + s] * Responses[s];
+      }
+
+      double value = sum / diag;
+      value = value < min ? min : (value > max ? max : value);
+
+      change += fabs(value - Responses[r]);
+      scale += fabs(value);
+      Responses[r] = value;
+    }
+
+    if (change <= 1e-12 * (scale + 1.0))
+      break;
+  }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 bool tag2eFIS::CheckFuzzyFactor(FuzzyFactor& Factor, bool verbose)
 {
   unsigned int j;
@@ -646,5 +917,45 @@ bool tag2eFIS::TestFISComputation()
     return false;
   }
 
+  std::cout << "ComputeLeastSquaresResponses Test" << std::endl;
+
+  // Compute the results on a regular grid with the original responses
+  // and try to recover the responses from the results
+  int numberOfPoints = 0;
+  std::vector<double> Points;
+  for (i = 0; i < 11; i++) {
+    for (j = 0; j < 11; j++) {
+      Points.push_back(F1.min + i * (F1.max - F1.min) / 10.0);
+      Points.push_back(F2.min + j * (F2.max - F2.min) / 10.0);
+      numberOfPoints++;
+    }
+  }
+
+  std::vector<double> Target(numberOfPoints);
+  std::vector<double> DOF(numberOfPoints * numberOfRules);
+  std::vector<double> Responses;
+
+  tag2eFIS::ComputeFISResults(&Points[0], numberOfPoints, numberOfRules,
+                              RuleCodeMatrix, FIS, &Target[0], &DOF[0]);
+
+  for (i = 0; i < numberOfRules; i++) {
+    FIS.Responses.Responses[i].constant = false;
+    FIS.Responses.Responses[i].value = 2.5;
+  }
+
+  if (!tag2eFIS::ComputeLeastSquaresResponses(&DOF[0], &Target[0], numberOfPoints,
+                                              numberOfRules, FIS, Responses)) {
+    (std::cerr << "ComputeLeastSquaresResponses failed");
+    return false;
+  }
+
+  for (i = 0; i < numberOfRules; i++) {
+    std::cout << "Response " << i << " = " << Responses[i] << std::endl;
+    if (fabs(Responses[i] - (i + 1)) > TOLERANCE) {
+      (std::cerr << "Wrong result in ComputeLeastSquaresResponses Test");
+      return false;
+    }
+  }
+
   return true;
 }
@@ -75,6 +75,11 @@ public:
     std::string name;
 };
 
+//! The maximum number of factors supported by the lookup table computation
+#define TAG2E_FIS_LOOKUP_TABLE_MAX_FACTORS 16
+//! The maximum number of grid nodes of a lookup table
+#define TAG2E_FIS_LOOKUP_TABLE_MAX_SIZE 16777216
+
 /** 
  * This class contains the computation algorithms of the weighted fuzzy inference scheme
  * 
@@ -110,6 +115,75 @@ public:
     //!\return The result of the fuzzy inference scheme computation
     static double ComputeFISResult(double *Input, int numberOfRules, std::vector< std::vector<int> > &RuleCodeMatrix, FuzzyInferenceScheme &FIS, std::vector<double> &DOFVector);
     
+    //!\brief Compute the fuzzy inference scheme results for many points at once.
+    //! The points are processed in parallel in case OpenMP is enabled.
+    //!\param Input The factor input vectors of all points, point after point (numberOfPoints * numberOfFactors)
+    //!\param numberOfPoints The number of points to compute
+    //!\param numberOfRules Number of rules
+    //!\param RuleCodeMatrix The matrix of coded rules
+    //!\param FIS The internal representation of the weighted fuzzy inference scheme
+    //!\param Result The array to store the results of all points (numberOfPoints)
+    //!\param DOF The array to store the rule specific deegrees of fulfillment of all points
+    //! (numberOfPoints * numberOfRules), may be NULL
+    static void ComputeFISResults(double *Input, int numberOfPoints, int numberOfRules,
+                         std::vector< std::vector<int> > &RuleCodeMatrix, FuzzyInferenceScheme &FIS,
+                         double *Result, double *DOF = NULL);
+
+    //!\brief Sample the fuzzy inference scheme result on a regular grid
+    //! between the factor minimum and maximum. The grid has resolution nodes
+    //! in each factor dimension, the first factor varies fastest.
+    //!\param LookupTable The vector to store the sampled results
+    //!\param SigmaLookupTable The vector to store the sampled sigma values, may be NULL
+    //!\param resolution The number of grid nodes for each factor, must be larger than 1
+    //!\param numberOfRules Number of rules
+    //!\param RuleCodeMatrix The matrix of coded rules
+    //!\param FIS The internal representation of the weighted fuzzy inference scheme
+    //!\return true in case of success
+    static bool ComputeLookupTable(std::vector<double> &LookupTable, std::vector<double> *SigmaLookupTable,
+                         int resolution, int numberOfRules, std::vector< std::vector<int> > &RuleCodeMatrix,
+                         FuzzyInferenceScheme &FIS);
+
+    //!\brief Compute the fuzzy inference scheme result of a single point using
+    //! multilinear interpolation in a lookup table created with ComputeLookupTable
+    //!\param The factor input vector of a single point, must be inside the factor ranges
+    //!\param resolution The number of grid nodes for each factor
+    //!\param LookupTable The sampled fuzzy inference scheme results
+    //!\param FIS The internal representation of the weighted fuzzy inference scheme
+    //!\return The interpolated result of the fuzzy inference scheme
+    static double InterpolateLookupTable(double *Input, int resolution, std::vector<double> &LookupTable,
+                         FuzzyInferenceScheme &FIS);
+
+    //!\brief Estimate the error of the lookup table interpolation. The exact fuzzy inference
+    //! scheme result is compared with the interpolated result at the center of each grid cell.
+    //! This is a sampled estimate and not an upper bound of the interpolation error, the
+    //! error may be larger at other locations of a grid cell.
+    //!\param resolution The number of grid nodes for each factor
+    //!\param LookupTable The sampled fuzzy inference scheme results
+    //!\param numberOfRules Number of rules
+    //!\param RuleCodeMatrix The matrix of coded rules
+    //!\param FIS The internal representation of the weighted fuzzy inference scheme
+    //!\return The maximum absolute difference between exact and interpolated result at the cell centers
+    static double EstimateLookupTableError(int resolution, std::vector<double> &LookupTable, int numberOfRules,
+                         std::vector< std::vector<int> > &RuleCodeMatrix, FuzzyInferenceScheme &FIS);
+
+    //!\brief Compute the response values which minimize the squared difference between
+    //! the fuzzy inference scheme results and the target values for fixed fuzzy sets.
+    //! The result of a point is linear in the response values, hence the responses are
+    //! the solution of a linear least squares problem, bounded by the response minimum
+    //! and maximum. The problem is solved with projected Gauss-Seidel iterations on the
+    //! normal equations. Constant responses and responses without data keep their value.
+    //!\param DOF The deegrees of fulfillment of all points (numberOfPoints * numberOfRules)
+    //!\param Target The target values of all points (numberOfPoints)
+    //!\param numberOfPoints The number of points
+    //!\param numberOfRules Number of rules
+    //!\param FIS The internal representation of the weighted fuzzy inference scheme
+    //!\param Responses The vector to store the computed response values (numberOfRules)
+    //!\param maxIterations The maximum number of Gauss-Seidel iterations
+    //!\return true in case of success
+    static bool ComputeLeastSquaresResponses(double *DOF, double *Target, int numberOfPoints,
+                         int numberOfRules, FuzzyInferenceScheme &FIS, std::vector<double> &Responses,
+                         int maxIterations = 1000);
+
     //!\brief Check if the fuzzy factor has correct alligned fuzzy sets
     static bool CheckFuzzyFactor(FuzzyFactor &Factor, bool verbose=false);
     
@@ -0,0 +1,370 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#include <stdlib.h>
+#include "tag2eN2O.h"
+#include "vtkTAG2EAlternativeN2OPredictionModules.h"
+
+//----------------------------------------------------------------------------
+
+static inline unsigned int tag2eN2OHash(int key)
+{
+  // Multiplicative hashing, the upper bits are folded into the lower
+  // bits since the table index is computed with a bit mask
+  unsigned int h = (unsigned int) key * 2654435761u;
+  return h ^ (h >> 16);
+}
+
+//----------------------------------------------------------------------------
+
+bool tag2eN2OKernelFreibauer::UsesInput(int input) const
+{
+  return input == TAG2E_N2O_NITROGEN_RATE || input == TAG2E_N2O_SAND_FRACTION
+    || input == TAG2E_N2O_SOIL_ORGANIC_CARBON || input == TAG2E_N2O_SOIL_NITROGEN;
+}
+
+double tag2eN2OKernelFreibauer::Compute(const double *Input) const
+{
+  return vtkTAG2EAlternativeN2OPredictionModules::Freibauer(
+    Input[TAG2E_N2O_NITROGEN_RATE], Input[TAG2E_N2O_SAND_FRACTION],
+    Input[TAG2E_N2O_SOIL_ORGANIC_CARBON], Input[TAG2E_N2O_SOIL_NITROGEN],
+    this->CropType, this->ClimateType);
+}
+
+//----------------------------------------------------------------------------
+
+bool tag2eN2OKernelStehfest::UsesInput(int input) const
+{
+  return input == TAG2E_N2O_NITROGEN_RATE || input == TAG2E_N2O_SOIL_ORGANIC_CARBON
+    || input == TAG2E_N2O_SILT_FRACTION || input == TAG2E_N2O_CLAY_FRACTION
+    || input == TAG2E_N2O_PH;
+}
+
+double tag2eN2OKernelStehfest::Compute(const double *Input) const
+{
+  return vtkTAG2EAlternativeN2OPredictionModules::Stehfest(
+    Input[TAG2E_N2O_NITROGEN_RATE], Input[TAG2E_N2O_SOIL_ORGANIC_CARBON],
+    Input[TAG2E_N2O_SILT_FRACTION], Input[TAG2E_N2O_CLAY_FRACTION],
+    Input[TAG2E_N2O_PH], this->CropType, this->ClimateType);
+}
+
+//----------------------------------------------------------------------------
+
+bool tag2eN2OKernelRoelandt::UsesInput(int input) const
+{
+  return input == TAG2E_N2O_NITROGEN_RATE || input == TAG2E_N2O_TEMP_SPRING
+    || input == TAG2E_N2O_TEMP_WINTER || input == TAG2E_N2O_PRECIPITATION_SUM;
+}
+
+double tag2eN2OKernelRoelandt::Compute(const double *Input) const
+{
+  double n = Input[TAG2E_N2O_NITROGEN_RATE];
+  double ts = Input[TAG2E_N2O_TEMP_SPRING];
+  double tw = Input[TAG2E_N2O_TEMP_WINTER];
+  // The precipitation sum is used as integer value
+  double P = (int) Input[TAG2E_N2O_PRECIPITATION_SUM];
+
+  switch (this->ModelType) {
+  case TAG2E_N2O_ROELANDT_MIN:
+    return vtkTAG2EAlternativeN2OPredictionModules::RoelandtMin(n, ts, P, tw,
+      this->CropType);
+  case TAG2E_N2O_ROELANDT_MAX:
+    return vtkTAG2EAlternativeN2OPredictionModules::RoelandtMax(n, ts, P, tw,
+      this->CropType);
+  default:
+    return vtkTAG2EAlternativeN2OPredictionModules::RoelandtBest(n, ts, P, tw,
+      this->CropType);
+  }
+}
+
+//----------------------------------------------------------------------------
+
+bool tag2eN2OKernelBouwman::UsesInput(int input) const
+{
+  return input == TAG2E_N2O_NITROGEN_RATE;
+}
+
+double tag2eN2OKernelBouwman::Compute(const double *Input) const
+{
+  return vtkTAG2EAlternativeN2OPredictionModules::Bouwman(
+    Input[TAG2E_N2O_NITROGEN_RATE]);
+}
+
+//----------------------------------------------------------------------------
+
+void tag2eN2O::CreateInputMasks(std::vector<tag2eN2OKernel*> &Kernels,
+  std::vector<unsigned int> &InputMasks)
+{
+  unsigned int k;
+  int j;
+
+  InputMasks.resize(Kernels.size());
+
+  for (k = 0; k < Kernels.size(); k++) {
+    InputMasks[k] = 0;
+    for (j = 0; j < TAG2E_N2O_NUMBER_OF_INPUTS; j++) {
+      if (Kernels[k]->UsesInput(j))
+        InputMasks[k] |= 1u << j;
+    }
+  }
+}
+
+//----------------------------------------------------------------------------
+
+double tag2eN2O::ComputeLocation(const double *Input,
+  std::vector<tag2eN2OKernel*> &Kernels, double nullValue, double *Results,
+  const unsigned int *InputMasks)
+{
+  unsigned int k;
+  int j;
+  int count = 0;
+  double sum = 0.0;
+
+  for (k = 0; k < Kernels.size(); k++) {
+    tag2eN2OKernel *Kernel = Kernels[k];
+    double value;
+    bool isNull = false;
+
+    // A kernel result is null in case one of its inputs is null
+    for (j = 0; j < TAG2E_N2O_NUMBER_OF_INPUTS; j++) {
+      if (Input[j] == nullValue &&
+          (InputMasks ? (InputMasks[k] >> j) & 1u : Kernel->UsesInput(j))) {
+        isNull = true;
+        break;
+      }
+    }
+
+    if (isNull) {
+      value = nullValue;
+    } else {
+      value = Kernel->Compute(Input);
+      sum += value;
+      count++;
+    }
+
+    if (Results)
+      Results[k] = value;
+  }
+
+  if (count == 0)
+    return nullValue;
+
+  return sum / count;
+}
+
+//----------------------------------------------------------------------------
+
+int tag2eN2O::CreateCategoryIndex(int *Categories, int numberOfValues,
+  std::vector<int> &Locations, std::vector<int> &Index)
+{
+  // Open addressing hash table with linear probing, which maps the
+  // category ids to consecutive indices. The capacity is a power of two
+  // and at least twice the number of distinct categories.
+  unsigned int capacity = 64;
+  unsigned int mask = capacity - 1;
+  std::vector<int> Keys(capacity);
+  std::vector<int> Values(capacity, -1);
+  int i;
+
+  Locations.clear();
+  Index.resize(numberOfValues);
+
+  for (i = 0; i < numberOfValues; i++) {
+    int cat = Categories[i];
+
+    if (cat < 0) {
+      Index[i] = -1;
+      continue;
+    }
+
+    unsigned int h = tag2eN2OHash(cat) & mask;
+    while (Values[h] != -1 && Keys[h] != cat)
+      h = (h + 1) & mask;
+
+    if (Values[h] != -1) {
+      Index[i] = Values[h];
+      continue;
+    }
+
+    // A new category, its first location is computed
+    Keys[h] = cat;
+    Values[h] = Locations.size();
+    Index[i] = Values[h];
+    Locations.push_back(i);
+
+    // Grow the table in case it is half filled
+    if (Locations.size() * 2 > capacity) {
+      unsigned int c;
+      std::vector<int> OldKeys(Keys);
+      std::vector<int> OldValues(Values);
+
+      capacity *= 2;
+      mask = capacity - 1;
+      Keys.assign(capacity, 0);
+      Values.assign(capacity, -1);
+
+      for (c = 0; c < OldValues.size(); c++) {
+        if (OldValues[c] == -1)
+          continue;
+        h = tag2eN2OHash(OldKeys[c]) & mask;
+        while (Values[h] != -1)
+          h = (h + 1) & mask;
+        Keys[h] = OldKeys[c];
+        Values[h] = OldValues[c];
+      }
+    }
+  }
+
+  return Locations.size();
+}
+
+//----------------------------------------------------------------------------
+
+bool tag2eN2O::ComputeEmissions(double **Inputs, int *Categories,
+  int numberOfValues, std::vector<tag2eN2OKernel*> &Kernels, double nullValue,
+  double **Results, double *Ensemble, int *inconsistentLocation)
+{
+  int numberOfKernels = Kernels.size();
+  int i, j, k;
+
+  if (numberOfKernels == 0)
+    return false;
+
+  // Check for all needed inputs
+  for (j = 0; j < TAG2E_N2O_NUMBER_OF_INPUTS; j++) {
+    for (k = 0; k < numberOfKernels; k++) {
+      if (Kernels[k]->UsesInput(j) && Inputs[j] == NULL)
+        return false;
+    }
+  }
+
+  // The locations which must be computed, in case categories are
+  // present only the first location of each category is computed
+  std::vector<int> Locations;
+
+  if (Categories) {
+    // The index of each location into the list of distinct categories
+    std::vector<int> Index;
+
+    tag2eN2O::CreateCategoryIndex(Categories, numberOfValues, Locations, Index);
+
+    // All locations of a category must have the same input data
+    if (inconsistentLocation) {
+      *inconsistentLocation = -1;
+      for (i = 0; i < numberOfValues; i++) {
+        if (Index[i] < 0)
+          continue;
+        int first = Locations[Index[i]];
+        for (j = 0; j < TAG2E_N2O_NUMBER_OF_INPUTS; j++) {
+          if (Inputs[j] && Inputs[j][i] != Inputs[j][first]) {
+            *inconsistentLocation = i;
+            return false;
+          }
+        }
+      }
+    }
+
+    ComputeLocations(Inputs, Locations, Kernels, nullValue, Results, Ensemble);
+
+    // Gather the results of the computed locations for all locations of a category
+#ifdef OMP_PARALLELIZED
+#pragma omp parallel for private(i, k)
+#endif
+    for (i = 0; i < numberOfValues; i++) {
+      int first = Index[i] < 0 ? -1 : Locations[Index[i]];
+
+      if (first == i)
+        continue;
+
+      for (k = 0; k < numberOfKernels; k++) {
+        if (Results && Results[k])
+          Results[k][i] = first < 0 ? nullValue : Results[k][first];
+      }
+      if (Ensemble)
+        Ensemble[i] = first < 0 ? nullValue : Ensemble[first];
+    }
+  } else {
+    Locations.resize(numberOfValues);
+    for (i = 0; i < numberOfValues; i++)
+      Locations[i] = i;
+
+    ComputeLocations(Inputs, Locations, Kernels, nullValue, Results, Ensemble);
+  }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+void tag2eN2O::ComputeLocations(double **Inputs, std::vector<int> &Locations,
+  std::vector<tag2eN2OKernel*> &Kernels, double nullValue, double **Results,
+  double *Ensemble)
+{
+  int numberOfKernels = Kernels.size();
+  int numberOfLocations = Locations.size();
+  int l;
+  std::vector<unsigned int> InputMasks;
+
+  // The inputs used by the kernels are the same for all locations
+  tag2eN2O::CreateInputMasks(Kernels, InputMasks);
+
+#ifdef OMP_PARALLELIZED
+#pragma omp parallel private(l)
+#endif
+  {
+    // The kernel results of a location, allocated once for each thread
+    std::vector<double> Values(numberOfKernels);
+
+#ifdef OMP_PARALLELIZED
+#pragma omp for
+#endif
+    for (l = 0; l < numberOfLocations; l++) {
+      int i = Locations[l];
+      int j, k;
+      double Input[TAG2E_N2O_NUMBER_OF_INPUTS];
+
+      // Gather the input variables, unused inputs are set to zero
+      for (j = 0; j < TAG2E_N2O_NUMBER_OF_INPUTS; j++)
+        Input[j] = Inputs[j] ? Inputs[j][i] : 0.0;
+
+      double mean = tag2eN2O::ComputeLocation(Input, Kernels, nullValue,
+        &Values[0], &InputMasks[0]);
+
+      for (k = 0; k < numberOfKernels; k++) {
+        if (Results && Results[k])
+          Results[k][i] = Values[k];
+      }
+      if (Ensemble)
+        Ensemble[i] = mean;
+    }
+  }
+}
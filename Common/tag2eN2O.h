@@ -0,0 +1,188 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#ifndef TAG2EN2O_H
+#define TAG2EN2O_H
+
+#include <vector>
+
+//! The input variables of the empirical N2O emission models
+#define TAG2E_N2O_NITROGEN_RATE 0
+#define TAG2E_N2O_SAND_FRACTION 1
+#define TAG2E_N2O_SILT_FRACTION 2
+#define TAG2E_N2O_CLAY_FRACTION 3
+#define TAG2E_N2O_SOIL_ORGANIC_CARBON 4
+#define TAG2E_N2O_SOIL_NITROGEN 5
+#define TAG2E_N2O_PH 6
+#define TAG2E_N2O_TEMP_SPRING 7
+#define TAG2E_N2O_TEMP_WINTER 8
+#define TAG2E_N2O_PRECIPITATION_SUM 9
+#define TAG2E_N2O_NUMBER_OF_INPUTS 10
+
+//! The model types of the Roelandt approach
+#define TAG2E_N2O_ROELANDT_BEST 1
+#define TAG2E_N2O_ROELANDT_MIN 2
+#define TAG2E_N2O_ROELANDT_MAX 3
+
+/**
+ * The interface of a single empirical N2O emission model. A kernel
+ * computes the annual emission of a single location from the input
+ * variables TAG2E_N2O_*. The model specific settings like the crop
+ * and climate type are members of the kernel.
+ */
+class tag2eN2OKernel {
+public:
+    virtual ~tag2eN2OKernel() {}
+
+    //!\brief The name of the model
+    virtual const char *GetName() const = 0;
+    //!\brief Return true if the model uses the input variable
+    virtual bool UsesInput(int input) const = 0;
+    //!\brief Compute the annual N2O emission in [kg /(ha a)] of a single location
+    //!\param Input The input variables indexed by TAG2E_N2O_* (TAG2E_N2O_NUMBER_OF_INPUTS)
+    virtual double Compute(const double *Input) const = 0;
+};
+
+class tag2eN2OKernelFreibauer : public tag2eN2OKernel {
+public:
+    tag2eN2OKernelFreibauer(int cropType, int climateType) :
+        CropType(cropType), ClimateType(climateType) {}
+
+    virtual const char *GetName() const {return "Freibauer";}
+    virtual bool UsesInput(int input) const;
+    virtual double Compute(const double *Input) const;
+
+private:
+    int CropType;
+    int ClimateType;
+};
+
+class tag2eN2OKernelStehfest : public tag2eN2OKernel {
+public:
+    tag2eN2OKernelStehfest(int cropType, int climateType) :
+        CropType(cropType), ClimateType(climateType) {}
+
+    virtual const char *GetName() const {return "Stehfest";}
+    virtual bool UsesInput(int input) const;
+    virtual double Compute(const double *Input) const;
+
+private:
+    int CropType;
+    int ClimateType;
+};
+
+class tag2eN2OKernelRoelandt : public tag2eN2OKernel {
+public:
+    tag2eN2OKernelRoelandt(int cropType, int modelType) :
+        CropType(cropType), ModelType(modelType) {}
+
+    virtual const char *GetName() const {return "Roelandt";}
+    virtual bool UsesInput(int input) const;
+    virtual double Compute(const double *Input) const;
+
+private:
+    int CropType;
+    int ModelType;
+};
+
+class tag2eN2OKernelBouwman : public tag2eN2OKernel {
+public:
+    virtual const char *GetName() const {return "Bouwman";}
+    virtual bool UsesInput(int input) const;
+    virtual double Compute(const double *Input) const;
+};
+
+/**
+ * This class contains the computation of several empirical N2O emission
+ * models on the same input data in a single pass.
+ */
+class tag2eN2O {
+public:
+
+    //!\brief Compute the emissions of all kernels of a single location.
+    //! A kernel result is null in case one of the inputs used by the kernel is null.
+    //!\param Input The input variables indexed by TAG2E_N2O_*
+    //!\param Kernels The models to compute
+    //!\param nullValue The null value of inputs and results
+    //!\param Results The array to store the result of each kernel, may be NULL
+    //!\param InputMasks The input masks of the kernels created with CreateInputMasks,
+    //! may be NULL in which case the kernels are asked for each input
+    //!\return The ensemble mean of all not null kernel results, null if all results are null
+    static double ComputeLocation(const double *Input, std::vector<tag2eN2OKernel*> &Kernels,
+                         double nullValue, double *Results, const unsigned int *InputMasks = NULL);
+
+    //!\brief Create the masks of the inputs used by the kernels, bit j of the
+    //! mask of a kernel is set in case the kernel uses the input j
+    //!\param Kernels The models
+    //!\param InputMasks The vector to store the input mask of each kernel
+    static void CreateInputMasks(std::vector<tag2eN2OKernel*> &Kernels,
+                         std::vector<unsigned int> &InputMasks);
+
+    //!\brief Compute the emissions of all kernels for many locations at once.
+    //! The locations are processed in parallel in case OpenMP is enabled.
+    //!\param Inputs The input arrays indexed by TAG2E_N2O_* (numberOfValues each),
+    //! arrays which are not used by any kernel may be NULL
+    //!\param Categories The category of each location, may be NULL. Locations with
+    //! identical category get the result of the first location of this category,
+    //! locations with a negative category are null. The categories may be sparse,
+    //! the memory needed is proportional to the number of distinct categories.
+    //!\param numberOfValues The number of locations
+    //!\param Kernels The models to compute
+    //!\param nullValue The null value of inputs and results
+    //!\param Results The result arrays of each kernel (numberOfValues each), single arrays may be NULL
+    //!\param Ensemble The array to store the ensemble mean of all kernels (numberOfValues), may be NULL
+    //!\param inconsistentLocation If not NULL the inputs of all locations of a category are
+    //! checked for identity, the first location which differs from its category is stored here
+    //! or -1 in case all categories are consistent
+    //!\return false in case an input needed by a kernel is missing or the categories are inconsistent
+    static bool ComputeEmissions(double **Inputs, int *Categories, int numberOfValues,
+                         std::vector<tag2eN2OKernel*> &Kernels, double nullValue,
+                         double **Results, double *Ensemble, int *inconsistentLocation = NULL);
+
+    //!\brief Create the index of distinct categories using a hash table
+    //!\param Categories The category of each location
+    //!\param numberOfValues The number of locations
+    //!\param Locations The vector to store the first location of each distinct category
+    //!\param Index The vector to store the index into Locations for each location,
+    //! -1 for negative categories
+    //!\return The number of distinct categories
+    static int CreateCategoryIndex(int *Categories, int numberOfValues,
+                         std::vector<int> &Locations, std::vector<int> &Index);
+
+private:
+    //!\brief Compute the emissions of all kernels at the selected locations
+    static void ComputeLocations(double **Inputs, std::vector<int> &Locations,
+                         std::vector<tag2eN2OKernel*> &Kernels, double nullValue,
+                         double **Results, double *Ensemble);
+};
+
+#endif	/* TAG2EN2O_H */
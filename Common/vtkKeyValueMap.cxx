@@ -32,59 +32,178 @@
 
 #include "vtkKeyValueMap.h"
 #include "vtkObjectFactory.h"
+#include "vtkStringArray.h"
+#include "vtkDoubleArray.h"
 
 vtkCxxRevisionMacro(vtkKeyValueMap, "$Revision: 1.0 $");
 vtkStandardNewMacro(vtkKeyValueMap);
 
 //----------------------------------------------------------------------------
+// FNV-1a string hash
 
-double vtkKeyValueMap::GetValue(unsigned int idx) {
-  unsigned int count;
-  std::map<const char*, double>::iterator it;
+static unsigned int vtkKeyValueMapHash(const char *key) {
+  unsigned int hash = 2166136261u;
+  
+  while(*key) {
+    hash ^= (unsigned char)*key++;
+    hash *= 16777619u;
+  }
+  return hash;
+}
+
+//----------------------------------------------------------------------------
+
+int vtkKeyValueMap::FindIndex(const char* key) {
+  unsigned int mask, slot;
+  
+  if(key == NULL || this->Table.empty())
+    return -1;
+  
+  mask = this->Table.size() - 1;
+  slot = vtkKeyValueMapHash(key) & mask;
+  
+  while(this->Table[slot] != -1) {
+    if(this->Keys[this->Table[slot]] == key)
+      return this->Table[slot];
+    slot = (slot + 1) & mask;
+  }
+  return -1;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkKeyValueMap::Rehash() {
+  unsigned int size, mask, slot;
+  unsigned int i;
+  
+  // Keep the load factor below 0.5
+  size = 16;
+  while(size < 2 * this->Keys.size() + 2)
+    size *= 2;
+  
+  this->Table.assign(size, -1);
+  mask = size - 1;
+  
+  for(i = 0; i < this->Keys.size(); i++) {
+    slot = vtkKeyValueMapHash(this->Keys[i].c_str()) & mask;
+    while(this->Table[slot] != -1)
+      slot = (slot + 1) & mask;
+    this->Table[slot] = i;
+  }
+}
+
+//----------------------------------------------------------------------------
+
+void vtkKeyValueMap::Add(const char* key, double value) {
+  int idx;
+  
+  if(key == NULL) {
+    vtkErrorMacro(<< "The key must not be NULL");
+    return;
+  }
+  
+  idx = this->FindIndex(key);
+  if(idx != -1) {
+    this->Values[idx] = value;
+    return;
+  }
+  
+  this->Keys.push_back(key);
+  this->Values.push_back(value);
+  
+  if(2 * this->Keys.size() + 2 > this->Table.size()) {
+    this->Rehash();
+  } else {
+    unsigned int mask = this->Table.size() - 1;
+    unsigned int slot = vtkKeyValueMapHash(key) & mask;
+    while(this->Table[slot] != -1)
+      slot = (slot + 1) & mask;
+    this->Table[slot] = this->Keys.size() - 1;
+  }
+}
+
+//----------------------------------------------------------------------------
+
+void vtkKeyValueMap::Remove(const char* key) {
+  int idx = this->FindIndex(key);
+  
+  if(idx == -1)
+    return;
+  
+  // Keep the insertion order, the indices behind the key change
+  this->Keys.erase(this->Keys.begin() + idx);
+  this->Values.erase(this->Values.begin() + idx);
+  this->Rehash();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkKeyValueMap::Clear() {
+  this->Keys.clear();
+  this->Values.clear();
+  this->Table.clear();
+}
+
+//----------------------------------------------------------------------------
+
+double vtkKeyValueMap::GetValue(const char* key) {
+  int idx = this->FindIndex(key);
   
-  if(idx >= this->KeyVals.size()) {
+  if(idx == -1)
+    return 0.0;
+  return this->Values[idx];
+}
+
+//----------------------------------------------------------------------------
+
+double vtkKeyValueMap::GetValue(unsigned int idx) {
+  if(idx >= this->Values.size()) {
     vtkErrorMacro(<< "Index is out of range");
     return 0.0;
   }
-  count = 0;
-  for(it = this->KeyVals.begin(); it != this->KeyVals.end(); it++)
-  {
-    if(idx == count)
-      return (*it).second;
-    count++;
-  }
-  return 0.0;
+  return this->Values[idx];
 }
     
 //----------------------------------------------------------------------------
 
 const char* vtkKeyValueMap::GetKey(unsigned int idx) {
-  unsigned int count;
-  std::map<const char*, double>::iterator it;
-  
-  if(idx >= this->KeyVals.size()) {
+  if(idx >= this->Keys.size()) {
     vtkErrorMacro(<< "Index is out of range");
     return NULL;
   }
-  count = 0;
-  for(it = this->KeyVals.begin(); it != this->KeyVals.end(); it++)
-  {
-    if(idx == count)
-      return (*it).first;
-    count++;
+  return this->Keys[idx].c_str();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkKeyValueMap::Export(vtkStringArray *keys, vtkDoubleArray *values) {
+  unsigned int i;
+  
+  if(keys) {
+    keys->SetNumberOfValues(this->Keys.size());
+    for(i = 0; i < this->Keys.size(); i++)
+      keys->SetValue(i, this->Keys[i]);
+  }
+  
+  if(values) {
+    values->SetNumberOfComponents(1);
+    values->SetNumberOfTuples(this->Values.size());
+    for(i = 0; i < this->Values.size(); i++)
+      values->SetValue(i, this->Values[i]);
   }
-  return NULL;
 }
-   //----------------------------------------------------------------------------
+
+//----------------------------------------------------------------------------
+
 void vtkKeyValueMap::PrintSelf(ostream& os, vtkIndent indent)
 {
   this->Superclass::PrintSelf(os,indent);
-  std::map<const char*, double>::iterator it;
+  unsigned int i;
   
-  for(it = this->KeyVals.begin(); it != this->KeyVals.end(); it++)
+  for(i = 0; i < this->Keys.size(); i++)
   {
 
-      os << indent << "key: " << (*it).first << "  value: " << (*it).second << endl;
+      os << indent << "key: " << this->Keys[i] << "  value: " << this->Values[i] << endl;
 
   }
 }
@@ -33,9 +33,20 @@
 #define	VTKKEYVALUEMAP_H
 #include "vtkTAG2ECommonWin32Header.h"
 #include <vtkObject.h>
-#include <map>
+#include <string>
 #include <vector>
 
+class vtkStringArray;
+class vtkDoubleArray;
+
+/**
+ * \brief A map of string keys and double values
+ *
+ * The keys are copied into the map and compared by content. The access by key
+ * uses a hash table, the access by index is in insertion order. Adding
+ * a key and the access by key or index are O(1), removing a key is O(n)
+ * because the insertion order is kept.
+ */
 class VTK_TAG2E_COMMON_EXPORT vtkKeyValueMap : public vtkObject {
 public:
     vtkTypeRevisionMacro(vtkKeyValueMap, vtkObject);
@@ -44,37 +55,39 @@ public:
     
     static vtkKeyValueMap *New();
 
-    void Add(const char* key, double value) {
-        this->KeyVals[key] = value;
-    }
+    //!\brief Add a key value pair, the value of an existing key is replaced
+    void Add(const char* key, double value);
 
-    void Remove(const char* key) {
-        this->KeyVals.erase(key);
-    }
+    //!\brief Remove a key and its value
+    void Remove(const char* key);
 
+    //!\brief Return the key at index idx in insertion order
     const char*GetKey(unsigned int idx);
 
+    //!\brief Return the value at index idx in insertion order
     double GetValue(unsigned int idx);
 
-    double GetValue(const char* key) {
-        return this->KeyVals[key];
-    }
+    //!\brief Return the value of a key, 0.0 in case the key is missing
+    double GetValue(const char* key);
 
     int GetNumberOfKeys() {
-        return this->KeyVals.size();
+        return this->Keys.size();
     }
 
     bool HasKey(const char* key) {
-        return (this->KeyVals.find(key) != this->KeyVals.end() ? true : false);
+        return (this->FindIndex(key) != -1 ? true : false);
     }
 
-    void Clear() {
-        this->KeyVals.clear();
-    }
+    void Clear();
+
+    //!\brief Copy all keys and values in insertion order into the
+    //! provided arrays, one of the arrays may be NULL
+    void Export(vtkStringArray *keys, vtkDoubleArray *values);
     
     // For internal use
     //BTX
-    const std::map<const char *, double> &GetInternalMap(){return this->KeyVals;}
+    const std::vector<std::string> &GetInternalKeys(){return this->Keys;}
+    const std::vector<double> &GetInternalValues(){return this->Values;}
     //ETX
 
 protected:
@@ -87,8 +100,17 @@ protected:
         ;
     }
 
+    //!\brief Return the index of the key or -1 in case the key is missing
+    int FindIndex(const char* key);
+    //!\brief Rebuild the hash table with a size suitable for the number of keys
+    void Rehash();
+
     //BTX
-    std::map<const char *, double> KeyVals;
+    std::vector<std::string> Keys;
+    std::vector<double> Values;
+    // Open addressing hash table with linear probing, each slot stores
+    // the index of a key or -1. The size is a power of two.
+    std::vector<int> Table;
     //ETX
     
 private:
@@ -97,4 +119,3 @@ private:
 };
 
 #endif	/* VTKKEYVALUEMAP_H */
-
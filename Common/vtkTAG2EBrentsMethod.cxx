@@ -49,6 +49,7 @@ vtkStandardNewMacro(vtkTAG2EBrentsMethod);
 
 vtkTAG2EBrentsMethod::vtkTAG2EBrentsMethod()
 {
+  this->AbsoluteTolerance = ZEPS;
   this->Reset();
 }
 
@@ -102,7 +103,7 @@ void vtkTAG2EBrentsMethod::Init(double ax, double bx, double cx, double _tol,
 bool vtkTAG2EBrentsMethod::IsFinished()
 {
   xm = 0.5 * (a + b);
-  tol1 = tol * fabs(x) + ZEPS;
+  tol1 = tol * fabs(x) + this->AbsoluteTolerance;
   tol2 = 2.0 * tol1;
 
   /*
@@ -120,7 +121,7 @@ bool vtkTAG2EBrentsMethod::IsFinished()
 
   if (fabs(x - xm) <= (tol2 - 0.5 * (b - a)))
     {
-    printf("Brent finished:\n");
+    vtkDebugMacro(<< "Brent finished");
     return true;
     }
   return false;
@@ -96,6 +96,11 @@ public:
   vtkGetMacro(x, double);
   vtkGetMacro(fx, double);
 
+  //!\brief The absolute break tolerance which is added to the relative
+  //! tolerance of Init(), default 0.001
+  vtkSetMacro(AbsoluteTolerance, double);
+  vtkGetMacro(AbsoluteTolerance, double);
+
 
   /**\brief the Init function. Calls this function once before the
    * best fit search should start.
@@ -131,6 +136,7 @@ protected:
   void Reset();
 
   double a,b,d,e,etemp,fu,fv,fw,fx,p,q,r,tol1,tol2,u,v,w,x,xm,tol;
+  double AbsoluteTolerance;
 
 private:
   vtkTAG2EBrentsMethod(const vtkTAG2EBrentsMethod&);  // Not implemented.
@@ -0,0 +1,349 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#include <vtkObjectFactory.h>
+#include <vtkMath.h>
+#include "vtkTAG2EDifferentialEvolutionMethod.h"
+#include <time.h>
+
+#define TINY 1.0E-20
+
+extern "C" {
+#include <math.h>
+}
+
+vtkCxxRevisionMacro(vtkTAG2EDifferentialEvolutionMethod, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2EDifferentialEvolutionMethod);
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDifferentialEvolutionMethod::vtkTAG2EDifferentialEvolutionMethod()
+{
+  this->PopulationSize = 20;
+  this->DifferentialWeight = 0.7;
+  this->CrossoverProbability = 0.9;
+  this->MaxNumberOfGenerations = 100;
+  this->Tolerance = 0.000001;
+  this->Seed = (unsigned int) time(NULL);
+  this->NumberOfEvaluations = 0;
+  this->Generation = 0;
+  this->Finished = true;
+  this->BestValue = VTK_DOUBLE_MAX;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDifferentialEvolutionMethod::~vtkTAG2EDifferentialEvolutionMethod()
+{
+  ;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDifferentialEvolutionMethod::SetNumberOfParameters(int number)
+{
+  if (number < 0)
+    number = 0;
+
+  this->Minimum.assign(number, 0.0);
+  this->Maximum.assign(number, 1.0);
+  this->Start.assign(number, 0.0);
+  this->Best.assign(number, 0.0);
+  this->Probes.clear();
+  this->ProbeValues.clear();
+  this->Finished = true;
+  this->Modified();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDifferentialEvolutionMethod::SetParameter(int index, double value,
+                                                       double min, double max)
+{
+  if (index < 0 || index >= (int) this->Minimum.size())
+    {
+    vtkErrorMacro(<< "Parameter index " << index << " is out of range");
+    return;
+    }
+
+  if (min > max)
+    {
+    vtkErrorMacro(<< "The minimum of parameter " << index
+                  << " is larger than the maximum");
+    return;
+    }
+
+  this->Minimum[index] = min;
+  this->Maximum[index] = max;
+
+  // Scale the start value to [0:1]
+  if (max > min)
+    this->Start[index] = (value - min) / (max - min);
+  else
+    this->Start[index] = 0.0;
+
+  if (this->Start[index] < 0.0)
+    this->Start[index] = 0.0;
+  if (this->Start[index] > 1.0)
+    this->Start[index] = 1.0;
+
+  this->Modified();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDifferentialEvolutionMethod::Init()
+{
+  int i;
+  unsigned int j;
+  int n = this->Minimum.size();
+
+  this->Probes.clear();
+  this->ProbeValues.clear();
+  this->Population.clear();
+  this->PopulationValues.clear();
+  this->NumberOfEvaluations = 0;
+  this->Generation = 0;
+  this->BestValue = VTK_DOUBLE_MAX;
+  this->Finished = true;
+
+  if (n == 0)
+    {
+    vtkErrorMacro(<< "No parameters to minimize");
+    return;
+    }
+
+  vtkMath::RandomSeed(this->Seed);
+
+  // The start point and uniform distributed members
+  this->Best = this->Start;
+  this->Probes.push_back(this->Start);
+  for (i = 1; i < this->PopulationSize; i++)
+    {
+    Point member(n);
+    for (j = 0; j < (unsigned int) n; j++)
+      member[j] = vtkMath::Random();
+    this->Probes.push_back(member);
+    }
+
+  this->ProbeValues.assign(this->Probes.size(), 0.0);
+  this->Finished = false;
+}
+
+//----------------------------------------------------------------------------
+
+double vtkTAG2EDifferentialEvolutionMethod::GetProbeParameter(int probe, int index)
+{
+  if (probe < 0 || probe >= (int) this->Probes.size() || index < 0
+      || index >= (int) this->Minimum.size())
+    {
+    vtkErrorMacro(<< "Probe " << probe << " or parameter index " << index
+                  << " is out of range");
+    return 0.0;
+    }
+
+  return this->Minimum[index] + this->Probes[probe][index]
+      * (this->Maximum[index] - this->Minimum[index]);
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDifferentialEvolutionMethod::SetProbeValue(int probe, double value)
+{
+  if (probe < 0 || probe >= (int) this->ProbeValues.size())
+    {
+    vtkErrorMacro(<< "Probe " << probe << " is out of range");
+    return;
+    }
+
+  this->ProbeValues[probe] = value;
+}
+
+//----------------------------------------------------------------------------
+
+double vtkTAG2EDifferentialEvolutionMethod::GetBestParameter(int index)
+{
+  if (index < 0 || index >= (int) this->Minimum.size())
+    {
+    vtkErrorMacro(<< "Parameter index " << index << " is out of range");
+    return 0.0;
+    }
+
+  return this->Minimum[index] + this->Best[index]
+      * (this->Maximum[index] - this->Minimum[index]);
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDifferentialEvolutionMethod::Evaluate()
+{
+  unsigned int i;
+
+  if (this->Finished || this->Probes.empty())
+    {
+    vtkErrorMacro(<< "The minimization is not initialized or already finished");
+    return;
+    }
+
+  this->NumberOfEvaluations += this->Probes.size();
+
+  if (this->Population.empty())
+    {
+    // The initial population
+    this->Population = this->Probes;
+    this->PopulationValues = this->ProbeValues;
+    }
+  else
+    {
+    // Select the trial vectors which are not worse than their target
+    for (i = 0; i < this->Probes.size(); i++)
+      {
+      if (this->ProbeValues[i] <= this->PopulationValues[i])
+        {
+        this->Population[i] = this->Probes[i];
+        this->PopulationValues[i] = this->ProbeValues[i];
+        }
+      }
+    this->Generation++;
+    }
+
+  // Find the best and the worst member
+  double worst = -VTK_DOUBLE_MAX;
+  for (i = 0; i < this->Population.size(); i++)
+    {
+    if (this->PopulationValues[i] < this->BestValue)
+      {
+      this->BestValue = this->PopulationValues[i];
+      this->Best = this->Population[i];
+      }
+    if (this->PopulationValues[i] > worst)
+      worst = this->PopulationValues[i];
+    }
+
+  if (this->Generation >= this->MaxNumberOfGenerations
+      || fabs(worst - this->BestValue) <= this->Tolerance
+          * (fabs(worst) + fabs(this->BestValue)) + TINY)
+    {
+    this->Finished = true;
+    this->Probes.clear();
+    this->ProbeValues.clear();
+    return;
+    }
+
+  this->CreateTrials();
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2EDifferentialEvolutionMethod::RandomMember(int exclude1, int exclude2,
+                                                      int exclude3)
+{
+  int member;
+
+  do
+    {
+    member = (int) vtkMath::Random(0.0, this->Population.size());
+    if (member >= (int) this->Population.size())
+      member = this->Population.size() - 1;
+    }
+  while (member == exclude1 || member == exclude2 || member == exclude3);
+
+  return member;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDifferentialEvolutionMethod::CreateTrials()
+{
+  unsigned int i;
+  int j;
+  int n = this->Minimum.size();
+
+  this->Probes.clear();
+
+  for (i = 0; i < this->Population.size(); i++)
+    {
+    const Point &target = this->Population[i];
+
+    // Three distinct members which differ from the target
+    int ia = this->RandomMember(i, -1, -1);
+    int ib = this->RandomMember(i, ia, -1);
+    int ic = this->RandomMember(i, ia, ib);
+
+    const Point &a = this->Population[ia];
+    const Point &b = this->Population[ib];
+    const Point &c = this->Population[ic];
+
+    // At least one parameter is taken from the mutated vector
+    int forced = (int) vtkMath::Random(0.0, n);
+    if (forced >= n)
+      forced = n - 1;
+    Point trial(target);
+
+    for (j = 0; j < n; j++)
+      {
+      if (j != forced && vtkMath::Random() >= this->CrossoverProbability)
+        continue;
+
+      double value = a[j] + this->DifferentialWeight * (b[j] - c[j]);
+
+      // Values outside the range are set between the target and the border
+      if (value < 0.0)
+        value = vtkMath::Random() * target[j];
+      if (value > 1.0)
+        value = target[j] + vtkMath::Random() * (1.0 - target[j]);
+
+      trial[j] = value;
+      }
+
+    this->Probes.push_back(trial);
+    }
+
+  this->ProbeValues.assign(this->Probes.size(), 0.0);
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDifferentialEvolutionMethod::PrintSelf(ostream& os, vtkIndent indent)
+{
+  this->Superclass::PrintSelf(os, indent);
+
+  os << indent << "PopulationSize: " << this->PopulationSize << endl;
+  os << indent << "DifferentialWeight: " << this->DifferentialWeight << endl;
+  os << indent << "CrossoverProbability: " << this->CrossoverProbability << endl;
+  os << indent << "MaxNumberOfGenerations: " << this->MaxNumberOfGenerations << endl;
+  os << indent << "Tolerance: " << this->Tolerance << endl;
+  os << indent << "Seed: " << this->Seed << endl;
+  os << indent << "Generation: " << this->Generation << endl;
+  os << indent << "NumberOfEvaluations: " << this->NumberOfEvaluations << endl;
+  os << indent << "BestValue: " << this->BestValue << endl;
+}
@@ -0,0 +1,200 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+/**
+ * \brief Differential evolution minimization of a function with several bounded parameters
+ *
+ * This class implements the classic DE/rand/1/bin scheme. A population of parameter
+ * vectors is improved generation by generation. For each member of the population
+ * a trial vector is created by adding the weighted difference of two random members to
+ * a third random member and crossing the result with the member. The trial vector
+ * replaces the member in case its function value is not larger.
+ *
+ * The parameters are scaled internally to [0:1] using their minimum and maximum,
+ * all probes are inside the parameter ranges. The first member of the initial
+ * population is the start point, the others are uniform distributed. The random numbers
+ * are generated with vtkMath::Random(), the generator is initialized with Seed in Init().
+ *
+ * Same as vtkTAG2EDirectSearchMethod this class uses reverse communication: The caller
+ * computes the function values of a batch of probes which are provided by
+ * this class. Each batch is the initial population or the trial vectors of a generation.
+ * The probes of a batch are independent, hence they can be evaluated in parallel,
+ * e.g. in several processes. Probes which are not valid for the caller should be
+ * evaluated with TAG2E_DIFFERENTIAL_EVOLUTION_INVALID_VALUE.
+ *
+ * Here some Python example code of the method usage:
+ *
+ * @code
+ *
+ * # Minimize (x - 1)^2 + (y - 2)^2 with x in [-5:5] and y in [-5:5]
+ *
+ * de = vtkTAG2EDifferentialEvolutionMethod()
+ * de.SetPopulationSize(20)
+ * de.SetNumberOfParameters(2)
+ * de.SetParameter(0, 0.0, -5.0, 5.0)
+ * de.SetParameter(1, 0.0, -5.0, 5.0)
+ * de.Init()
+ *
+ * while not de.IsFinished():
+ *     for probe in range(de.GetNumberOfProbes()):
+ *         x = de.GetProbeParameter(probe, 0)
+ *         y = de.GetProbeParameter(probe, 1)
+ *         de.SetProbeValue(probe, (x - 1)*(x - 1) + (y - 2)*(y - 2))
+ *     de.Evaluate()
+ *
+ * print de.GetBestParameter(0), de.GetBestParameter(1), de.GetBestValue()
+ *
+ * @endcode
+ *
+ * \author Soeren Gebbert
+ * \author Rene Dechow
+ *
+ *
+ * */
+
+#ifndef __vtkTAG2EDifferentialEvolutionMethod_h
+#define __vtkTAG2EDifferentialEvolutionMethod_h
+
+#include <vtkObject.h>
+#include "vtkTAG2ECommonWin32Header.h"
+#include <vector>
+
+//! The function value which should be used for invalid probes
+#define TAG2E_DIFFERENTIAL_EVOLUTION_INVALID_VALUE 1.0E20
+
+class VTK_TAG2E_COMMON_EXPORT vtkTAG2EDifferentialEvolutionMethod : public vtkObject
+{
+public:
+  static  vtkTAG2EDifferentialEvolutionMethod *New();
+  vtkTypeRevisionMacro(vtkTAG2EDifferentialEvolutionMethod,vtkObject);
+  void PrintSelf(ostream& os, vtkIndent indent);
+
+  //!\brief The number of members of the population, default 20
+  vtkSetClampMacro(PopulationSize, int, 4, VTK_INT_MAX);
+  vtkGetMacro(PopulationSize, int);
+  //!\brief The weight of the difference vector, default 0.7
+  vtkSetClampMacro(DifferentialWeight, double, 0.0, 2.0);
+  vtkGetMacro(DifferentialWeight, double);
+  //!\brief The probability to take a parameter from the mutated vector, default 0.9
+  vtkSetClampMacro(CrossoverProbability, double, 0.0, 1.0);
+  vtkGetMacro(CrossoverProbability, double);
+  //!\brief The maximum number of generations, default 100
+  vtkSetMacro(MaxNumberOfGenerations, int);
+  vtkGetMacro(MaxNumberOfGenerations, int);
+  //!\brief The relative break tolerance of the function values of the
+  //! population, default 0.000001
+  vtkSetMacro(Tolerance, double);
+  vtkGetMacro(Tolerance, double);
+  //!\brief The seed used for random number generation, default current time
+  vtkSetMacro(Seed, unsigned int);
+  vtkGetMacro(Seed, unsigned int);
+
+  //!\brief Set the number of parameters, must be called before the parameters are set
+  void SetNumberOfParameters(int number);
+  int GetNumberOfParameters(){return this->Minimum.size();}
+  //!\brief Set the start value and the range of a parameter
+  void SetParameter(int index, double value, double min, double max);
+
+  /**\brief Create the initial population as first batch of probes.
+   * Call this function once after all parameters are set.
+   */
+  void Init();
+  /**\brief Check if the function values of the population are close enough or
+   * the maximum number of generations was reached
+   *
+   * @return true if finished, false if not
+   */
+  bool IsFinished(){return this->Finished;}
+
+  //!\brief Return the number of probes of the current batch
+  int GetNumberOfProbes(){return this->Probes.size();}
+  //!\brief Return the parameter value at index of a probe of the current batch
+  double GetProbeParameter(int probe, int index);
+  //!\brief Set the function value of a probe of the current batch
+  void SetProbeValue(int probe, double value);
+  /**\brief Process the function values of all probes of the current batch
+   * and create the trial vectors of the next generation
+   */
+  void Evaluate();
+
+  //!\brief Return the parameter value at index of the best member
+  double GetBestParameter(int index);
+  //!\brief Return the function value of the best member
+  vtkGetMacro(BestValue, double);
+  //!\brief Return the number of evaluated probes
+  vtkGetMacro(NumberOfEvaluations, int);
+  //!\brief Return the number of finished generations
+  vtkGetMacro(Generation, int);
+
+protected:
+  vtkTAG2EDifferentialEvolutionMethod();
+  ~vtkTAG2EDifferentialEvolutionMethod();
+
+  //BTX
+  typedef std::vector<double> Point;
+
+  void CreateTrials();
+  int RandomMember(int exclude1, int exclude2, int exclude3);
+
+  int PopulationSize;
+  int MaxNumberOfGenerations;
+  int NumberOfEvaluations;
+  int Generation;
+  unsigned int Seed;
+  bool Finished;
+  double DifferentialWeight;
+  double CrossoverProbability;
+  double Tolerance;
+  double BestValue;
+
+  // The parameter ranges, the values of the points are scaled to [0:1]
+  std::vector<double> Minimum;
+  std::vector<double> Maximum;
+  Point Start;
+  Point Best;
+
+  // The population and the function values of its members
+  std::vector<Point> Population;
+  std::vector<double> PopulationValues;
+
+  // The current batch of probes and their function values
+  std::vector<Point> Probes;
+  std::vector<double> ProbeValues;
+  //ETX
+
+private:
+  vtkTAG2EDifferentialEvolutionMethod(const vtkTAG2EDifferentialEvolutionMethod&);  // Not implemented.
+  void operator=(const vtkTAG2EDifferentialEvolutionMethod&);  // Not implemented.
+};
+
+
+#endif
@@ -0,0 +1,694 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#include <vtkObjectFactory.h>
+#include "vtkTAG2EDirectSearchMethod.h"
+#include "vtkTAG2EBrentsMethod.h"
+#include <algorithm>
+
+#define TINY 1.0E-20
+#define MAX_LINE_ITERATIONS 100
+
+#define STATE_NONE 0
+#define STATE_POWELL_START 1
+#define STATE_POWELL_BRACKET 2
+#define STATE_POWELL_BRENT 3
+#define STATE_POWELL_EXTRAPOLATE 4
+#define STATE_NELDER_MEAD_START 5
+#define STATE_NELDER_MEAD_REFLECT 6
+#define STATE_NELDER_MEAD_EXPAND 7
+#define STATE_NELDER_MEAD_CONTRACT_OUTSIDE 8
+#define STATE_NELDER_MEAD_CONTRACT_INSIDE 9
+#define STATE_NELDER_MEAD_SHRINK 10
+
+extern "C" {
+#include <math.h>
+}
+
+vtkCxxRevisionMacro(vtkTAG2EDirectSearchMethod, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2EDirectSearchMethod);
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDirectSearchMethod::vtkTAG2EDirectSearchMethod()
+{
+  this->Method = TAG2E_DIRECT_SEARCH_POWELL;
+  this->Tolerance = 0.0001;
+  this->MaxNumberOfEvaluations = 1000;
+  this->NumberOfLineProbes = 4;
+  this->InitialStep = 0.1;
+  this->NumberOfEvaluations = 0;
+  this->State = STATE_NONE;
+  this->Finished = true;
+  this->BestValue = VTK_DOUBLE_MAX;
+  this->FX = VTK_DOUBLE_MAX;
+  this->IterationStartValue = VTK_DOUBLE_MAX;
+  this->LargestDecrease = 0.0;
+  this->LargestDecreaseDirection = 0;
+  this->Direction = 0;
+  this->LineIterations = 0;
+  this->ReflectionValue = VTK_DOUBLE_MAX;
+  this->Brent = vtkTAG2EBrentsMethod::New();
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDirectSearchMethod::~vtkTAG2EDirectSearchMethod()
+{
+  this->Brent->Delete();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::SetNumberOfParameters(int number)
+{
+  if (number < 0)
+    number = 0;
+
+  this->Minimum.assign(number, 0.0);
+  this->Maximum.assign(number, 1.0);
+  this->Start.assign(number, 0.0);
+  this->Best.assign(number, 0.0);
+  this->Probes.clear();
+  this->ProbeValues.clear();
+  this->Finished = true;
+  this->State = STATE_NONE;
+  this->Modified();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::SetParameter(int index, double value,
+                                              double min, double max)
+{
+  if (index < 0 || index >= (int) this->Minimum.size())
+    {
+    vtkErrorMacro(<< "Parameter index " << index << " is out of range");
+    return;
+    }
+
+  if (min > max)
+    {
+    vtkErrorMacro(<< "The minimum of parameter " << index
+                  << " is larger than the maximum");
+    return;
+    }
+
+  this->Minimum[index] = min;
+  this->Maximum[index] = max;
+
+  // Scale the start value to [0:1]
+  if (max > min)
+    this->Start[index] = (value - min) / (max - min);
+  else
+    this->Start[index] = 0.0;
+
+  this->Modified();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::Init()
+{
+  int i;
+  int n = this->Minimum.size();
+
+  this->Probes.clear();
+  this->ProbeValues.clear();
+  this->NumberOfEvaluations = 0;
+  this->BestValue = VTK_DOUBLE_MAX;
+  this->Finished = true;
+  this->State = STATE_NONE;
+
+  if (n == 0)
+    {
+    vtkErrorMacro(<< "No parameters to minimize");
+    return;
+    }
+
+  this->Clamp(this->Start);
+  this->Best = this->Start;
+  this->Finished = false;
+
+  if (this->Method == TAG2E_DIRECT_SEARCH_POWELL)
+    {
+    // Start with the coordinate directions
+    this->Directions.assign(n, Point(n, 0.0));
+    for (i = 0; i < n; i++)
+      this->Directions[i][i] = 1.0;
+
+    this->X = this->Start;
+    this->SetBatch(this->Start);
+    this->State = STATE_POWELL_START;
+    }
+  else
+    {
+    // The initial simplex with a vertex on each axis
+    this->Probes.assign(n + 1, this->Start);
+    for (i = 0; i < n; i++)
+      {
+      Point &vertex = this->Probes[i + 1];
+      if (vertex[i] + this->InitialStep <= 1.0)
+        vertex[i] += this->InitialStep;
+      else
+        vertex[i] -= this->InitialStep;
+      }
+    this->ProbeValues.assign(n + 1, 0.0);
+    this->State = STATE_NELDER_MEAD_START;
+    }
+}
+
+//----------------------------------------------------------------------------
+
+double vtkTAG2EDirectSearchMethod::GetProbeParameter(int probe, int index)
+{
+  if (probe < 0 || probe >= (int) this->Probes.size() || index < 0
+      || index >= (int) this->Minimum.size())
+    {
+    vtkErrorMacro(<< "Probe " << probe << " or parameter index " << index
+                  << " is out of range");
+    return 0.0;
+    }
+
+  return this->Minimum[index] + this->Probes[probe][index]
+      * (this->Maximum[index] - this->Minimum[index]);
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::SetProbeValue(int probe, double value)
+{
+  if (probe < 0 || probe >= (int) this->ProbeValues.size())
+    {
+    vtkErrorMacro(<< "Probe " << probe << " is out of range");
+    return;
+    }
+
+  this->ProbeValues[probe] = value;
+}
+
+//----------------------------------------------------------------------------
+
+double vtkTAG2EDirectSearchMethod::GetBestParameter(int index)
+{
+  if (index < 0 || index >= (int) this->Minimum.size())
+    {
+    vtkErrorMacro(<< "Parameter index " << index << " is out of range");
+    return 0.0;
+    }
+
+  return this->Minimum[index] + this->Best[index]
+      * (this->Maximum[index] - this->Minimum[index]);
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::SetBatch(const Point &point)
+{
+  this->Probes.assign(1, point);
+  this->ProbeValues.assign(1, 0.0);
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::Clamp(Point &point)
+{
+  unsigned int i;
+
+  for (i = 0; i < point.size(); i++)
+    {
+    if (point[i] < 0.0)
+      point[i] = 0.0;
+    if (point[i] > 1.0)
+      point[i] = 1.0;
+    }
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::Evaluate()
+{
+  unsigned int i, j;
+  int n = this->Minimum.size();
+
+  if (this->Finished || this->Probes.empty())
+    {
+    vtkErrorMacro(<< "The minimization is not initialized or already finished");
+    return;
+    }
+
+  // The handling of the states creates a new batch
+  std::vector<Point> probes = this->Probes;
+  std::vector<double> values = this->ProbeValues;
+
+  for (i = 0; i < probes.size(); i++)
+    {
+    this->NumberOfEvaluations++;
+    if (values[i] < this->BestValue)
+      {
+      this->BestValue = values[i];
+      this->Best = probes[i];
+      }
+    }
+
+  switch (this->State)
+    {
+  case STATE_POWELL_START:
+    this->FX = values[0];
+    this->StartPowellIteration();
+    break;
+  case STATE_POWELL_BRACKET:
+    {
+    // Bracket the minimum with the probes and the current point at t = 0
+    std::vector<std::pair<double, double> > line;
+    line.push_back(std::pair<double, double>(0.0, this->FX));
+    for (i = 0; i < probes.size(); i++)
+      {
+      double t = 0.0;
+      for (j = 0; j < (unsigned int) n; j++)
+        if (this->LineDirection[j] != 0.0)
+          {
+          t = (probes[i][j] - this->X[j]) / this->LineDirection[j];
+          break;
+          }
+      line.push_back(std::pair<double, double>(t, values[i]));
+      }
+    std::sort(line.begin(), line.end());
+
+    unsigned int best = 0;
+    for (i = 1; i < line.size(); i++)
+      if (line[i].second < line[best].second)
+        best = i;
+
+    double a = line[best > 0 ? best - 1 : best].first;
+    double c = line[best + 1 < line.size() ? best + 1 : best].first;
+
+    // The absolute tolerance of Brent's method must be smaller than the
+    // parameter tolerance, otherwise narrow valleys are not followed
+    this->Brent->SetAbsoluteTolerance(0.01 * this->Tolerance);
+    this->Brent->Init(a, line[best].first, c, this->Tolerance, line[best].second);
+    this->LineIterations = 0;
+    this->State = STATE_POWELL_BRENT;
+    this->NextLineProbe();
+    break;
+    }
+  case STATE_POWELL_BRENT:
+    this->Brent->Evaluate(values[0]);
+    this->NextLineProbe();
+    break;
+  case STATE_POWELL_EXTRAPOLATE:
+    {
+    double fp = this->IterationStartValue;
+    double fret = this->FX;
+    double fptt = values[0];
+    double del = this->LargestDecrease;
+
+    // Replace the direction of the largest decrease with the
+    // average direction of the last iteration if useful
+    if (fptt < fp)
+      {
+      double t = 2.0 * (fp - 2.0 * fret + fptt) * (fp - fret - del) * (fp - fret - del)
+          - del * (fp - fptt) * (fp - fptt);
+      if (t < 0.0)
+        {
+        this->Direction = n;
+        this->StartLineSearch(this->ExtrapolationDirection);
+        break;
+        }
+      }
+    this->StartPowellIteration();
+    break;
+    }
+  case STATE_NELDER_MEAD_START:
+    this->Simplex = probes;
+    this->SimplexValues = values;
+    this->NextNelderMeadStep();
+    break;
+  case STATE_NELDER_MEAD_REFLECT:
+    {
+    double fr = values[0];
+    this->ReflectionValue = fr;
+
+    if (fr < this->SimplexValues[0])
+      {
+      // Try to expand
+      Point expansion(n);
+      for (j = 0; j < (unsigned int) n; j++)
+        expansion[j] = this->Centroid[j] + 2.0 * (this->Centroid[j] - this->Simplex[n][j]);
+      this->Clamp(expansion);
+      this->SetBatch(expansion);
+      this->State = STATE_NELDER_MEAD_EXPAND;
+      }
+    else if (fr < this->SimplexValues[n - 1])
+      {
+      this->ReplaceWorstVertex(this->Reflection, fr);
+      this->NextNelderMeadStep();
+      }
+    else
+      {
+      // Contract outside or inside of the simplex
+      Point contraction(n);
+      const Point &target = (fr < this->SimplexValues[n] ? this->Reflection : this->Simplex[n]);
+      for (j = 0; j < (unsigned int) n; j++)
+        contraction[j] = this->Centroid[j] + 0.5 * (target[j] - this->Centroid[j]);
+      this->SetBatch(contraction);
+      if (fr < this->SimplexValues[n])
+        this->State = STATE_NELDER_MEAD_CONTRACT_OUTSIDE;
+      else
+        this->State = STATE_NELDER_MEAD_CONTRACT_INSIDE;
+      }
+    break;
+    }
+  case STATE_NELDER_MEAD_EXPAND:
+    if (values[0] < this->ReflectionValue)
+      this->ReplaceWorstVertex(probes[0], values[0]);
+    else
+      this->ReplaceWorstVertex(this->Reflection, this->ReflectionValue);
+    this->NextNelderMeadStep();
+    break;
+  case STATE_NELDER_MEAD_CONTRACT_OUTSIDE:
+  case STATE_NELDER_MEAD_CONTRACT_INSIDE:
+    if ((this->State == STATE_NELDER_MEAD_CONTRACT_OUTSIDE && values[0] <= this->ReflectionValue)
+        || (this->State == STATE_NELDER_MEAD_CONTRACT_INSIDE && values[0] < this->SimplexValues[n]))
+      {
+      this->ReplaceWorstVertex(probes[0], values[0]);
+      this->NextNelderMeadStep();
+      }
+    else
+      {
+      // Shrink the simplex towards the best vertex, all new vertices
+      // are evaluated in a single batch
+      this->Probes.clear();
+      for (i = 1; i <= (unsigned int) n; i++)
+        {
+        Point vertex(n);
+        for (j = 0; j < (unsigned int) n; j++)
+          vertex[j] = this->Simplex[0][j] + 0.5 * (this->Simplex[i][j] - this->Simplex[0][j]);
+        this->Probes.push_back(vertex);
+        }
+      this->ProbeValues.assign(n, 0.0);
+      this->State = STATE_NELDER_MEAD_SHRINK;
+      }
+    break;
+  case STATE_NELDER_MEAD_SHRINK:
+    for (i = 0; i < probes.size(); i++)
+      {
+      this->Simplex[i + 1] = probes[i];
+      this->SimplexValues[i + 1] = values[i];
+      }
+    this->NextNelderMeadStep();
+    break;
+  default:
+    vtkErrorMacro(<< "Unknown state " << this->State);
+    this->Finished = true;
+    break;
+    }
+
+  if (this->NumberOfEvaluations >= this->MaxNumberOfEvaluations)
+    this->Finished = true;
+
+  if (this->Finished)
+    {
+    this->Probes.clear();
+    this->ProbeValues.clear();
+    }
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::StartPowellIteration()
+{
+  this->IterationStart = this->X;
+  this->IterationStartValue = this->FX;
+  this->LargestDecrease = 0.0;
+  this->LargestDecreaseDirection = 0;
+  this->Direction = 0;
+  this->StartLineSearch(this->Directions[0]);
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::FinishPowellIteration()
+{
+  unsigned int i;
+  int n = this->Minimum.size();
+  double fp = this->IterationStartValue;
+
+  if (2.0 * (fp - this->FX) <= this->Tolerance * (fabs(fp) + fabs(this->FX)) + TINY)
+    {
+    this->Finished = true;
+    return;
+    }
+
+  // The extrapolated point and the average direction of the iteration
+  Point extrapolation(n);
+  double scale = 0.0;
+  bool inside = true;
+
+  this->ExtrapolationDirection.assign(n, 0.0);
+  for (i = 0; i < (unsigned int) n; i++)
+    {
+    extrapolation[i] = 2.0 * this->X[i] - this->IterationStart[i];
+    this->ExtrapolationDirection[i] = this->X[i] - this->IterationStart[i];
+    if (fabs(this->ExtrapolationDirection[i]) > scale)
+      scale = fabs(this->ExtrapolationDirection[i]);
+    if (extrapolation[i] < 0.0 || extrapolation[i] > 1.0)
+      inside = false;
+    }
+
+  if (!inside || scale == 0.0)
+    {
+    this->StartPowellIteration();
+    return;
+    }
+
+  for (i = 0; i < (unsigned int) n; i++)
+    this->ExtrapolationDirection[i] /= scale;
+
+  this->SetBatch(extrapolation);
+  this->State = STATE_POWELL_EXTRAPOLATE;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::StartLineSearch(const Point &direction)
+{
+  unsigned int i;
+  int j;
+  int n = this->Minimum.size();
+  double tmin = -VTK_DOUBLE_MAX;
+  double tmax = VTK_DOUBLE_MAX;
+
+  this->LineDirection = direction;
+
+  // Compute the range of the line inside the parameter ranges
+  for (i = 0; i < (unsigned int) n; i++)
+    {
+    double d = direction[i];
+    if (d == 0.0)
+      continue;
+    double lo = (0.0 - this->X[i]) / d;
+    double hi = (1.0 - this->X[i]) / d;
+    if (lo > hi)
+      std::swap(lo, hi);
+    if (lo > tmin)
+      tmin = lo;
+    if (hi < tmax)
+      tmax = hi;
+    }
+
+  if (tmax - tmin <= TINY || tmin > 0.0 || tmax < 0.0)
+    {
+    this->FinishLineSearch(0.0, this->FX);
+    return;
+    }
+
+  // Equidistant probes along the line to bracket the minimum
+  this->Probes.clear();
+  for (j = 0; j < this->NumberOfLineProbes; j++)
+    {
+    double t = tmin + j * (tmax - tmin) / (this->NumberOfLineProbes - 1);
+    Point probe(n);
+    for (i = 0; i < (unsigned int) n; i++)
+      probe[i] = this->X[i] + t * direction[i];
+    this->Clamp(probe);
+    this->Probes.push_back(probe);
+    }
+  this->ProbeValues.assign(this->Probes.size(), 0.0);
+  this->State = STATE_POWELL_BRACKET;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::NextLineProbe()
+{
+  unsigned int i;
+
+  if (this->LineIterations >= MAX_LINE_ITERATIONS || this->Brent->IsFinished())
+    {
+    this->FinishLineSearch(this->Brent->Getx(), this->Brent->Getfx());
+    return;
+    }
+
+  double t = this->Brent->Fit();
+  Point probe(this->X.size());
+
+  for (i = 0; i < this->X.size(); i++)
+    probe[i] = this->X[i] + t * this->LineDirection[i];
+  this->Clamp(probe);
+
+  this->LineIterations++;
+  this->SetBatch(probe);
+  this->State = STATE_POWELL_BRENT;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::FinishLineSearch(double t, double value)
+{
+  unsigned int i;
+  int n = this->Minimum.size();
+  double decrease = 0.0;
+
+  if (value < this->FX)
+    {
+    for (i = 0; i < (unsigned int) n; i++)
+      this->X[i] += t * this->LineDirection[i];
+    this->Clamp(this->X);
+    decrease = this->FX - value;
+    this->FX = value;
+    }
+
+  if (this->Direction < n)
+    {
+    if (decrease > this->LargestDecrease)
+      {
+      this->LargestDecrease = decrease;
+      this->LargestDecreaseDirection = this->Direction;
+      }
+    this->Direction++;
+    if (this->Direction < n)
+      this->StartLineSearch(this->Directions[this->Direction]);
+    else
+      this->FinishPowellIteration();
+    }
+  else
+    {
+    // The line search along the average direction is finished
+    this->Directions[this->LargestDecreaseDirection] = this->Directions[n - 1];
+    this->Directions[n - 1] = this->ExtrapolationDirection;
+    this->StartPowellIteration();
+    }
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::NextNelderMeadStep()
+{
+  unsigned int i, j;
+  int n = this->Minimum.size();
+
+  // Sort the simplex by the function values
+  std::vector<std::pair<double, unsigned int> > order;
+  for (i = 0; i < this->Simplex.size(); i++)
+    order.push_back(std::pair<double, unsigned int>(this->SimplexValues[i], i));
+  std::sort(order.begin(), order.end());
+
+  std::vector<Point> simplex;
+  for (i = 0; i < order.size(); i++)
+    {
+    simplex.push_back(this->Simplex[order[i].second]);
+    this->SimplexValues[i] = order[i].first;
+    }
+  this->Simplex = simplex;
+
+  // Check the function values and the size of the simplex
+  double fl = this->SimplexValues[0];
+  double fh = this->SimplexValues[n];
+
+  if (2.0 * fabs(fh - fl) <= this->Tolerance * (fabs(fh) + fabs(fl)) + TINY)
+    {
+    this->Finished = true;
+    return;
+    }
+
+  double size = 0.0;
+  for (i = 1; i <= (unsigned int) n; i++)
+    for (j = 0; j < (unsigned int) n; j++)
+      if (fabs(this->Simplex[i][j] - this->Simplex[0][j]) > size)
+        size = fabs(this->Simplex[i][j] - this->Simplex[0][j]);
+
+  if (size <= this->Tolerance)
+    {
+    this->Finished = true;
+    return;
+    }
+
+  // Reflect the worst vertex at the centroid of the others
+  this->Centroid.assign(n, 0.0);
+  for (i = 0; i < (unsigned int) n; i++)
+    for (j = 0; j < (unsigned int) n; j++)
+      this->Centroid[j] += this->Simplex[i][j] / n;
+
+  this->Reflection.assign(n, 0.0);
+  for (j = 0; j < (unsigned int) n; j++)
+    this->Reflection[j] = 2.0 * this->Centroid[j] - this->Simplex[n][j];
+  this->Clamp(this->Reflection);
+
+  this->SetBatch(this->Reflection);
+  this->State = STATE_NELDER_MEAD_REFLECT;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::ReplaceWorstVertex(const Point &point, double value)
+{
+  int n = this->Minimum.size();
+
+  this->Simplex[n] = point;
+  this->SimplexValues[n] = value;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDirectSearchMethod::PrintSelf(ostream& os, vtkIndent indent)
+{
+  this->Superclass::PrintSelf(os, indent);
+
+  os << indent << "Method: " << this->Method << endl;
+  os << indent << "Tolerance: " << this->Tolerance << endl;
+  os << indent << "MaxNumberOfEvaluations: " << this->MaxNumberOfEvaluations << endl;
+  os << indent << "NumberOfLineProbes: " << this->NumberOfLineProbes << endl;
+  os << indent << "InitialStep: " << this->InitialStep << endl;
+  os << indent << "NumberOfEvaluations: " << this->NumberOfEvaluations << endl;
+  os << indent << "BestValue: " << this->BestValue << endl;
+}
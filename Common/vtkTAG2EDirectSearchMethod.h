@@ -0,0 +1,232 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+/**
+ * \brief Direct search minimization of a function with several bounded parameters
+ *
+ * Two methods are available:
+ *
+ * <ul>
+ * <li>Powell's method of conjugate directions. Starting with the coordinate
+ *     directions, the function is minimized along each direction using
+ *     vtkTAG2EBrentsMethod. The minimum along a direction is bracketed
+ *     by NumberOfLineProbes equidistant probes in the feasible range before
+ *     Brent's method starts.</li>
+ * <li>The Nelder-Mead simplex method</li>
+ * </ul>
+ *
+ * The parameters are scaled internally to [0:1] using their minimum and maximum,
+ * all probes are inside the parameter ranges.
+ *
+ * Same as vtkTAG2EBrentsMethod this class uses reverse communication: The caller
+ * computes the function values of a batch of probes which are provided by
+ * this class. The probes of a batch are independent, hence they can
+ * be evaluated in parallel, e.g. with several model instances. The bracketing
+ * of the line searches, the initial simplex and the simplex shrinking
+ * result in batches with several probes. Probes which are not valid
+ * for the caller should be evaluated with TAG2E_DIRECT_SEARCH_INVALID_VALUE.
+ *
+ * Here some Python example code of the method usage:
+ *
+ * @code
+ *
+ * # Minimize (x - 1)^2 + (y - 2)^2 with x in [-5:5] and y in [-5:5]
+ *
+ * search = vtkTAG2EDirectSearchMethod()
+ * search.SetMethodToPowell()
+ * search.SetNumberOfParameters(2)
+ * search.SetParameter(0, 0.0, -5.0, 5.0)
+ * search.SetParameter(1, 0.0, -5.0, 5.0)
+ * search.Init()
+ *
+ * while not search.IsFinished():
+ *     for probe in range(search.GetNumberOfProbes()):
+ *         x = search.GetProbeParameter(probe, 0)
+ *         y = search.GetProbeParameter(probe, 1)
+ *         search.SetProbeValue(probe, (x - 1)*(x - 1) + (y - 2)*(y - 2))
+ *     search.Evaluate()
+ *
+ * print search.GetBestParameter(0), search.GetBestParameter(1), search.GetBestValue()
+ *
+ * @endcode
+ *
+ * \author Soeren Gebbert
+ * \author Rene Dechow
+ *
+ *
+ * */
+
+#ifndef __vtkTAG2EDirectSearchMethod_h
+#define __vtkTAG2EDirectSearchMethod_h
+
+#include <vtkObject.h>
+#include "vtkTAG2ECommonWin32Header.h"
+#include <vector>
+
+#define TAG2E_DIRECT_SEARCH_POWELL 0
+#define TAG2E_DIRECT_SEARCH_NELDER_MEAD 1
+
+//! The function value which should be used for invalid probes
+#define TAG2E_DIRECT_SEARCH_INVALID_VALUE 1.0E20
+
+class vtkTAG2EBrentsMethod;
+
+class VTK_TAG2E_COMMON_EXPORT vtkTAG2EDirectSearchMethod : public vtkObject
+{
+public:
+  static  vtkTAG2EDirectSearchMethod *New();
+  vtkTypeRevisionMacro(vtkTAG2EDirectSearchMethod,vtkObject);
+  void PrintSelf(ostream& os, vtkIndent indent);
+
+  //!\brief The minimization method, default is Powell's method
+  vtkSetClampMacro(Method, int, TAG2E_DIRECT_SEARCH_POWELL, TAG2E_DIRECT_SEARCH_NELDER_MEAD);
+  vtkGetMacro(Method, int);
+  void SetMethodToPowell(){this->SetMethod(TAG2E_DIRECT_SEARCH_POWELL);}
+  void SetMethodToNelderMead(){this->SetMethod(TAG2E_DIRECT_SEARCH_NELDER_MEAD);}
+
+  //!\brief The relative break tolerance of the function value and the tolerance
+  //! of the scaled parameters, default 0.0001
+  vtkSetMacro(Tolerance, double);
+  vtkGetMacro(Tolerance, double);
+  //!\brief The maximum number of function evaluations, default 1000
+  vtkSetMacro(MaxNumberOfEvaluations, int);
+  vtkGetMacro(MaxNumberOfEvaluations, int);
+  //!\brief The number of probes used to bracket the minimum of a line search
+  //! in Powell's method, default 4
+  vtkSetClampMacro(NumberOfLineProbes, int, 2, VTK_INT_MAX);
+  vtkGetMacro(NumberOfLineProbes, int);
+  //!\brief The size of the initial simplex of the Nelder-Mead method relative to
+  //! the parameter ranges, default 0.1
+  vtkSetClampMacro(InitialStep, double, 0.0, 1.0);
+  vtkGetMacro(InitialStep, double);
+
+  //!\brief Set the number of parameters, must be called before the parameters are set
+  void SetNumberOfParameters(int number);
+  int GetNumberOfParameters(){return this->Minimum.size();}
+  //!\brief Set the start value and the range of a parameter
+  void SetParameter(int index, double value, double min, double max);
+
+  /**\brief Start the minimization and create the first batch of probes.
+   * Call this function once after all parameters are set.
+   */
+  void Init();
+  /**\brief Check if the minimum was found or the maximum number
+   * of evaluations was reached
+   *
+   * @return true if finished, false if not
+   */
+  bool IsFinished(){return this->Finished;}
+
+  //!\brief Return the number of probes of the current batch
+  int GetNumberOfProbes(){return this->Probes.size();}
+  //!\brief Return the parameter value at index of a probe of the current batch
+  double GetProbeParameter(int probe, int index);
+  //!\brief Set the function value of a probe of the current batch
+  void SetProbeValue(int probe, double value);
+  /**\brief Process the function values of all probes of the current batch
+   * and create the next batch
+   */
+  void Evaluate();
+
+  //!\brief Return the parameter value at index of the best probe
+  double GetBestParameter(int index);
+  //!\brief Return the function value of the best probe
+  vtkGetMacro(BestValue, double);
+  //!\brief Return the number of evaluated probes
+  vtkGetMacro(NumberOfEvaluations, int);
+
+protected:
+  vtkTAG2EDirectSearchMethod();
+  ~vtkTAG2EDirectSearchMethod();
+
+  //BTX
+  typedef std::vector<double> Point;
+
+  void SetBatch(const Point &point);
+  void Clamp(Point &point);
+  void StartPowellIteration();
+  void FinishPowellIteration();
+  void StartLineSearch(const Point &direction);
+  void NextLineProbe();
+  void FinishLineSearch(double t, double value);
+  void NextNelderMeadStep();
+  void ReplaceWorstVertex(const Point &point, double value);
+
+  int Method;
+  int MaxNumberOfEvaluations;
+  int NumberOfLineProbes;
+  int NumberOfEvaluations;
+  int State;
+  bool Finished;
+  double Tolerance;
+  double InitialStep;
+  double BestValue;
+
+  // The parameter ranges, the values of the points are scaled to [0:1]
+  std::vector<double> Minimum;
+  std::vector<double> Maximum;
+  Point Start;
+  Point Best;
+
+  // The current batch of probes and their function values
+  std::vector<Point> Probes;
+  std::vector<double> ProbeValues;
+
+  // Powell's method
+  vtkTAG2EBrentsMethod *Brent;
+  std::vector<Point> Directions;
+  Point X;
+  Point IterationStart;
+  Point LineDirection;
+  Point ExtrapolationDirection;
+  double FX;
+  double IterationStartValue;
+  double LargestDecrease;
+  int LargestDecreaseDirection;
+  int Direction;
+  int LineIterations;
+
+  // Nelder-Mead method, the simplex is sorted by the function values
+  std::vector<Point> Simplex;
+  std::vector<double> SimplexValues;
+  Point Centroid;
+  Point Reflection;
+  double ReflectionValue;
+  //ETX
+
+private:
+  vtkTAG2EDirectSearchMethod(const vtkTAG2EDirectSearchMethod&);  // Not implemented.
+  void operator=(const vtkTAG2EDirectSearchMethod&);  // Not implemented.
+};
+
+
+#endif
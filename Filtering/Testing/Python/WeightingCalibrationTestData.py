@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+#
+# Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+#
+# Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+#          Rene Dechow, rene.dechow@vti.bund.de
+#
+# Copyright:
+#
+# Johann Heinrich von Thuenen-Institut
+# Institut fuer Agrarrelevante Klimaforschung
+#
+# Phone: +49 (0)531 596 2601
+#
+# Fax:+49 (0)531 596 2699
+#
+# Mail: ak@vti.bund.de
+#
+# Bundesallee 50
+# 38116 Braunschweig
+# Germany
+#
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#include the VTK and vtkGRASSBridge Python libraries
+from vtk import *
+
+from libvtkTAG2ECommonPython import *
+from libvtkTAG2EFilteringPython import *
+
+# The datasets and the weighting scheme which are shared by the tests of the
+# model calibrators. The model input has seven cells with the factor values
+# 0 ... 6 and the model values 1 ... 7, the target is 1 in all cells.
+# Hence the expected weights are 1, 1/2, 1/3, 1/4, 1/5, 1/6, 1/7.
+
+def CreateWeightingDataSets():
+    """Create the model input and the target dataset of the weighting tests
+       and return them as tuple
+    """
+    # Create the point data
+    xext = 7
+    yext = 1
+    num = xext*yext
+
+    ds1 = vtkPolyData()
+    ds1.Allocate(xext,yext)
+
+    ds2 = vtkPolyData()
+    ds2.Allocate(xext,yext)
+
+    model = vtkDoubleArray()
+    model.SetNumberOfTuples(num)
+    model.SetName("model")
+
+    factor = vtkDoubleArray()
+    factor.SetNumberOfTuples(num)
+    factor.SetName("factor")
+
+    target = vtkDoubleArray()
+    target.SetNumberOfTuples(num)
+    target.SetName("target")
+    target.FillComponent(0, 1.0)
+
+    # Point ids for poly vertex cell
+    points = vtkPoints()
+
+    count = 0
+    for i in range(xext):
+        for j in range(yext):
+            ids = vtkIdList()
+            ids.InsertNextId(points.InsertNextPoint(i, j, 0))
+            model.SetValue(count, count + 1)
+            factor.SetValue(count, count)
+            ds1.InsertNextCell(vtk.VTK_VERTEX, ids)
+            ds2.InsertNextCell(vtk.VTK_VERTEX, ids)
+            count += 1
+
+    ds1.GetCellData().AddArray(factor)
+    ds1.GetCellData().AddArray(model)
+    ds1.GetCellData().SetActiveScalars(model.GetName())
+    ds1.SetPoints(points)
+
+    ds2.GetCellData().AddArray(target)
+    ds2.GetCellData().SetActiveScalars(target.GetName())
+    ds2.SetPoints(points)
+
+    return ds1, ds2
+
+def BuildWeightingXML(value):
+    """Create the weighting scheme with seven calibratable weights in the
+       range [0:1] which are all set to value
+    """
+    root  = vtk.vtkXMLDataElement()
+
+    factor = vtkXMLDataElement()
+    factor.SetName("Factor")
+    factor.SetAttribute("name", "factor")
+
+    weights = vtkXMLDataElement()
+    weights.SetName("Weights")
+
+    for i in range(7):
+        weight = vtkXMLDataElement()
+        weight.SetName("Weight")
+        weight.SetIntAttribute("id", i)
+        weight.SetIntAttribute("const", 0)
+        weight.SetIntAttribute("active", 1)
+        weight.SetDoubleAttribute("min", 0)
+        weight.SetDoubleAttribute("max", 1)
+        weight.SetCharacterData(str(value), 6)
+        weights.AddNestedElement(weight)
+
+    root.SetName("Weighting")
+    root.AddNestedElement(factor)
+    root.AddNestedElement(weights)
+    root.SetAttribute("name", "test")
+    root.SetAttribute("xmlns", "http://tag2e.googlecode.com/files/Weighting")
+    root.SetAttribute("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
+    root.SetAttribute("xsi:schemaLocation", "http://tag2e.googlecode.com/files/Weighting http://tag2e.googlecode.com/files/Weighting.xsd")
+
+    return root
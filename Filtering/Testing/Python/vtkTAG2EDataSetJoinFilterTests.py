@@ -120,6 +120,53 @@ class vtkTAG2EDataSetJoinFilterTests(unittest.TestCase):
         if not filter.GetOutput().GetPointData().HasArray("E"):
             print "ERROR: array E not GetCellData in cell data"
         
+    def test2ReferenceMode(self):
+
+        ds1 = self._buildPolyDataSet("A", 1)
+        ds2 = self._buildPolyDataSet("B", 2)
+        ds3 = self._buildPolyDataSet("A", 3)
+
+        for mode in [0, 1]:
+            filter = vtkTAG2EDataSetJoinFilter()
+            filter.SetReferenceMode(mode)
+            filter.AddInput(ds1)
+            filter.AddInput(ds2)
+            filter.AddInput(ds3)
+            filter.Update()
+
+            output = filter.GetOutput()
+
+            self.assertEqual(output.GetCellData().GetNumberOfArrays(), 2)
+            self.assertEqual(output.GetPointData().GetNumberOfArrays(), 2)
+            # The first found array is used
+            self.assertEqual(output.GetCellData().GetArray("A").GetValue(0), 1)
+            self.assertEqual(output.GetCellData().GetArray("B").GetValue(0), 2)
+            self.assertEqual(output.GetNumberOfCells(), ds1.GetNumberOfCells())
+
+            # The arrays are shared, not copied
+            self.assertEqual(output.GetCellData().GetArray("B"), ds2.GetCellData().GetArray("B"))
+
+            # A second update must give the same result
+            ds2.Modified()
+            filter.Update()
+            self.assertEqual(filter.GetOutput().GetCellData().GetNumberOfArrays(), 2)
+
+    def test3WrongStructure(self):
+
+        ds1 = self._buildPolyDataSet("A", 1)
+        # A dataset without cells must not be joined
+        ds2 = vtkPolyData()
+        array = vtkDoubleArray()
+        array.SetName("B")
+        ds2.GetCellData().AddArray(array)
+
+        filter = vtkTAG2EDataSetJoinFilter()
+        filter.AddInput(ds1)
+        filter.AddInput(ds2)
+        filter.Update()
+
+        self.assertFalse(filter.GetOutput().GetCellData().HasArray("B"))
+
 if __name__ == '__main__':
     suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDataSetJoinFilterTests)
     unittest.TextTestRunner(verbosity=2).run(suite1) 
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+#
+# Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+#
+# Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+#          Rene Dechow, rene.dechow@vti.bund.de
+#
+# Copyright:
+#
+# Johann Heinrich von Thuenen-Institut
+# Institut fuer Agrarrelevante Klimaforschung
+#
+# Phone: +49 (0)531 596 2601
+#
+# Fax:+49 (0)531 596 2699
+#
+# Mail: ak@vti.bund.de
+#
+# Bundesallee 50
+# 38116 Braunschweig
+# Germany
+#
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#include the VTK and vtkGRASSBridge Python libraries
+import unittest
+
+from vtk import *
+
+from libvtkTAG2ECommonPython import *
+from libvtkTAG2EFilteringPython import *
+from libvtkGRASSBridgeCommonPython import *
+
+from WeightingCalibrationTestData import *
+from Calibration import DifferentialEvolution
+
+################################################################################
+################################################################################
+################################################################################
+
+class vtkTAG2EDifferentialEvolutionModelCalibratorTestsWeighting(unittest.TestCase):
+  
+    def setUp(self):
+
+        self.ds1, self.ds2 = CreateWeightingDataSets()
+        self.root = BuildWeightingXML(0.5)
+
+    def test1Model(self):
+
+        # We expect as result the following weights:
+        # 1, 1/2, 1/3, 1/4, 1/5, 1/6, 1/7
+
+        # Set up the parameter and the model
+        parameter = vtkTAG2EWeightingModelParameter()
+        parameter.SetXMLRepresentation(self.root)
+
+        model = vtkTAG2EWeightingModel()
+        model.SetInput(self.ds1)
+        model.SetModelParameter(parameter)
+        model.UseCellDataOn()
+
+        caliModel = vtkTAG2EDifferentialEvolutionModelCalibrator()
+        caliModel.SetInput(self.ds2)
+        caliModel.SetModel(model)
+        caliModel.SetModelParameter(parameter)
+        caliModel.SetPopulationSize(30)
+        caliModel.SetMaxNumberOfGenerations(150)
+        caliModel.SetSeed(1)
+        caliModel.Update()
+        
+        self.assertTrue(caliModel.GetNumberOfEvaluations() <= 30*151)
+        
+        best = caliModel.GetBestFitModelParameter()
+        for i in range(7):
+            self.assertAlmostEqual(best.GetParameterValue(i), 1.0/(i + 1), 2)
+        
+        best.SetFileName("/tmp/vtkTAG2EDifferentialEvolutionModelCalibratorTestsWeighting1.xml")
+        best.Write()
+
+    def _CreateModel(self):
+
+        parameter = vtkTAG2EWeightingModelParameter()
+        parameter.SetXMLRepresentation(self.root)
+
+        model = vtkTAG2EWeightingModel()
+        model.SetInput(self.ds1)
+        model.SetModelParameter(parameter)
+        model.UseCellDataOn()
+
+        return model, parameter
+
+    def test2SerialParallel(self):
+
+        # The process based calibration of the Calibration module in Python/lib,
+        # we expect as result the following weights:
+        # 1, 1/2, 1/3, 1/4, 1/5, 1/6, 1/7
+        serial = DifferentialEvolution(self._CreateModel, self.ds2,
+                                       populationSize=30, maxGenerations=150,
+                                       seed=1, processes=1)
+        parallel = DifferentialEvolution(self._CreateModel, self.ds2,
+                                         populationSize=30, maxGenerations=150,
+                                         seed=1, processes=3)
+
+        # The same seed must result in the same best fit
+        self.assertEqual(serial[2], parallel[2])
+        self.assertEqual(serial[3], parallel[3])
+
+        for i in range(7):
+            self.assertEqual(serial[0].GetParameterValue(i),
+                             parallel[0].GetParameterValue(i))
+            self.assertAlmostEqual(parallel[0].GetParameterValue(i), 1.0/(i + 1), 2)
+
+        self.assertEqual(serial[1].GetNumberOfCells(), parallel[1].GetNumberOfCells())
+  
+if __name__ == '__main__':
+    suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDifferentialEvolutionModelCalibratorTestsWeighting)
+    unittest.TextTestRunner(verbosity=2).run(suite1)
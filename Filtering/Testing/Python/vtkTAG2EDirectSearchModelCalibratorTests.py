@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#
+# Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+#
+# Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+#          Rene Dechow, rene.dechow@vti.bund.de
+#
+# Copyright:
+#
+# Johann Heinrich von Thuenen-Institut
+# Institut fuer Agrarrelevante Klimaforschung
+#
+# Phone: +49 (0)531 596 2601
+#
+# Fax:+49 (0)531 596 2699
+#
+# Mail: ak@vti.bund.de
+#
+# Bundesallee 50
+# 38116 Braunschweig
+# Germany
+#
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#include the VTK and vtkGRASSBridge Python libraries
+import unittest
+
+from vtk import *
+
+from libvtkTAG2ECommonPython import *
+from libvtkTAG2EFilteringPython import *
+from libvtkGRASSBridgeCommonPython import *
+
+from WeightingCalibrationTestData import *
+
+################################################################################
+################################################################################
+################################################################################
+
+class vtkTAG2EDirectSearchModelCalibratorTestsWeighting(unittest.TestCase):
+  
+    def setUp(self):
+
+        self.ds1, self.ds2 = CreateWeightingDataSets()
+        self.root = BuildWeightingXML(0.5)
+
+    def _Calibrate(self, useNelderMead):
+
+        # We expect as result the following weights:
+        # 1, 1/2, 1/3, 1/4, 1/5, 1/6, 1/7
+
+        # Set up the parameter and the model
+        parameter = vtkTAG2EWeightingModelParameter()
+        parameter.SetXMLRepresentation(self.root)
+
+        model = vtkTAG2EWeightingModel()
+        model.SetInput(self.ds1)
+        model.SetModelParameter(parameter)
+        model.UseCellDataOn()
+
+        caliModel = vtkTAG2EDirectSearchModelCalibrator()
+        caliModel.SetInput(self.ds2)
+        caliModel.SetModel(model)
+        caliModel.SetModelParameter(parameter)
+        if useNelderMead:
+            caliModel.SetMethodToNelderMead()
+        else:
+            caliModel.SetMethodToPowell()
+        caliModel.SetMaxNumberOfEvaluations(2000)
+        caliModel.SetTolerance(0.000001)
+        caliModel.Update()
+        
+        self.assertTrue(caliModel.GetNumberOfEvaluations() <= 2000)
+        
+        best = caliModel.GetBestFitModelParameter()
+        for i in range(7):
+            self.assertAlmostEqual(best.GetParameterValue(i), 1.0/(i + 1), 2)
+        
+        return caliModel
+        
+    def test1Powell(self):
+        
+        caliModel = self._Calibrate(False)
+        caliModel.GetBestFitModelParameter().SetFileName("/tmp/vtkTAG2EDirectSearchModelCalibratorTestsWeighting1.xml")
+        caliModel.GetBestFitModelParameter().Write()
+        
+    def test2NelderMead(self):
+        
+        caliModel = self._Calibrate(True)
+        caliModel.GetBestFitModelParameter().SetFileName("/tmp/vtkTAG2EDirectSearchModelCalibratorTestsWeighting2.xml")
+        caliModel.GetBestFitModelParameter().Write()
+  
+if __name__ == '__main__':
+    suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDirectSearchModelCalibratorTestsWeighting)
+    unittest.TextTestRunner(verbosity=2).run(suite1)
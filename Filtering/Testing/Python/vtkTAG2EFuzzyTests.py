@@ -282,7 +282,128 @@ class vtkTAG2EDFuzzyTest(unittest.TestCase):
         pwriter.Write()
         
         print(fim.GetOutput())
-            
+
+    def test3LookupTable(self):
+
+        # Use the grid nodes of the lookup table as input values
+        pH = self.ds.GetPointData().GetArray("pH")
+        nmin = self.ds.GetPointData().GetArray("nmin")
+        for i in range(pH.GetNumberOfTuples()):
+            pH.SetValue(i, ((i * 37) % 65) * 10000.0/64.0)
+            nmin.SetValue(i, ((i * 13) % 65) * 150.0/64.0)
+
+        fisc = vtkTAG2EFuzzyInferenceModelParameter()
+        fisc.SetXMLRepresentation(self.root)
+
+        model = vtkTAG2EFuzzyInferenceModel()
+        model.SetModelParameter(fisc)
+        model.SetInput(self.ds)
+        model.ComputeSigmaOn()
+        model.Update()
+
+        exact = vtkPolyData()
+        exact.DeepCopy(model.GetOutput())
+
+        model.UseLookupTableOn()
+        model.SetLookupTableResolution(65)
+        model.Update()
+
+        estimate = model.GetLookupTableErrorEstimate()
+        print "Estimated lookup table interpolation error ", estimate
+        self.assertTrue(estimate >= 0.0)
+
+        result = model.GetOutput().GetPointData().GetArray("result")
+        exactResult = exact.GetPointData().GetArray("result")
+
+        # The results at the grid nodes are exact
+        for i in range(result.GetNumberOfTuples()):
+            self.assertAlmostEqual(result.GetValue(i), exactResult.GetValue(i), 6)
+
+        self.assertEqual(model.GetOutput().GetPointData().HasArray("Sigma"), 1)
+        self.assertEqual(model.GetModelAssessmentFactor(), 1)
+
+    def test3LookupTableSwapParameter(self):
+
+        # Use the grid nodes of the lookup table as input values
+        pH = self.ds.GetPointData().GetArray("pH")
+        nmin = self.ds.GetPointData().GetArray("nmin")
+        for i in range(pH.GetNumberOfTuples()):
+            pH.SetValue(i, ((i * 37) % 65) * 10000.0/64.0)
+            nmin.SetValue(i, ((i * 13) % 65) * 150.0/64.0)
+
+        # The second parameter is modified before the first one is created,
+        # hence its modification time is older than the first lookup table
+        root2 = vtkXMLDataElement()
+        root2.DeepCopy(self.root)
+        resp = root2.FindNestedElementWithName("Responses")
+        for i in range(9):
+            resp.GetNestedElement(i).SetCharacterData(str(1.0 - i * 0.1), 6)
+
+        fisc2 = vtkTAG2EFuzzyInferenceModelParameter()
+        fisc2.SetXMLRepresentation(root2)
+
+        fisc1 = vtkTAG2EFuzzyInferenceModelParameter()
+        fisc1.SetXMLRepresentation(self.root)
+
+        model = vtkTAG2EFuzzyInferenceModel()
+        model.SetInput(self.ds)
+        model.SetModelParameter(fisc2)
+        model.Update()
+
+        exact = vtkPolyData()
+        exact.DeepCopy(model.GetOutput())
+
+        model.SetModelParameter(fisc1)
+        model.UseLookupTableOn()
+        model.SetLookupTableResolution(65)
+        model.Update()
+
+        # The lookup table of the first parameter must not be used for the second
+        model.SetModelParameter(fisc2)
+        model.Update()
+
+        result = model.GetOutput().GetPointData().GetArray("result")
+        exactResult = exact.GetPointData().GetArray("result")
+
+        for i in range(result.GetNumberOfTuples()):
+            self.assertAlmostEqual(result.GetValue(i), exactResult.GetValue(i), 6)
+
+    def test4ParameterToImageData(self):
+
+        fisc = vtkTAG2EFuzzyInferenceModelParameter()
+        fisc.SetXMLRepresentation(self.root)
+        fisc.GenerateInternalSchemeFromXML()
+
+        fim = vtkTAG2EFuzzyInferenceModelParameterToImageData()
+        fim.SetFuzzyModelParameter(fisc)
+        fim.SetXAxisExtent(20)
+        fim.SetYAxisExtent(10)
+        fim.CreateDOFArraysOn()
+        fim.Update()
+
+        output = fim.GetOutput()
+        self.assertEqual(output.GetNumberOfPoints(), 200)
+        # Two factors with three fuzzy sets each result in nine rules
+        for rule in range(9):
+            self.assertEqual(output.GetPointData().HasArray("DOF_" + str(rule)), 1)
+
+        # Swap the axes, the responses must be transposed
+        fimSwap = vtkTAG2EFuzzyInferenceModelParameterToImageData()
+        fimSwap.SetFuzzyModelParameter(fisc)
+        fimSwap.SetXAxisFactor(1)
+        fimSwap.SetYAxisFactor(0)
+        fimSwap.SetXAxisExtent(10)
+        fimSwap.SetYAxisExtent(20)
+        fimSwap.Update()
+
+        responses = output.GetPointData().GetArray("Responses")
+        responsesSwap = fimSwap.GetOutput().GetPointData().GetArray("Responses")
+
+        for y in range(10):
+            for x in range(20):
+                self.assertAlmostEqual(responses.GetValue(y * 20 + x),
+                                       responsesSwap.GetValue(x * 10 + y))
+
 if __name__ == '__main__':
     suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDFuzzyTest)
     unittest.TextTestRunner(verbosity=2).run(suite1) 
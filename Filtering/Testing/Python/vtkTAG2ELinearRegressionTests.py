@@ -120,6 +120,154 @@ class vtkTAG2EDLinearRegressionModelTestSimple(unittest.TestCase):
         #result must be exactly 5
         if mean != 5.0:
             print "ERROR mean should be 5 but is", mean
+
+    def testCellDataAndNullValues(self):
+        
+        # Integer cell data with a null value at cell 7
+        data = vtkIntArray()
+        data.SetNumberOfTuples(25)
+        data.SetName("data")
+        data.FillComponent(0,3)
+        data.SetValue(7, -999999)
+
+        ds = vtkPolyData()
+        ds.Allocate(25,25)
+        for i in range(25):
+            ids = vtkIdList()
+            ids.InsertNextId(i)
+            ds.InsertNextCell(vtk.VTK_VERTEX, ids)
+        ds.SetPoints(self.points)
+        ds.GetCellData().SetScalars(data)
+
+        model = vtkTAG2ELinearRegressionModel()
+        model.SetModelParameter(self.lrs)
+        model.SetInput(ds)
+        model.UseCellDataOn()
+        model.Update()   
+
+        result = model.GetOutput().GetCellData().GetScalars()
+        
+        for i in range(25):
+            if i == 7:
+                self.assertEqual(result.GetValue(i), -999999)
+            else:
+                self.assertEqual(result.GetValue(i), 5.0)
+        
+class vtkTAG2EDLinearRegressionModelEstimatorTest(unittest.TestCase):
+    
+    def setUp(self):
+        
+        # The target follows 0.5 + 2*x + 0.5*x^2 exactly
+        x = vtkDoubleArray()
+        x.SetName("x")
+        y = vtkDoubleArray()
+        y.SetName("y")
+        
+        points = vtkPoints()
+        
+        for i in range(100):
+            value = i/10.0
+            points.InsertNextPoint(i, 0, 0)
+            x.InsertNextValue(value)
+            y.InsertNextValue(0.5 + 2.0*value + 0.5*value*value)
+        
+        # A null value which must be skipped
+        x.SetValue(50, -999999)
+
+        self.ds = vtkPolyData()
+        self.ds.SetPoints(points)
+        self.ds.GetPointData().AddArray(x)
+        self.ds.GetPointData().SetScalars(y)
+        
+        # The initial scheme with wrong coefficients
+        self.lrs = vtkTAG2EAbstractModelParameter()
+        
+        root  = vtk.vtkXMLDataElement()
+        
+        intercept = vtkXMLDataElement()
+        coefficient1 = vtkXMLDataElement()
+        coefficient2 = vtkXMLDataElement()
+        
+        intercept.SetName("Intercept")
+        intercept.SetCharacterData("0", 1)
+        
+        coefficient1.SetName("Coefficient")
+        coefficient1.SetIntAttribute("portId", 0)
+        coefficient1.SetAttribute("name", "x")
+        coefficient1.SetDoubleAttribute("power", 1)
+        coefficient1.SetCharacterData("1", 1)
+        
+        coefficient2.SetName("Coefficient")
+        coefficient2.SetIntAttribute("portId", 0)
+        coefficient2.SetAttribute("name", "x")
+        coefficient2.SetDoubleAttribute("power", 2)
+        coefficient2.SetCharacterData("1", 1)
+
+        root.SetName("LinearRegressionScheme")
+        root.SetAttribute("name", "Estimation")
+        root.SetIntAttribute("numberOfCoefficients", 2)
+        root.SetIntAttribute("hasIntercept", 1)
+        root.AddNestedElement(intercept)
+        root.AddNestedElement(coefficient1)
+        root.AddNestedElement(coefficient2)
+        root.SetCharacterDataWidth(0)
+        
+        self.lrs.SetXMLRepresentation(root)
+        
+    def testEstimation(self):
+        
+        model = vtkTAG2ELinearRegressionModel()
+        
+        estimator = vtkTAG2ELinearRegressionModelEstimator()
+        estimator.SetInput(self.ds)
+        estimator.SetModel(model)
+        estimator.SetModelParameter(self.lrs)
+        estimator.SetChunkSize(16)
+        estimator.Update()
+        
+        self.assertEqual(estimator.GetNumberOfSamples(), 99)
+        self.assertAlmostEqual(model.GetIntercept(), 0.5, 8)
+        self.assertAlmostEqual(model.GetCoefficient(0), 2.0, 8)
+        self.assertAlmostEqual(model.GetCoefficient(1), 0.5, 8)
+        
+        result = estimator.GetOutput().GetPointData().GetScalars()
+        self.assertAlmostEqual(result.GetValue(10), 3.0, 6)
+        
+        # The input connections of the model are not modified
+        self.assertEqual(model.GetNumberOfInputConnections(0), 0)
+        
+    def testAccumulate(self):
+        
+        # Estimate the coefficients from two halves of the dataset
+        model = vtkTAG2ELinearRegressionModel()
+        
+        estimator = vtkTAG2ELinearRegressionModelEstimator()
+        estimator.SetModel(model)
+        estimator.SetModelParameter(self.lrs)
+        estimator.AccumulateOn()
+        
+        for start in (0, 50):
+            piece = vtkPolyData()
+            points = vtkPoints()
+            x = vtkDoubleArray()
+            x.SetName("x")
+            y = vtkDoubleArray()
+            y.SetName("y")
+            for i in range(start, start + 50):
+                points.InsertNextPoint(i, 0, 0)
+                x.InsertNextValue(self.ds.GetPointData().GetArray("x").GetValue(i))
+                y.InsertNextValue(self.ds.GetPointData().GetScalars().GetValue(i))
+            piece.SetPoints(points)
+            piece.GetPointData().AddArray(x)
+            piece.GetPointData().SetScalars(y)
+            
+            estimator.SetInput(piece)
+            estimator.Update()
+        
+        self.assertEqual(estimator.GetNumberOfSamples(), 99)
+        self.assertAlmostEqual(model.GetIntercept(), 0.5, 8)
+        self.assertAlmostEqual(model.GetCoefficient(0), 2.0, 8)
+        self.assertAlmostEqual(model.GetCoefficient(1), 0.5, 8)
         
 # Test a more complex multi-linear regression scheme
 class vtkTAG2EDLinearRegressionModelTestComplex(unittest.TestCase):
@@ -321,5 +469,7 @@ if __name__ == '__main__':
     unittest.TextTestRunner(verbosity=2).run(suite2) 
     suite3 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDLinearRegressionModelTestComplex)
     unittest.TextTestRunner(verbosity=2).run(suite3) 
+    suite4 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDLinearRegressionModelEstimatorTest)
+    unittest.TextTestRunner(verbosity=2).run(suite4) 
     
     
\ No newline at end of file
@@ -539,6 +539,115 @@ class vtkTAG2EDataSetN2OFilterTest(unittest.TestCase):
 
         print model.GetOutput().GetPointData().GetScalars().GetRange()
 
+    def testEnsemble(self):
+
+        # Compute all models in a single pass
+        model = vtkTAG2EDataSetN2OFilter()
+        model.SetInput(self.data)
+        model.SetNitrogenRateArrayName(self.nrate.GetName())
+        model.SetSandFractionArrayName(self.sand.GetName())
+        model.SetSiltFractionArrayName(self.silt.GetName())
+        model.SetClayFractionArrayName(self.clay.GetName())
+        model.SetpHArrayName(self.pH.GetName())
+        model.SetSoilOrganicCarbonArrayName(self.soilC.GetName())
+        model.SetSoilNitrogenArrayName(self.soilN.GetName())
+        model.SetTempWinterArrayName(self.T_win.GetName())
+        model.SetTempSpringArrayName(self.T_spring.GetName())
+        model.SetPrecipitationSumArrayName(self.P_sum.GetName())
+        model.SetCategoryArrayName(self.cats.GetName())
+        model.ComputeFreibauerOn()
+        model.ComputeStehfestOn()
+        model.ComputeRoelandtOn()
+        model.ComputeBouwmanOn()
+        model.UsePointDataOn()
+        model.Update()
+
+        output = model.GetOutput().GetPointData()
+
+        # The single model filters must compute identical results
+        freibauer = vtkTAG2EDataSetN2OFilterFreibauer()
+        freibauer.SetInput(self.data)
+        freibauer.SetNitrogenRateArrayName(self.nrate.GetName())
+        freibauer.SetSandFractionArrayName(self.sand.GetName())
+        freibauer.SetSoilOrganicCarbonArrayName(self.soilC.GetName())
+        freibauer.SetSoilNitrogenArrayName(self.soilN.GetName())
+        freibauer.UsePointDataOn()
+        freibauer.Update()
+
+        bouwman = vtkTAG2EDataSetN2OFilterBouwman()
+        bouwman.SetInput(self.data)
+        bouwman.SetNitrogenRateArrayName(self.nrate.GetName())
+        bouwman.UsePointDataOn()
+        bouwman.Update()
+
+        for i in range(0, self.data.GetNumberOfPoints(), 97):
+            self.assertAlmostEqual(output.GetArray("N2O_Freibauer").GetValue(i),
+                                   freibauer.GetOutput().GetPointData().GetScalars().GetValue(i))
+            self.assertAlmostEqual(output.GetArray("N2O_Bouwman").GetValue(i),
+                                   bouwman.GetOutput().GetPointData().GetScalars().GetValue(i))
+
+            mean = (output.GetArray("N2O_Freibauer").GetValue(i) +
+                    output.GetArray("N2O_Stehfest").GetValue(i) +
+                    output.GetArray("N2O_Roelandt").GetValue(i) +
+                    output.GetArray("N2O_Bouwman").GetValue(i))/4.0
+            self.assertAlmostEqual(output.GetScalars().GetValue(i), mean)
+
+    def testNullValues(self):
+
+        nrate = vtkDoubleArray()
+        nrate.DeepCopy(self.nrate)
+        nrate.SetName("nrate_null")
+        nrate.SetValue(0, -999999)
+        self.data.GetPointData().AddArray(nrate)
+
+        model = vtkTAG2EDataSetN2OFilterBouwman()
+        model.SetInput(self.data)
+        model.SetNitrogenRateArrayName(nrate.GetName())
+        model.SetNullValue(-999999)
+        model.UsePointDataOn()
+        model.Update()
+
+        result = model.GetOutput().GetPointData().GetScalars()
+        self.assertEqual(result.GetValue(0), -999999)
+        self.assertAlmostEqual(result.GetValue(1), 1 + 0.0125 * 100)
+
+    def testSparseCategories(self):
+
+        # Sparse category ids with differing nitrogen rates per category
+        nrate = vtkDoubleArray()
+        nrate.SetName("nrate_sparse")
+        nrate.SetNumberOfTuples(self.data.GetNumberOfPoints())
+
+        cats = vtkIntArray()
+        cats.SetName("cats_sparse")
+        cats.SetNumberOfTuples(self.data.GetNumberOfPoints())
+
+        for i in range(self.data.GetNumberOfPoints()):
+            cats.SetValue(i, (i % 100) * 1000003)
+            nrate.SetValue(i, (i % 100))
+
+        self.data.GetPointData().AddArray(nrate)
+        self.data.GetPointData().AddArray(cats)
+
+        model = vtkTAG2EDataSetN2OFilterBouwman()
+        model.SetInput(self.data)
+        model.SetNitrogenRateArrayName(nrate.GetName())
+        model.SetCategoryArrayName(cats.GetName())
+        model.CheckCategoryConsistencyOn()
+        model.UsePointDataOn()
+        model.Update()
+
+        result = model.GetOutput().GetPointData().GetScalars()
+        for i in range(0, self.data.GetNumberOfPoints(), 13):
+            self.assertAlmostEqual(result.GetValue(i), 1 + 0.0125 * (i % 100))
+
+        # A category with differing input data must be detected
+        nrate.SetValue(150, 1000)
+        model.Modified()
+        model.Update()
+
+        self.assertEqual(model.GetOutput().GetPointData().GetArray("N2O"), None)
+
 if __name__ == '__main__':
     suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDImageDataN2OFilterTest)
     suite2= unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDataSetN2OFilterTest)
@@ -231,6 +231,93 @@ class vtkTAG2EDParameterFuzzyTest(unittest.TestCase):
             for i in range(10):
                 fisc.ModifyParameter(j, 0.1*(j + 1)/2)
                 print fisc.GetParameterValue(j)
+
+    def test4FuzzyBinary(self):
+        
+        fisc = vtkTAG2EFuzzyInferenceModelParameter()
+        fisc.SetXMLRepresentation(self.root)
+        fisc.SetFileName("/tmp/FuzzyInferenceScheme4.bin")
+        fisc.Write()
+
+        second = vtkTAG2EFuzzyInferenceModelParameter()
+        second.SetFileName("/tmp/FuzzyInferenceScheme4.bin")
+        self.assertTrue(second.Read())
+
+        self.assertEqual(fisc.GetNumberOfCalibratableParameter(), second.GetNumberOfCalibratableParameter())
+        for j in range(fisc.GetNumberOfCalibratableParameter()):
+            self.assertEqual(fisc.GetParameterValue(j), second.GetParameterValue(j))
+
+        # The XML written from the binary file must be identical
+        fisc.SetFileName("/tmp/FuzzyInferenceScheme4a.xml")
+        fisc.Write()
+        second.SetFileName("/tmp/FuzzyInferenceScheme4b.xml")
+        second.Write()
+
+        self.assertEqual(open("/tmp/FuzzyInferenceScheme4a.xml").read(), 
+                         open("/tmp/FuzzyInferenceScheme4b.xml").read())
+
+        root = vtkXMLDataElement()
+        self.assertTrue(vtkTAG2EAbstractModelParameter.ReadXMLFile("/tmp/FuzzyInferenceScheme4.bin", root))
+        self.assertEqual(root.GetNumberOfNestedElements(), self.root.GetNumberOfNestedElements())
+        self.assertFalse(vtkTAG2EAbstractModelParameter.ReadXMLFile("/tmp/FuzzyInferenceScheme4a.bin.missing", root))
+
+    def test5FuzzyDeepCopy(self):
+        
+        fisc = vtkTAG2EFuzzyInferenceModelParameter()
+        fisc.SetXMLRepresentation(self.root)
+        fisc.ModifyParameter(0, 0.1)
+
+        copy = fisc.NewInstance()
+        self.assertTrue(copy.DeepCopy(fisc))
+
+        self.assertEqual(fisc.GetNumberOfCalibratableParameter(), copy.GetNumberOfCalibratableParameter())
+        for j in range(fisc.GetNumberOfCalibratableParameter()):
+            self.assertEqual(fisc.GetParameterValue(j), copy.GetParameterValue(j))
+
+        # The XML representation of the copy is generated from its internal scheme
+        xml = vtkXMLDataElement()
+        self.assertTrue(copy.GetXMLRepresentation(xml))
+        second = vtkTAG2EFuzzyInferenceModelParameter()
+        second.SetXMLRepresentation(xml)
+        for j in range(fisc.GetNumberOfCalibratableParameter()):
+            self.assertAlmostEqual(fisc.GetParameterValue(j), second.GetParameterValue(j), 10)
+
+        # The copy is independent
+        for i in range(100):
+            if copy.ModifyParameter(1, 0.1):
+                break
+        self.assertNotEqual(fisc.GetParameterValue(1), copy.GetParameterValue(1))
+
+        # Parameter of different type can not be copied
+        weighting = vtkTAG2EWeightingModelParameter()
+        self.assertFalse(weighting.DeepCopy(fisc))
+
+    def test6ParameterPool(self):
+        
+        fisc = vtkTAG2EFuzzyInferenceModelParameter()
+        fisc.SetXMLRepresentation(self.root)
+
+        pool = vtkTAG2EModelParameterPool()
+        pool.SetTemplateParameter(fisc)
+        self.assertTrue(pool.Allocate(4))
+        self.assertEqual(pool.GetNumberOfParameter(), 4)
+
+        parameter = []
+        for i in range(6):
+            parameter.append(pool.AcquireParameter())
+        self.assertEqual(pool.GetNumberOfParameter(), 6)
+        self.assertEqual(pool.GetNumberOfAvailableParameter(), 0)
+
+        for i in range(10):
+            parameter[0].ModifyParameter(0, 0.1)
+        self.assertTrue(pool.ReleaseParameter(parameter[0]))
+        self.assertFalse(pool.ReleaseParameter(parameter[0]))
+        self.assertEqual(pool.GetNumberOfAvailableParameter(), 1)
+
+        # A released parameter is reset to the template
+        reused = pool.AcquireParameter()
+        for j in range(fisc.GetNumberOfCalibratableParameter()):
+            self.assertEqual(fisc.GetParameterValue(j), reused.GetParameterValue(j))
   
 if __name__ == '__main__':
     suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EDParameterFuzzyTest)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+#
+# Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+#
+# Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+#          Rene Dechow, rene.dechow@vti.bund.de
+#
+# Copyright:
+#
+# Johann Heinrich von Thuenen-Institut
+# Institut fuer Agrarrelevante Klimaforschung
+#
+# Phone: +49 (0)531 596 2601
+#
+# Fax:+49 (0)531 596 2699
+#
+# Mail: ak@vti.bund.de
+#
+# Bundesallee 50
+# 38116 Braunschweig
+# Germany
+#
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+#include the VTK and vtkGRASSBridge Python libraries
+import unittest
+import random
+
+from vtk import *
+
+from libvtkTAG2ECommonPython import *
+from libvtkTAG2EFilteringPython import *
+from libvtkGRASSBridgeCommonPython import *
+
+def CreateArray(name, num, min, max):
+    array = vtkDoubleArray()
+    array.SetNumberOfTuples(num)
+    array.SetName(name)
+    for i in range(num):
+        array.SetValue(i, random.uniform(min, max))
+    return array
+
+class vtkTAG2ERothCFusedModelTests(unittest.TestCase):
+
+    def setUp(self):
+
+        random.seed(1)
+
+        # Create the point data
+        xext = 5
+        yext = 4
+        num = xext*yext
+
+        # ETpot input
+        self.ds3 = vtkPolyData()
+        self.ds3.Allocate(xext,yext)
+        # Water budget input
+        self.ds2 = vtkPolyData()
+        self.ds2.Allocate(xext,yext)
+        # RothC input
+        self.ds1 = vtkPolyData()
+        self.ds1.Allocate(xext,yext)
+        # Fused model input
+        self.ds = vtkPolyData()
+        self.ds.Allocate(xext,yext)
+
+        arrays = {}
+        arrays["Clay"] = CreateArray("Clay", num, 5, 60)
+        arrays["MeanTemperature"] = CreateArray("MeanTemperature", num, -5, 25)
+        arrays["GlobalRadiation"] = CreateArray("GlobalRadiation", num, 20, 300)
+        arrays["Precipitation"] = CreateArray("Precipitation", num, 0, 120)
+        arrays["SoilCover"] = CreateArray("SoilCover", num, 0, 1)
+        arrays["ResidualsRoots"] = CreateArray("ResidualsRoots", num, 0, 0.5)
+        arrays["ResidualsSurface"] = CreateArray("ResidualsSurface", num, 0, 1)
+        arrays["FertilizerCarbon"] = CreateArray("FertilizerCarbon", num, 0, 1)
+        arrays["ShootID"] = CreateArray("ShootID", num, 0, 0)
+        arrays["RootID"] = CreateArray("RootID", num, 0, 0)
+        arrays["FertilizerID"] = CreateArray("FertilizerID", num, 0, 0)
+
+        # Both models modify the C pools in place, hence each
+        # model gets its own copy of the pools
+        for name in ["DPM", "RPM", "BIO", "HUM", "IOM"]:
+            pool = CreateArray(name, num, 0.5, 10)
+            copy = vtkDoubleArray()
+            copy.DeepCopy(pool)
+            self.ds1.GetCellData().AddArray(pool)
+            self.ds.GetCellData().AddArray(copy)
+
+        # Point ids for poly vertex cell
+        points = vtkPoints()
+
+        for i in range(xext):
+            for j in range(yext):
+                ids = vtkIdList()
+                ids.InsertNextId(points.InsertNextPoint(i, j, 0))
+                ids.InsertNextId(points.InsertNextPoint(i, j, -0.3))
+                self.ds1.InsertNextCell(vtk.VTK_LINE, ids)
+                self.ds2.InsertNextCell(vtk.VTK_LINE, ids)
+                self.ds3.InsertNextCell(vtk.VTK_LINE, ids)
+                self.ds.InsertNextCell(vtk.VTK_LINE, ids)
+
+        self.ds1.SetPoints(points)
+        self.ds2.SetPoints(points)
+        self.ds3.SetPoints(points)
+        self.ds.SetPoints(points)
+
+        for name in ["MeanTemperature", "GlobalRadiation"]:
+            self.ds3.GetCellData().AddArray(arrays[name])
+
+        for name in ["Clay", "Precipitation", "SoilCover"]:
+            self.ds2.GetCellData().AddArray(arrays[name])
+
+        for name in ["Clay", "MeanTemperature", "SoilCover", "ResidualsRoots",
+                     "ResidualsSurface", "ShootID", "RootID", "FertilizerID",
+                     "FertilizerCarbon"]:
+            self.ds1.GetCellData().AddArray(arrays[name])
+
+        for name in arrays.keys():
+            self.ds.GetCellData().AddArray(arrays[name])
+
+    def compareArrays(self, name, array1, array2):
+        self.assertEqual(array1.GetNumberOfTuples(), array2.GetNumberOfTuples())
+        for i in range(array1.GetNumberOfTuples()):
+            self.assertAlmostEqual(array1.GetValue(i), array2.GetValue(i), 10,
+                                   "Array %s differs at cell %i" % (name, i))
+
+    def test1CompareWithSeparateModels(self):
+
+        rp = vtkTAG2ERothCModelParameter()
+
+        # The separate models
+        ETpot = vtkTAG2ETurcETPotModel()
+        ETpot.SetTimeInterval(30)
+        ETpot.SetInput(self.ds3)
+
+        dc1 = vtkTAG2EDataSetJoinFilter()
+        dc1.AddInputConnection(ETpot.GetOutputPort())
+        dc1.AddInput(self.ds2)
+
+        SoilMoisture = vtkTAG2ERothCWaterBudgetModel()
+        SoilMoisture.SetInputConnection(dc1.GetOutputPort())
+
+        dc2 = vtkTAG2EDataSetJoinFilter()
+        dc2.AddInputConnection(SoilMoisture.GetOutputPort())
+        dc2.AddInput(self.ds1)
+
+        RothC = vtkTAG2ERothCModel()
+        RothC.SetModelParameter(rp)
+        RothC.AddCPoolsToOutputOn()
+        RothC.SetInputConnection(dc2.GetOutputPort())
+
+        # The fused model
+        Fused = vtkTAG2ERothCFusedModel()
+        Fused.SetModelParameter(rp)
+        Fused.AddCPoolsToOutputOn()
+        Fused.SetTimeInterval(30)
+        Fused.SetInput(self.ds)
+
+        # Run several time steps to check the pool update
+        for step in range(3):
+            RothC.Modified()
+            RothC.Update()
+            Fused.Modified()
+            Fused.Update()
+
+            output = Fused.GetOutput().GetCellData()
+
+            self.compareArrays("ETpot", ETpot.GetOutput().GetCellData().GetArray("ETpot"),
+                               output.GetArray("ETpot"))
+
+            for name in ["UsableFieldCapacity", "SoilMoisture"]:
+                self.compareArrays(name, SoilMoisture.GetOutput().GetCellData().GetArray(name),
+                                   output.GetArray(name))
+
+            for name in ["SoilCarbon", "DPM", "RPM", "BIO", "HUM", "IOM"]:
+                self.compareArrays(name, RothC.GetOutput().GetCellData().GetArray(name),
+                                   output.GetArray(name))
+
+if __name__ == '__main__':
+    suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2ERothCFusedModelTests)
+    unittest.TextTestRunner(verbosity=2).run(suite1)
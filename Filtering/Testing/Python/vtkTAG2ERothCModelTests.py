@@ -241,6 +241,53 @@ class vtkTAG2ERothCModelTests(unittest.TestCase):
         
         #print RothC.GetOutput()
         
+    def test2Checkpoint(self):
+
+        # Compute potential evapo-transpiration
+        ETpot = vtkTAG2ETurcETPotModel()
+        ETpot.SetTimeInterval(30)
+        ETpot.SetInput(self.ds3)
+
+        # Soil moisture input
+        dc1 = vtkTAG2EDataSetJoinFilter()
+        dc1.AddInputConnection(ETpot.GetOutputPort())
+        dc1.AddInput(self.ds2)
+
+        # Soil moisture computation
+        SoilMoisture = vtkTAG2ERothCWaterBudgetModel()
+        SoilMoisture.SetInputConnection(dc1.GetOutputPort())
+
+        # RothC input
+        dc2 = vtkTAG2EDataSetJoinFilter()
+        dc2.AddInputConnection(SoilMoisture.GetOutputPort())
+        dc2.AddInput(self.ds1)
+
+        rp = vtkTAG2ERothCModelParameter()
+
+        RothC = vtkTAG2ERothCModel()
+        RothC.SetModelParameter(rp)
+        RothC.AddCPoolsToOutputOn()
+        RothC.SetInputConnection(dc2.GetOutputPort())
+        RothC.Update()
+
+        # Store the pools after the first time step
+        self.assertTrue(RothC.SaveCPools("/tmp/vtkTAG2ERothCModelTestsCheckpoint.bin", 1))
+
+        RothC.Modified()
+        RothC.Update()
+        result = RothC.GetOutput().GetCellData().GetArray("SoilCarbon").GetValue(0)
+
+        # Resume the computation with a new model
+        Resumed = vtkTAG2ERothCModel()
+        Resumed.SetModelParameter(rp)
+        self.assertTrue(Resumed.LoadCPools("/tmp/vtkTAG2ERothCModelTestsCheckpoint.bin"))
+        self.assertEqual(Resumed.GetCPoolsTimeStep(), 1)
+        Resumed.SetInputConnection(dc2.GetOutputPort())
+        Resumed.Update()
+
+        self.assertAlmostEqual(Resumed.GetOutput().GetCellData().GetArray("SoilCarbon").GetValue(0),
+                               result, 10)
+
 if __name__ == '__main__':
     suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2ERothCModelTests)
     unittest.TextTestRunner(verbosity=2).run(suite1) 
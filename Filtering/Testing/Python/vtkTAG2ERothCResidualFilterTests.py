@@ -112,7 +112,50 @@ class vtkTAG2ERothCResidualFilterTests(unittest.TestCase):
         pwriter.Write()
         
         print model.GetOutput()
-        
+
+    def test2SoilColumnIndex(self):
+
+        index = vtkTAG2ERothCSoilColumnIndex()
+        self.assertTrue(index.Update(self.ds))
+
+        self.assertEqual(index.GetNumberOfColumns(), 4)
+
+        layer = self.ds.GetCellData().GetArray("Layer")
+        for cellId in range(self.ds.GetNumberOfCells()):
+            k = layer.GetValue(cellId)
+            self.assertEqual(index.GetLayerId().GetValue(cellId), k)
+            self.assertAlmostEqual(index.GetLineLength().GetValue(cellId), 0.2, 6)
+            self.assertAlmostEqual(index.GetCumulativeLineLength().GetValue(cellId), 0.2*(k + 1), 6)
+
+        # The index must not be rebuild for an unmodified geometry
+        lineLength = index.GetLineLength()
+        self.assertTrue(index.Update(self.ds))
+        self.assertEqual(lineLength, index.GetLineLength())
+
+        # The residual filter uses the shared index
+        model = vtkTAG2ERothCResidualFilter()
+        model.SetSoilColumnIndex(index)
+        model.SetInput(self.ds)
+        model.Update()
+
+        self.assertEqual(lineLength, index.GetLineLength())
+
+        # The residuals are distributed in the top layer of each column only,
+        # the layer id is computed by the index from the line topology
+        output = model.GetOutput()
+        surface = output.GetCellData().GetArray("ResidualsSurface")
+        roots = output.GetCellData().GetArray("ResidualsRoots")
+        layerId = output.GetCellData().GetArray("Layer")
+        for cellId in range(output.GetNumberOfCells()):
+            k = layer.GetValue(cellId)
+            self.assertEqual(layerId.GetValue(cellId), k)
+            if k == 0:
+                self.assertAlmostEqual(surface.GetValue(cellId), 1.0, 6)
+                self.assertAlmostEqual(roots.GetValue(cellId), 1.0, 6)
+            else:
+                self.assertAlmostEqual(surface.GetValue(cellId), 0.0, 6)
+                self.assertAlmostEqual(roots.GetValue(cellId), 0.0, 6)
+
 if __name__ == '__main__':
     suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2ERothCResidualFilterTests)
     unittest.TextTestRunner(verbosity=2).run(suite1) 
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+#
+# Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+#
+# Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+#          Rene Dechow, rene.dechow@vti.bund.de
+#
+# Copyright:
+#
+# Johann Heinrich von Thuenen-Institut
+# Institut fuer Agrarrelevante Klimaforschung
+#
+# Phone: +49 (0)531 596 2601
+#
+# Fax:+49 (0)531 596 2699
+#
+# Mail: ak@vti.bund.de
+#
+# Bundesallee 50
+# 38116 Braunschweig
+# Germany
+#
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+
+#include the VTK and vtkGRASSBridge Python libraries
+import unittest
+import random
+
+from vtk import *
+
+from libvtkTAG2ECommonPython import *
+from libvtkTAG2EFilteringPython import *
+from libvtkGRASSBridgeCommonPython import *
+
+def CreateArray(name, num, min, max):
+    array = vtkDoubleArray()
+    array.SetNumberOfTuples(num)
+    array.SetName(name)
+    for i in range(num):
+        array.SetValue(i, random.uniform(min, max))
+    return array
+
+class vtkTAG2ERothCScenarioModelTests(unittest.TestCase):
+
+    def setUp(self):
+
+        random.seed(1)
+
+        # Create the point data
+        xext = 5
+        yext = 4
+        num = xext*yext
+        self.scenarios = 3
+
+        points = vtkPoints()
+        lines = vtkCellArray()
+
+        for i in range(xext):
+            for j in range(yext):
+                ids = vtkIdList()
+                ids.InsertNextId(points.InsertNextPoint(i, j, 0))
+                ids.InsertNextId(points.InsertNextPoint(i, j, -0.3))
+                lines.InsertNextCell(ids)
+
+        arrays = []
+        arrays.append(CreateArray("Clay", num, 5, 60))
+        arrays.append(CreateArray("MeanTemperature", num, -5, 25))
+        arrays.append(CreateArray("SoilCover", num, 0, 1))
+        arrays.append(CreateArray("SoilMoisture", num, 0, 60))
+        arrays.append(CreateArray("UsableFieldCapacity", num, 60, 80))
+        arrays.append(CreateArray("ResidualsRoots", num, 0, 0.5))
+        arrays.append(CreateArray("ResidualsSurface", num, 0, 1))
+
+        pools = []
+        for name in ["DPM", "RPM", "BIO", "HUM", "IOM"]:
+            pools.append(CreateArray(name, num, 0.5, 10))
+
+        # The fertilizer carbon differs for each scenario
+        fertC = vtkDoubleArray()
+        fertC.SetName("FertilizerCarbon")
+        fertC.SetNumberOfComponents(self.scenarios)
+        fertC.SetNumberOfTuples(num)
+        for i in range(num):
+            for s in range(self.scenarios):
+                fertC.SetComponent(i, s, random.uniform(0, 1) * s)
+
+        # The scenario model input with single component pools
+        self.ds = vtkPolyData()
+        self.ds.SetPoints(points)
+        self.ds.SetLines(lines)
+        for array in arrays + pools:
+            self.ds.GetCellData().AddArray(array)
+        self.ds.GetCellData().AddArray(fertC)
+
+        # A single scenario input for each scenario, the RothC model
+        # modifies the C pools in place, hence each input gets
+        # its own copy of the pools
+        self.inputs = []
+        for s in range(self.scenarios):
+            ds = vtkPolyData()
+            ds.SetPoints(points)
+            ds.SetLines(lines)
+            for array in arrays:
+                ds.GetCellData().AddArray(array)
+            for pool in pools:
+                copy = vtkDoubleArray()
+                copy.DeepCopy(pool)
+                ds.GetCellData().AddArray(copy)
+            fert = vtkDoubleArray()
+            fert.SetName("FertilizerCarbon")
+            fert.SetNumberOfTuples(num)
+            for i in range(num):
+                fert.SetValue(i, fertC.GetComponent(i, s))
+            ds.GetCellData().AddArray(fert)
+            self.inputs.append(ds)
+
+    def test1CompareWithSingleScenarioModels(self):
+
+        rp = vtkTAG2ERothCModelParameter()
+        rp2 = vtkTAG2ERothCModelParameter()
+
+        Scenario = vtkTAG2ERothCScenarioModel()
+        Scenario.SetModelParameter(rp)
+        Scenario.SetScenarioModelParameter(1, rp2)
+        Scenario.SetNumberOfScenarios(self.scenarios)
+        Scenario.AddCPoolsToOutputOn()
+        Scenario.SetInput(self.ds)
+
+        models = []
+        for s in range(self.scenarios):
+            RothC = vtkTAG2ERothCModel()
+            RothC.SetModelParameter(rp)
+            RothC.AddCPoolsToOutputOn()
+            RothC.SetInput(self.inputs[s])
+            models.append(RothC)
+
+        # Run several time steps to check the pool update
+        for step in range(3):
+            Scenario.Modified()
+            Scenario.Update()
+
+            output = Scenario.GetOutput().GetCellData()
+
+            for s in range(self.scenarios):
+                models[s].Modified()
+                models[s].Update()
+
+                single = models[s].GetOutput().GetCellData()
+
+                for name in ["SoilCarbon", "DPM", "RPM", "BIO", "HUM", "IOM"]:
+                    array = output.GetArray(name)
+                    self.assertEqual(array.GetNumberOfComponents(), self.scenarios)
+                    for i in range(array.GetNumberOfTuples()):
+                        self.assertAlmostEqual(array.GetComponent(i, s),
+                                               single.GetArray(name).GetValue(i), 10,
+                                               "Array %s differs at cell %i in scenario %i" % (name, i, s))
+
+    def test2WrongNumberOfComponents(self):
+
+        rp = vtkTAG2ERothCModelParameter()
+
+        Scenario = vtkTAG2ERothCScenarioModel()
+        Scenario.SetModelParameter(rp)
+        Scenario.SetNumberOfScenarios(self.scenarios + 1)
+        Scenario.SetInput(self.ds)
+        Scenario.Update()
+
+        # The fertilizer carbon array has the wrong number of components
+        self.assertEqual(Scenario.GetOutput().GetNumberOfCells(), 0)
+
+    def test3Checkpoint(self):
+
+        rp = vtkTAG2ERothCModelParameter()
+
+        Scenario = vtkTAG2ERothCScenarioModel()
+        Scenario.SetModelParameter(rp)
+        Scenario.SetNumberOfScenarios(self.scenarios)
+        Scenario.SetInput(self.ds)
+        Scenario.Update()
+
+        # Store the pools of all scenarios after the first time step
+        self.assertTrue(Scenario.SaveCPools("/tmp/vtkTAG2ERothCScenarioModelTestsCheckpoint.bin", 1))
+
+        Scenario.Modified()
+        Scenario.Update()
+        result = vtkDoubleArray()
+        result.DeepCopy(Scenario.GetOutput().GetCellData().GetArray("SoilCarbon"))
+
+        # Resume the computation of all scenarios with a new model
+        Resumed = vtkTAG2ERothCScenarioModel()
+        Resumed.SetModelParameter(rp)
+        Resumed.SetNumberOfScenarios(self.scenarios)
+        self.assertTrue(Resumed.LoadCPools("/tmp/vtkTAG2ERothCScenarioModelTestsCheckpoint.bin"))
+        self.assertEqual(Resumed.GetCPoolsTimeStep(), 1)
+        Resumed.SetInput(self.ds)
+        Resumed.Update()
+
+        resumed = Resumed.GetOutput().GetCellData().GetArray("SoilCarbon")
+        self.assertEqual(resumed.GetNumberOfComponents(), self.scenarios)
+
+        for i in range(result.GetNumberOfTuples()):
+            for s in range(self.scenarios):
+                self.assertAlmostEqual(resumed.GetComponent(i, s),
+                                       result.GetComponent(i, s), 10,
+                                       "Cell %i differs in scenario %i" % (i, s))
+
+if __name__ == '__main__':
+    suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2ERothCScenarioModelTests)
+    unittest.TextTestRunner(verbosity=2).run(suite1)
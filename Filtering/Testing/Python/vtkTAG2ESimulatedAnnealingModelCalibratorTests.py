@@ -41,6 +41,8 @@ from libvtkTAG2ECommonPython import *
 from libvtkTAG2EFilteringPython import *
 from libvtkGRASSBridgeCommonPython import *
 
+from WeightingCalibrationTestData import *
+
 ################################################################################
 ################################################################################
 ################################################################################
@@ -194,7 +196,51 @@ class vtkTAG2ESimulatedAnnealingModelCalibratorTests(unittest.TestCase):
 
         caliModel.GetBestFitModelParameter().SetFileName("/tmp/vtkTAG2ESimulatedAnnealingModelCalibratorTests.xml")
         caliModel.GetBestFitModelParameter().Write()
-        
+
+    def test2SolveResponses(self):
+
+        self._BuildXML()
+
+        # The target is exactly the fuzzy inference result of the initial
+        # fuzzy sets with the responses 20 and 100, it is constant outside
+        # of [30:70] and linear inside
+        for i in range(self.measure.GetNumberOfTuples()):
+            x = self.model.GetValue(i)
+            self.measure.SetValue(i, min(100.0, max(20.0, 20.0 + 2.0*(x - 30.0))))
+
+        parameter = vtkTAG2EFuzzyInferenceModelParameter()
+        parameter.DebugOff()
+        parameter.SetXMLRepresentation(self.root)
+
+        model = vtkTAG2EFuzzyInferenceModel()
+        model.SetInput(self.ds)
+        model.SetModelParameter(parameter)
+        model.UseCellDataOn()
+
+        caliModel = vtkTAG2ESimulatedAnnealingModelCalibrator()
+        caliModel.SetInput(self.ds)
+        caliModel.SetModel(model)
+        caliModel.SetModelParameter(parameter)
+        caliModel.SetMaxNumberOfIterations(20)
+        caliModel.SetSeed(1)
+        caliModel.SolveResponsesOn()
+        caliModel.Update()
+
+        print "Best fit error solved responses", caliModel.GetBestFitError()
+
+        # The responses of the initial fuzzy sets are recovered exactly
+        self.assertTrue(caliModel.GetBestFitError() < 1e-4)
+
+        fis = vtkXMLDataElement()
+        caliModel.GetBestFitModelParameter().GetXMLRepresentation(fis)
+        responses = fis.FindNestedElementWithName("Responses")
+        self.assertAlmostEqual(float(responses.GetNestedElement(0).GetCharacterData()), 20.0, 3)
+        self.assertAlmostEqual(float(responses.GetNestedElement(1).GetCharacterData()), 100.0, 3)
+
+        # The settings of the model and the parameter are restored
+        self.assertEqual(model.GetCreateDOFArray(), 0)
+        self.assertEqual(parameter.GetCalibrateResponses(), 1)
+
 ################################################################################
 ################################################################################
 ################################################################################
@@ -833,89 +879,11 @@ class vtkTAG2ESimulatedAnnealingModelCalibratorTestsWeighting(unittest.TestCase)
   
     def setUp(self):
 
-        # Create the point data
-        xext = 7
-        yext = 1
-        num = xext*yext
-
-        self.ds1 = vtkPolyData()
-        self.ds1.Allocate(xext,yext)
-        
-        self.ds2 = vtkPolyData()
-        self.ds2.Allocate(xext,yext)
-
-        self.model = vtkDoubleArray()
-        self.model.SetNumberOfTuples(num)
-        self.model.SetName("model")
-
-        self.factor = vtkDoubleArray()
-        self.factor.SetNumberOfTuples(num)
-        self.factor.SetName("factor")
-
-        self.target = vtkDoubleArray()
-        self.target.SetNumberOfTuples(num)
-        self.target.SetName("target")
-        self.target.FillComponent(0, 1.0)
-
-        # Point ids for poly vertex cell
-        points = vtkPoints()
-
-        count = 0
-        for i in range(xext):
-            for j in range(yext):
-                ids = vtkIdList()
-                ids.InsertNextId(points.InsertNextPoint(i, j, 0))
-                # Data range [1:100] -> linear function x
-                self.model.SetValue(count, count + 1)
-                self.factor.SetValue(count, count)
-                self.ds1.InsertNextCell(vtk.VTK_VERTEX, ids)
-                self.ds2.InsertNextCell(vtk.VTK_VERTEX, ids)
-                count += 1
-
-        self.ds1.GetCellData().AddArray(self.factor)
-        self.ds1.GetCellData().AddArray(self.model)
-        self.ds1.GetCellData().SetActiveScalars(self.model.GetName())
-        self.ds1.SetPoints(points)
-        
-        self.ds2.GetCellData().AddArray(self.target)
-        self.ds2.GetCellData().SetActiveScalars(self.target.GetName())
-        self.ds2.SetPoints(points)
-                        
-        self._BuildXML()
-
-    def _BuildXML(self):
+        self.ds1, self.ds2 = CreateWeightingDataSets()
+        self.root = BuildWeightingXML(0)
 
-        self.root  = vtk.vtkXMLDataElement()
-        
-        factor = vtkXMLDataElement()
-        factor.SetName("Factor")
-        factor.SetAttribute("name", "factor")
-        
-        weights = vtkXMLDataElement()
-        weights.SetName("Weights")
-
-        for i in range(7):
-            weight = vtkXMLDataElement()
-            weight.SetName("Weight")
-            weight.SetIntAttribute("id", i)
-            weight.SetIntAttribute("const", 0)
-            weight.SetIntAttribute("active", 1)
-            weight.SetDoubleAttribute("min", 0)
-            weight.SetDoubleAttribute("max", 1)
-            weight.SetCharacterData(str(0), 6)
-            weights.AddNestedElement(weight)
-        
-        self.root.SetName("Weighting")
-        self.root.AddNestedElement(factor)
-        self.root.AddNestedElement(weights)
-        self.root.SetAttribute("name", "test")
-        self.root.SetAttribute("xmlns", "http://tag2e.googlecode.com/files/Weighting")
-        self.root.SetAttribute("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
-        self.root.SetAttribute("xsi:schemaLocation", "http://tag2e.googlecode.com/files/Weighting http://tag2e.googlecode.com/files/Weighting.xsd")
-        
     def test1Model(self):
 
-        self._BuildXML()
         # We expect as result the following weights:
         # 1, 1/2, 1/3, 1/4, 1/5, 1/6, 1/7
 
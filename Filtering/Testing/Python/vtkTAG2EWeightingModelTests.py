@@ -128,7 +128,98 @@ class vtkTAG2EWeightingModelTests(unittest.TestCase):
                                                                1, 1)
         if diff != 0.0:
             print "ERROR: difference should be 0.0 but is", diff
-        
+
+    def test2IntegerFactorAndParameterChange(self):
+
+        # Integer factor ids with an id without weight
+        factor = vtkIntArray()
+        factor.SetNumberOfTuples(self.ds.GetNumberOfCells())
+        factor.SetName("factor")
+        for i in range(self.ds.GetNumberOfCells()):
+            factor.SetValue(i, i % 10)
+
+        ds = vtkPolyData()
+        ds.ShallowCopy(self.ds)
+        ds.GetCellData().AddArray(factor)
+        ds.GetCellData().SetActiveScalars("model")
+
+        w = vtkTAG2EWeightingModelParameter()
+        w.SetXMLRepresentation(self.root)
+
+        model = vtkTAG2EWeightingModel()
+        model.SetInput(ds)
+        model.SetModelParameter(w)
+        model.SetNullValue(-99999)
+        model.UseCellDataOn()
+        model.Update()
+
+        result = model.GetOutput().GetCellData().GetArray("result")
+        for i in range(ds.GetNumberOfCells()):
+            if i % 10 == 9:
+                self.assertEqual(result.GetValue(i), -99999)
+            else:
+                self.assertEqual(result.GetValue(i), i % 10)
+
+        # The input arrays must not be modified
+        self.assertEqual(ds.GetCellData().GetScalars().GetName(), "model")
+
+        # Double the weights, the weight table must be updated
+        weights = self.root.FindNestedElementWithName("Weights")
+        for i in range(weights.GetNumberOfNestedElements()):
+            weights.GetNestedElement(i).SetCharacterData(str(2*i), 6)
+        w.SetXMLRepresentation(self.root)
+
+        model.Modified()
+        model.Update()
+
+        result = model.GetOutput().GetCellData().GetArray("result")
+        for i in range(ds.GetNumberOfCells()):
+            if i % 10 != 9:
+                self.assertEqual(result.GetValue(i), 2*(i % 10))
+
+    def test3FitWeights(self):
+
+        # The target is the model value weighted with the factor id + 1
+        target = vtkPolyData()
+        target.ShallowCopy(self.ds)
+
+        model = vtkDoubleArray()
+        model.SetNumberOfTuples(self.ds.GetNumberOfCells())
+        model.SetName("model")
+
+        t = vtkDoubleArray()
+        t.SetNumberOfTuples(self.ds.GetNumberOfCells())
+        t.SetName("target")
+
+        for i in range(self.ds.GetNumberOfCells()):
+            value = random.uniform(1, 10)
+            model.SetValue(i, value)
+            t.SetValue(i, value * (self.factor.GetValue(i) + 1))
+
+        ds = vtkPolyData()
+        ds.ShallowCopy(self.ds)
+        ds.GetCellData().AddArray(model)
+        ds.GetCellData().SetActiveScalars("model")
+
+        target.GetCellData().AddArray(t)
+        target.GetCellData().SetActiveScalars("target")
+
+        w = vtkTAG2EWeightingModelParameter()
+        w.SetXMLRepresentation(self.root)
+
+        weighting = vtkTAG2EWeightingModel()
+        weighting.SetInput(ds)
+        weighting.SetModelParameter(w)
+        weighting.UseCellDataOn()
+        weighting.Update()
+
+        self.assertTrue(weighting.FitWeights(target))
+        weighting.Update()
+
+        result = weighting.GetOutput().GetCellData().GetArray("result")
+        for i in range(ds.GetNumberOfCells()):
+            self.assertAlmostEqual(result.GetValue(i), t.GetValue(i), 8)
+
 if __name__ == '__main__':
     suite1 = unittest.TestLoader().loadTestsFromTestCase(vtkTAG2EWeightingModelTests)
     unittest.TextTestRunner(verbosity=2).run(suite1) 
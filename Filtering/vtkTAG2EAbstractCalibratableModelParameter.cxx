@@ -35,6 +35,7 @@
 
 extern "C" {
 #include <stdlib.h>
+#include <string.h>
 #include <time.h>
 }
 
@@ -145,6 +146,36 @@ bool vtkTAG2EAbstractCalibratableModelParameter::ModifyParameter(int index, doub
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2EAbstractCalibratableModelParameter::SetParameterValue(int index, double value)
+{
+  if (index < 0 || index >= (int)this->ParameterValues.size()) {
+    vtkErrorMacro(<< "Parameter index " << index << " is out of range");
+    return false;
+  }
+
+  double min = this->ParameterMinMax[index][0];
+  double max = this->ParameterMinMax[index][1];
+
+  if (value < min || value > max) {
+    vtkDebugMacro(<< "Parameter " << index << " Value " << value << " is out of range [" << min << ":" << max << "]");
+    return false;
+  }
+
+  if (value == this->ParameterValues[index])
+    return true;
+
+  // Set the Parameter. This method must be overwritten in the subclasses
+  bool check = this->SetParameter(index, value);
+
+  // Revert the change in case the parameter results in an invalid configuration
+  if (check == false)
+    this->RestoreLastModifiedParameter();
+
+  return check;
+}
+
+//----------------------------------------------------------------------------
+
 bool vtkTAG2EAbstractCalibratableModelParameter::RestoreLastModifiedParameter()
 {
   vtkDebugMacro(<< "Restore last parameter " << this->ParameterId << " to " << this->ParameterValue);
@@ -169,6 +200,8 @@ void vtkTAG2EAbstractCalibratableModelParameter::UpdateParameterState(unsigned i
   this->ParameterId = index;
   // Modify the value array too 
   this->ParameterValues[index] = new_value;
+  // Models caching data derived from the parameter need to know the change
+  this->Modified();
 }
 
 //----------------------------------------------------------------------------
@@ -224,3 +257,67 @@ bool vtkTAG2EAbstractCalibratableModelParameter::SetXMLRepresentation(vtkXMLData
   
   return true;
 }
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EAbstractCalibratableModelParameter::Read()
+{
+  if (!this->Superclass::Read())
+    return false;
+
+  this->GenerateInternalSchemeFromXML();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EAbstractCalibratableModelParameter::Write()
+{
+  this->GenerateXMLFromInternalScheme();
+
+  this->Superclass::Write();
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EAbstractCalibratableModelParameter::DeepCopy(vtkTAG2EAbstractCalibratableModelParameter *parameter)
+{
+  if (parameter == NULL)
+    return false;
+
+  if (parameter == this)
+    return true;
+
+  if (strcmp(parameter->GetClassName(), this->GetClassName()) != 0) {
+    vtkErrorMacro( << "Unable to copy a " << parameter->GetClassName() << " into a " << this->GetClassName());
+    return false;
+  }
+
+  // The XML representation is not copied, it is generated from the
+  // internal scheme in Write() and GetXMLRepresentation()
+  this->NumberOfCalibratableParameter = parameter->NumberOfCalibratableParameter;
+  this->ParameterValue = parameter->ParameterValue;
+  this->ParameterId = parameter->ParameterId;
+  this->ParameterIndex = parameter->ParameterIndex;
+  this->ParameterValues = parameter->ParameterValues;
+  this->ParameterMinMax = parameter->ParameterMinMax;
+
+  this->Modified();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EAbstractCalibratableModelParameter *vtkTAG2EAbstractCalibratableModelParameter::Clone()
+{
+  vtkTAG2EAbstractCalibratableModelParameter *clone = this->NewInstance();
+
+  if (!clone->DeepCopy(this)) {
+    clone->Delete();
+    return NULL;
+  }
+
+  return clone;
+}
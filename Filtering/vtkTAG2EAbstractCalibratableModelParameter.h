@@ -59,6 +59,15 @@ public:
     //!\brief Return a model parameter at index. No index range check is performed.
     //! The method GenerateInternalSchemeFromXML must be called first, before you can use this method
     virtual double GetParameterValue(int index){return this->ParameterValues[index];};
+    //!\brief Set the model parameter at index to a specific value. The value must be inside
+    //! the parameter range. The last value is restored in case the value results in an
+    //! invalid parameter configuration.
+    //! The method GenerateInternalSchemeFromXML must be called first, before you can use this method
+    virtual bool SetParameterValue(int index, double value);
+    //!\brief Return the minimum of the model parameter at index. No index range check is performed.
+    virtual double GetParameterMinimum(int index){return this->ParameterMinMax[index][0];};
+    //!\brief Return the maximum of the model parameter at index. No index range check is performed.
+    virtual double GetParameterMaximum(int index){return this->ParameterMinMax[index][1];};
     //!\brief Restore the last modified model parameter 
     //! The method GenerateInternalSchemeFromXML must be called first, before you can use this method
     virtual bool RestoreLastModifiedParameter();
@@ -71,11 +80,32 @@ public:
     //!\brief Reimplemented from abstract model parameter to call
     //! the internal representation generator
     virtual bool SetXMLRepresentation(vtkXMLDataElement *root);
+    //!\brief Reimplemented from abstract model parameter to call
+    //! the internal representation generator after reading
+    virtual bool Read();
+    //!\brief Reimplemented from abstract model parameter to write
+    //! the XML representation of the current internal scheme
+    virtual void Write();
     
     //!\brief IMPLEMENT THIS METHOD IN SUBCLASS
     virtual bool GenerateInternalSchemeFromXML() = 0;
     //!\brief IMPLEMENT THIS METHOD IN SUBCLASS
     virtual bool GenerateXMLFromInternalScheme() = 0;
+
+    //!\brief Copy the internal scheme, the parameter index and the parameter
+    //! values and ranges of a parameter of the same type directly, without
+    //! generating and parsing XML. The XML representation is not copied,
+    //! it is generated from the internal scheme when it is requested.
+    //! Subclasses must copy their internal scheme and call this method of
+    //! the superclass first.
+    //!\param parameter The parameter to copy, must be of the same class
+    //!\return true in case of success
+    virtual bool DeepCopy(vtkTAG2EAbstractCalibratableModelParameter *parameter);
+    //!\brief Create a new instance of the same class which is a deep copy of
+    //! this parameter. The caller owns the new instance and must delete it.
+    //! Use NewInstance() and DeepCopy() in Python.
+    //!\return The copy or NULL in case of an error
+    vtkTAG2EAbstractCalibratableModelParameter *Clone();
     
 protected:
     vtkSetMacro(NumberOfCalibratableParameter, int);
@@ -39,6 +39,7 @@
 #include <vtkDataSet.h>
 #include <vtkFieldData.h>
 #include "vtkTAG2EAbstractModelCalibrator.h"
+#include <vector>
 
 extern "C" {
 #include <math.h>
@@ -65,6 +66,98 @@ vtkTAG2EAbstractModelCalibrator::~vtkTAG2EAbstractModelCalibrator()
 }
 
 
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EAbstractModelCalibrator::SetModelParameterValues(
+    std::vector<double> &Values)
+{
+  unsigned int i;
+  std::vector<int> pending;
+  std::vector<int> failed;
+
+  if (this->ModelParameter == NULL)
+    return false;
+
+  if ((int) Values.size() != this->ModelParameter->GetNumberOfCalibratableParameter())
+    {
+    vtkErrorMacro( << "Wrong number of parameter values");
+    return false;
+    }
+
+  for (i = 0; i < Values.size(); i++)
+    pending.push_back(i);
+
+  // Parameter which depend on each other, like the fuzzy sets of a factor,
+  // may be valid only if they are set in a specific order. Hence the
+  // parameter which are invalid are set again until no progress is made.
+  while (pending.size() > 0)
+    {
+    failed.clear();
+
+    for (i = 0; i < pending.size(); i++)
+      {
+      int index = pending[i];
+      double value = Values[index];
+      double min = this->ModelParameter->GetParameterMinimum(index);
+      double max = this->ModelParameter->GetParameterMaximum(index);
+
+      // Avoid rounding errors at the range borders
+      if (value < min)
+        value = min;
+      if (value > max)
+        value = max;
+
+      if (!this->ModelParameter->SetParameterValue(index, value))
+        failed.push_back(index);
+      }
+
+    if (failed.size() == pending.size())
+      return false;
+
+    pending = failed;
+    }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EAbstractModelCalibrator::EvaluateProbe(
+    std::vector<double> &Values, vtkDataSet *input, vtkDataSet *output,
+    double &error, double &bestFitError, double &bestFitModelAssessment,
+    vtkTAG2EAbstractCalibratableModelParameter *bestFitModelParameter,
+    int evaluation)
+{
+  double modelAssessment;
+
+  if (!this->SetModelParameterValues(Values))
+    return false;
+
+  // Run the model, the modified parameter is referenced internally
+  // so we need to tell the model that its modified
+  this->Model->Modified();
+  this->Model->Update();
+  modelAssessment = this->Model->GetModelAssessmentFactor();
+
+  // Compute the error between the model result and the target values
+  error = vtkTAG2EAbstractModelCalibrator::CompareDataSets(
+      this->Model->GetOutput(), input, this->Model->GetUseCellData(), 0,
+      false) * modelAssessment;
+
+  // Store the best fit
+  if (error < bestFitError)
+    {
+    bestFitError = error;
+    bestFitModelAssessment = modelAssessment;
+    std::cout << "Store best result at evaluation " << evaluation
+        << " with error " << bestFitError << std::endl;
+    output->ShallowCopy(this->Model->GetOutput());
+    bestFitModelParameter->DeepCopy(this->ModelParameter);
+    }
+
+  return true;
+}
+
 //----------------------------------------------------------------------------
 
 bool vtkTAG2EAbstractModelCalibrator::ComputeDataSetsResiduals(
@@ -136,6 +136,32 @@ protected:
         return -1;
     }
     
+    //BTX
+    //!\brief Set all calibratable parameter values of the model parameter.
+    //! Values outside of the parameter ranges are clamped.
+    //!\param Values The values of all calibratable parameter
+    //!\return false in case the values result in an invalid parameter configuration
+    bool SetModelParameterValues(std::vector<double> &Values);
+
+    //!\brief Set the calibratable parameter values, run the model and compare
+    //! its result with the measured data. The best fit is updated in case the
+    //! error is lower than the best fit error.
+    //!\param Values The values of all calibratable parameter
+    //!\param input The dataset with the measured data
+    //!\param output The dataset in which the model result of the best fit is stored
+    //!\param error The error of the model result multiplied with the model assessment factor
+    //!\param bestFitError The error of the best fit
+    //!\param bestFitModelAssessment The model assessment factor of the best fit
+    //!\param bestFitModelParameter The model parameter of the best fit
+    //!\param evaluation The number of the evaluation, used for status messages
+    //!\return false in case the values result in an invalid parameter configuration
+    bool EvaluateProbe(std::vector<double> &Values, vtkDataSet *input,
+                       vtkDataSet *output, double &error, double &bestFitError,
+                       double &bestFitModelAssessment,
+                       vtkTAG2EAbstractCalibratableModelParameter *bestFitModelParameter,
+                       int evaluation);
+    //ETX
+    
     vtkTAG2EAbstractCalibratableModel *Model;
     vtkTAG2EAbstractCalibratableModelParameter *ModelParameter;
     
@@ -34,6 +34,10 @@
 #include <vtkObjectFactory.h>
 #include "vtkTAG2EAbstractModelParameter.h"
 #include <vtkXMLDataParser.h>
+#include <string>
+#include <vector>
+#include <map>
+#include <string.h>
 
 vtkCxxRevisionMacro(vtkTAG2EAbstractModelParameter, "$Revision: 1.0 $");
 vtkStandardNewMacro(vtkTAG2EAbstractModelParameter);
@@ -59,16 +63,17 @@ vtkTAG2EAbstractModelParameter::~vtkTAG2EAbstractModelParameter()
 
 bool vtkTAG2EAbstractModelParameter::Read()
 {
-  vtkXMLDataParser *reader = vtkXMLDataParser::New();
-  reader->SetFileName(this->FileName);
-  if (0 == reader->Parse()) {
-    vtkErrorMacro( << "Unable to parse XML file " << this->FileName);
+  vtkXMLDataElement *root = vtkXMLDataElement::New();
+
+  if (!vtkTAG2EAbstractModelParameter::ReadXMLFile(this->FileName, root)) {
+    vtkErrorMacro( << "Unable to read parameter file " << this->FileName);
+    root->Delete();
     return false;
   }
 
-  this->SetXMLRepresentation(reader->GetRootElement());
-
-  reader->Delete();
+  // Take over the element tree which was read instead of copying it
+  this->XMLRoot->Delete();
+  this->XMLRoot = root;
 
   this->Modified();
 
@@ -79,7 +84,293 @@ bool vtkTAG2EAbstractModelParameter::Read()
 
 void vtkTAG2EAbstractModelParameter::Write()
 {
-  this->XMLRoot->PrintXML(this->FileName);
+  if (!vtkTAG2EAbstractModelParameter::WriteXMLFile(this->FileName, this->XMLRoot))
+    vtkErrorMacro( << "Unable to write parameter file " << this->FileName);
+}
+
+//----------------------------------------------------------------------------
+// The binary parameter format stores the XML element tree in pre-order.
+// All names, attribute values and character data are stored once in a
+// string table and referenced by index. All integers are unsigned 32 bit
+// integers in the byte order of the writing machine.
+//
+// Header:  magic "TAG2EBIN", version, byte order mark
+// Strings: number of strings, (length, characters) for each string
+// Tree:    number of integers of the element tree, root element
+// Element: name, number of attributes, (name, value) for each attribute,
+//          character data or TAG2E_BINARY_NO_STRING, number of nested
+//          elements followed by the nested elements
+//----------------------------------------------------------------------------
+
+static const char TAG2E_BINARY_MAGIC[8] = {'T', 'A', 'G', '2', 'E', 'B', 'I', 'N'};
+#define TAG2E_BINARY_BYTE_ORDER 0x01020304
+#define TAG2E_BINARY_NO_STRING 0xFFFFFFFF
+
+typedef unsigned int tag2eBinaryUInt;
+
+//----------------------------------------------------------------------------
+
+static tag2eBinaryUInt tag2eBinaryStringId(const char *string,
+                                           std::map<std::string, tag2eBinaryUInt> &Ids,
+                                           std::vector<std::string> &Strings)
+{
+  if (string == NULL)
+    return TAG2E_BINARY_NO_STRING;
+
+  std::map<std::string, tag2eBinaryUInt>::iterator it = Ids.find(string);
+  if (it != Ids.end())
+    return it->second;
+
+  tag2eBinaryUInt id = Strings.size();
+  Ids[string] = id;
+  Strings.push_back(string);
+  return id;
+}
+
+//----------------------------------------------------------------------------
+
+static void tag2eBinaryEncodeElement(vtkXMLDataElement *element,
+                                     std::map<std::string, tag2eBinaryUInt> &Ids,
+                                     std::vector<std::string> &Strings,
+                                     std::vector<tag2eBinaryUInt> &Tree)
+{
+  int i;
+
+  Tree.push_back(tag2eBinaryStringId(element->GetName(), Ids, Strings));
+  Tree.push_back(element->GetNumberOfAttributes());
+  for (i = 0; i < element->GetNumberOfAttributes(); i++) {
+    Tree.push_back(tag2eBinaryStringId(element->GetAttributeName(i), Ids, Strings));
+    Tree.push_back(tag2eBinaryStringId(element->GetAttributeValue(i), Ids, Strings));
+  }
+  Tree.push_back(tag2eBinaryStringId(element->GetCharacterData(), Ids, Strings));
+  Tree.push_back(element->GetNumberOfNestedElements());
+  for (i = 0; i < element->GetNumberOfNestedElements(); i++)
+    tag2eBinaryEncodeElement(element->GetNestedElement(i), Ids, Strings, Tree);
+}
+
+//----------------------------------------------------------------------------
+
+static bool tag2eBinaryDecodeElement(vtkXMLDataElement *element,
+                                     std::vector<std::string> &Strings,
+                                     const tag2eBinaryUInt *Tree, size_t size,
+                                     size_t &pos)
+{
+  tag2eBinaryUInt i, num, name, value;
+
+  // Name, number of attributes
+  if (pos + 2 > size)
+    return false;
+
+  name = Tree[pos++];
+  if (name != TAG2E_BINARY_NO_STRING) {
+    if (name >= Strings.size())
+      return false;
+    element->SetName(Strings[name].c_str());
+  }
+
+  num = Tree[pos++];
+  if (num > (size - pos) / 2)
+    return false;
+
+  for (i = 0; i < num; i++) {
+    name = Tree[pos++];
+    value = Tree[pos++];
+    if (name >= Strings.size() || value >= Strings.size())
+      return false;
+    element->SetAttribute(Strings[name].c_str(), Strings[value].c_str());
+    // The XML parser sets the id of an element from its id attribute
+    if (Strings[name] == "id")
+      element->SetId(Strings[value].c_str());
+  }
+
+  // Character data, number of nested elements
+  if (pos + 2 > size)
+    return false;
+
+  value = Tree[pos++];
+  if (value != TAG2E_BINARY_NO_STRING) {
+    if (value >= Strings.size())
+      return false;
+    element->SetCharacterData(Strings[value].c_str(), Strings[value].size());
+  }
+
+  num = Tree[pos++];
+  for (i = 0; i < num; i++) {
+    vtkXMLDataElement *nested = vtkXMLDataElement::New();
+    bool check = tag2eBinaryDecodeElement(nested, Strings, Tree, size, pos);
+    element->AddNestedElement(nested);
+    nested->Delete();
+    if (!check)
+      return false;
+  }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+static bool tag2eBinaryReadUInt(std::vector<char> &Data, size_t &offset, tag2eBinaryUInt &value)
+{
+  if (offset + sizeof (tag2eBinaryUInt) > Data.size())
+    return false;
+
+  memcpy(&value, &Data[offset], sizeof (tag2eBinaryUInt));
+  offset += sizeof (tag2eBinaryUInt);
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EAbstractModelParameter::IsBinaryFileName(const char *fileName)
+{
+  if (fileName == NULL)
+    return false;
+
+  size_t length = strlen(fileName);
+  size_t extLength = strlen(TAG2E_BINARY_PARAMETER_EXTENSION);
+
+  if (length < extLength)
+    return false;
+
+  return strcmp(fileName + length - extLength, TAG2E_BINARY_PARAMETER_EXTENSION) == 0;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EAbstractModelParameter::ReadXMLFile(const char *fileName, vtkXMLDataElement *root)
+{
+  if (fileName == NULL || root == NULL)
+    return false;
+
+  if (!vtkTAG2EAbstractModelParameter::IsBinaryFileName(fileName)) {
+    vtkXMLDataParser *reader = vtkXMLDataParser::New();
+    reader->SetFileName(fileName);
+    if (0 == reader->Parse()) {
+      vtkGenericWarningMacro( << "Unable to parse XML file " << fileName);
+      reader->Delete();
+      return false;
+    }
+    root->DeepCopy(reader->GetRootElement());
+    reader->Delete();
+    return true;
+  }
+
+  ifstream file(fileName, ios::in | ios::binary);
+  if (!file) {
+    vtkGenericWarningMacro( << "Unable to open binary parameter file " << fileName);
+    return false;
+  }
+
+  // Read the whole file at once
+  std::vector<char> Data;
+  file.seekg(0, ios::end);
+  Data.resize(file.tellg());
+  file.seekg(0, ios::beg);
+  if (Data.size() > 0)
+    file.read(&Data[0], Data.size());
+
+  if (!file || Data.size() < 8 || memcmp(&Data[0], TAG2E_BINARY_MAGIC, 8) != 0) {
+    vtkGenericWarningMacro( << "The file " << fileName << " is not a binary parameter file");
+    return false;
+  }
+
+  size_t offset = 8;
+  tag2eBinaryUInt version = 0, byteOrder = 0, numberOfStrings = 0, length, size = 0;
+
+  tag2eBinaryReadUInt(Data, offset, version);
+  if (version != TAG2E_BINARY_PARAMETER_VERSION) {
+    vtkGenericWarningMacro( << "Unsupported version " << version << " of binary parameter file " << fileName);
+    return false;
+  }
+
+  tag2eBinaryReadUInt(Data, offset, byteOrder);
+  if (byteOrder != TAG2E_BINARY_BYTE_ORDER) {
+    vtkGenericWarningMacro( << "The binary parameter file " << fileName << " was written with a different byte order");
+    return false;
+  }
+
+  // Read the string table
+  std::vector<std::string> Strings;
+  bool check = tag2eBinaryReadUInt(Data, offset, numberOfStrings);
+
+  for (tag2eBinaryUInt i = 0; check && i < numberOfStrings; i++) {
+    check = tag2eBinaryReadUInt(Data, offset, length) && length <= Data.size() - offset;
+    if (check) {
+      Strings.push_back(std::string(&Data[offset], length));
+      offset += length;
+    }
+  }
+
+  // Read the element tree
+  check = check && tag2eBinaryReadUInt(Data, offset, size) && size > 0 &&
+    size == (Data.size() - offset) / sizeof (tag2eBinaryUInt);
+
+  if (!check) {
+    vtkGenericWarningMacro( << "The binary parameter file " << fileName << " is corrupt");
+    return false;
+  }
+
+  std::vector<tag2eBinaryUInt> Tree(size);
+  memcpy(&Tree[0], &Data[offset], size * sizeof (tag2eBinaryUInt));
+
+  size_t pos = 0;
+
+  // Decode the element tree directly into the empty root element
+  root->RemoveAllAttributes();
+  root->RemoveAllNestedElements();
+  root->SetCharacterData("", 0);
+
+  if (!tag2eBinaryDecodeElement(root, Strings, &Tree[0], size, pos) || pos != size) {
+    vtkGenericWarningMacro( << "The binary parameter file " << fileName << " is corrupt");
+    return false;
+  }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EAbstractModelParameter::WriteXMLFile(const char *fileName, vtkXMLDataElement *root)
+{
+  if (fileName == NULL || root == NULL)
+    return false;
+
+  if (!vtkTAG2EAbstractModelParameter::IsBinaryFileName(fileName)) {
+    root->PrintXML(fileName);
+    return true;
+  }
+
+  std::map<std::string, tag2eBinaryUInt> Ids;
+  std::vector<std::string> Strings;
+  std::vector<tag2eBinaryUInt> Tree;
+
+  tag2eBinaryEncodeElement(root, Ids, Strings, Tree);
+
+  ofstream file(fileName, ios::out | ios::binary);
+  if (!file) {
+    vtkGenericWarningMacro( << "Unable to open binary parameter file " << fileName);
+    return false;
+  }
+
+  tag2eBinaryUInt header[3];
+  header[0] = TAG2E_BINARY_PARAMETER_VERSION;
+  header[1] = TAG2E_BINARY_BYTE_ORDER;
+  header[2] = Strings.size();
+
+  file.write(TAG2E_BINARY_MAGIC, 8);
+  file.write((char*) header, 3 * sizeof (tag2eBinaryUInt));
+
+  for (size_t i = 0; i < Strings.size(); i++) {
+    tag2eBinaryUInt length = Strings[i].size();
+    file.write((char*) & length, sizeof (tag2eBinaryUInt));
+    file.write(Strings[i].data(), length);
+  }
+
+  tag2eBinaryUInt size = Tree.size();
+  file.write((char*) & size, sizeof (tag2eBinaryUInt));
+  file.write((char*) & Tree[0], size * sizeof (tag2eBinaryUInt));
+
+  return (bool)file;
 }
 
 //----------------------------------------------------------------------------
@@ -55,6 +55,14 @@
  * specify the input/output filename, read and write XML files and return the 
  * content as vtkXMLDataElement.
  * 
+ * Besides the XML text format a compact binary format is supported, which
+ * stores the XML element tree with a string table and is loaded without the
+ * XML parser. Read() decodes the file directly into the XML representation.
+ * The read times of both formats are reported by Python/Scripts/TAG2EBenchmark.py.
+ * The format is selected by the file name extension, files ending with
+ * TAG2E_BINARY_PARAMETER_EXTENSION are binary files, all other files are XML.
+ * Both formats represent exactly the same XML element tree.
+ * 
  */
 
 #ifndef vtkTAG2EAbstractModelParameter_H
@@ -67,6 +75,11 @@
 
 class vtkKeyValueMap;
 
+//! The file name extension of the binary model parameter format
+#define TAG2E_BINARY_PARAMETER_EXTENSION ".bin"
+//! The version of the binary model parameter format
+#define TAG2E_BINARY_PARAMETER_VERSION 1
+
 class vtkTAG2EAbstractModelParameter : public vtkObject {
 public:
     vtkTypeRevisionMacro(vtkTAG2EAbstractModelParameter, vtkObject);
@@ -77,10 +90,10 @@ public:
     
     static vtkTAG2EAbstractModelParameter *New();
     
-    //!\brief Read the XML file with model parameter
+    //!\brief Read the XML or binary file with model parameter
     //!definitions specified by FileName
     virtual bool Read();
-    //!\brief Write the XML file with model parameter
+    //!\brief Write the XML or binary file with model parameter
     //!definitions as file specified by FileName
     virtual void Write();
     //\brief filename of the XML model parameter
@@ -94,6 +107,21 @@ public:
     virtual bool GetXMLRepresentation(vtkXMLDataElement *root);
     //!\brief Set the internal XML representation
     virtual bool SetXMLRepresentation(vtkXMLDataElement *root);
+
+    //!\brief Return true in case the file name has the binary parameter extension
+    static bool IsBinaryFileName(const char *fileName);
+    //!\brief Read an XML element tree from an XML or binary file,
+    //! the format is selected by the file name extension
+    //!\param fileName The name of the file to read
+    //!\param root the XML element which will be overwritten
+    //!\return true in case of success
+    static bool ReadXMLFile(const char *fileName, vtkXMLDataElement *root);
+    //!\brief Write an XML element tree as XML or binary file,
+    //! the format is selected by the file name extension
+    //!\param fileName The name of the file to write
+    //!\param root the XML element to write
+    //!\return true in case of success
+    static bool WriteXMLFile(const char *fileName, vtkXMLDataElement *root);
     
 protected:
     
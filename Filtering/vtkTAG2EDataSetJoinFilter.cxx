@@ -33,22 +33,62 @@
 #include <vtkObjectFactory.h>
 
 #include <vtkDataSet.h>
+#include <vtkAbstractArray.h>
 #include <vtkPointData.h>
 #include <vtkCellData.h>
 #include <vtkInformation.h>
 #include <vtkInformationVector.h>
 #include "vtkTAG2EDataSetJoinFilter.h"
+#include <set>
+#include <string>
 
 vtkCxxRevisionMacro(vtkTAG2EDataSetJoinFilter, "$Revision: 1.0 $");
 vtkStandardNewMacro(vtkTAG2EDataSetJoinFilter);
 
 //----------------------------------------------------------------------------
 
+// Insert the names of all arrays of the field data into the name set
+static void CollectNames(vtkFieldData *fd, std::set<std::string> &names)
+{
+  for(int j = 0; j < fd->GetNumberOfArrays(); j++)
+    {
+    if(fd->GetAbstractArray(j)->GetName() != NULL)
+      names.insert(fd->GetAbstractArray(j)->GetName());
+    }
+}
+
+//----------------------------------------------------------------------------
+
+// Add all arrays with unknown names to the output field data
+static void JoinFieldData(vtkFieldData *output, vtkFieldData *input,
+                          std::set<std::string> &names)
+{
+  for(int j = 0; j < input->GetNumberOfArrays(); j++)
+    {
+    vtkAbstractArray *array = input->GetAbstractArray(j);
+
+    if(array->GetName() == NULL)
+      {
+      output->AddArray(array);
+      continue;
+      }
+
+    // Insert returns false in case the name is already present
+    if(names.insert(array->GetName()).second)
+      {
+      output->AddArray(array);
+      }
+    }
+}
+
+//----------------------------------------------------------------------------
+
 vtkTAG2EDataSetJoinFilter::vtkTAG2EDataSetJoinFilter()
 {
   // At least on input is needed
   this->SetNumberOfInputPorts(1);
   this->SetNumberOfOutputPorts(1);
+  this->ReferenceMode = 0;
 }
 
 //----------------------------------------------------------------------------
@@ -81,72 +121,80 @@ int vtkTAG2EDataSetJoinFilter::FillOutputPortInformation(
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2EDataSetJoinFilter::CheckStructure(vtkDataSet *firstInput,
+    vtkDataSet *input, int index)
+{
+  int j;
+
+  if(firstInput->GetNumberOfCells() != input->GetNumberOfCells())
+    {
+    vtkErrorMacro("The number of cells is different between the first input"
+        " and the " << index << " input " << firstInput->GetNumberOfCells() <<
+        " : " << input->GetNumberOfCells());
+    cerr << "First input arrays:" << endl;
+    for(j = 0; j < firstInput->GetCellData()->GetNumberOfArrays(); j++)
+      {
+      cerr << firstInput->GetCellData()->GetArray(j)->GetName() << endl;;
+      }
+    cerr << "Arrays of input number " << index << endl;
+      for(j = 0; j < input->GetCellData()->GetNumberOfArrays(); j++)
+        {
+        cerr << input->GetCellData()->GetArray(j)->GetName() << endl;;
+        }
+    return false;
+    }
+
+  if(firstInput->GetNumberOfPoints() != input->GetNumberOfPoints())
+    {
+    vtkErrorMacro("The number of points is different between the first input"
+        " and the " << index << " input ");
+    return false;
+    }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 int vtkTAG2EDataSetJoinFilter::RequestData(vtkInformation * vtkNotUsed(request),
     vtkInformationVector **inputVector, vtkInformationVector *outputVector)
 {
-  int i, j;
+  int i;
+  int start = 0;
   bool error = false;
+  std::set<std::string> cellDataNames;
+  std::set<std::string> pointDataNames;
 
   vtkDataSet* firstInput = vtkDataSet::GetData(inputVector[0], 0);
   vtkDataSet* output = vtkDataSet::GetData(outputVector);
 
-  // We copy the structure of the first input
-  output->CopyStructure(firstInput);
-
-  //for(j = 0; j < firstInput->GetCellData()->GetNumberOfArrays(); j++)
-  //  {
-  //  cerr << firstInput->GetCellData()->GetArray(j)->GetName() << endl;;
-  //  }
+  if(this->ReferenceMode)
+    {
+    // Share the structure and the arrays of the first input
+    output->ShallowCopy(firstInput);
+    CollectNames(output->GetCellData(), cellDataNames);
+    CollectNames(output->GetPointData(), pointDataNames);
+    start = 1;
+    }
+  else
+    {
+    // We copy the structure of the first input
+    output->CopyStructure(firstInput);
+    }
 
   // Now we add the data arrays from all inputs to the output
-  for(i = 0; i < inputVector[0]->GetNumberOfInformationObjects(); i++)
+  for(i = start; i < inputVector[0]->GetNumberOfInformationObjects(); i++)
     {
     vtkDataSet* input = vtkDataSet::GetData(inputVector[0], i);
 
-    if(firstInput->GetNumberOfCells() != input->GetNumberOfCells())
+    if(!this->CheckStructure(firstInput, input, i))
       {
-      vtkErrorMacro("The number of cells is different between the first input"
-          " and the " << i << " input " << firstInput->GetNumberOfCells() <<
-          " : " << input->GetNumberOfCells());
-      cerr << "First input arrays:" << endl;
-      for(j = 0; j < firstInput->GetCellData()->GetNumberOfArrays(); j++)
-        {
-        cerr << firstInput->GetCellData()->GetArray(j)->GetName() << endl;;
-        }
-      cerr << "Arrays of input number " << i << endl;
-        for(j = 0; j < input->GetCellData()->GetNumberOfArrays(); j++)
-          {
-          cerr << input->GetCellData()->GetArray(j)->GetName() << endl;;
-          }
       error = true;
       continue;
       }
 
-    if(firstInput->GetNumberOfPoints() != input->GetNumberOfPoints())
-      {
-      vtkErrorMacro("The number of points is different between the first input"
-          " and the " << i << " input ");
-      error = true;
-      continue;
-      }
-
-    for(j = 0; j < input->GetCellData()->GetNumberOfArrays(); j++)
-      {
-      if(!output->GetCellData()->HasArray(input->GetCellData()->GetArray(j)->GetName()))
-        {
-        //std::cout << "Add " << input->GetCellData()->GetArray(j)->GetName() << std::endl;
-        output->GetCellData()->AddArray(input->GetCellData()->GetArray(j));
-        }
-      }
-
-    for(j = 0; j < input->GetPointData()->GetNumberOfArrays(); j++)
-      {
-      if(!output->GetPointData()->HasArray(input->GetPointData()->GetArray(j)->GetName()))
-        {
-        //std::cout << "Add " << input->GetPointData()->GetArray(j)->GetName() << std::endl;
-        output->GetPointData()->AddArray(input->GetPointData()->GetArray(j));
-        }
-      }
+    JoinFieldData(output->GetCellData(), input->GetCellData(), cellDataNames);
+    JoinFieldData(output->GetPointData(), input->GetPointData(), pointDataNames);
     }
 
   if(error)
@@ -40,8 +40,13 @@
  * is equal between the datasets. The topology is and spatial location
  * will not checked.
  * 
- * In case arrays with the same names appear in the input datasets the last
- * found array will be used.
+ * In case arrays with the same names appear in the input datasets the first
+ * found array will be used. The array names are looked up in a set of
+ * names, hence the join of many inputs with many arrays is not quadratic.
+ *
+ * In reference mode the first input is shallow copied to the output, so
+ * that the structure and the data arrays of the first input are shared
+ * by reference and the arrays of the other inputs are simply added.
  *
  * Use this filter as follows (Python):
  * 
@@ -64,6 +69,15 @@ public:
     vtkTypeRevisionMacro(vtkTAG2EDataSetJoinFilter, vtkDataSetAlgorithm);
     static vtkTAG2EDataSetJoinFilter *New();
 
+    //!\brief Set this true to shallow copy the first input to the output
+    //! instead of copying its structure, the arrays of the first input
+    //! are shared by reference
+    vtkSetMacro(ReferenceMode, int);
+    //!\brief Get the reference mode
+    vtkGetMacro(ReferenceMode, int);
+    //!\brief Set this true to shallow copy the first input to the output
+    vtkBooleanMacro(ReferenceMode, int);
+
 protected:
     vtkTAG2EDataSetJoinFilter();
     ~vtkTAG2EDataSetJoinFilter();
@@ -73,6 +87,12 @@ protected:
     virtual int FillInputPortInformation(int port, vtkInformation* info);
     virtual int FillOutputPortInformation(int port, vtkInformation* info);
 
+    //!\brief Check if the input has the same number of points and cells as the
+    //! first input
+    bool CheckStructure(vtkDataSet *firstInput, vtkDataSet *input, int index);
+
+    int ReferenceMode;
+
 private:
     vtkTAG2EDataSetJoinFilter(const vtkTAG2EDataSetJoinFilter& orig); // Not implemented.
     void operator=(const vtkTAG2EDataSetJoinFilter&); // Not implemented.
@@ -0,0 +1,322 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#include <vtkCellData.h>
+#include <vtkDataSet.h>
+#include <vtkDoubleArray.h>
+#include <vtkInformation.h>
+#include <vtkInformationVector.h>
+#include <vtkObjectFactory.h>
+#include <vtkPointData.h>
+#include <vtkDataSetAttributes.h>
+#include "vtkTAG2EDataSetN2OFilter.h"
+#include "tag2eN2O.h"
+#include <vector>
+#include <string>
+
+vtkCxxRevisionMacro(vtkTAG2EDataSetN2OFilter, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2EDataSetN2OFilter);
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDataSetN2OFilter::vtkTAG2EDataSetN2OFilter()
+{
+  this->UsePointData = 0;
+  this->CheckCategoryConsistency = 0;
+  this->NullValue = -999999;
+  this->NitrogenRateArrayName = NULL;
+  this->SandFractionArrayName = NULL;
+  this->SiltFractionArrayName = NULL;
+  this->ClayFractionArrayName = NULL;
+  this->SoilOrganicCarbonArrayName = NULL;
+  this->SoilNitrogenArrayName = NULL;
+  this->pHArrayName = NULL;
+  this->TempSpringArrayName = NULL;
+  this->TempWinterArrayName = NULL;
+  this->PrecipitationSumArrayName = NULL;
+  this->CategoryArrayName = NULL;
+  this->ComputeFreibauer = 0;
+  this->ComputeStehfest = 0;
+  this->ComputeRoelandt = 0;
+  this->ComputeBouwman = 0;
+  this->CropType = VTK_TAG2E_CROPTYPE_GRASS;
+  this->FreibauerClimateType = VTK_TAG2E_CLIMATETYPE_FREIBAUER_TWE;
+  this->StehfestClimateType = VTK_TAG2E_CLIMATETYPE_STEHFEST_BOREAL;
+  this->RoelandtModelType = TAG2E_N2O_ROELANDT_BEST;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDataSetN2OFilter::~vtkTAG2EDataSetN2OFilter()
+{
+  this->SetNitrogenRateArrayName(NULL);
+  this->SetSandFractionArrayName(NULL);
+  this->SetSiltFractionArrayName(NULL);
+  this->SetClayFractionArrayName(NULL);
+  this->SetSoilOrganicCarbonArrayName(NULL);
+  this->SetSoilNitrogenArrayName(NULL);
+  this->SetpHArrayName(NULL);
+  this->SetTempSpringArrayName(NULL);
+  this->SetTempWinterArrayName(NULL);
+  this->SetPrecipitationSumArrayName(NULL);
+  this->SetCategoryArrayName(NULL);
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2EDataSetN2OFilter::RequestData(
+    vtkInformation *vtkNotUsed(request), vtkInformationVector **inputVector,
+    vtkInformationVector *outputVector)
+{
+  // get the info objects
+  vtkInformation *inInfo = inputVector[0]->GetInformationObject(0);
+  vtkInformation *outInfo = outputVector->GetInformationObject(0);
+
+  // get the input and ouptut
+  vtkDataSet *input = vtkDataSet::SafeDownCast(
+      inInfo->Get(vtkDataObject::DATA_OBJECT()));
+  vtkDataSet *output = vtkDataSet::SafeDownCast(
+      outInfo->Get(vtkDataObject::DATA_OBJECT()));
+
+  int i, j, num;
+  vtkDataSetAttributes *data = NULL;
+
+  // Switch between Point or Cell data
+  if (this->UsePointData)
+    {
+    num = input->GetNumberOfPoints();
+    data = input->GetPointData();
+    } else
+    {
+    num = input->GetNumberOfCells();
+    data = input->GetCellData();
+    }
+
+  // The kernels of all selected models
+  tag2eN2OKernelFreibauer freibauer(this->CropType, this->FreibauerClimateType);
+  tag2eN2OKernelStehfest stehfest(this->CropType, this->StehfestClimateType);
+  tag2eN2OKernelRoelandt roelandt(this->CropType, this->RoelandtModelType);
+  tag2eN2OKernelBouwman bouwman;
+
+  std::vector<tag2eN2OKernel*> Kernels;
+
+  if (this->ComputeFreibauer)
+    Kernels.push_back(&freibauer);
+  if (this->ComputeStehfest)
+    Kernels.push_back(&stehfest);
+  if (this->ComputeRoelandt)
+    Kernels.push_back(&roelandt);
+  if (this->ComputeBouwman)
+    Kernels.push_back(&bouwman);
+
+  if (Kernels.size() == 0)
+    {
+    vtkErrorMacro(<< "No N2O emission model selected, abort.");
+    return 0;
+    }
+
+  // The input array names indexed by the kernel input ids
+  const char *names[TAG2E_N2O_NUMBER_OF_INPUTS];
+  names[TAG2E_N2O_NITROGEN_RATE] = this->NitrogenRateArrayName;
+  names[TAG2E_N2O_SAND_FRACTION] = this->SandFractionArrayName;
+  names[TAG2E_N2O_SILT_FRACTION] = this->SiltFractionArrayName;
+  names[TAG2E_N2O_CLAY_FRACTION] = this->ClayFractionArrayName;
+  names[TAG2E_N2O_SOIL_ORGANIC_CARBON] = this->SoilOrganicCarbonArrayName;
+  names[TAG2E_N2O_SOIL_NITROGEN] = this->SoilNitrogenArrayName;
+  names[TAG2E_N2O_PH] = this->pHArrayName;
+  names[TAG2E_N2O_TEMP_SPRING] = this->TempSpringArrayName;
+  names[TAG2E_N2O_TEMP_WINTER] = this->TempWinterArrayName;
+  names[TAG2E_N2O_PRECIPITATION_SUM] = this->PrecipitationSumArrayName;
+
+  // Check for all arrays needed by the selected models
+  std::vector<bool> used(TAG2E_N2O_NUMBER_OF_INPUTS, false);
+
+  for (j = 0; j < TAG2E_N2O_NUMBER_OF_INPUTS; j++)
+    {
+    for (unsigned int k = 0; k < Kernels.size(); k++)
+      {
+      if (Kernels[k]->UsesInput(j))
+        used[j] = true;
+      }
+
+    if (!used[j])
+      continue;
+
+    if (names[j] == NULL || !data->HasArray(names[j]))
+      {
+      vtkErrorMacro(<< "Missing " << (this->UsePointData ? "point" : "cell")
+          << " data input array " << (names[j] ? names[j] : "(none)")
+          << ", abort.");
+      return 0;
+      }
+    if (data->GetArray(names[j])->GetNumberOfComponents() != 1)
+      {
+      vtkErrorMacro(<< "Input array " << names[j]
+          << " must have a single component, abort.");
+      return 0;
+      }
+    }
+
+  if (this->CategoryArrayName && !data->HasArray(this->CategoryArrayName))
+    {
+    vtkErrorMacro(<< "Missing category array " << this->CategoryArrayName
+        << ", abort.");
+    return 0;
+    }
+
+  // First, copy the input to the output as a starting point
+  output->CopyStructure(input);
+
+  // Access the input arrays directly, arrays of other type
+  // than double are converted once
+  double *Inputs[TAG2E_N2O_NUMBER_OF_INPUTS];
+  std::vector<vtkDoubleArray*> Copies;
+
+  for (j = 0; j < TAG2E_N2O_NUMBER_OF_INPUTS; j++)
+    {
+    Inputs[j] = NULL;
+
+    if (!used[j])
+      continue;
+
+    vtkDataArray *array = data->GetArray(names[j]);
+    vtkDoubleArray *values = vtkDoubleArray::SafeDownCast(array);
+
+    if (values == NULL)
+      {
+      values = vtkDoubleArray::New();
+      values->DeepCopy(array);
+      Copies.push_back(values);
+      }
+    Inputs[j] = values->GetPointer(0);
+    }
+
+  // The categories are converted into a dense integer vector
+  std::vector<int> Categories;
+
+  if (this->CategoryArrayName)
+    {
+    vtkDataArray *cats = data->GetArray(this->CategoryArrayName);
+    Categories.resize(num);
+    for (i = 0; i < num; i++)
+      Categories[i] = (int) cats->GetTuple1(i);
+    }
+
+  // The resulting arrays
+  vtkDoubleArray *N2Oemission = vtkDoubleArray::New();
+  N2Oemission->SetName("N2O");
+  N2Oemission->SetNumberOfTuples(num);
+
+  std::vector<vtkDoubleArray*> Models;
+  std::vector<double*> Results(Kernels.size(), (double*)NULL);
+
+  // Create the model specific arrays only in case of an ensemble
+  if (Kernels.size() > 1)
+    {
+    for (unsigned int k = 0; k < Kernels.size(); k++)
+      {
+      std::string name = std::string("N2O_") + Kernels[k]->GetName();
+      vtkDoubleArray *model = vtkDoubleArray::New();
+      model->SetName(name.c_str());
+      model->SetNumberOfTuples(num);
+      Models.push_back(model);
+      Results[k] = model->GetPointer(0);
+      }
+    }
+
+  // Compute the emission of all models
+  int inconsistent = -1;
+  bool success = true;
+
+  if (num > 0)
+    success = tag2eN2O::ComputeEmissions(Inputs,
+        Categories.size() > 0 ? &Categories[0] : NULL, num, Kernels,
+        this->NullValue, &Results[0], N2Oemission->GetPointer(0),
+        this->CheckCategoryConsistency ? &inconsistent : NULL);
+
+  for (unsigned int k = 0; k < Copies.size(); k++)
+    Copies[k]->Delete();
+
+  if (!success)
+    {
+    if (inconsistent >= 0)
+      vtkErrorMacro(<< "The input data of category " << Categories[inconsistent]
+          << " differs at " << (this->UsePointData ? "point " : "cell ")
+          << inconsistent << ", abort.");
+    else
+      vtkErrorMacro(<< "Unable to compute the N2O emission, abort.");
+
+    for (unsigned int k = 0; k < Models.size(); k++)
+      Models[k]->Delete();
+    N2Oemission->Delete();
+    return 0;
+    }
+
+  // Update self
+  //
+  output->GetPointData()->CopyScalarsOff();
+  output->GetPointData()->PassData(input->GetPointData());
+  output->GetCellData()->PassData(input->GetCellData());
+
+  data = this->UsePointData ? (vtkDataSetAttributes*)output->GetPointData() :
+      (vtkDataSetAttributes*)output->GetCellData();
+
+  for (unsigned int k = 0; k < Models.size(); k++)
+    {
+    data->AddArray(Models[k]);
+    Models[k]->Delete();
+    }
+  data->AddArray(N2Oemission);
+  data->SetActiveScalars(N2Oemission->GetName());
+  N2Oemission->Delete();
+
+  return 1;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EDataSetN2OFilter::PrintSelf(ostream& os, vtkIndent indent)
+{
+  this->Superclass::PrintSelf(os, indent);
+
+  os << indent << "UsePointData: " << this->UsePointData << endl;
+  os << indent << "CheckCategoryConsistency: " << this->CheckCategoryConsistency << endl;
+  os << indent << "NullValue: " << this->NullValue << endl;
+  os << indent << "ComputeFreibauer: " << this->ComputeFreibauer << endl;
+  os << indent << "ComputeStehfest: " << this->ComputeStehfest << endl;
+  os << indent << "ComputeRoelandt: " << this->ComputeRoelandt << endl;
+  os << indent << "ComputeBouwman: " << this->ComputeBouwman << endl;
+  os << indent << "CropType: " << this->CropType << endl;
+  os << indent << "FreibauerClimateType: " << this->FreibauerClimateType << endl;
+  os << indent << "StehfestClimateType: " << this->StehfestClimateType << endl;
+  os << indent << "RoelandtModelType: " << this->RoelandtModelType << endl;
+}
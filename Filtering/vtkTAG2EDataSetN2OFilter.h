@@ -0,0 +1,221 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+
+/**
+ * \brief This class computes the annual emission of N2O in [kg /(ha a)] for
+ * agricultural mineral soil with several empirical models in a single pass.
+ * Available are the approaches of Freibauer, Stehfest, Roelandt and Bouwman.
+ * Each selected model needs its own set of input arrays, the arrays of
+ * models which are not selected must not be set.
+ *
+ * As input any vtkDataSet can be used including the input parameter as cell or
+ * point data. The usage of categories for similiar cells/points
+ * (image or polydata) can speed up the processing in case the number of
+ * categories is smaller than the number cells/points. The N2O emission is only
+ * computed for a single category and stored for each cell/point with this category.
+ * The categories are managed in a hash table, so sparse category ids need
+ * memory proportional to the number of distinct categories only.
+ * The computation is parallelized with OpenMP if enabled.
+ *
+ * Cell data will be used as default. The resulting data set contains the structure
+ * of the input data set and the ensemble mean of all selected models in [kg /(ha a)]
+ * as array "N2O". In case more than one model is selected, the result of
+ * each model is stored in an additional array named "N2O_" followed by the
+ * model name, e.g "N2O_Freibauer".
+ *
+ * \author Soeren Gebbert
+ * \author Rene Dechow
+ *
+ * */
+
+#ifndef __vtkTAG2EDataSetN2OFilter_h
+#define __vtkTAG2EDataSetN2OFilter_h
+
+#include <vtkDataSetAlgorithm.h>
+#include "vtkTAG2EFilteringWin32Header.h"
+#include "vtkTAG2EAlternativeN2OPredictionModules.h"
+
+class VTK_TAG2E_FILTERING_EXPORT vtkTAG2EDataSetN2OFilter : public vtkDataSetAlgorithm
+{
+public:
+  vtkTypeRevisionMacro(vtkTAG2EDataSetN2OFilter,vtkDataSetAlgorithm);
+  void PrintSelf(ostream& os, vtkIndent indent);
+  static vtkTAG2EDataSetN2OFilter *New();
+
+  //!\brief The name of the array of annual fertilizer input in [(kg N )/(ha a)]
+  vtkSetStringMacro(NitrogenRateArrayName);
+  //!\brief The name of the array of sand content in top soil, in [%] of soil weight
+  vtkSetStringMacro(SandFractionArrayName);
+  //!\brief The name of the array of silt content in top soil, in [%] of soil weight
+  vtkSetStringMacro(SiltFractionArrayName);
+  //!\brief The name of the array of clay content in top soil, in [%] of soil weight
+  vtkSetStringMacro(ClayFractionArrayName);
+  //!\brief The name of the array of soil organic carbon content in top soil in [%] of soil weight
+  vtkSetStringMacro(SoilOrganicCarbonArrayName);
+  //!\brief The name of the array of total soil nitrogen content in [%] of soil weight
+  vtkSetStringMacro(SoilNitrogenArrayName);
+  //!\brief The name of the array of the pH value of top soil
+  vtkSetStringMacro(pHArrayName);
+  //!\brief The name of the array of the mean spring temperature
+  vtkSetStringMacro(TempSpringArrayName);
+  //!\brief The name of the array of the mean winter temperature
+  vtkSetStringMacro(TempWinterArrayName);
+  //!\brief The name of the array of annual precipitation
+  vtkSetStringMacro(PrecipitationSumArrayName);
+  //!\brief The name of the category array, which describes cells/points with identical
+  //! data. This is used to speed up the computation in case the input data set
+  //! has many cells/points but does not vary much in parameters (Like the multi polygon
+  //! approach for grouping different but data identical areas)
+  //! Categories must be integer values in range 0 .. n. The category array is optional.
+  vtkSetStringMacro(CategoryArrayName);
+
+  //!\brief The name of the array of annual fertilizer input in [(kg N )/(ha a)]
+  vtkGetStringMacro(NitrogenRateArrayName);
+  //!\brief The name of the array of sand content in top soil, in [%] of soil weight
+  vtkGetStringMacro(SandFractionArrayName);
+  //!\brief The name of the array of silt content in top soil, in [%] of soil weight
+  vtkGetStringMacro(SiltFractionArrayName);
+  //!\brief The name of the array of clay content in top soil, in [%] of soil weight
+  vtkGetStringMacro(ClayFractionArrayName);
+  //!\brief The name of the array of soil organic carbon content in top soil in [%] of soil weight
+  vtkGetStringMacro(SoilOrganicCarbonArrayName);
+  //!\brief The name of the array of total soil nitrogen content in [%] of soil weight
+  vtkGetStringMacro(SoilNitrogenArrayName);
+  //!\brief The name of the array of the pH value of top soil
+  vtkGetStringMacro(pHArrayName);
+  //!\brief The name of the array of the mean spring temperature
+  vtkGetStringMacro(TempSpringArrayName);
+  //!\brief The name of the array of the mean winter temperature
+  vtkGetStringMacro(TempWinterArrayName);
+  //!\brief The name of the array of annual precipitation
+  vtkGetStringMacro(PrecipitationSumArrayName);
+  //!\brief The name of the category array
+  vtkGetStringMacro(CategoryArrayName);
+
+  //!\brief Check that all cells/points of a category have identical input data.
+  //! The computation is aborted with an error in case a category is inconsistent,
+  //! default off
+  vtkSetMacro(CheckCategoryConsistency, int);
+  //!\brief Check that all cells/points of a category have identical input data.
+  vtkGetMacro(CheckCategoryConsistency, int);
+  //!\brief Check that all cells/points of a category have identical input data.
+  vtkBooleanMacro(CheckCategoryConsistency, int);
+
+  //!\brief Use the point data arrays instead of the default cell data arrays
+  vtkSetMacro(UsePointData, int);
+  //!\brief Use the point data arrays instead of the default cell data arrays
+  vtkGetMacro(UsePointData, int);
+  //!\brief Use the point data arrays instead of the default cell data arrays
+  vtkBooleanMacro(UsePointData, int);
+
+  //!\brief The value which should be used as result for wrong category data
+  //! and null input data
+  vtkSetMacro(NullValue, double);
+  //!\brief The value which should be used as result for wrong category data
+  //! and null input data
+  vtkGetMacro(NullValue, double);
+
+  //!\brief Compute the Freibauer model, needs nitrogen rate, sand fraction,
+  //! soil organic carbon and soil nitrogen
+  vtkSetMacro(ComputeFreibauer, int);
+  vtkGetMacro(ComputeFreibauer, int);
+  vtkBooleanMacro(ComputeFreibauer, int);
+  //!\brief Compute the Stehfest model, needs nitrogen rate, soil organic
+  //! carbon, silt fraction, clay fraction and pH
+  vtkSetMacro(ComputeStehfest, int);
+  vtkGetMacro(ComputeStehfest, int);
+  vtkBooleanMacro(ComputeStehfest, int);
+  //!\brief Compute the Roelandt model, needs nitrogen rate, spring and
+  //! winter temperature and the precipitation sum
+  vtkSetMacro(ComputeRoelandt, int);
+  vtkGetMacro(ComputeRoelandt, int);
+  vtkBooleanMacro(ComputeRoelandt, int);
+  //!\brief Compute the Bouwman model, needs the nitrogen rate
+  vtkSetMacro(ComputeBouwman, int);
+  vtkGetMacro(ComputeBouwman, int);
+  vtkBooleanMacro(ComputeBouwman, int);
+
+  //!\brief The crop type VTK_TAG2E_CROPTYPE_* used by all models, default grass
+  vtkSetMacro(CropType, int);
+  vtkGetMacro(CropType, int);
+  //!\brief The climate type VTK_TAG2E_CLIMATETYPE_FREIBAUER_* of the Freibauer model,
+  //! default temperate western europe
+  vtkSetMacro(FreibauerClimateType, int);
+  vtkGetMacro(FreibauerClimateType, int);
+  //!\brief The climate type VTK_TAG2E_CLIMATETYPE_STEHFEST_* of the Stehfest model,
+  //! default boreal
+  vtkSetMacro(StehfestClimateType, int);
+  vtkGetMacro(StehfestClimateType, int);
+  //!\brief The model type TAG2E_N2O_ROELANDT_* of the Roelandt model
+  //! (1 best, 2 min, 3 max), default best
+  vtkSetClampMacro(RoelandtModelType, int, 1, 3);
+  vtkGetMacro(RoelandtModelType, int);
+
+protected:
+  vtkTAG2EDataSetN2OFilter();
+  ~vtkTAG2EDataSetN2OFilter();
+
+  char *NitrogenRateArrayName;
+  char *SandFractionArrayName;
+  char *SiltFractionArrayName;
+  char *ClayFractionArrayName;
+  char *SoilOrganicCarbonArrayName;
+  char *SoilNitrogenArrayName;
+  char *pHArrayName;
+  char *TempSpringArrayName;
+  char *TempWinterArrayName;
+  char *PrecipitationSumArrayName;
+  char *CategoryArrayName;
+
+  int UsePointData;
+  int CheckCategoryConsistency;
+  double NullValue;
+
+  int ComputeFreibauer;
+  int ComputeStehfest;
+  int ComputeRoelandt;
+  int ComputeBouwman;
+
+  int CropType;
+  int FreibauerClimateType;
+  int StehfestClimateType;
+  int RoelandtModelType;
+
+  int RequestData(vtkInformation *, vtkInformationVector **, vtkInformationVector *);
+
+private:
+  vtkTAG2EDataSetN2OFilter(const vtkTAG2EDataSetN2OFilter&);  // Not implemented.
+  void operator=(const vtkTAG2EDataSetN2OFilter&);  // Not implemented.
+};
+
+#endif
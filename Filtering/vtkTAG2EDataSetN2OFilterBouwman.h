@@ -41,6 +41,9 @@
  * categories is smaller than the number cells/points. The N2O emission is only
  * computed for a single category and stored for each cell/point with this category.
  *
+ * The computation is performed by vtkTAG2EDataSetN2OFilter, the category
+ * array is optional.
+ *
  * Cell data will be used as default. The resulting data set contains the structure
  * of the input data set and the resulting N2O emission in [kg /(ha a)].
  *
@@ -56,62 +59,22 @@
 #ifndef __vtkTAG2EDataSetN2OFilterBouwman_h
 #define __vtkTAG2EDataSetN2OFilterBouwman_h
 
-#include <vtkDataSetAlgorithm.h>
-#include "vtkTAG2EFilteringWin32Header.h"
+#include "vtkTAG2EDataSetN2OFilter.h"
 
-class VTK_TAG2E_FILTERING_EXPORT vtkTAG2EDataSetN2OFilterBouwman : public vtkDataSetAlgorithm
+class VTK_TAG2E_FILTERING_EXPORT vtkTAG2EDataSetN2OFilterBouwman : public vtkTAG2EDataSetN2OFilter
 {
 public:
-  vtkTypeRevisionMacro(vtkTAG2EDataSetN2OFilterBouwman,vtkDataSetAlgorithm);
+  vtkTypeRevisionMacro(vtkTAG2EDataSetN2OFilterBouwman,vtkTAG2EDataSetN2OFilter);
   void PrintSelf(ostream& os, vtkIndent indent);
   static vtkTAG2EDataSetN2OFilterBouwman *New();
 
-  //!\brief The name of the array of annual fertilizer input in [(kg N )/(ha a)]
-  vtkSetStringMacro(NitrogenRateArrayName);
-  //!\brief The name of the category array, which describes cells/points with identical
-  //! data. This is used to speed up the computation in case the input data set
-  //! has many cells/points but does not vary much in parameters (Like the multi polygon
-  //! approach for grouping different but data identical areas)
-  //! Categories must be integer values in range 0 .. n.
-  vtkSetStringMacro(CategoryArrayName);
-
-  //!\brief The name of the array of annual fertilizer input in [(kg N )/(ha a)]
-  vtkGetStringMacro(NitrogenRateArrayName);
-  //!\brief The name of the category array, which describes cells/points with identical
-  //! data. This is used to speed up the computation in case the input data set
-  //! has many cells/points but does not vary much in parameters (Like the multi polygon
-  //! approach for grouping different but data identical areas)
-  vtkGetStringMacro(CategoryArrayName);
-
-  //!\brief Use the point data arrays instead of the default cell data arrays
-  vtkSetMacro(UsePointData, int);
-  //!\brief Use the point data arrays instead of the default cell data arrays
-  vtkGetMacro(UsePointData, int);
-  //!\brief Use the point data arrays instead of the default cell data arrays
-  vtkBooleanMacro(UsePointData, int);
-
-  //!\brief The value which should be used as result for wrong category data
-  vtkSetMacro(NullValue, double);
-  //!\brief The value which should be used as result for wrong category data
-  vtkGetMacro(NullValue, double);
-
 protected:
   vtkTAG2EDataSetN2OFilterBouwman();
   ~vtkTAG2EDataSetN2OFilterBouwman() {};
 
-  char *NitrogenRateArrayName;
-  char *CategoryArrayName;
-
-  int UsePointData;
-  double NullValue;
-
-  int RequestData(vtkInformation *, vtkInformationVector **, vtkInformationVector *);
-
 private:
   vtkTAG2EDataSetN2OFilterBouwman(const vtkTAG2EDataSetN2OFilterBouwman&);  // Not implemented.
   void operator=(const vtkTAG2EDataSetN2OFilterBouwman&);  // Not implemented.
 };
 
 #endif
-
-
@@ -45,6 +45,9 @@
  * categories is smaller than the number cells/points. The N2O emission is only
  * computed for a single category and stored for each cell/point with this category.
  *
+ * The computation is performed by vtkTAG2EDataSetN2OFilter, the category
+ * array is optional.
+ *
  * Cell data will be used as default. The resulting data set contains the structure
  * of the input data set and the resulting N2O emission in [kg /(ha a)].
  *
@@ -60,97 +63,32 @@
 #ifndef __vtkTAG2EDataSetN2OFilterFreibauer_h
 #define __vtkTAG2EDataSetN2OFilterFreibauer_h
 
-#include <vtkDataSetAlgorithm.h>
-#include "vtkTAG2EFilteringWin32Header.h"
-#include "vtkTAG2EAlternativeN2OPredictionModules.h"
+#include "vtkTAG2EDataSetN2OFilter.h"
 
-class VTK_TAG2E_FILTERING_EXPORT vtkTAG2EDataSetN2OFilterFreibauer : public vtkDataSetAlgorithm
+class VTK_TAG2E_FILTERING_EXPORT vtkTAG2EDataSetN2OFilterFreibauer : public vtkTAG2EDataSetN2OFilter
 {
 public:
-  vtkTypeRevisionMacro(vtkTAG2EDataSetN2OFilterFreibauer,vtkDataSetAlgorithm);
+  vtkTypeRevisionMacro(vtkTAG2EDataSetN2OFilterFreibauer,vtkTAG2EDataSetN2OFilter);
   void PrintSelf(ostream& os, vtkIndent indent);
   static vtkTAG2EDataSetN2OFilterFreibauer *New();
 
-  //!\brief The name of the array of annual fertilizer input in [(kg N )/(ha a)]
-  vtkSetStringMacro(NitrogenRateArrayName);
-  //!\brief The name of the array of sand content in top soil, in [%] of soil weight
-  vtkSetStringMacro(SandFractionArrayName);
-  //!\brief The name of the array of soil organic carbon content in top soil in [%] of soil weight
-  vtkSetStringMacro(SoilOrganicCarbonArrayName);
-  //!\brief The name of the array of total soil nitrogen content in [%] of soil weight
-  vtkSetStringMacro(SoilNitrogenArrayName);
-
-  //!\brief The name of the category array, which describes cells/points with identical
-  //! data. This is used to speed up the computation in case the input data set
-  //! has many cells/points but does not vary much in parameters (Like the multi polygon
-  //! approach for grouping different but data identical areas)
-  //! Categories must be integer values in range 0 .. n.
-  vtkSetStringMacro(CategoryArrayName);
-
-  //!\brief The name of the array of annual fertilizer input in [(kg N )/(ha a)]
-  vtkGetStringMacro(NitrogenRateArrayName);
-  //!\brief The name of the array of sand content in top soil, in [%] of soil weight
-  vtkGetStringMacro(SandFractionArrayName);
-  //!\brief The name of the array of soil organic carbon content in top soil in [%] of soil weight
-  vtkGetStringMacro(SoilOrganicCarbonArrayName);
-  //!\brief The name of the array of total soil nitrogen content in [%] of soil weight
-  vtkGetStringMacro(SoilNitrogenArrayName);
-
-  //!\brief The name of the category array, which describes cells/points with identical
-  //! data. This is used to speed up the computation in case the input data set
-  //! has many cells/points but does not vary much in parameters (Like the multi polygon
-  //! approach for grouping different but data identical areas)
-  vtkGetStringMacro(CategoryArrayName);
-
-  //!\brief Use the point data arrays instead of the default cell data arrays
-  vtkSetMacro(UsePointData, int);
-  //!\brief Use the point data arrays instead of the default cell data arrays
-  vtkGetMacro(UsePointData, int);
-  //!\brief Use the point data arrays instead of the default cell data arrays
-  vtkBooleanMacro(UsePointData, int);
-
-  //!\brief The value which should be used as result for wrong category data
-  vtkSetMacro(NullValue, double);
-  //!\brief The value which should be used as result for wrong category data
-  vtkGetMacro(NullValue, double);
-  
-
   //!\brief Set the climate type to sub-boreal
-  void SetClimateTypeToSubBoreal(){this->SetClimateType(VTK_TAG2E_CLIMATETYPE_FREIBAUER_SUBBOREAL);}
+  void SetClimateTypeToSubBoreal(){this->SetFreibauerClimateType(VTK_TAG2E_CLIMATETYPE_FREIBAUER_SUBBOREAL);}
   //!\brief Set the climate type to temperate western europe (this is the default)
-  void SetClimateTypeToTemperate(){this->SetClimateType(VTK_TAG2E_CLIMATETYPE_FREIBAUER_TWE);}
+  void SetClimateTypeToTemperate(){this->SetFreibauerClimateType(VTK_TAG2E_CLIMATETYPE_FREIBAUER_TWE);}
   
   //!\brief Set the croptype to grass (this is the default)
   void SetCropTypeToGrass(){this->SetCropType(VTK_TAG2E_CROPTYPE_GRASS);}
   //!\brief Set the croptype to other than grass
   void SetCropTypeToOther(){this->SetCropType(VTK_TAG2E_CROPTYPE_OTHER);}
-  
+
 protected:
   vtkTAG2EDataSetN2OFilterFreibauer();
   ~vtkTAG2EDataSetN2OFilterFreibauer() {};
 
-
-  char *NitrogenRateArrayName;
-  char *SandFractionArrayName;
-  char *SoilOrganicCarbonArrayName;
-  char *SoilNitrogenArrayName;
-  char *CategoryArrayName;
-  
-  int UsePointData;
-  double NullValue;
-
-  int ClimateType;
-  int CropType;
-  vtkSetMacro(ClimateType, int);
-  vtkSetMacro(CropType, int);
-  
-  int RequestData(vtkInformation *, vtkInformationVector **, vtkInformationVector *);
-
 private:
   vtkTAG2EDataSetN2OFilterFreibauer(const vtkTAG2EDataSetN2OFilterFreibauer&);  // Not implemented.
   void operator=(const vtkTAG2EDataSetN2OFilterFreibauer&);  // Not implemented.
 };
 
 #endif
-
-
@@ -44,6 +44,9 @@
  * categories is smaller than the number cells/points. The N2O emission is only
  * computed for a single category and stored for each cell/point with this category.
  *
+ * The computation is performed by vtkTAG2EDataSetN2OFilter, the category
+ * array is optional.
+ *
  * Cell data will be used as default. The resulting data set contains the structure
  * of the input data set and the resulting N2O emission in [kg /(ha a)].
  *
@@ -59,102 +62,34 @@
 #ifndef __vtkTAG2EDataSetN2OFilterRoelandt_h
 #define __vtkTAG2EDataSetN2OFilterRoelandt_h
 
-#include <vtkDataSetAlgorithm.h>
-#include "vtkTAG2EFilteringWin32Header.h"
-#include "vtkTAG2EAlternativeN2OPredictionModules.h"
+#include "vtkTAG2EDataSetN2OFilter.h"
 
-class VTK_TAG2E_FILTERING_EXPORT vtkTAG2EDataSetN2OFilterRoelandt : public vtkDataSetAlgorithm
+class VTK_TAG2E_FILTERING_EXPORT vtkTAG2EDataSetN2OFilterRoelandt : public vtkTAG2EDataSetN2OFilter
 {
 public:
-  vtkTypeRevisionMacro(vtkTAG2EDataSetN2OFilterRoelandt,vtkDataSetAlgorithm);
+  vtkTypeRevisionMacro(vtkTAG2EDataSetN2OFilterRoelandt,vtkTAG2EDataSetN2OFilter);
   void PrintSelf(ostream& os, vtkIndent indent);
   static vtkTAG2EDataSetN2OFilterRoelandt *New();
 
-  //!\brief The name of the array of annual fertilizer input in [(kg N )/(ha a)]
-  vtkSetStringMacro(NitrogenRateArrayName);
-  //!\brief The name of the spring temperature array
-  vtkSetStringMacro(TempSpringArrayName);
-  //!\brief The name of the winter temperature array
-  vtkSetStringMacro(TempWinterArrayName);
-  //!\brief The name of the array of annual precipitation
-  vtkSetStringMacro(PrecipitationSumArrayName);
-  
-  //!\brief The name of the category array, which describes cells/points with identical
-  //! data. This is used to speed up the computation in case the input data set
-  //! has many cells/points but does not vary much in parameters (Like the multi polygon
-  //! approach for grouping different but data identical areas)
-  //! Categories must be integer values in range 0 .. n.
-  vtkSetStringMacro(CategoryArrayName);
-
-
-  //!\brief The name of the array of annual fertilizer input in [(kg N )/(ha a)]
-  vtkGetStringMacro(NitrogenRateArrayName);
-  //!\brief The name of the spring temperature array
-  vtkGetStringMacro(TempSpringArrayName);
-  //!\brief The name of the winter temperature array
-  vtkGetStringMacro(TempWinterArrayName);
-  //!\brief The name of the array of annual precipitation
-  vtkGetStringMacro(PrecipitationSumArrayName);
-  
-  //!\brief The name of the category array, which describes cells/points with identical
-  //! data. This is used to speed up the computation in case the input data set
-  //! has many cells/points but does not vary much in parameters (Like the multi polygon
-  //! approach for grouping different but data identical areas)
-  vtkGetStringMacro(CategoryArrayName);
-
-  //!\brief Use the point data arrays instead of the default cell data arrays
-  vtkSetMacro(UsePointData, int);
-  //!\brief Use the point data arrays instead of the default cell data arrays
-  vtkGetMacro(UsePointData, int);
-  //!\brief Use the point data arrays instead of the default cell data arrays
-  vtkBooleanMacro(UsePointData, int);
-
-  //!\brief The value which should be used as result for wrong category data
-  vtkSetMacro(NullValue, double);
-  //!\brief The value which should be used as result for wrong category data
-  vtkGetMacro(NullValue, double);
-
-
-  virtual void SetModeltypeToBest(){this->SetModelType(1);}
-  virtual void SetModeltypeToMin(){this->SetModelType(2);}
-  virtual void SetModeltypeToMax(){this->SetModelType(3);}
+  virtual void SetModeltypeToBest(){this->SetRoelandtModelType(1);}
+  virtual void SetModeltypeToMin(){this->SetRoelandtModelType(2);}
+  virtual void SetModeltypeToMax(){this->SetRoelandtModelType(3);}
 
   //!\brief Which model type should be used, Best, Min or Max
-  vtkGetMacro(ModelType, int);
+  int GetModelType(){return this->GetRoelandtModelType();}
   
   //!\brief Set the croptype to grass (this is the default)
   void SetCropTypeToGrass(){this->SetCropType(VTK_TAG2E_CROPTYPE_GRASS);}
   //!\brief Set the croptype to other than grass
   void SetCropTypeToOther(){this->SetCropType(VTK_TAG2E_CROPTYPE_OTHER);}
-  
+
 protected:
   vtkTAG2EDataSetN2OFilterRoelandt();
   ~vtkTAG2EDataSetN2OFilterRoelandt() {};
 
-  char *NitrogenRateArrayName;
-  char *TempSpringArrayName;
-  char *TempWinterArrayName;
-  
-  char *PrecipitationSumArrayName;
-  char *CategoryArrayName;
-
-  int ModelType;
-  int UsePointData;
-  double NullValue;
-  
-  int CropType;
-  vtkSetMacro(CropType, int);
-  
-  //!\brief Which model type should be used, Best, Min or Max
-  vtkSetMacro(ModelType, int);
-
-  int RequestData(vtkInformation *, vtkInformationVector **, vtkInformationVector *);
-
 private:
   vtkTAG2EDataSetN2OFilterRoelandt(const vtkTAG2EDataSetN2OFilterRoelandt&);  // Not implemented.
   void operator=(const vtkTAG2EDataSetN2OFilterRoelandt&);  // Not implemented.
 };
 
 #endif
-
-
@@ -0,0 +1,179 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#include <vtkObjectFactory.h>
+#include <vtkDataSet.h>
+#include <vtkInformation.h>
+#include <vtkInformationVector.h>
+#include "vtkTAG2EDifferentialEvolutionModelCalibrator.h"
+#include "vtkTAG2EDifferentialEvolutionMethod.h"
+#include <time.h>
+#include <vector>
+
+vtkCxxRevisionMacro(vtkTAG2EDifferentialEvolutionModelCalibrator, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2EDifferentialEvolutionModelCalibrator);
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDifferentialEvolutionModelCalibrator::vtkTAG2EDifferentialEvolutionModelCalibrator()
+{
+  this->PopulationSize = 20;
+  this->MaxNumberOfGenerations = 100;
+  this->DifferentialWeight = 0.7;
+  this->CrossoverProbability = 0.9;
+  this->Tolerance = 0.000001;
+  this->NumberOfEvaluations = 0;
+  time_t t = time(NULL);
+  this->Seed = (unsigned int) t;
+  this->BestFitModelParameter = NULL;
+  this->BestFitError = 999999;
+  this->BestFitModelAssessmentFactor = 1;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDifferentialEvolutionModelCalibrator::~vtkTAG2EDifferentialEvolutionModelCalibrator()
+{
+  if (this->BestFitModelParameter)
+    this->BestFitModelParameter->Delete();
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2EDifferentialEvolutionModelCalibrator::RequestData(
+    vtkInformation *vtkNotUsed(request), vtkInformationVector **inputVector,
+    vtkInformationVector *outputVector)
+{
+  int i, probe;
+  double error;
+  double bestFitError;
+  double bestFitModelAssessment;
+
+  vtkDataSet* input = vtkDataSet::GetData(inputVector[0]);
+  vtkDataSet* output = vtkDataSet::GetData(outputVector);
+
+  if (this->Model == NULL)
+    {
+    vtkErrorMacro( << "The model is not set");
+    return 0;
+    }
+
+  if (this->ModelParameter == NULL)
+    {
+    vtkErrorMacro( << "The model parameter is not set");
+    return 0;
+    }
+
+  int numberOfParameter = this->ModelParameter->GetNumberOfCalibratableParameter();
+
+  if (numberOfParameter == 0)
+    {
+    vtkErrorMacro( << "The model parameter has no calibratable parameter");
+    return 0;
+    }
+
+  // Check for existing best fit model parameter
+  if (this->BestFitModelParameter)
+    this->BestFitModelParameter->Delete();
+
+  // We store the parameter of the best fit separately in a copy of the same type
+  this->BestFitModelParameter = this->ModelParameter->Clone();
+  if (this->BestFitModelParameter == NULL)
+    {
+    vtkErrorMacro( << "Unable to copy the model parameter");
+    return 0;
+    }
+
+  vtkTAG2EDifferentialEvolutionMethod *search = vtkTAG2EDifferentialEvolutionMethod::New();
+  search->SetPopulationSize(this->PopulationSize);
+  search->SetMaxNumberOfGenerations(this->MaxNumberOfGenerations);
+  search->SetDifferentialWeight(this->DifferentialWeight);
+  search->SetCrossoverProbability(this->CrossoverProbability);
+  search->SetTolerance(this->Tolerance);
+  search->SetSeed(this->Seed);
+
+  // The current parameter values are the first member of the population
+  search->SetNumberOfParameters(numberOfParameter);
+  for (i = 0; i < numberOfParameter; i++)
+    {
+    search->SetParameter(i, this->ModelParameter->GetParameterValue(i),
+        this->ModelParameter->GetParameterMinimum(i),
+        this->ModelParameter->GetParameterMaximum(i));
+    }
+
+  this->Model->SetModelParameter(this->ModelParameter);
+
+  std::vector<double> Values(numberOfParameter);
+
+  bestFitError = VTK_DOUBLE_MAX;
+  bestFitModelAssessment = 1;
+
+  search->Init();
+
+  // This is the main loop, each step evaluates a generation
+  while (!search->IsFinished())
+    {
+    for (probe = 0; probe < search->GetNumberOfProbes(); probe++)
+      {
+      for (i = 0; i < numberOfParameter; i++)
+        Values[i] = search->GetProbeParameter(probe, i);
+
+      if (!this->EvaluateProbe(Values, input, output, error, bestFitError,
+          bestFitModelAssessment, this->BestFitModelParameter,
+          search->GetNumberOfEvaluations() + probe))
+        error = TAG2E_DIFFERENTIAL_EVOLUTION_INVALID_VALUE;
+
+      search->SetProbeValue(probe, error);
+      }
+
+    search->Evaluate();
+    }
+
+  int generation = search->GetGeneration();
+  this->NumberOfEvaluations = search->GetNumberOfEvaluations();
+  this->BestFitError = bestFitError;
+  this->BestFitModelAssessmentFactor = bestFitModelAssessment;
+
+  search->Delete();
+
+  if (bestFitError == VTK_DOUBLE_MAX)
+    {
+    vtkErrorMacro( << "No valid model parameter configuration found");
+    return 0;
+    }
+
+  std::cout << "Finished after " << generation << " generations and "
+      << this->NumberOfEvaluations << " evaluations with best fit error " << bestFitError
+      << " model assessment factor " << bestFitModelAssessment << std::endl;
+
+  return 1;
+}
@@ -0,0 +1,120 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+/**
+ * \brief This class uses differential evolution to calibrate models.
+ * 
+ * The model and the model parameter must be set in the same way as for the
+ * simulated annealing calibrator. The calibratable model parameter are minimized
+ * inside their ranges using vtkTAG2EDifferentialEvolutionMethod. The objective is
+ * the comparison of the model result with the target values of the input multiplied
+ * with the model assessment factor, same as for the simulated annealing calibrator.
+ * Model parameter configurations which are invalid for the model parameter
+ * are treated as very large objective values.
+ * 
+ * Differential evolution is a population based global method, it is less
+ * sensitive to local minima than the direct search methods. The members of a
+ * generation are evaluated one after another with the model.
+ * Use the DifferentialEvolution() function of the Python Calibration module
+ * to evaluate the members of a generation in parallel in several processes,
+ * it computes the same result for the same seed.
+ *
+ * The best fittet result of the model will be available as output of this class.
+ */
+
+#ifndef vtkTAG2EDifferentialEvolutionModelCalibrator_H
+#define	vtkTAG2EDifferentialEvolutionModelCalibrator_H
+
+#include "vtkTAG2EAbstractModelCalibrator.h"
+
+class vtkDataSet;
+
+class vtkTAG2EDifferentialEvolutionModelCalibrator : public vtkTAG2EAbstractModelCalibrator {
+public:
+    vtkTypeRevisionMacro(vtkTAG2EDifferentialEvolutionModelCalibrator,
+        vtkTAG2EAbstractModelCalibrator);
+    static vtkTAG2EDifferentialEvolutionModelCalibrator *New(); 
+    
+    //!\brief The number of members of the population, default 20
+    vtkSetClampMacro(PopulationSize, int, 4, VTK_INT_MAX);
+    vtkGetMacro(PopulationSize, int);
+    //!\brief The maximum number of generations, default 100
+    vtkSetMacro(MaxNumberOfGenerations, int);
+    vtkGetMacro(MaxNumberOfGenerations, int);
+    //!\brief The weight of the difference vector, default 0.7
+    vtkSetClampMacro(DifferentialWeight, double, 0.0, 2.0);
+    vtkGetMacro(DifferentialWeight, double);
+    //!\brief The crossover probability, default 0.9
+    vtkSetClampMacro(CrossoverProbability, double, 0.0, 1.0);
+    vtkGetMacro(CrossoverProbability, double);
+    //!\brief The relative break tolerance of the errors of the population, default 0.000001
+    vtkSetMacro(Tolerance, double);
+    vtkGetMacro(Tolerance, double);
+    //!\brief The seed used for random number generation
+    //! initialization, default current time
+    vtkSetMacro(Seed, unsigned int);
+    vtkGetMacro(Seed, unsigned int);
+    
+    //!\brief Return the number of model runs of the calibration run
+    vtkGetMacro(NumberOfEvaluations, int);
+    //!\brief Return the best fit error of the calibration run
+    vtkGetMacro(BestFitError, double);
+    //!\brief Return the best fit modell assessment factor of the calibration run
+    vtkGetMacro(BestFitModelAssessmentFactor, double);
+    
+    //!\brief Get the calibrated model parameter
+    vtkGetObjectMacro(BestFitModelParameter, vtkTAG2EAbstractCalibratableModelParameter);
+    
+protected:
+    vtkTAG2EDifferentialEvolutionModelCalibrator();
+    ~vtkTAG2EDifferentialEvolutionModelCalibrator();
+
+    virtual int RequestData(vtkInformation *, vtkInformationVector **, vtkInformationVector *);
+
+    int PopulationSize;
+    int MaxNumberOfGenerations;
+    int NumberOfEvaluations;
+    unsigned int Seed;
+    double DifferentialWeight;
+    double CrossoverProbability;
+    double Tolerance;
+    double BestFitError;
+    double BestFitModelAssessmentFactor;
+    
+    vtkTAG2EAbstractCalibratableModelParameter *BestFitModelParameter;
+    
+private:
+    vtkTAG2EDifferentialEvolutionModelCalibrator(const vtkTAG2EDifferentialEvolutionModelCalibrator& orig); // Not implemented.
+    void operator=(const vtkTAG2EDifferentialEvolutionModelCalibrator&); // Not implemented.
+};
+
+#endif	/* vtkTAG2EDifferentialEvolutionModelCalibrator_H */
@@ -0,0 +1,173 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#include <vtkObjectFactory.h>
+#include <vtkDataSet.h>
+#include <vtkInformation.h>
+#include <vtkInformationVector.h>
+#include "vtkTAG2EDirectSearchModelCalibrator.h"
+#include <vector>
+
+vtkCxxRevisionMacro(vtkTAG2EDirectSearchModelCalibrator, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2EDirectSearchModelCalibrator);
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDirectSearchModelCalibrator::vtkTAG2EDirectSearchModelCalibrator()
+{
+  this->Method = TAG2E_DIRECT_SEARCH_POWELL;
+  this->MaxNumberOfEvaluations = 1000;
+  this->NumberOfLineProbes = 4;
+  this->NumberOfEvaluations = 0;
+  this->Tolerance = 0.0001;
+  this->InitialStep = 0.1;
+  this->BestFitModelParameter = NULL;
+  this->BestFitError = 999999;
+  this->BestFitModelAssessmentFactor = 1;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EDirectSearchModelCalibrator::~vtkTAG2EDirectSearchModelCalibrator()
+{
+  if (this->BestFitModelParameter)
+    this->BestFitModelParameter->Delete();
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2EDirectSearchModelCalibrator::RequestData(
+    vtkInformation *vtkNotUsed(request), vtkInformationVector **inputVector,
+    vtkInformationVector *outputVector)
+{
+  int i, probe;
+  double error;
+  double bestFitError;
+  double bestFitModelAssessment;
+
+  vtkDataSet* input = vtkDataSet::GetData(inputVector[0]);
+  vtkDataSet* output = vtkDataSet::GetData(outputVector);
+
+  if (this->Model == NULL)
+    {
+    vtkErrorMacro( << "The model is not set");
+    return 0;
+    }
+
+  if (this->ModelParameter == NULL)
+    {
+    vtkErrorMacro( << "The model parameter is not set");
+    return 0;
+    }
+
+  int numberOfParameter = this->ModelParameter->GetNumberOfCalibratableParameter();
+
+  if (numberOfParameter == 0)
+    {
+    vtkErrorMacro( << "The model parameter has no calibratable parameter");
+    return 0;
+    }
+
+  // Check for existing best fit model parameter
+  if (this->BestFitModelParameter)
+    this->BestFitModelParameter->Delete();
+
+  // We store the parameter of the best fit separately in a copy of the same type
+  this->BestFitModelParameter = this->ModelParameter->Clone();
+  if (this->BestFitModelParameter == NULL)
+    {
+    vtkErrorMacro( << "Unable to copy the model parameter");
+    return 0;
+    }
+
+  vtkTAG2EDirectSearchMethod *search = vtkTAG2EDirectSearchMethod::New();
+  search->SetMethod(this->Method);
+  search->SetMaxNumberOfEvaluations(this->MaxNumberOfEvaluations);
+  search->SetTolerance(this->Tolerance);
+  search->SetNumberOfLineProbes(this->NumberOfLineProbes);
+  search->SetInitialStep(this->InitialStep);
+
+  // The current parameter values are the start point
+  search->SetNumberOfParameters(numberOfParameter);
+  for (i = 0; i < numberOfParameter; i++)
+    {
+    search->SetParameter(i, this->ModelParameter->GetParameterValue(i),
+        this->ModelParameter->GetParameterMinimum(i),
+        this->ModelParameter->GetParameterMaximum(i));
+    }
+
+  this->Model->SetModelParameter(this->ModelParameter);
+
+  std::vector<double> Values(numberOfParameter);
+
+  bestFitError = VTK_DOUBLE_MAX;
+  bestFitModelAssessment = 1;
+
+  search->Init();
+
+  // This is the main loop, each step evaluates a batch of probes
+  while (!search->IsFinished())
+    {
+    for (probe = 0; probe < search->GetNumberOfProbes(); probe++)
+      {
+      for (i = 0; i < numberOfParameter; i++)
+        Values[i] = search->GetProbeParameter(probe, i);
+
+      if (!this->EvaluateProbe(Values, input, output, error, bestFitError,
+          bestFitModelAssessment, this->BestFitModelParameter,
+          search->GetNumberOfEvaluations() + probe))
+        error = TAG2E_DIRECT_SEARCH_INVALID_VALUE;
+
+      search->SetProbeValue(probe, error);
+      }
+
+    search->Evaluate();
+    }
+
+  this->NumberOfEvaluations = search->GetNumberOfEvaluations();
+  this->BestFitError = bestFitError;
+  this->BestFitModelAssessmentFactor = bestFitModelAssessment;
+
+  search->Delete();
+
+  if (bestFitError == VTK_DOUBLE_MAX)
+    {
+    vtkErrorMacro( << "No valid model parameter configuration found");
+    return 0;
+    }
+
+  std::cout << "Finished after " << this->NumberOfEvaluations
+      << " evaluations with best fit error " << bestFitError
+      << " model assessment factor " << bestFitModelAssessment << std::endl;
+
+  return 1;
+}
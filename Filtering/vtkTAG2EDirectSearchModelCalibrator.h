@@ -0,0 +1,124 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+/**
+ * \brief This class uses direct search methods to calibrate models with
+ * smooth objective functions.
+ * 
+ * The model and the model parameter must be set in the same way as for the
+ * simulated annealing calibrator. The calibratable model parameter are minimized
+ * using vtkTAG2EDirectSearchMethod, either with Powell's method of Brent line 
+ * searches or with the Nelder-Mead simplex method. The objective is the comparison
+ * of the model result with the target values of the input multiplied with the
+ * model assessment factor, same as for the simulated annealing calibrator.
+ * Model parameter configurations which are invalid for the model parameter
+ * are treated as very large objective values.
+ * 
+ * For smooth objectives like weighting factors or rate constants these methods
+ * converge in much less model runs than simulated annealing. The objective should
+ * not have many local minima.
+ * 
+ * The probes of a batch are evaluated one after another with the model.
+ * Use vtkTAG2EDirectSearchMethod directly to evaluate the probes of a batch in 
+ * parallel.
+ *
+ * The best fittet result of the model will be available as output of this class.
+ */
+
+#ifndef vtkTAG2EDirectSearchModelCalibrator_H
+#define	vtkTAG2EDirectSearchModelCalibrator_H
+
+#include "vtkTAG2EAbstractModelCalibrator.h"
+#include "vtkTAG2EDirectSearchMethod.h"
+
+class vtkDataSet;
+
+class vtkTAG2EDirectSearchModelCalibrator : public vtkTAG2EAbstractModelCalibrator {
+public:
+    vtkTypeRevisionMacro(vtkTAG2EDirectSearchModelCalibrator,
+        vtkTAG2EAbstractModelCalibrator);
+    static vtkTAG2EDirectSearchModelCalibrator *New(); 
+    
+    //!\brief The minimization method, default is Powell's method
+    vtkSetClampMacro(Method, int, TAG2E_DIRECT_SEARCH_POWELL, TAG2E_DIRECT_SEARCH_NELDER_MEAD);
+    vtkGetMacro(Method, int);
+    void SetMethodToPowell(){this->SetMethod(TAG2E_DIRECT_SEARCH_POWELL);}
+    void SetMethodToNelderMead(){this->SetMethod(TAG2E_DIRECT_SEARCH_NELDER_MEAD);}
+    //!\brief The maximum number of model runs used for calibration, default 1000
+    vtkSetMacro(MaxNumberOfEvaluations, int);
+    vtkGetMacro(MaxNumberOfEvaluations, int);
+    //!\brief The relative break tolerance of the objective and the tolerance of
+    //! the parameter values scaled by their ranges, default 0.0001
+    vtkSetMacro(Tolerance, double);
+    vtkGetMacro(Tolerance, double);
+    //!\brief The number of probes to bracket the minimum of a line
+    //! search in Powell's method, default 4
+    vtkSetClampMacro(NumberOfLineProbes, int, 2, VTK_INT_MAX);
+    vtkGetMacro(NumberOfLineProbes, int);
+    //!\brief The size of the initial simplex of the Nelder-Mead method relative to
+    //! the parameter ranges, default 0.1
+    vtkSetClampMacro(InitialStep, double, 0.0, 1.0);
+    vtkGetMacro(InitialStep, double);
+    
+    //!\brief Return the number of model runs of the calibration run
+    vtkGetMacro(NumberOfEvaluations, int);
+    //!\brief Return the best fit error of the calibration run
+    vtkGetMacro(BestFitError, double);
+    //!\brief Return the best fit modell assessment factor of the calibration run
+    vtkGetMacro(BestFitModelAssessmentFactor, double);
+    
+    //!\brief Get the calibrated model parameter
+    vtkGetObjectMacro(BestFitModelParameter, vtkTAG2EAbstractCalibratableModelParameter);
+    
+protected:
+    vtkTAG2EDirectSearchModelCalibrator();
+    ~vtkTAG2EDirectSearchModelCalibrator();
+
+    virtual int RequestData(vtkInformation *, vtkInformationVector **, vtkInformationVector *);
+
+    int Method;
+    int MaxNumberOfEvaluations;
+    int NumberOfLineProbes;
+    int NumberOfEvaluations;
+    double Tolerance;
+    double InitialStep;
+    double BestFitError;
+    double BestFitModelAssessmentFactor;
+    
+    vtkTAG2EAbstractCalibratableModelParameter *BestFitModelParameter;
+    
+private:
+    vtkTAG2EDirectSearchModelCalibrator(const vtkTAG2EDirectSearchModelCalibrator& orig); // Not implemented.
+    void operator=(const vtkTAG2EDirectSearchModelCalibrator&); // Not implemented.
+};
+
+#endif	/* vtkTAG2EDirectSearchModelCalibrator_H */
@@ -62,6 +62,10 @@ vtkTAG2EFuzzyInferenceModel::vtkTAG2EFuzzyInferenceModel()
   this->ApplicabilityRuleLimit = 2;
   this->CreateDOFArray = 0;
   this->ComputeSigma = 0;
+  this->UseLookupTable = 0;
+  this->LookupTableResolution = 33;
+  this->LookupTableResolutionInUse = 0;
+  this->LookupTableErrorEstimate = 0.0;
 }
 
 //----------------------------------------------------------------------------
@@ -100,6 +104,10 @@ void vtkTAG2EFuzzyInferenceModel::SetModelParameter (
 
   this->Superclass::SetModelParameter ( modelParameter );
 
+  // The lookup tables belong to the previous model parameter
+  this->LookupTable.clear();
+  this->SigmaLookupTable.clear();
+
   this->ArrayNames->Initialize();
   this->InputPorts->Initialize();
 
@@ -138,6 +146,43 @@ void vtkTAG2EFuzzyInferenceModel::SetModelParameter (
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2EFuzzyInferenceModel::UpdateLookupTable ( int numberOfRules,
+    std::vector< std::vector<int> > &RuleCodeMatrix )
+{
+  // Check if the lookup table is up to date
+  if ( !this->LookupTable.empty() &&
+       this->LookupTableResolutionInUse == this->LookupTableResolution &&
+       this->LookupTableTime.GetMTime() > this->FuzzyModelParameter->GetMTime() &&
+       ( this->ComputeSigma == 0 || !this->SigmaLookupTable.empty() ) )
+    return true;
+
+  FuzzyInferenceScheme &FIS = this->FuzzyModelParameter->GetInternalScheme();
+
+  this->SigmaLookupTable.clear();
+
+  if ( !tag2eFIS::ComputeLookupTable ( this->LookupTable,
+                                      this->ComputeSigma ? &this->SigmaLookupTable : NULL,
+                                      this->LookupTableResolution, numberOfRules,
+                                      RuleCodeMatrix, FIS ) )
+    {
+      this->LookupTable.clear();
+      return false;
+    }
+
+  this->LookupTableErrorEstimate = tag2eFIS::EstimateLookupTableError (
+                                     this->LookupTableResolution, this->LookupTable,
+                                     numberOfRules, RuleCodeMatrix, FIS );
+  this->LookupTableResolutionInUse = this->LookupTableResolution;
+  this->LookupTableTime.Modified();
+
+  vtkDebugMacro ( << "Lookup table with resolution " << this->LookupTableResolution
+                  << " computed, estimated interpolation error " << this->LookupTableErrorEstimate );
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 #define MAX_RULE_NUMBER 1024
 
 int vtkTAG2EFuzzyInferenceModel::RequestData (
@@ -208,19 +253,6 @@ int vtkTAG2EFuzzyInferenceModel::RequestData (
 
   output->DeepCopy ( firstInput );
 
-  // Result array
-  vtkDoubleArray *result = vtkDoubleArray::New();
-  vtkDoubleArray *dof = NULL;
-  vtkDoubleArray *sigma = NULL;
-
-  result->SetNumberOfComponents ( 0 );
-  result->SetName ( this->ResultArrayName );
-  if ( this->UseCellData )
-    result->SetNumberOfTuples ( firstInput->GetNumberOfCells() );
-  else
-    result->SetNumberOfTuples ( firstInput->GetNumberOfPoints() );
-  result->FillComponent ( 0, 0.0 );
-
   // This is used to store the needed arrays pointer to collect the
   // data for fuzzy computation
   std::vector<vtkDataArray *> Data;
@@ -290,26 +322,19 @@ int vtkTAG2EFuzzyInferenceModel::RequestData (
   else
     num = firstInput->GetNumberOfPoints();
   
-  if ( this->ComputeSigma == 1 )
-      sigma = vtkDoubleArray::New();
-  
-  if ( this->CreateDOFArray == 1 )
-      dof = vtkDoubleArray::New();
-  
-  if ( dof )
-    {
-      dof->SetName ( "DOF" );
-      dof->SetNumberOfComponents ( numberOfRules );
-      dof->SetNumberOfTuples ( num );
-      dof->FillComponent ( 0, 0.0 );
-    }
-
-  if ( sigma )
+  if ( this->UseLookupTable )
     {
-      sigma->SetName ( "Sigma" );
-      sigma->SetNumberOfComponents ( 1 );
-      sigma->SetNumberOfTuples ( num );
-      sigma->FillComponent ( 0, 0.0 );
+      if ( this->CreateDOFArray == 1 )
+        {
+          vtkErrorMacro ( << "The DOF array can not be created in lookup table mode" );
+          return -1;
+        }
+      if ( !this->UpdateLookupTable ( numberOfRules, RuleCodeMatrix ) )
+        {
+          vtkErrorMacro ( << "Unable to compute the lookup table, the number of "
+                          "factors or the lookup table resolution is too large" );
+          return -1;
+        }
     }
 
   /* We need to adjust the value range in case of a none-calibration model run */
@@ -337,6 +362,39 @@ int vtkTAG2EFuzzyInferenceModel::RequestData (
         }
     }
 
+  // Allocate the result arrays after all checks passed, so that the
+  // error paths above do not leak them
+  vtkDoubleArray *result = vtkDoubleArray::New();
+  vtkDoubleArray *dof = NULL;
+  vtkDoubleArray *sigma = NULL;
+
+  result->SetNumberOfComponents ( 0 );
+  result->SetName ( this->ResultArrayName );
+  result->SetNumberOfTuples ( num );
+  result->FillComponent ( 0, 0.0 );
+
+  if ( this->ComputeSigma == 1 )
+      sigma = vtkDoubleArray::New();
+  
+  if ( this->CreateDOFArray == 1 )
+      dof = vtkDoubleArray::New();
+  
+  if ( dof )
+    {
+      dof->SetName ( "DOF" );
+      dof->SetNumberOfComponents ( numberOfRules );
+      dof->SetNumberOfTuples ( num );
+      dof->FillComponent ( 0, 0.0 );
+    }
+
+  if ( sigma )
+    {
+      sigma->SetName ( "Sigma" );
+      sigma->SetNumberOfComponents ( 1 );
+      sigma->SetNumberOfTuples ( num );
+      sigma->FillComponent ( 0, 0.0 );
+    }
+
   for ( i = 0; i < num; i++ )
     {
       bool isNull = false;
@@ -360,6 +418,17 @@ int vtkTAG2EFuzzyInferenceModel::RequestData (
           continue;
         }
 
+      if ( this->UseLookupTable )
+        {
+          result->SetValue ( i, tag2eFIS::InterpolateLookupTable ( fuzzyInput,
+                             this->LookupTableResolution, this->LookupTable, FIS ) );
+          if ( sigma )
+            sigma->SetValue ( i, tag2eFIS::InterpolateLookupTable ( fuzzyInput,
+                              this->LookupTableResolution, this->SigmaLookupTable, FIS ) );
+          observationCount++;
+          continue;
+        }
+
       double val = tag2eFIS::ComputeFISResult ( fuzzyInput, numberOfRules,
                    RuleCodeMatrix, FIS, DOFVector );
 
@@ -410,6 +479,17 @@ int vtkTAG2EFuzzyInferenceModel::RequestData (
       output->GetPointData()->SetActiveScalars ( result->GetName() );
     }
   result->Delete();
+  if ( sigma )
+    sigma->Delete();
+  if ( dof )
+    dof->Delete();
+
+  /* The rule specific deegrees of fulfillment are not computed in lookup table mode */
+  if ( this->UseLookupTable )
+    {
+      this->ModelAssessmentFactor = 1;
+      return 1;
+    }
 
   /* Compute punishment function */
   double v = observationCount * this->ApplicabilityRuleLimit / 100.0;
@@ -438,4 +518,7 @@ int vtkTAG2EFuzzyInferenceModel::RequestData (
 void vtkTAG2EFuzzyInferenceModel::PrintSelf ( ostream& os, vtkIndent indent )
 {
   this->Superclass::PrintSelf ( os, indent );
+  os << indent << "UseLookupTable: " << this->UseLookupTable << endl;
+  os << indent << "LookupTableResolution: " << this->LookupTableResolution << endl;
+  os << indent << "LookupTableErrorEstimate: " << this->LookupTableErrorEstimate << endl;
 }
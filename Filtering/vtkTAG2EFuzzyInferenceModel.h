@@ -40,6 +40,7 @@
 #ifndef vtkTAG2EFuzzyInferenceModel_H
 #define	vtkTAG2EFuzzyInferenceModel_H
 
+#include <vtkTimeStamp.h>
 #include "vtkTAG2EAbstractCalibratableModel.h"
 #include "tag2eFIS.h"
 
@@ -85,6 +86,29 @@ public:
     //! \brief Add the DOF (deegree of fullfillment) vector array to the output
     vtkBooleanMacro(CreateDOFArray, int);
 
+    //! \brief Use a precomputed lookup table of the fuzzy inference scheme and
+    //! multilinear interpolation instead of the exact computation. The lookup table
+    //! is sampled on a regular grid between the factor minimum and maximum and is
+    //! recomputed when the model parameter was modified. The DOF array and the
+    //! model assessment factor are not available in this mode, hence it should
+    //! be used for application runs only and not for calibration.
+    vtkSetMacro(UseLookupTable, int);
+    //! \brief Use a precomputed lookup table of the fuzzy inference scheme
+    vtkGetMacro(UseLookupTable, int);
+    //! \brief Use a precomputed lookup table of the fuzzy inference scheme
+    vtkBooleanMacro(UseLookupTable, int);
+
+    //! \brief Set the number of lookup table grid nodes for each factor, default is 33
+    vtkSetClampMacro(LookupTableResolution, int, 2, VTK_INT_MAX);
+    //! \brief Get the number of lookup table grid nodes for each factor
+    vtkGetMacro(LookupTableResolution, int);
+
+    //! \brief The estimated lookup table interpolation error, which is the maximum
+    //! absolute difference between the exact and the interpolated fuzzy inference
+    //! scheme result at the grid cell centers of the lookup table. This is not an
+    //! upper bound of the error. Available after the lookup table was computed.
+    vtkGetMacro(LookupTableErrorEstimate, double);
+
 protected:
     vtkTAG2EFuzzyInferenceModel();
     ~vtkTAG2EFuzzyInferenceModel();
@@ -101,6 +125,19 @@ protected:
     double ApplicabilityRuleLimit;
     int ComputeSigma;
     int CreateDOFArray;
+    int UseLookupTable;
+    int LookupTableResolution;
+    double LookupTableErrorEstimate;
+    
+    //BTX
+    std::vector<double> LookupTable;
+    std::vector<double> SigmaLookupTable;
+    int LookupTableResolutionInUse;
+    vtkTimeStamp LookupTableTime;
+
+    //! \brief Compute the lookup table in case the model parameter or the resolution changed
+    bool UpdateLookupTable(int numberOfRules, std::vector< std::vector<int> > &RuleCodeMatrix);
+    //ETX
     
 private:
     vtkTAG2EFuzzyInferenceModel(const vtkTAG2EFuzzyInferenceModel& orig); // Not implemented.
@@ -36,15 +36,23 @@
 #include "tag2eFIS.h"
 #include <sstream>
 
+extern "C" {
+#include <stdlib.h>
+}
+
 vtkCxxRevisionMacro(vtkTAG2EFuzzyInferenceModelParameter, "$Revision: 1.0 $");
 vtkStandardNewMacro(vtkTAG2EFuzzyInferenceModelParameter);
 
+#define MAX_CHANGE_SET_PARAMETER_RUNS 10000
+
 //----------------------------------------------------------------------------
 
 vtkTAG2EFuzzyInferenceModelParameter::vtkTAG2EFuzzyInferenceModelParameter()
 {
   this->NumberOfFactors = 0;
   this->NumberOfRules = 0;
+  this->NumberOfSetParameter = 0;
+  this->CalibrateResponses = 1;
 }
 
 //----------------------------------------------------------------------------
@@ -56,6 +64,29 @@ vtkTAG2EFuzzyInferenceModelParameter::~vtkTAG2EFuzzyInferenceModelParameter()
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2EFuzzyInferenceModelParameter::DeepCopy(
+    vtkTAG2EAbstractCalibratableModelParameter *parameter)
+{
+  if (!this->Superclass::DeepCopy(parameter))
+    return false;
+
+  vtkTAG2EFuzzyInferenceModelParameter *fuzzy =
+      vtkTAG2EFuzzyInferenceModelParameter::SafeDownCast(parameter);
+
+  if (fuzzy == this)
+    return true;
+
+  this->FIS = fuzzy->FIS;
+  this->NumberOfRules = fuzzy->NumberOfRules;
+  this->NumberOfFactors = fuzzy->NumberOfFactors;
+  this->NumberOfSetParameter = fuzzy->NumberOfSetParameter;
+  this->CalibrateResponses = fuzzy->CalibrateResponses;
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 bool vtkTAG2EFuzzyInferenceModelParameter::GenerateXMLFromInternalScheme()
 {
   unsigned int i, j;
@@ -303,6 +334,73 @@ bool vtkTAG2EFuzzyInferenceModelParameter::SetParameter(unsigned int index,
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2EFuzzyInferenceModelParameter::ModifyParameterRandomly(double sd)
+{
+  if (this->CalibrateResponses)
+    return this->Superclass::ModifyParameterRandomly(sd);
+
+  if (this->NumberOfSetParameter == 0)
+    {
+    vtkErrorMacro(<< "No calibratable fuzzy sets available");
+    return false;
+    }
+
+  bool check = false;
+  int count = 0;
+
+  // Change a randomly selected fuzzy set parameter until a valid configuration is found
+  while (!check)
+    {
+    // Avoid endless loops
+    count++;
+    if (count > MAX_CHANGE_SET_PARAMETER_RUNS)
+      {
+      vtkErrorMacro( << "Maximum number of parameter runs reached");
+      return false;
+      }
+
+    // Select randomly a uniform distributed fuzzy set parameter index
+    int index = (int) (this->NumberOfSetParameter * (rand() / (RAND_MAX + 1.0)));
+
+    check = this->ModifyParameter(index, sd);
+    }
+
+  return check;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EFuzzyInferenceModelParameter::SetResponseValue(unsigned int rule,
+    double value)
+{
+  unsigned int count = this->NumberOfSetParameter;
+  unsigned int i;
+
+  if (rule >= this->FIS.Responses.Responses.size())
+    {
+    vtkErrorMacro(<< "Rule " << rule << " is out of range");
+    return false;
+    }
+
+  // The count mechanism must be identical with CreateParameterIndex
+  for (i = 0; i < rule; i++)
+    {
+    if (this->FIS.Responses.Responses[i].constant == false)
+      count++;
+    }
+
+  if (this->FIS.Responses.Responses[rule].constant == false
+      && count < this->ParameterValues.size())
+    this->ParameterValues[count] = value;
+
+  this->FIS.Responses.Responses[rule].value = value;
+  this->Modified();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 bool vtkTAG2EFuzzyInferenceModelParameter::CreateParameterIndex()
 {
   unsigned int i, j;
@@ -351,6 +449,9 @@ bool vtkTAG2EFuzzyInferenceModelParameter::CreateParameterIndex()
       }
     }
 
+  // The responses are located behind the fuzzy set parameter
+  this->NumberOfSetParameter = this->ParameterIndex.size();
+
   for (i = 0; i < this->FIS.Responses.Responses.size(); i++)
     {
     FuzzyResponse &Response = this->FIS.Responses.Responses[i];
@@ -60,9 +60,29 @@ public:
 
     virtual bool GenerateInternalSchemeFromXML();
     virtual bool GenerateXMLFromInternalScheme();
+
+    //!\brief Copy the fuzzy inference scheme and the parameter state of
+    //! another fuzzy inference model parameter
+    virtual bool DeepCopy(vtkTAG2EAbstractCalibratableModelParameter *parameter);
     
     vtkGetMacro(NumberOfRules, int);
     vtkGetMacro(NumberOfFactors, int);
+
+    //!\brief Enable/disable the random modification of the responses while
+    //! calibrating. If disabled only the fuzzy sets are modified. Default is on.
+    vtkSetMacro(CalibrateResponses, int);
+    vtkGetMacro(CalibrateResponses, int);
+    vtkBooleanMacro(CalibrateResponses, int);
+
+    //!\brief Reimplemented to modify only the fuzzy sets in case
+    //! the calibration of the responses is disabled
+    virtual bool ModifyParameterRandomly(double sd);
+
+    //!\brief Set the value of a response and keep the calibration state in sync
+    //!\param rule The index of the rule of the response
+    //!\param value The new response value
+    //!\return false in case the rule index is out of range
+    bool SetResponseValue(unsigned int rule, double value);
     
     //BTX
     FuzzyInferenceScheme &GetInternalScheme() {
@@ -88,6 +108,8 @@ protected:
 
     unsigned int NumberOfRules;
     unsigned int NumberOfFactors;
+    unsigned int NumberOfSetParameter;
+    int CalibrateResponses;
     
 private:
     vtkTAG2EFuzzyInferenceModelParameter(const vtkTAG2EFuzzyInferenceModelParameter& orig);
@@ -42,6 +42,7 @@
 #include <vtkImageData.h>
 #include <vtkDataSetAlgorithm.h>
 #include <vtkObjectFactory.h>
+#include <sstream>
 #include "vtkTAG2EFuzzyInferenceModelParameterToImageData.h"
 
 vtkCxxRevisionMacro(vtkTAG2EFuzzyInferenceModelParameterToImageData,
@@ -58,15 +59,93 @@ vtkTAG2EFuzzyInferenceModelParameterToImageData::vtkTAG2EFuzzyInferenceModelPara
   this->XAxisExtent = 10;
   this->YAxisExtent = 10;
   this->ZAxisExtent = 10;
+  this->XAxisFactor = 0;
+  this->YAxisFactor = 1;
+  this->ZAxisFactor = 2;
+  this->CreateDOFArrays = 0;
 }
 
 //----------------------------------------------------------------------------
 
 vtkTAG2EFuzzyInferenceModelParameterToImageData::~vtkTAG2EFuzzyInferenceModelParameterToImageData()
 {
-  ;
+  this->SetFuzzyModelParameter(NULL);
 }
 
+//----------------------------------------------------------------------------
+
+void vtkTAG2EFuzzyInferenceModelParameterToImageData::SetFactorValue(
+    int factor, double value)
+{
+  this->FactorValues[factor] = value;
+  this->Modified();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EFuzzyInferenceModelParameterToImageData::RemoveAllFactorValues()
+{
+  this->FactorValues.clear();
+  this->Modified();
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EFuzzyInferenceModelParameterToImageData::ComputeAxes(
+    int axisFactor[3], int axisExtent[3])
+{
+  int i, j;
+
+  if (this->FuzzyModelParameter == NULL)
+    {
+    vtkErrorMacro("The fuzzy model parameter is not set");
+    return false;
+    }
+
+  int numberOfFactors = this->FuzzyModelParameter->GetNumberOfFactors();
+
+  axisFactor[0] = this->XAxisFactor;
+  axisFactor[1] = this->YAxisFactor;
+  axisFactor[2] = this->ZAxisFactor;
+  axisExtent[0] = this->XAxisExtent;
+  axisExtent[1] = this->YAxisExtent;
+  axisExtent[2] = this->ZAxisExtent;
+
+  // Schemes with less than three factors have a reduced dimension
+  for (i = numberOfFactors; i < 3; i++)
+    {
+    axisFactor[i] = -1;
+    axisExtent[i] = 1;
+    }
+
+  for (i = 0; i < 3 && i < numberOfFactors; i++)
+    {
+    if (axisFactor[i] < 0 || axisFactor[i] >= numberOfFactors)
+      {
+      vtkErrorMacro("The factor index " << axisFactor[i] << " of axis " << i
+          << " is out of range. The scheme has " << numberOfFactors << " factors");
+      return false;
+      }
+    for (j = 0; j < i; j++)
+      {
+      if (axisFactor[i] == axisFactor[j])
+        {
+        vtkErrorMacro("The factor " << axisFactor[i] << " is used for several axes");
+        return false;
+        }
+      }
+    if (axisExtent[i] < 1)
+      {
+      vtkErrorMacro("The axis extent must be larger than 0");
+      return false;
+      }
+    }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 // This method returns the largest data that can be generated.
 int vtkTAG2EFuzzyInferenceModelParameterToImageData::RequestInformation(
     vtkInformation * vtkNotUsed( request ),
@@ -79,43 +158,32 @@ int vtkTAG2EFuzzyInferenceModelParameterToImageData::RequestInformation(
   double spacing[3];
   int extent[6];
   double origin[3];
+  int axisFactor[3];
+  int axisExtent[3];
+  int i;
 
-  int numberOfFactors = this->FuzzyModelParameter->GetNumberOfFactors();
-
-  if (numberOfFactors == 2)
-    {
-    this->ZAxisExtent = 1;
-    }
-
-  extent[0] = 0.0;
-  extent[1] = this->XAxisExtent - 1;
-  extent[2] = 0.0;
-  extent[3] = this->YAxisExtent - 1;
-  extent[4] = 0.0;
-  extent[5] = this->ZAxisExtent - 1;
+  if (!this->ComputeAxes(axisFactor, axisExtent))
+    return 0;
 
   FuzzyInferenceScheme &FIS = this->FuzzyModelParameter->GetInternalScheme();
 
-  double minX = FIS.Factors[0].min;
-  double maxX = FIS.Factors[0].max;
-  double minY = FIS.Factors[1].min;
-  double maxY = FIS.Factors[1].max;
-
-  double minZ = 0;
-  double maxZ = 0;
-  if (numberOfFactors == 3)
+  for (i = 0; i < 3; i++)
     {
-    minZ = FIS.Factors[2].min;
-    maxZ = FIS.Factors[2].max;
-    }
-
-  origin[0] = minX;
-  origin[1] = minY;
-  origin[2] = minZ;
+    extent[2 * i] = 0;
+    extent[2 * i + 1] = axisExtent[i] - 1;
 
-  spacing[0] = (maxX - minX) / this->XAxisExtent;
-  spacing[1] = (maxY - minY) / this->YAxisExtent;
-  spacing[2] = (maxZ - minZ) / this->ZAxisExtent;
+    if (axisFactor[i] < 0)
+      {
+      origin[i] = 0;
+      spacing[i] = 1;
+      }
+    else
+      {
+      FuzzyFactor &Factor = FIS.Factors[axisFactor[i]];
+      origin[i] = Factor.min;
+      spacing[i] = (Factor.max - Factor.min) / axisExtent[i];
+      }
+    }
 
   outInfo->Set(vtkStreamingDemandDrivenPipeline::WHOLE_EXTENT(), extent, 6);
   outInfo->Set(vtkDataObject::SPACING(), spacing, 3);
@@ -135,103 +203,121 @@ int vtkTAG2EFuzzyInferenceModelParameterToImageData::RequestData(
 {
   int numberOfRules = 0;
   int numberOfFactors = 0;
-  int i;
+  int numberOfPoints = 0;
+  int i, f, rule;
   int Extent[6];
+  int axisFactor[3];
+  int axisExtent[3];
 
   // get the data object
   vtkInformation *outInfo = outputVector->GetInformationObject(0);
   vtkImageData *output = vtkImageData::SafeDownCast(
       outInfo->Get(vtkDataObject::DATA_OBJECT()));
 
+  if (!this->ComputeAxes(axisFactor, axisExtent))
+    return -1;
+
   FuzzyInferenceScheme &FIS = this->FuzzyModelParameter->GetInternalScheme();
 
   // Compute the number of rules and number of factors
   numberOfRules = this->FuzzyModelParameter->GetNumberOfRules();
   numberOfFactors = this->FuzzyModelParameter->GetNumberOfFactors();
 
-  if (numberOfFactors < 2 or numberOfFactors > 3)
-    {
-    vtkErrorMacro("The number of Factors must be 2 or 3");
-    return -1;
-    }
-
-  if (numberOfFactors == 2)
-    {
-    this->ZAxisExtent = 1;
-    }
-
   // Create the rule code matrix
   std::vector < std::vector<int>
       > RuleCodeMatrix(numberOfRules, std::vector<int>(numberOfFactors));
-  std::vector<double> DOFVector(numberOfRules);
-  std::vector<double> DOFSumVector(numberOfRules);
-
-  /* Initialize the degree of fulfillment vectors */
-  for (i = 0; i < numberOfRules; i++)
-    {
-    DOFVector[i] = 0;
-    DOFSumVector[i] = 0;
-    }
 
   // Compute the rule code matrix entries
   tag2eFIS::ComputeRuleCodeMatrixEntries(RuleCodeMatrix, numberOfRules, FIS);
 
-  Extent[0] = 0;
-  Extent[1] = this->XAxisExtent - 1;
-  Extent[2] = 0;
-  Extent[3] = this->YAxisExtent - 1;
-  Extent[4] = 0;
-  Extent[5] = this->ZAxisExtent - 1;
+  for (i = 0; i < 3; i++)
+    {
+    Extent[2 * i] = 0;
+    Extent[2 * i + 1] = axisExtent[i] - 1;
+    }
 
   output->SetExtent(Extent);
   output->AllocateScalars();
 
-  vtkDataArray *result;
-
-  result = output->GetPointData()->GetScalars();
-  result->SetName("Responses");
-
-  double *fuzzyInput = new double[numberOfFactors];
+  numberOfPoints = axisExtent[0] * axisExtent[1] * axisExtent[2];
 
-  double minX = FIS.Factors[0].min;
-  double maxX = FIS.Factors[0].max;
-  double minY = FIS.Factors[1].min;
-  double maxY = FIS.Factors[1].max;
-
-  double minZ = 0;
-  double maxZ = 0;
-  if (numberOfFactors == 3)
+  // The fixed values of the factors that are not sampled along an axis
+  std::vector<double> fixedValues(numberOfFactors);
+  for (f = 0; f < numberOfFactors; f++)
     {
-    minZ = FIS.Factors[2].min;
-    maxZ = FIS.Factors[2].max;
+    if (this->FactorValues.find(f) != this->FactorValues.end())
+      fixedValues[f] = this->FactorValues[f];
+    else
+      fixedValues[f] = (FIS.Factors[f].min + FIS.Factors[f].max) / 2.0;
     }
 
+  // Create the factor input vectors of all grid points
+  std::vector<double> fuzzyInput(numberOfPoints * numberOfFactors);
+
   int count = 0;
 
-  for (int z = 0; z < this->ZAxisExtent; z++)
+  for (int z = 0; z < axisExtent[2]; z++)
     {
-    for (int y = 0; y < this->YAxisExtent; y++)
+    for (int y = 0; y < axisExtent[1]; y++)
       {
-      for (int x = 0; x < this->XAxisExtent; x++)
+      for (int x = 0; x < axisExtent[0]; x++)
         {
+        int index[3] = {x, y, z};
+        double *input = &fuzzyInput[count * numberOfFactors];
 
-        fuzzyInput[0] = minX + x * (maxX - minX) / this->XAxisExtent;
-        fuzzyInput[1] = minY + y * (maxY - minY) / this->YAxisExtent;
+        for (f = 0; f < numberOfFactors; f++)
+          input[f] = fixedValues[f];
 
-        if (numberOfFactors == 3)
+        for (i = 0; i < 3; i++)
           {
-          fuzzyInput[2] = minZ + z * (maxZ - minZ) / this->ZAxisExtent;
+          if (axisFactor[i] < 0)
+            continue;
+          FuzzyFactor &Factor = FIS.Factors[axisFactor[i]];
+          input[axisFactor[i]] = Factor.min + index[i] * (Factor.max
+              - Factor.min) / axisExtent[i];
           }
-        double val = tag2eFIS::ComputeFISResult(fuzzyInput, numberOfRules,
-            RuleCodeMatrix, FIS, DOFVector);
-        //cout << "Result x " << x << " y " << y << " z " << z << " " << val << endl;
-        result->InsertTuple1(count, val);
         count++;
         }
       }
     }
 
-  delete[] fuzzyInput;
+  // Compute the responses of all grid points at once
+  std::vector<double> results(numberOfPoints);
+  std::vector<double> dofs;
+
+  if (this->CreateDOFArrays)
+    dofs.resize(numberOfPoints * numberOfRules);
+
+  tag2eFIS::ComputeFISResults(&fuzzyInput[0], numberOfPoints, numberOfRules,
+      RuleCodeMatrix, FIS, &results[0], this->CreateDOFArrays ? &dofs[0] : NULL);
+
+  vtkDataArray *result;
+
+  result = output->GetPointData()->GetScalars();
+  result->SetName("Responses");
+
+  for (i = 0; i < numberOfPoints; i++)
+    result->SetTuple1(i, results[i]);
+
+  // Create the rule specific deegree of fulfillment volumes
+  if (this->CreateDOFArrays)
+    {
+    for (rule = 0; rule < numberOfRules; rule++)
+      {
+      vtkDoubleArray *dof = vtkDoubleArray::New();
+      std::ostringstream name;
+      name << "DOF_" << rule;
+      dof->SetName(name.str().c_str());
+      dof->SetNumberOfComponents(1);
+      dof->SetNumberOfTuples(numberOfPoints);
+
+      for (i = 0; i < numberOfPoints; i++)
+        dof->SetValue(i, dofs[i * numberOfRules + rule]);
+
+      output->GetPointData()->AddArray(dof);
+      dof->Delete();
+      }
+    }
 
   return 1;
 }
@@ -242,4 +328,8 @@ void vtkTAG2EFuzzyInferenceModelParameterToImageData::PrintSelf(ostream& os,
     vtkIndent indent)
 {
   this->Superclass::PrintSelf(os, indent);
+  os << indent << "XAxisFactor: " << this->XAxisFactor << endl;
+  os << indent << "YAxisFactor: " << this->YAxisFactor << endl;
+  os << indent << "ZAxisFactor: " << this->ZAxisFactor << endl;
+  os << indent << "CreateDOFArrays: " << this->CreateDOFArrays << endl;
 }
@@ -31,16 +31,21 @@
  */
 
 /**
- * \brief This class uses a  fuzzy inference scheme to process
- * the point data of the temporal input data sets. The  fuzzy inference 
+ * \brief This class samples a fuzzy inference scheme on a regular grid and
+ * stores the responses as image data. The fuzzy inference scheme
  * must be provided as as XML model parameter representation which is of type
- * vtkTAG2EFuzzyInferenceModelParameterToImageDataParameter. 
+ * vtkTAG2EFuzzyInferenceModelParameter.
+ *
+ * Up to three factors are sampled along the x, y and z axis between their
+ * minimum and maximum. All other factors are set to fixed values, so schemes
+ * with any number of factors can be visualized as slices through the factor space.
  */
 
 #ifndef vtkTAG2EFuzzyInferenceModelParameterToImageData_H
 #define	vtkTAG2EFuzzyInferenceModelParameterToImageData_H
 
 #include <vtkImageAlgorithm.h>
+#include <map>
 #include "vtkTAG2EFuzzyInferenceModelParameter.h"
 #include "tag2eFIS.h"
 
@@ -71,6 +76,32 @@ vtkTypeRevisionMacro(vtkTAG2EFuzzyInferenceModelParameterToImageData, vtkImageAl
   vtkGetMacro(YAxisExtent, unsigned int);
   vtkGetMacro(ZAxisExtent, unsigned int);
 
+  //!\brief Set the index of the factor which is sampled along the x axis, default 0
+  vtkSetMacro(XAxisFactor, int);
+  //!\brief Set the index of the factor which is sampled along the y axis, default 1
+  vtkSetMacro(YAxisFactor, int);
+  //!\brief Set the index of the factor which is sampled along the z axis, default 2
+  vtkSetMacro(ZAxisFactor, int);
+
+  vtkGetMacro(XAxisFactor, int);
+  vtkGetMacro(YAxisFactor, int);
+  vtkGetMacro(ZAxisFactor, int);
+
+  //!\brief Set the fixed value of a factor which is not sampled along an axis.
+  //! Schemes with more than 3 factors are sampled as a 3D slice through the
+  //! factor space at these values. The default is the center of the factor range.
+  void SetFactorValue(int factor, double value);
+  //!\brief Remove all fixed factor values
+  void RemoveAllFactorValues();
+
+  //!\brief Add a scalar array for each rule with the deegree of fulfillment
+  //! named DOF_<rule index> to the output
+  vtkSetMacro(CreateDOFArrays, int);
+  //!\brief Add a scalar array for each rule with the deegree of fulfillment
+  vtkGetMacro(CreateDOFArrays, int);
+  //!\brief Add a scalar array for each rule with the deegree of fulfillment
+  vtkBooleanMacro(CreateDOFArrays, int);
+
 
 protected:
   vtkTAG2EFuzzyInferenceModelParameterToImageData();
@@ -86,6 +117,18 @@ protected:
   unsigned int XAxisExtent;
   unsigned int YAxisExtent;
   unsigned int ZAxisExtent;
+  int XAxisFactor;
+  int YAxisFactor;
+  int ZAxisFactor;
+  int CreateDOFArrays;
+
+  //BTX
+  std::map<int, double> FactorValues;
+  //ETX
+
+  //!\brief Compute the factor index and the number of samples of each axis,
+  //! unused axes get the factor index -1 and a single sample
+  bool ComputeAxes(int axisFactor[3], int axisExtent[3]);
 
 private:
   vtkTAG2EFuzzyInferenceModelParameterToImageData(
@@ -37,6 +37,8 @@
 #include <vtkObjectFactory.h>
 #include <vtkStreamingDemandDrivenPipeline.h>
 #include "vtkTAG2EImageDataN2OFilterFreibauer.h"
+#include "tag2eN2O.h"
+#include <vector>
 
 vtkCxxRevisionMacro(vtkTAG2EImageDataN2OFilterFreibauer, "$Revision: 1.1 $");
 vtkStandardNewMacro(vtkTAG2EImageDataN2OFilterFreibauer);
@@ -80,11 +82,15 @@ void vtkTAG2EImageDataN2OFilterFreibauerExecute(
   vtkImageIterator<T> soilNIt(soilNData, outExt);
   vtkImageProgressIterator<T> outIt(outData, outExt, self, id);
 
+  // The same model kernel is used by the data set N2O filter
+  tag2eN2OKernelFreibauer freibauer(cropType, climateType);
+  std::vector<tag2eN2OKernel*> Kernels(1, &freibauer);
+  std::vector<unsigned int> InputMasks;
+  tag2eN2O::CreateInputMasks(Kernels, InputMasks);
+
   double result;
-  double Nrate;
-  double sandFract;
-  double soilOrgFract;
-  double soilN;
+  double nullValue = self->GetNullValue();
+  double Input[TAG2E_N2O_NUMBER_OF_INPUTS] = {0.0};
 
   // Loop through ouput pixels
   while (!outIt.IsAtEnd())
@@ -99,21 +105,14 @@ void vtkTAG2EImageDataN2OFilterFreibauerExecute(
 
     while (outSI != outSIEnd)
       {
-      Nrate = static_cast<double>(*NrateSI);
-      sandFract = static_cast<double>(*sandFractSI);
-      soilOrgFract = static_cast<double>(*soilOrgFractSI);
-      soilN = static_cast<double>(*soilNSI);
-
-      if (Nrate == self->GetNullValue() || sandFract == self->GetNullValue()
-          || soilOrgFract == self->GetNullValue()
-          || soilN == self->GetNullValue())
-        {
-        result = self->GetNullValue();
-        } else
-        {
-        result = vtkTAG2EAlternativeN2OPredictionModules::Freibauer(Nrate,
-            sandFract, soilOrgFract, soilN, cropType, climateType);
-        }
+      Input[TAG2E_N2O_NITROGEN_RATE] = static_cast<double>(*NrateSI);
+      Input[TAG2E_N2O_SAND_FRACTION] = static_cast<double>(*sandFractSI);
+      Input[TAG2E_N2O_SOIL_ORGANIC_CARBON] = static_cast<double>(*soilOrgFractSI);
+      Input[TAG2E_N2O_SOIL_NITROGEN] = static_cast<double>(*soilNSI);
+
+      // The result is null in case one of the inputs is null
+      result = tag2eN2O::ComputeLocation(Input, Kernels, nullValue, NULL,
+          &InputMasks[0]);
 
       *outSI = static_cast<T>(result);
       ++NrateSI;
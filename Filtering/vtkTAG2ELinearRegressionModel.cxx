@@ -33,6 +33,7 @@
 #include <vtkCompositeDataPipeline.h>
 #include <vtkDataSet.h>
 #include <vtkPointData.h>
+#include <vtkCellData.h>
 #include <vtkIntArray.h>
 #include <vtkDoubleArray.h>
 #include <vtkStringArray.h>
@@ -43,6 +44,8 @@
 #include <vtkDataSetAlgorithm.h>
 #include <vtkObjectFactory.h>
 #include "vtkTAG2ELinearRegressionModel.h"
+#include <vector>
+#include <math.h>
 
 vtkCxxRevisionMacro(vtkTAG2ELinearRegressionModel, "$Revision: 1.0 $");
 vtkStandardNewMacro(vtkTAG2ELinearRegressionModel);
@@ -70,15 +73,99 @@ vtkTAG2ELinearRegressionModel::~vtkTAG2ELinearRegressionModel()
 
 //----------------------------------------------------------------------------
 
+//----------------------------------------------------------------------------
+// The powers are evaluated with multiplications for the common exponents
+
+#define TAG2E_LR_POWER_ZERO 0
+#define TAG2E_LR_POWER_ONE 1
+#define TAG2E_LR_POWER_TWO 2
+#define TAG2E_LR_POWER_THREE 3
+#define TAG2E_LR_POWER_MINUS_ONE 4
+#define TAG2E_LR_POWER_SQRT 5
+#define TAG2E_LR_POWER_GENERIC 6
+
+static int vtkTAG2ELinearRegressionModelPowerType(double power)
+{
+  if (power == 0.0)
+    return TAG2E_LR_POWER_ZERO;
+  if (power == 1.0)
+    return TAG2E_LR_POWER_ONE;
+  if (power == 2.0)
+    return TAG2E_LR_POWER_TWO;
+  if (power == 3.0)
+    return TAG2E_LR_POWER_THREE;
+  if (power == -1.0)
+    return TAG2E_LR_POWER_MINUS_ONE;
+  if (power == 0.5)
+    return TAG2E_LR_POWER_SQRT;
+  return TAG2E_LR_POWER_GENERIC;
+}
+
+//----------------------------------------------------------------------------
+// Compute the linear regression of all points or cells in a single pass
+
+static void vtkTAG2ELinearRegressionModelExecute(const double **data,
+    const double *coef, const double *power, const int *powerType,
+    int numberOfTerms, double intercept, vtkIdType num, double nullValue,
+    double *result)
+{
+  vtkIdType id;
+
+#ifdef OMP_PARALLELIZED
+#pragma omp parallel for private(id) shared(data, coef, power, powerType, result)
+#endif
+  for (id = 0; id < num; id++)
+    {
+    double r = intercept;
+    double x;
+    int j;
+
+    for (j = 0; j < numberOfTerms; j++)
+      {
+      x = data[j][id];
+
+      if (x == nullValue)
+        {
+        r = nullValue;
+        break;
+        }
+
+      switch (powerType[j])
+        {
+      case TAG2E_LR_POWER_ZERO:
+        r += coef[j];
+        break;
+      case TAG2E_LR_POWER_ONE:
+        r += coef[j] * x;
+        break;
+      case TAG2E_LR_POWER_TWO:
+        r += coef[j] * x * x;
+        break;
+      case TAG2E_LR_POWER_THREE:
+        r += coef[j] * x * x * x;
+        break;
+      case TAG2E_LR_POWER_MINUS_ONE:
+        r += coef[j] / x;
+        break;
+      case TAG2E_LR_POWER_SQRT:
+        r += coef[j] * sqrt(x);
+        break;
+      default:
+        r += coef[j] * pow(x, power[j]);
+        }
+      }
+
+    result[id] = r;
+    }
+}
+
+//----------------------------------------------------------------------------
+
 int vtkTAG2ELinearRegressionModel::RequestData(
     vtkInformation * vtkNotUsed(request), vtkInformationVector **inputVector,
     vtkInformationVector *outputVector)
 {
-  unsigned int timeStep;
-  int id;
-  double power = 0.0;
-  double coef = 0.0;
-  double r = 0.0;
+  vtkIdType num;
   int i = 0;
   int port;
 
@@ -94,23 +181,31 @@ int vtkTAG2ELinearRegressionModel::RequestData(
   // The first input is used to create the ouput
   // It is assumed that each input has the same number of points and the same topology
   // The number of point data arrays can/should differ
-  output->DeepCopy(firstInput);
+  // The result array is added to the output attributes only,
+  // hence the input arrays can be shared
+  output->ShallowCopy(firstInput);
 
-  // Result for the current time step
-  vtkDataArray *result = vtkDoubleArray::New();
-  result->SetNumberOfComponents(0);
-  result->SetName(this->ResultArrayName);
-  result->SetNumberOfTuples(firstInput->GetNumberOfPoints());
-  result->FillComponent(0, this->Intercept);
+  if (this->UseCellData)
+    num = firstInput->GetNumberOfCells();
+  else
+    num = firstInput->GetNumberOfPoints();
+
+  int numberOfTerms = this->InputPorts->GetNumberOfTuples();
+
+  // The input arrays of all coefficients as double arrays
+  std::vector<vtkDoubleArray*> Arrays;
+  std::vector<const double*> Data;
+  std::vector<double> Coef;
+  std::vector<double> Power;
+  std::vector<int> PowerType;
+  bool check = true;
 
   // For input port and defined array name
-  for (i = 0; i < this->InputPorts->GetNumberOfTuples(); i++)
+  for (i = 0; i < numberOfTerms; i++)
     {
     // Gather all needed information for the current input port
     port = this->InputPorts->GetValue(i);
     const char *arrayName = this->ArrayNames->GetValue(i);
-    coef = this->Coefficents->GetValue(i);
-    power = this->Power->GetValue(i);
 
     vtkDataSet *activeInput = vtkDataSet::GetData(inputVector[port]);
 
@@ -118,7 +213,8 @@ int vtkTAG2ELinearRegressionModel::RequestData(
     if (activeInput == NULL)
       {
       vtkErrorMacro(<<"No dataset available at input port " << port);
-      return -1;
+      check = false;
+      break;
       }
 
     // Check if the number of points and cells in the active input are identical with the first input
@@ -127,34 +223,87 @@ int vtkTAG2ELinearRegressionModel::RequestData(
       {
       vtkErrorMacro(
           << "The number of points or cells differ between the inputs.");
-      return -1;
+      check = false;
+      break;
       }
 
-    //TODO: Support point and cell data
-    // Get the point data
-    vtkPointData *inputData = activeInput->GetPointData();
+    vtkDataSetAttributes *inputData;
+    if (this->UseCellData)
+      inputData = activeInput->GetCellData();
+    else
+      inputData = activeInput->GetPointData();
 
     // Check if the array exists in the current input
     if (!inputData->HasArray(arrayName))
       {
       vtkErrorMacro(<< "Array " << arrayName << " is missing in input. "
       "Wrong reference in the model parameter");
-      return -1;
+      check = false;
+      break;
       }
 
     vtkDataArray *array = inputData->GetArray(arrayName);
 
-    // For each point in the point data array compute the linear regression
-    for (id = 0; id < activeInput->GetNumberOfPoints(); id++)
+    if (array->GetNumberOfComponents() != 1)
+      {
+      vtkErrorMacro(<< "Array " << arrayName << " must have a single component");
+      check = false;
+      break;
+      }
+
+    // The arrays are converted in case they are not of type double
+    vtkDoubleArray *doubleArray = vtkDoubleArray::SafeDownCast(array);
+    if (doubleArray)
+      {
+      doubleArray->Register(this);
+      } else
       {
-      r = result->GetTuple1(id) + coef * pow(array->GetTuple1(id), power);
-      result->SetTuple1(id, r);
+      doubleArray = vtkDoubleArray::New();
+      doubleArray->DeepCopy(array);
       }
+
+    Arrays.push_back(doubleArray);
+    Data.push_back(doubleArray->GetPointer(0));
+    Coef.push_back(this->Coefficents->GetValue(i));
+    Power.push_back(this->Power->GetValue(i));
+    PowerType.push_back(vtkTAG2ELinearRegressionModelPowerType(this->Power->GetValue(i)));
+    }
+
+  if (!check)
+    {
+    for (i = 0; i < (int)Arrays.size(); i++)
+      Arrays[i]->UnRegister(this);
+    return -1;
     }
 
-  //TODO: Support point and cell data
-  output->GetPointData()->AddArray(result);
-  output->GetPointData()->SetActiveScalars(result->GetName());
+  // Result for the current time step
+  vtkDoubleArray *result = vtkDoubleArray::New();
+  result->SetNumberOfComponents(1);
+  result->SetName(this->ResultArrayName);
+  result->SetNumberOfTuples(num);
+
+  if (numberOfTerms > 0)
+    {
+    vtkTAG2ELinearRegressionModelExecute(&Data[0], &Coef[0], &Power[0],
+        &PowerType[0], numberOfTerms, this->Intercept, num, this->NullValue,
+        result->GetPointer(0));
+    } else if (num > 0)
+    {
+    result->FillComponent(0, this->Intercept);
+    }
+
+  for (i = 0; i < (int)Arrays.size(); i++)
+    Arrays[i]->UnRegister(this);
+
+  if (this->UseCellData)
+    {
+    output->GetCellData()->AddArray(result);
+    output->GetCellData()->SetActiveScalars(result->GetName());
+    } else
+    {
+    output->GetPointData()->AddArray(result);
+    output->GetPointData()->SetActiveScalars(result->GetName());
+    }
   result->Delete();
 
   return 1;
@@ -185,6 +334,7 @@ bool vtkTAG2ELinearRegressionModel::BuildLRValueArrays()
   this->Coefficents->Initialize();
   this->Power->Initialize();
   this->ArrayNames->Initialize();
+  this->Intercept = 0.0;
 
   vtkXMLDataElement *root = vtkXMLDataElement::New();
   this->ModelParameter->GetXMLRepresentation(root);
@@ -270,6 +420,53 @@ bool vtkTAG2ELinearRegressionModel::BuildLRValueArrays()
 
 //----------------------------------------------------------------------------
 
+int vtkTAG2ELinearRegressionModel::GetNumberOfCoefficients()
+{
+  return this->InputPorts->GetNumberOfTuples();
+}
+
+//----------------------------------------------------------------------------
+
+const char *vtkTAG2ELinearRegressionModel::GetCoefficientArrayName(int index)
+{
+  if (index < 0 || index >= this->GetNumberOfCoefficients())
+    return NULL;
+
+  return this->ArrayNames->GetValue(index);
+}
+
+//----------------------------------------------------------------------------
+
+double vtkTAG2ELinearRegressionModel::GetCoefficientPower(int index)
+{
+  if (index < 0 || index >= this->GetNumberOfCoefficients())
+    return 0.0;
+
+  return this->Power->GetValue(index);
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2ELinearRegressionModel::GetCoefficientInputPort(int index)
+{
+  if (index < 0 || index >= this->GetNumberOfCoefficients())
+    return -1;
+
+  return this->InputPorts->GetValue(index);
+}
+
+//----------------------------------------------------------------------------
+
+double vtkTAG2ELinearRegressionModel::GetCoefficient(int index)
+{
+  if (index < 0 || index >= this->GetNumberOfCoefficients())
+    return 0.0;
+
+  return this->Coefficents->GetValue(index);
+}
+
+//----------------------------------------------------------------------------
+
 void vtkTAG2ELinearRegressionModel::PrintSelf(ostream& os, vtkIndent indent)
 {
   this->Superclass::PrintSelf(os, indent);
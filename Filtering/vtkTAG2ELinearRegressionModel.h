@@ -31,7 +31,14 @@
  */
 
 /**
- * \brief 
+ * \brief This class computes a linear regression model
+ * 
+ * The result is the sum of the intercept and the coefficients multiplied
+ * with the powers of the input arrays. The coefficients, powers, array names
+ * and input ports are specified in the LinearRegressionScheme XML model parameter.
+ * All coefficients are evaluated in a single pass over the points or cells,
+ * the powers 0, 1, 2, 3, -1 and 0.5 are computed without pow(). In case a
+ * value of an input array is equal to the null value, the result is the null value.
  * 
  */
 
@@ -56,6 +63,19 @@ vtkTypeRevisionMacro(vtkTAG2ELinearRegressionModel, vtkTAG2EAbstractModel);
 
   static vtkTAG2ELinearRegressionModel *New();
 
+  //!\brief Return the number of coefficients of the linear regression scheme
+  int GetNumberOfCoefficients();
+  //!\brief Return the name of the input array of coefficient index
+  const char *GetCoefficientArrayName(int index);
+  //!\brief Return the power of coefficient index
+  double GetCoefficientPower(int index);
+  //!\brief Return the input port of coefficient index
+  int GetCoefficientInputPort(int index);
+  //!\brief Return the value of coefficient index
+  double GetCoefficient(int index);
+  //!\brief Return the intercept of the linear regression scheme
+  vtkGetMacro(Intercept, double);
+
 protected:
   vtkTAG2ELinearRegressionModel();
   ~vtkTAG2ELinearRegressionModel();
@@ -0,0 +1,436 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+
+#include <vtkObjectFactory.h>
+#include <vtkDataSet.h>
+#include <vtkPointData.h>
+#include <vtkCellData.h>
+#include <vtkDataArray.h>
+#include <vtkInformation.h>
+#include <vtkInformationVector.h>
+#include <vtkXMLDataElement.h>
+#include <vtkMath.h>
+#include "vtkTAG2ELinearRegressionModelEstimator.h"
+#include "vtkTAG2ELinearRegressionModel.h"
+#include <sstream>
+#include <math.h>
+#include <stdlib.h>
+#include <string.h>
+#include <strings.h>
+
+vtkCxxRevisionMacro(vtkTAG2ELinearRegressionModelEstimator, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2ELinearRegressionModelEstimator);
+
+//----------------------------------------------------------------------------
+
+vtkTAG2ELinearRegressionModelEstimator::vtkTAG2ELinearRegressionModelEstimator()
+{
+  this->FitIntercept = 1;
+  this->Accumulate = 0;
+  this->ChunkSize = 4096;
+  this->NumberOfSamples = 0;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2ELinearRegressionModelEstimator::~vtkTAG2ELinearRegressionModelEstimator()
+{
+  ;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ELinearRegressionModelEstimator::ResetNormalEquations()
+{
+  this->XTX.clear();
+  this->XTY.clear();
+  this->NumberOfSamples = 0;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ELinearRegressionModelEstimator::SetModelParameter(
+    vtkTAG2EAbstractModelParameter *modelParameter)
+{
+  int i;
+  int maxPort = 0;
+
+  this->Superclass::SetModelParameter(modelParameter);
+
+  if (modelParameter == NULL)
+    return;
+
+  // Ports from 0 ... n must be used
+  vtkXMLDataElement *root = vtkXMLDataElement::New();
+  modelParameter->GetXMLRepresentation(root);
+
+  for (i = 0; i < root->GetNumberOfNestedElements(); i++)
+    {
+    vtkXMLDataElement *element = root->GetNestedElement(i);
+    if (strncasecmp(element->GetName(), "Coefficient", 11) == 0
+        && element->GetAttribute("portId") != NULL)
+      {
+      int port = atoi(element->GetAttribute("portId"));
+      if (port > maxPort)
+        maxPort = port;
+      }
+    }
+
+  root->Delete();
+
+  this->SetNumberOfInputPorts(maxPort + 1);
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2ELinearRegressionModelEstimator::RequestData(
+    vtkInformation * vtkNotUsed(request), vtkInformationVector **inputVector,
+    vtkInformationVector *outputVector)
+{
+  int i, j, k;
+  vtkIdType id, start, end;
+
+  vtkTAG2ELinearRegressionModel *model =
+      vtkTAG2ELinearRegressionModel::SafeDownCast(this->Model);
+
+  if (model == NULL)
+    {
+    vtkErrorMacro(<< "The model must be a linear regression model");
+    return -1;
+    }
+
+  if (this->ModelParameter == NULL)
+    {
+    vtkErrorMacro(<< "Model parameter not set or invalid.");
+    return -1;
+    }
+
+  // Parse the linear regression scheme
+  model->SetModelParameter(this->ModelParameter);
+  if (model->GetModelParameter() == NULL)
+    {
+    vtkErrorMacro(<< "The model parameter is not a valid linear regression scheme");
+    return -1;
+    }
+
+  int numberOfCoefficients = model->GetNumberOfCoefficients();
+  int offset = this->FitIntercept ? 1 : 0;
+  int size = numberOfCoefficients + offset;
+
+  if (size == 0)
+    {
+    vtkErrorMacro(<< "Nothing to estimate");
+    return -1;
+    }
+
+  // Start new normal equations
+  if (!this->Accumulate || (int) this->XTY.size() != size)
+    {
+    this->ResetNormalEquations();
+    this->XTX.assign(size * size, 0.0);
+    this->XTY.assign(size, 0.0);
+    }
+
+  vtkDataSet* firstInput = vtkDataSet::GetData(inputVector[0]);
+  vtkDataSet* output = vtkDataSet::GetData(outputVector);
+
+  int useCellData = model->GetUseCellData();
+  double nullValue = model->GetNullValue();
+  vtkIdType num;
+  vtkDataArray *target;
+
+  if (useCellData)
+    {
+    num = firstInput->GetNumberOfCells();
+    target = firstInput->GetCellData()->GetScalars();
+    } else
+    {
+    num = firstInput->GetNumberOfPoints();
+    target = firstInput->GetPointData()->GetScalars();
+    }
+
+  if (target == NULL || target->GetNumberOfComponents() != 1)
+    {
+    vtkErrorMacro(<< "Active scalars with a single component are missing in the first input");
+    return -1;
+    }
+
+  // Collect the input arrays of all coefficients, the arrays are read
+  // chunk by chunk without converting them
+  std::vector<vtkDataArray*> Arrays;
+  std::vector<double> Power;
+  bool check = true;
+
+  for (j = 0; j < numberOfCoefficients; j++)
+    {
+    int port = model->GetCoefficientInputPort(j);
+    const char *arrayName = model->GetCoefficientArrayName(j);
+
+    if (port >= this->GetNumberOfInputPorts())
+      {
+      vtkErrorMacro(<<"No dataset available at input port " << port);
+      check = false;
+      break;
+      }
+
+    vtkDataSet *activeInput = vtkDataSet::GetData(inputVector[port]);
+
+    if (activeInput == NULL)
+      {
+      vtkErrorMacro(<<"No dataset available at input port " << port);
+      check = false;
+      break;
+      }
+
+    vtkDataSetAttributes *inputData;
+    if (useCellData)
+      inputData = activeInput->GetCellData();
+    else
+      inputData = activeInput->GetPointData();
+
+    vtkDataArray *array = inputData->GetArray(arrayName);
+
+    if (array == NULL || array->GetNumberOfComponents() != 1
+        || array->GetNumberOfTuples() != num)
+      {
+      vtkErrorMacro(<< "Array " << arrayName << " is missing, has more than a "
+          "single component or a wrong number of tuples in input " << port);
+      check = false;
+      break;
+      }
+
+    Arrays.push_back(array);
+    Power.push_back(model->GetCoefficientPower(j));
+    }
+
+  if (check)
+    {
+    // The design matrix rows and the partial normal equations of a chunk.
+    // Summing up each chunk separately reduces the rounding errors of
+    // the accumulation for large datasets.
+    std::vector<double> Rows(this->ChunkSize * size);
+    std::vector<double> Y(this->ChunkSize);
+    std::vector<double> ChunkXTX(size * size);
+    std::vector<double> ChunkXTY(size);
+
+    for (start = 0; start < num; start += this->ChunkSize)
+      {
+      end = start + this->ChunkSize;
+      if (end > num)
+        end = num;
+
+      // Fill the design matrix rows of the valid points or cells
+      int rows = 0;
+      for (id = start; id < end; id++)
+        {
+        double y = target->GetTuple1(id);
+        double *row = &Rows[rows * size];
+        bool valid = (y != nullValue);
+
+        if (offset)
+          row[0] = 1.0;
+
+        for (j = 0; valid && j < numberOfCoefficients; j++)
+          {
+          double x = Arrays[j]->GetTuple1(id);
+          if (x == nullValue)
+            valid = false;
+          else
+            row[j + offset] = pow(x, Power[j]);
+          }
+
+        if (valid)
+          {
+          Y[rows] = y;
+          rows++;
+          }
+        }
+
+      if (rows == 0)
+        continue;
+
+      // Accumulate the upper triangle of the chunk
+      ChunkXTX.assign(size * size, 0.0);
+      ChunkXTY.assign(size, 0.0);
+
+      for (i = 0; i < rows; i++)
+        {
+        const double *row = &Rows[i * size];
+        for (j = 0; j < size; j++)
+          {
+          ChunkXTY[j] += row[j] * Y[i];
+          for (k = j; k < size; k++)
+            ChunkXTX[j * size + k] += row[j] * row[k];
+          }
+        }
+
+      for (j = 0; j < size; j++)
+        {
+        this->XTY[j] += ChunkXTY[j];
+        for (k = j; k < size; k++)
+          this->XTX[j * size + k] += ChunkXTX[j * size + k];
+        }
+
+      this->NumberOfSamples += rows;
+      }
+    }
+
+  if (!check)
+    return -1;
+
+  if (this->NumberOfSamples < size)
+    {
+    vtkErrorMacro(<< "Not enough valid data to estimate " << size << " parameter");
+    return -1;
+    }
+
+  // Solve the normal equations, the symmetric matrix is copied
+  // because the solver overwrites it
+  std::vector<double> Matrix(size * size);
+  std::vector<double*> MatrixRows(size);
+  std::vector<double> Solution(this->XTY);
+
+  for (j = 0; j < size; j++)
+    {
+    MatrixRows[j] = &Matrix[j * size];
+    for (k = j; k < size; k++)
+      Matrix[j * size + k] = Matrix[k * size + j] = this->XTX[j * size + k];
+    }
+
+  if (vtkMath::SolveLinearSystem(&MatrixRows[0], &Solution[0], size) == 0)
+    {
+    vtkErrorMacro(<< "The normal equations are singular, the input arrays of the "
+        "coefficients are linear dependent");
+    return -1;
+    }
+
+  if (!this->UpdateModelParameter(Solution))
+    return -1;
+
+  // Compute the model result with the estimated parameter. A private
+  // model instance is used, so that the input connections of the model
+  // set by the user are not modified.
+  model->SetModelParameter(this->ModelParameter);
+
+  vtkTAG2ELinearRegressionModel *resultModel = vtkTAG2ELinearRegressionModel::New();
+  if (model->GetUseCellData())
+    resultModel->UseCellDataOn();
+  else
+    resultModel->UseCellDataOff();
+  resultModel->SetNullValue(model->GetNullValue());
+  resultModel->SetResultArrayName(model->GetResultArrayName());
+  resultModel->SetModelParameter(this->ModelParameter);
+
+  for (i = 0; i < this->GetNumberOfInputPorts(); i++)
+    {
+    vtkDataSet *input = vtkDataSet::GetData(inputVector[i]);
+    vtkDataSet *copy = input->NewInstance();
+    copy->ShallowCopy(input);
+    resultModel->SetInput(i, copy);
+    copy->Delete();
+    }
+  resultModel->Update();
+
+  output->ShallowCopy(resultModel->GetOutput());
+  resultModel->Delete();
+
+  return 1;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2ELinearRegressionModelEstimator::UpdateModelParameter(
+    std::vector<double> &Solution)
+{
+  int i;
+  int count = 0;
+  int offset = this->FitIntercept ? 1 : 0;
+
+  vtkXMLDataElement *root = vtkXMLDataElement::New();
+  this->ModelParameter->GetXMLRepresentation(root);
+
+  // The intercept is optional in the scheme
+  vtkXMLDataElement *intercept = root->FindNestedElementWithName("Intercept");
+  if (intercept == NULL && this->FitIntercept)
+    {
+    intercept = vtkXMLDataElement::New();
+    intercept->SetName("Intercept");
+    root->AddNestedElement(intercept);
+    intercept->Delete();
+    }
+
+  if (intercept != NULL)
+    {
+    std::ostringstream value;
+    value.precision(17);
+    value << (this->FitIntercept ? Solution[0] : 0.0);
+    intercept->SetCharacterData(value.str().c_str(), value.str().size());
+    }
+
+  for (i = 0; i < root->GetNumberOfNestedElements(); i++)
+    {
+    vtkXMLDataElement *element = root->GetNestedElement(i);
+
+    if (strncasecmp(element->GetName(), "Coefficient", 11) == 0)
+      {
+      if (count + offset >= (int) Solution.size())
+        {
+        vtkErrorMacro(<< "The model parameter was modified while estimating");
+        root->Delete();
+        return false;
+        }
+      std::ostringstream value;
+      value.precision(17);
+      value << Solution[count + offset];
+      element->SetCharacterData(value.str().c_str(), value.str().size());
+      count++;
+      }
+    }
+
+  this->ModelParameter->SetXMLRepresentation(root);
+  root->Delete();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ELinearRegressionModelEstimator::PrintSelf(ostream& os, vtkIndent indent)
+{
+  this->Superclass::PrintSelf(os, indent);
+
+  os << indent << "FitIntercept: " << this->FitIntercept << endl;
+  os << indent << "Accumulate: " << this->Accumulate << endl;
+  os << indent << "ChunkSize: " << this->ChunkSize << endl;
+  os << indent << "NumberOfSamples: " << this->NumberOfSamples << endl;
+}
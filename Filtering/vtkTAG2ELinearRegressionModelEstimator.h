@@ -0,0 +1,125 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+/**
+ * \brief This class estimates the intercept and the coefficients of a
+ * linear regression model with the method of least squares.
+ *
+ * The model must be a vtkTAG2ELinearRegressionModel and the model parameter
+ * a LinearRegressionScheme. The array names, powers and input ports of the
+ * coefficients are taken from the scheme, the coefficient values are estimated
+ * and written back into the scheme. The target values are the active scalars
+ * of the first input, null values in the target or the input arrays are skipped.
+ * 
+ * The normal equations are accumulated in chunks of ChunkSize points or cells,
+ * the input arrays of any data type are read directly without a copy.
+ * In case Accumulate is enabled, the normal equations are not reset between
+ * two updates, so that datasets which do not fit in memory can be
+ * processed piece by piece. The coefficients are estimated from all
+ * pieces processed since the last call of ResetNormalEquations().
+ *
+ * The output is the result of the model with the estimated parameter. It is
+ * computed with a private model instance, the input connections of the
+ * model are not modified.
+ */
+
+#ifndef vtkTAG2ELinearRegressionModelEstimator_H
+#define	vtkTAG2ELinearRegressionModelEstimator_H
+
+#include "vtkTAG2EAbstractModelEstimator.h"
+#include <vector>
+
+class vtkTAG2ELinearRegressionModel;
+
+class vtkTAG2ELinearRegressionModelEstimator : public vtkTAG2EAbstractModelEstimator {
+public:
+    vtkTypeRevisionMacro(vtkTAG2ELinearRegressionModelEstimator, vtkTAG2EAbstractModelEstimator);
+    void PrintSelf(ostream& os, vtkIndent indent);
+    static vtkTAG2ELinearRegressionModelEstimator *New();
+
+    //!\brief Set the model parameter and configure the input ports
+    //! of the estimator based on the linear regression scheme
+    virtual void SetModelParameter(vtkTAG2EAbstractModelParameter *modelParameter);
+
+    //!\brief Estimate the intercept, default is on. Otherwise the intercept is zero.
+    vtkSetMacro(FitIntercept, int);
+    //!\brief Estimate the intercept, default is on. Otherwise the intercept is zero.
+    vtkGetMacro(FitIntercept, int);
+    //!\brief Estimate the intercept, default is on. Otherwise the intercept is zero.
+    vtkBooleanMacro(FitIntercept, int);
+
+    //!\brief Accumulate the normal equations over several updates, default is off
+    vtkSetMacro(Accumulate, int);
+    //!\brief Accumulate the normal equations over several updates, default is off
+    vtkGetMacro(Accumulate, int);
+    //!\brief Accumulate the normal equations over several updates, default is off
+    vtkBooleanMacro(Accumulate, int);
+
+    //!\brief The number of points or cells which are accumulated at once, default is 4096
+    vtkSetClampMacro(ChunkSize, int, 1, VTK_INT_MAX);
+    //!\brief The number of points or cells which are accumulated at once, default is 4096
+    vtkGetMacro(ChunkSize, int);
+
+    //!\brief Return the number of points or cells used for the estimation
+    vtkGetMacro(NumberOfSamples, vtkIdType);
+
+    //!\brief Remove all accumulated data
+    void ResetNormalEquations();
+
+protected:
+    vtkTAG2ELinearRegressionModelEstimator();
+    ~vtkTAG2ELinearRegressionModelEstimator();
+
+    virtual int RequestData(vtkInformation *, vtkInformationVector **,
+    		vtkInformationVector *);
+
+    //!\brief Write the estimated intercept and coefficients into the model parameter
+    bool UpdateModelParameter(std::vector<double> &Solution);
+
+    int FitIntercept;
+    int Accumulate;
+    int ChunkSize;
+    vtkIdType NumberOfSamples;
+
+    //BTX
+    // The matrix X^T X, row major
+    std::vector<double> XTX;
+    // X^T y
+    std::vector<double> XTY;
+    //ETX
+
+private:
+    vtkTAG2ELinearRegressionModelEstimator(const vtkTAG2ELinearRegressionModelEstimator& orig); // Not implemented.
+    void operator=(const vtkTAG2ELinearRegressionModelEstimator&); // Not implemented.
+};
+
+#endif	/* vtkTAG2ELinearRegressionModelEstimator_H */
@@ -0,0 +1,217 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+
+#include <vtkObjectFactory.h>
+#include "vtkTAG2EModelParameterPool.h"
+
+vtkCxxRevisionMacro(vtkTAG2EModelParameterPool, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2EModelParameterPool);
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EModelParameterPool::vtkTAG2EModelParameterPool()
+{
+  this->TemplateParameter = NULL;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EModelParameterPool::~vtkTAG2EModelParameterPool()
+{
+  this->RemoveAllParameter();
+  this->SetTemplateParameter(NULL);
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EModelParameterPool::RemoveAllParameter()
+{
+  this->Lock.Lock();
+
+  for (unsigned int i = 0; i < this->Parameter.size(); i++)
+    this->Parameter[i]->Delete();
+
+  this->Parameter.clear();
+  this->InUse.clear();
+  this->Fresh.clear();
+
+  this->Lock.Unlock();
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EModelParameterPool::Allocate(int numberOfParameter)
+{
+  int i;
+
+  if (this->TemplateParameter == NULL) {
+    vtkErrorMacro( << "The template parameter is not set");
+    return false;
+  }
+
+  this->RemoveAllParameter();
+
+  this->Lock.Lock();
+
+  for (i = 0; i < numberOfParameter; i++) {
+    vtkTAG2EAbstractCalibratableModelParameter *parameter = this->TemplateParameter->Clone();
+    if (parameter == NULL) {
+      this->Lock.Unlock();
+      vtkErrorMacro( << "Unable to copy the template parameter");
+      return false;
+    }
+    this->Parameter.push_back(parameter);
+    this->InUse.push_back(false);
+    this->Fresh.push_back(true);
+  }
+
+  this->CopyTime.Modified();
+
+  this->Lock.Unlock();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EAbstractCalibratableModelParameter *vtkTAG2EModelParameterPool::AcquireParameter()
+{
+  unsigned int i;
+
+  if (this->TemplateParameter == NULL) {
+    vtkErrorMacro( << "The template parameter is not set");
+    return NULL;
+  }
+
+  this->Lock.Lock();
+
+  // All copies are outdated in case the template was modified
+  if (this->TemplateParameter->GetMTime() > this->CopyTime.GetMTime()) {
+    for (i = 0; i < this->Fresh.size(); i++)
+      this->Fresh[i] = false;
+    this->CopyTime.Modified();
+  }
+
+  vtkTAG2EAbstractCalibratableModelParameter *parameter = NULL;
+
+  for (i = 0; i < this->Parameter.size(); i++) {
+    if (!this->InUse[i]) {
+      // Reset the copy to the state of the template
+      if (!this->Fresh[i] && !this->Parameter[i]->DeepCopy(this->TemplateParameter))
+        break;
+      this->InUse[i] = true;
+      this->Fresh[i] = false;
+      parameter = this->Parameter[i];
+      break;
+    }
+  }
+
+  // Extend the pool in case all copies are in use
+  if (parameter == NULL && i == this->Parameter.size()) {
+    parameter = this->TemplateParameter->Clone();
+    if (parameter != NULL) {
+      this->Parameter.push_back(parameter);
+      this->InUse.push_back(true);
+      this->Fresh.push_back(false);
+    }
+  }
+
+  this->Lock.Unlock();
+
+  if (parameter == NULL)
+    vtkErrorMacro( << "Unable to copy the template parameter");
+
+  return parameter;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2EModelParameterPool::ReleaseParameter(vtkTAG2EAbstractCalibratableModelParameter *parameter)
+{
+  bool found = false;
+
+  this->Lock.Lock();
+
+  for (unsigned int i = 0; i < this->Parameter.size(); i++) {
+    if (this->Parameter[i] == parameter && this->InUse[i]) {
+      this->InUse[i] = false;
+      found = true;
+      break;
+    }
+  }
+
+  this->Lock.Unlock();
+
+  if (!found)
+    vtkErrorMacro( << "The parameter is not an acquired copy of this pool");
+
+  return found;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2EAbstractCalibratableModelParameter *vtkTAG2EModelParameterPool::GetParameter(int index)
+{
+  if (index < 0 || index >= (int)this->Parameter.size())
+    return NULL;
+
+  return this->Parameter[index];
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2EModelParameterPool::GetNumberOfAvailableParameter()
+{
+  int count = 0;
+
+  this->Lock.Lock();
+
+  for (unsigned int i = 0; i < this->InUse.size(); i++)
+    if (!this->InUse[i])
+      count++;
+
+  this->Lock.Unlock();
+
+  return count;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2EModelParameterPool::PrintSelf(ostream& os, vtkIndent indent)
+{
+  this->Superclass::PrintSelf(os, indent);
+
+  os << indent << "TemplateParameter: " << this->TemplateParameter << endl;
+  os << indent << "NumberOfParameter: " << this->GetNumberOfParameter() << endl;
+  os << indent << "NumberOfAvailableParameter: " << this->GetNumberOfAvailableParameter() << endl;
+}
@@ -0,0 +1,115 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+/**
+ * \brief A pool of pre-built copies of a calibratable model parameter
+ *
+ * Multi-chain and ensemble calibrations need many independent copies of the
+ * same model parameter. Creating them from XML requires the generation and
+ * parsing of the XML representation for each copy. This pool creates the
+ * copies with DeepCopy() from a template parameter and hands them out to the
+ * workers. A released copy is reset to the state of the template before it
+ * is handed out again. AcquireParameter() and ReleaseParameter() can be called
+ * from several threads.
+ *
+ * The pool owns all copies, the workers must not delete them.
+ */
+
+#ifndef vtkTAG2EModelParameterPool_H
+#define	vtkTAG2EModelParameterPool_H
+
+#include <vtkObject.h>
+#include <vtkCriticalSection.h>
+#include <vtkTimeStamp.h>
+#include "vtkTAG2EAbstractCalibratableModelParameter.h"
+#include <vector>
+
+class vtkTAG2EModelParameterPool : public vtkObject {
+public:
+    vtkTypeRevisionMacro(vtkTAG2EModelParameterPool, vtkObject);
+    void PrintSelf(ostream& os, vtkIndent indent);
+    static vtkTAG2EModelParameterPool *New();
+
+    //!\brief Set the template parameter which is copied
+    vtkSetObjectMacro(TemplateParameter, vtkTAG2EAbstractCalibratableModelParameter);
+    //!\brief Get the template parameter which is copied
+    vtkGetObjectMacro(TemplateParameter, vtkTAG2EAbstractCalibratableModelParameter);
+
+    //!\brief Create numberOfParameter copies of the template parameter in advance.
+    //! Existing copies are removed, hence no copy must be in use.
+    //!\return true in case of success
+    bool Allocate(int numberOfParameter);
+
+    //!\brief Return an unused copy of the template parameter. A new
+    //! copy is created in case all copies are in use.
+    //!\return The copy or NULL in case of an error
+    vtkTAG2EAbstractCalibratableModelParameter *AcquireParameter();
+
+    //!\brief Give a copy back to the pool
+    //!\return false in case the parameter is not an acquired copy of this pool
+    bool ReleaseParameter(vtkTAG2EAbstractCalibratableModelParameter *parameter);
+
+    //!\brief Return the copy at index, no matter if it is in use or not
+    vtkTAG2EAbstractCalibratableModelParameter *GetParameter(int index);
+
+    //!\brief Return the number of copies in the pool
+    int GetNumberOfParameter() {return (int)this->Parameter.size();}
+
+    //!\brief Return the number of copies which are not in use
+    int GetNumberOfAvailableParameter();
+
+    //!\brief Delete all copies
+    void RemoveAllParameter();
+
+protected:
+    vtkTAG2EModelParameterPool();
+    ~vtkTAG2EModelParameterPool();
+
+    vtkTAG2EAbstractCalibratableModelParameter *TemplateParameter;
+
+    //BTX
+    std::vector<vtkTAG2EAbstractCalibratableModelParameter*> Parameter;
+    // True if the copy is handed out
+    std::vector<bool> InUse;
+    // True if the copy has the state of the template
+    std::vector<bool> Fresh;
+    //ETX
+
+    vtkSimpleCriticalSection Lock;
+    vtkTimeStamp CopyTime;
+
+private:
+    vtkTAG2EModelParameterPool(const vtkTAG2EModelParameterPool& orig); // Not implemented.
+    void operator=(const vtkTAG2EModelParameterPool&); // Not implemented.
+};
+
+#endif	/* vtkTAG2EModelParameterPool_H */
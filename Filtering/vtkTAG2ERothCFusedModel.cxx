@@ -0,0 +1,378 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#include <vtkPolyData.h>
+#include <vtkCellData.h>
+#include <vtkDoubleArray.h>
+#include <vtkInformation.h>
+#include <vtkInformationVector.h>
+
+extern "C" {
+#include <math.h>
+}
+
+#include <vtkObjectFactory.h>
+#include "vtkTAG2ERothCFusedModel.h"
+#include "vtkTAG2ETurcETPotModel.h"
+#include "vtkTAG2ERothCWaterBudgetModel.h"
+#include "vtkTAG2ERothCDefines.h"
+#include "vtkTAG2EDefines.h"
+
+vtkCxxRevisionMacro(vtkTAG2ERothCFusedModel, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2ERothCFusedModel);
+
+//----------------------------------------------------------------------------
+
+vtkTAG2ERothCFusedModel::vtkTAG2ERothCFusedModel()
+{
+  this->TimeInterval = 1; // Default a single day
+  this->RadiationInWatt = 1;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2ERothCFusedModel::~vtkTAG2ERothCFusedModel()
+{
+  ;
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2ERothCFusedModel::RequestData(vtkInformation * vtkNotUsed(request),
+                                         vtkInformationVector **inputVector,
+                                         vtkInformationVector *outputVector)
+{
+  vtkIdType i;
+  vtkIdType cellId;
+  int error = 0;
+
+  // Check for model parameter
+  if (this->ModelParameter == NULL)
+    {
+    vtkErrorMacro("Model parameter not set or invalid.");
+    return -1;
+    }
+
+  // the internal parameter object for fast access
+  RothC &R = this->RothCModelParameter->GetInternalScheme();
+
+  vtkPolyData* input = vtkPolyData::GetData(inputVector[0]);
+  vtkPolyData* output = vtkPolyData::GetData(outputVector);
+
+  // Check the array names
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_GLOBAL_RADIATION))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_GLOBAL_RADIATION << "> is missing ");
+    return -1;
+    }
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_MEAN_TEMPERATURE))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_MEAN_TEMPERATURE << "> is missing ");
+    return -1;
+    }
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_PRECIPITATION))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_PRECIPITATION << "> is missing ");
+    return -1;
+    }
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_SOILCOVER))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_SOILCOVER << "> is missing ");
+    return -1;
+    }
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_CLAY))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_CLAY << "> is missing ");
+    return -1;
+    }
+
+  // Allocate or initiate the C pools
+  if (!this->SetupCPools(input))
+    return -1;
+
+  // Compute the line length of the cells, the soil column
+  // index is only recomputed if the geometry changed
+  if (!this->SoilColumnIndex->Update(input))
+    return -1;
+
+  vtkDoubleArray *lineLengthArray = this->SoilColumnIndex->GetLineLength();
+
+  // Copy geometry from input
+  output->CopyStructure(input);
+
+  int cellNum = input->GetNumberOfCells();
+
+  // Result arrays
+  vtkDoubleArray *resultETpot = vtkDoubleArray::New();
+  resultETpot->SetNumberOfComponents(1);
+  resultETpot->SetName(ROTHC_INPUT_NAME_ETPOT);
+  resultETpot->SetNumberOfTuples(cellNum);
+
+  vtkDoubleArray *resultUsableFieldCapacity = vtkDoubleArray::New();
+  resultUsableFieldCapacity->SetNumberOfComponents(1);
+  resultUsableFieldCapacity->SetName(ROTHC_INPUT_NAME_USABLE_FIELD_CAPACITY);
+  resultUsableFieldCapacity->SetNumberOfTuples(cellNum);
+
+  vtkDoubleArray *resultSoilMoisture = vtkDoubleArray::New();
+  resultSoilMoisture->SetNumberOfComponents(1);
+  resultSoilMoisture->SetName(ROTHC_INPUT_NAME_SOIL_MOISTURE);
+  resultSoilMoisture->SetNumberOfTuples(cellNum);
+
+  vtkDoubleArray *result = vtkDoubleArray::New();
+  result->SetNumberOfComponents(1);
+  result->SetName(this->ResultArrayName);
+  result->SetNumberOfTuples(cellNum);
+
+  // Get array pointer for easy access
+  vtkDataArray *dpmArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_DPM);
+  vtkDataArray *rpmArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_RPM);
+  vtkDataArray *bioArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_BIO);
+  vtkDataArray *humArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_HUM);
+  vtkDataArray *iomArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_IOM);
+  vtkDataArray *globalRadiationArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_GLOBAL_RADIATION);
+  vtkDataArray *meanTempArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_MEAN_TEMPERATURE);
+  vtkDataArray *precipitationArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_PRECIPITATION);
+  vtkDataArray *soilCoverArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_SOILCOVER);
+  vtkDataArray *clayArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_CLAY);
+  vtkDataArray *waterContentArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_USABLE_WATER_CONTENT);
+  vtkDataArray *resRootsArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_RESIDUALS_ROOTS);
+  vtkDataArray *resSurfArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_RESIDUALS_SURFACE);
+  vtkDataArray *fertCArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_FERTILIZER_CARBON);
+
+  vtkDataArray *shootIdArray = input->GetCellData()->GetArray(ROTHC_INPUT_NAME_SHOOT_ID);
+  vtkDataArray *rootIdArray = input->GetCellData()->GetArray(ROTHC_INPUT_NAME_ROOT_ID);
+  vtkDataArray *fertIdArray = input->GetCellData()->GetArray(
+        ROTHC_INPUT_NAME_FERTILIZER_ID);
+
+  // Parallelize with OpenMP
+#ifdef OMP_PARALLELIZED
+#pragma omp parallel for private(cellId) shared(input, fertIdArray, shootIdArray,\
+		rootIdArray, fertCArray, resRootsArray, resSurfArray, waterContentArray,\
+		clayArray, soilCoverArray, precipitationArray, meanTempArray,\
+		globalRadiationArray, iomArray, humArray, bioArray, rpmArray, dpmArray,\
+		resultETpot, resultUsableFieldCapacity, resultSoilMoisture, result,\
+		lineLengthArray, cellNum, error)
+#endif
+  for (cellId = 0; cellId < cellNum; cellId++)
+    {
+    double lineLength;
+    double dpm, rpm, bio, hum, iom; // Pools
+    double globalRadiation, meanTemp, precipitation, etpot, waterContent;
+    double fertC, usableFieldCapacity, soilMoisture, soilCover,
+        resRoots, resSurf, clay;
+    double fertId, shootId, rootId;
+
+    // The length of the line in vertical direction
+    lineLength = lineLengthArray->GetValue(cellId); //m
+
+    globalRadiationArray->GetTuple(cellId, &globalRadiation);
+    meanTempArray->GetTuple(cellId, &meanTemp);
+    precipitationArray->GetTuple(cellId, &precipitation);
+    soilCoverArray->GetTuple(cellId, &soilCover);
+    clayArray->GetTuple(cellId, &clay);
+
+    // Potential evapotranspiration
+    if(globalRadiation == this->NullValue || meanTemp == this->NullValue)
+      etpot = this->NullValue;
+    else
+      etpot = vtkTAG2ETurcETPotModel::ComputeETpot(globalRadiation, meanTemp,
+          this->TimeInterval, this->RadiationInWatt);
+
+    // Water budget
+    usableFieldCapacity =
+        vtkTAG2ERothCWaterBudgetModel::ComputeUsableFieldCapacity(clay);
+
+    if (waterContentArray != NULL)
+      waterContentArray->GetTuple(cellId, &waterContent);
+    else
+      waterContent = usableFieldCapacity;
+
+    soilMoisture = vtkTAG2ERothCWaterBudgetModel::ComputeWaterContent(
+        waterContent, precipitation, etpot, usableFieldCapacity, lineLength);
+
+    resultETpot->SetTuple1(cellId, etpot);
+    resultUsableFieldCapacity->SetTuple1(cellId, usableFieldCapacity);
+    resultSoilMoisture->SetTuple1(cellId, soilMoisture);
+
+    // RothC
+    // We set them 0 if no residuals are provided
+    if(resRootsArray)
+      resRootsArray->GetTuple(cellId, &resRoots); // [ tC /ha/layer]
+    else
+      resRoots = 0.0;
+    if(resSurfArray)
+      resSurfArray->GetTuple(cellId, &resSurf); // [ tC /ha/layer]
+    else
+      resSurf = 0.0;
+
+    if(!fertCArray || this->EquilibriumRun)
+      fertC = 0.0;
+    else
+      fertCArray->GetTuple(cellId, &fertC); // [ tC /ha/layer]
+
+    dpmArray->GetTuple(cellId, &dpm);
+    rpmArray->GetTuple(cellId, &rpm);
+    bioArray->GetTuple(cellId, &bio);
+    humArray->GetTuple(cellId, &hum);
+    iomArray->GetTuple(cellId, &iom);
+
+    // Set the result to NULL in case some values are empty (NULL)
+    if (clay == this->NullValue || meanTemp == this->NullValue
+        || soilMoisture == this->NullValue
+        || usableFieldCapacity == this->NullValue || dpm == this->NullValue
+        || rpm == this->NullValue || bio == this->NullValue
+        || hum == this->NullValue || iom == this->NullValue)
+      {
+      result->SetTuple1(cellId, this->NullValue);
+      continue;
+      }
+
+    // Root index 0 is the default value
+    if (rootIdArray)
+      {
+      rootIdArray->GetTuple(cellId, &rootId);
+      if ((int)rootId == this->NullValue)
+        rootId = 0;
+      }
+    else
+      {
+      rootId = 0;
+      }
+
+    // Shoot index 0 is the default value
+    if (shootIdArray)
+      {
+      shootIdArray->GetTuple(cellId, &shootId);
+      if ((int)shootId == this->NullValue)
+        shootId = 0;
+      }
+    else
+      {
+      shootId = 0;
+      }
+
+    if (fertIdArray)
+      {
+      fertIdArray->GetTuple(cellId, &fertId);
+      if ((int)fertId == this->NullValue)
+        fertId = 0;
+      }
+    else
+      {
+      fertId = 0;
+      }
+
+    if (!this->CheckFractionIds(R, shootId, rootId, fertId))
+      {
+#ifndef OMP_PARALLELIZED
+      resultETpot->Delete();
+      resultUsableFieldCapacity->Delete();
+      resultSoilMoisture->Delete();
+      result->Delete();
+      return -1;
+#else
+      error = 1;
+      continue;
+#endif
+      }
+
+    this->ComputeCPools(R, meanTemp, soilMoisture, usableFieldCapacity,
+        soilCover, clay, resRoots, resSurf, fertC, shootId, rootId, fertId,
+        dpm, rpm, bio, hum);
+
+    result->SetTuple1(cellId, dpm + rpm + bio + hum + iom);
+
+    dpmArray->SetTuple1(cellId, dpm);
+    rpmArray->SetTuple1(cellId, rpm);
+    bioArray->SetTuple1(cellId, bio);
+    humArray->SetTuple1(cellId, hum);
+    }
+
+  // A cell with wrong fraction ids was skipped in the parallel loop
+  if (error)
+    {
+    resultETpot->Delete();
+    resultUsableFieldCapacity->Delete();
+    resultSoilMoisture->Delete();
+    result->Delete();
+    return -1;
+    }
+
+  if(input->GetCellData()->HasArray(ROTHC_INPUT_NAME_LAYER))
+    output->GetCellData()->AddArray(input->GetCellData()->GetArray(ROTHC_INPUT_NAME_LAYER));
+  output->GetCellData()->AddArray(resultETpot);
+  output->GetCellData()->AddArray(resultUsableFieldCapacity);
+  output->GetCellData()->AddArray(resultSoilMoisture);
+  output->GetCellData()->AddArray(result);
+  output->GetCellData()->SetActiveScalars(result->GetName());
+
+  if (this->AddCPoolsToOutput)
+    {
+    for (i = 0; i < this->CPools->GetCellData()->GetNumberOfArrays(); i++)
+      output->GetCellData()->AddArray(this->CPools->GetCellData()->GetArray(i));
+    }
+
+  resultETpot->Delete();
+  resultUsableFieldCapacity->Delete();
+  resultSoilMoisture->Delete();
+  result->Delete();
+
+  return 1;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ERothCFusedModel::PrintSelf(ostream& os, vtkIndent indent)
+{
+  this->Superclass::PrintSelf(os, indent);
+  os << indent << "TimeInterval: " << this->TimeInterval << endl;
+  os << indent << "RadiationInWatt: " << this->RadiationInWatt << endl;
+}
@@ -0,0 +1,101 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+/**
+ * \brief Combined ETpot, water budget and RothC time step
+ *
+ * This class computes the potential evapotranspiration (Turc), the
+ * water budget and the RothC carbon pools of a single time step in a
+ * single cell loop. The results are identical to the pipeline of
+ * vtkTAG2ETurcETPotModel, vtkTAG2ERothCWaterBudgetModel and
+ * vtkTAG2ERothCModel, but no join filters and intermediate datasets
+ * are required.
+ *
+ * Inputs:
+ * - Global radiation in J/(cm^2 * d) or alternatively in W/m^2
+ * - Mean temperature in C°
+ * - Precipitation
+ * - Clay content in %
+ * - Soil cover in [0:1] boolean
+ * - Optional usable water content
+ * - Optional residuals, fertilizer carbon and the shoot, root and fertilizer ids
+ *
+ * Outputs:
+ * - ETpot
+ * - Usable field capacity
+ * - Soil moisture
+ * - Soil carbon
+ * - Optional the C pools
+ *
+ */
+
+#ifndef vtkTAG2ERothCFusedModel_H
+#define	vtkTAG2ERothCFusedModel_H
+
+#include "vtkTAG2ERothCModel.h"
+
+class vtkTAG2ERothCFusedModel: public vtkTAG2ERothCModel
+{
+public:
+vtkTypeRevisionMacro(vtkTAG2ERothCFusedModel, vtkTAG2ERothCModel);
+
+  void PrintSelf(ostream& os, vtkIndent indent);
+  static vtkTAG2ERothCFusedModel *New();
+
+  //! \brief Set the time interval of the ETpot computation in days
+  vtkSetMacro(TimeInterval, double);
+  //! \brief Get the time interval of the ETpot computation in days
+  vtkGetMacro(TimeInterval, double);
+
+  //! \brief Set this true is the radiation is in W/m^2
+  vtkSetMacro(RadiationInWatt, int);
+  //! \brief Get the radiation unit flag
+  vtkGetMacro(RadiationInWatt, int);
+  //! \brief Set this true is the radiation is in W/m^2
+  vtkBooleanMacro(RadiationInWatt, int);
+
+protected:
+  vtkTAG2ERothCFusedModel();
+  ~vtkTAG2ERothCFusedModel();
+
+  virtual int RequestData(vtkInformation *, vtkInformationVector **,
+      vtkInformationVector *);
+
+  double TimeInterval;
+  int RadiationInWatt;
+
+private:
+  vtkTAG2ERothCFusedModel(const vtkTAG2ERothCFusedModel& orig); // Not implemented.
+  void operator=(const vtkTAG2ERothCFusedModel&); // Not implemented.
+};
+
+#endif	/* vtkTAG2ERothCFusedModel_H */
@@ -47,8 +47,13 @@
 
 extern "C" {
 #include <math.h>
+#include <stdio.h>
+#include <string.h>
 }
 
+#include <vector>
+#include <vtkType.h>
+
 #include <vtkDataSetAlgorithm.h>
 #include <vtkObjectFactory.h>
 #include "vtkTAG2ERothCModel.h"
@@ -63,6 +68,15 @@ vtkStandardNewMacro(vtkTAG2ERothCModel);
 
 #define DEFAULT_ROOTS 1
 
+// The checkpoint file identifier and byte order mark
+#define ROTHC_CHECKPOINT_MAGIC "TAG2ECP1"
+#define ROTHC_CHECKPOINT_BYTE_ORDER 0x01020304
+#define ROTHC_CHECKPOINT_NUMBER_OF_POOLS 5
+
+static const char *RothCCheckpointPools[ROTHC_CHECKPOINT_NUMBER_OF_POOLS] = {
+    ROTHC_POOL_NAME_DPM, ROTHC_POOL_NAME_RPM, ROTHC_POOL_NAME_BIO,
+    ROTHC_POOL_NAME_HUM, ROTHC_POOL_NAME_IOM};
+
 //----------------------------------------------------------------------------
 
 vtkTAG2ERothCModel::vtkTAG2ERothCModel()
@@ -73,6 +87,8 @@ vtkTAG2ERothCModel::vtkTAG2ERothCModel()
   this->AddCPoolsToOutput = 0;
   this->TemporalRatio = 1 / 12.0; // Default is monthly resolution
   this->EquilibriumRun = 0;
+  this->CPoolsTimeStep = 0;
+  this->SoilColumnIndex = vtkTAG2ERothCSoilColumnIndex::New();
   this->SetResultArrayName(ROTHC_OUTPUT_NAME_SOIL_CARBON);
   this->SetNumberOfInputPorts(1);
   this->SetNumberOfOutputPorts(1);
@@ -84,6 +100,7 @@ vtkTAG2ERothCModel::~vtkTAG2ERothCModel()
 {
   if (this->CPools)
     this->CPools->Delete();
+  this->SetSoilColumnIndex(NULL);
 }
 
 //----------------------------------------------------------------------------
@@ -143,7 +160,7 @@ int vtkTAG2ERothCModel::RequestData(vtkInformation * vtkNotUsed(request),
 {
   vtkIdType i;
   vtkIdType cellId;
-  bool hasInputPools = true;
+  int error = 0;
 
   // Check for model parameter
   if (this->ModelParameter == NULL)
@@ -158,58 +175,10 @@ int vtkTAG2ERothCModel::RequestData(vtkInformation * vtkNotUsed(request),
   vtkPolyData* input = vtkPolyData::GetData(inputVector[0]);
   vtkPolyData* output = vtkPolyData::GetData(outputVector);
 
-  // Check if the input has the C pools
-  if (!input->GetCellData()->HasArray(ROTHC_POOL_NAME_DPM)
-      || !input->GetCellData()->HasArray(ROTHC_POOL_NAME_RPM)
-      || !input->GetCellData()->HasArray(ROTHC_POOL_NAME_BIO)
-      || !input->GetCellData()->HasArray(ROTHC_POOL_NAME_HUM)
-      || !input->GetCellData()->HasArray(ROTHC_POOL_NAME_IOM))
-    hasInputPools = false;
-
-  // Allocate the pool structure if empty or if it has different
-  // number of points/cells
-  if (this->CPools == NULL
-      || this->CPools->GetNumberOfCells() != input->GetNumberOfCells()
-      || this->CPools->GetNumberOfPoints() != input->GetNumberOfPoints())
-    {
-    if (this->CPools)
-      this->CPools->Delete();
-    this->CPools = vtkPolyData::New();
-    this->CPools->CopyStructure(input);
-    cout << "Allocating C-Pools" << endl;
-    }
-
-  // Copy the arrays from input to the pools
-  if (hasInputPools && this->CPoolsInitiated == 0)
-    {
-    for (i = 0; i < this->CPools->GetCellData()->GetNumberOfArrays(); i++)
-      this->CPools->GetCellData()->RemoveArray(i);
-
-    this->CPools->GetCellData()->AddArray(
-        input->GetCellData()->GetArray(ROTHC_POOL_NAME_DPM));
-    this->CPools->GetCellData()->AddArray(
-        input->GetCellData()->GetArray(ROTHC_POOL_NAME_RPM));
-    this->CPools->GetCellData()->AddArray(
-        input->GetCellData()->GetArray(ROTHC_POOL_NAME_BIO));
-    this->CPools->GetCellData()->AddArray(
-        input->GetCellData()->GetArray(ROTHC_POOL_NAME_HUM));
-    this->CPools->GetCellData()->AddArray(
-        input->GetCellData()->GetArray(ROTHC_POOL_NAME_IOM));
-    cout << "Initializing C-Pools" << endl;
-    this->CPoolsInitiatedOn();
-    }
-
-  // Initiate the C pools
-  if (this->CPoolsInitiated == 0 && hasInputPools == false)
-    {
-    // Check for initial carbon array in the input
-    if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_INITIAL_CARBON))
-      {
-      vtkErrorMacro("Initial soil carbon is missing in input dataset, assuming no initial carbon.");
-      }
+  // Allocate or initiate the C pools
+  if (!this->SetupCPools(input))
+    return -1;
 
-    this->CreateCPools(input);
-    }
   // Check the array names
 
   if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_CLAY))
@@ -243,6 +212,11 @@ int vtkTAG2ERothCModel::RequestData(vtkInformation * vtkNotUsed(request),
     return -1;
     }
 
+  // Check the line cells, the soil column index is only
+  // recomputed if the geometry changed
+  if (!this->SoilColumnIndex->Update(input))
+    return -1;
+
   // Copy geometry from input
   output->CopyStructure(input);
 
@@ -285,66 +259,20 @@ int vtkTAG2ERothCModel::RequestData(vtkInformation * vtkNotUsed(request),
   vtkDataArray *fertIdArray = input->GetCellData()->GetArray(
         ROTHC_INPUT_NAME_FERTILIZER_ID);
 
-#ifdef OMP_PARALLELIZED
-  // We must call the following method first in a single thread to
-  // avoid race conditions
-  if(input->GetNumberOfCells() > 0) {
-    vtkIdList *tmp = vtkIdList::New();
-    input->GetCellPoints(0, tmp);
-    input->GetCellType(0);
-    tmp->Delete();
-  }
-#endif
-
   // Parallelize with OpenMP
 #ifdef OMP_PARALLELIZED
 #pragma omp parallel for private(cellId) shared(input, fertIdArray, shootIdArray,\
 		fertCArray, usableFieldCArray, soilMArray, resSurfArray, soilCoverArray,\
 		meanTempArray, clayArray, iomArray, humArray, bioArray, rpmArray, dpmArray,\
-		result)
+		result, error)
 #endif
   for (cellId = 0; cellId < input->GetNumberOfCells(); cellId++)
     {
-    double lineLength;
-    double p1[3];
-    double p2[3];
-    double a, b, c; // rate modifiers
-    double x1, x2, x3, x4;
-    double a1, a2, a3; // rate modifier parameter
-    double b1, b2, b3;
-    double efficiency; // fraction of degraded C that remains
-    double allocFractionbio, allocFractionhum;
     double dpm, rpm, bio, hum, iom; // Pools
-    double dpm_old, rpm_old, bio_old, hum_old; //old_pools
     double meanTemp, fertC, usableFieldCapacity, soilMoisture, soilCover,
         resRoots, resSurf, clay;
     double fertId, shootId, rootId;
 
-    vtkIdList *pointIds = vtkIdList::New();
-    input->GetCellPoints(cellId, pointIds);
-
-    // Check cell type, we support only lines
-    if (input->GetCellType(cellId) != VTK_LINE)
-      {
-      vtkErrorMacro("Unsupported cell type.");
-#ifndef OMP_PARALLELIZED
-      return -1;
-#else
-      continue;
-#endif
-      }
-
-    // We support only lines with two coordinates
-    if (pointIds->GetNumberOfIds() != 2)
-      {
-      vtkErrorMacro("Unsupported line length.");
-#ifndef OMP_PARALLELIZED
-      return -1;
-#else
-      continue;
-#endif
-      }
-
     // We set them 0 if no residuals are provided
     if(resRootsArray)
       resRootsArray->GetTuple(cellId, &resRoots); // [ tC /ha/layer]
@@ -371,10 +299,6 @@ int vtkTAG2ERothCModel::RequestData(vtkInformation * vtkNotUsed(request),
     bioArray->GetTuple(cellId, &bio);
     humArray->GetTuple(cellId, &hum);
     iomArray->GetTuple(cellId, &iom);
-    dpm_old = dpm;
-    rpm_old = rpm;
-    bio_old = bio;
-    hum_old = hum;
 
     /*
     cout << "resRoots " << resRoots << " resSurf " << resSurf
@@ -429,135 +353,20 @@ int vtkTAG2ERothCModel::RequestData(vtkInformation * vtkNotUsed(request),
       fertId = 0;
       }
 
-    // Compute length of the line in vertical direction
-    input->GetPoint(pointIds->GetId(0), p1);
-    input->GetPoint(pointIds->GetId(1), p2);
-    lineLength = fabs(p1[2] - p2[2]);
-
-    a1 = R.a.a1.value;
-    a2 = R.a.a2.value;
-    a3 = R.a.a3.value;
-
-    // a of (1 - e^(-abckt)) (Temperature Response)
-    a = a1 / (1.0 + exp(a2 / (meanTemp + a3)));
-
-    // b (moistureResponse)
-    b1 = R.b.b1.value;
-    b2 = R.b.b2.value;
-    b3 = R.b.b3.value;
-
-    if (soilMoisture > usableFieldCapacity * b3)
-      b = 1;
-    else
-      b = b1 + (b2 - b1) * soilMoisture / (usableFieldCapacity * b3);
-
-    // c (soilcover_factor)
-    if(this->EquilibriumRun)
-      {
-      c = 0.6;
-      }
-    else
-      {
-      if (soilCover == 0 || soilCover == this->NullValue)
-        c = 1.0;
-      else
-        c = 0.6;
-      }
-
-    // efficiency , that describes how much of degraded C remains in the system
-    // and is not blown out as CO2
-
-    x1 = R.x.x1.value;
-    x2 = R.x.x2.value;
-    x3 = R.x.x3.value;
-    x4 = R.x.x4.value;
-
-    efficiency = x1 * (x2 + x3 * exp(x4 * clay));
-    efficiency = 1 / (1 + efficiency);
-    allocFractionhum = 0.54;
-    allocFractionbio = 0.46;
-
-    if (R.PlantFractions.size() <= shootId || R.PlantFractions.size() <= rootId)
-      {
-      vtkErrorMacro("Shoot/root ids out of plant fraction vector boundaries");
-#ifndef OMP_PARALLELIZED
-      return -1;
-#else
-      continue;
-#endif
-      }
-#ifdef DEFAULT_ROOTS
-    double dpmRootsFraction = R.PlantFractions[rootId]->DPM.value;
-    double rpmRootsFraction = R.PlantFractions[rootId]->RPM.value;
-    double humRootsFraction = R.PlantFractions[rootId]->HUM.value;
-#else
-    /* Work around, values from a mean calibration */
-    double dpmRootsFraction = 0.2656288362015;
-    double rpmRootsFraction = 0.7343711637985;
-    double humRootsFraction = 0;
-#endif
-    double dpmSurfFraction = R.PlantFractions[shootId]->DPM.value;
-    double rpmSurfFraction = R.PlantFractions[shootId]->RPM.value;
-    double humSurfFraction = R.PlantFractions[shootId]->HUM.value;
-
-    if (R.FertilizerFractions.size() <= fertId)
+    if (!this->CheckFractionIds(R, shootId, rootId, fertId))
       {
-      vtkErrorMacro(
-          "Fertilizer id is out of fertilizer fraction vector boundaries");
 #ifndef OMP_PARALLELIZED
+      result->Delete();
       return -1;
 #else
+      error = 1;
       continue;
 #endif
       }
 
-    double dpmFertFraction = R.FertilizerFractions[fertId]->DPM.value;
-    double rpmFertFraction = R.FertilizerFractions[fertId]->RPM.value;
-    double humFertFraction = R.FertilizerFractions[fertId]->HUM.value;
-
-    // CPool computation
-    // 1. Add residues from crop and fertilization
-    dpm_old = dpm_old + dpmRootsFraction * resRoots + dpmSurfFraction * resSurf
-        + dpmFertFraction * fertC;
-    rpm_old = rpm_old + rpmRootsFraction * resRoots + rpmSurfFraction * resSurf
-        + rpmFertFraction * fertC;
-    hum_old = hum_old + humRootsFraction * resRoots + humSurfFraction * resSurf
-        + humFertFraction * fertC;
-
-    // Degradation
-    double degradedC = 0;
-    double dpm_k, rpm_k, hum_k, bio_k;
-    dpm_k = R.k.DPM.value;
-    rpm_k = R.k.RPM.value;
-    hum_k = R.k.HUM.value;
-    bio_k = R.k.BIO.value;
-
-    // cout << "a " << a << " b " << b << " c " << c << " dpmRootsFraction "
-    //     << dpmRootsFraction << " dpmSurfFraction " << dpmSurfFraction
-    //     << " dpmFertFraction " << dpmFertFraction << endl;
-
-    dpm = dpm_old * exp(-1.0 * dpm_k * a * b * c * this->TemporalRatio);
-    degradedC = degradedC + (dpm_old - dpm);
-
-    rpm = rpm_old * exp(-1.0 * rpm_k * a * b * c * this->TemporalRatio);
-    degradedC = degradedC + (rpm_old - rpm);
-
-    hum = hum_old * exp(-1.0 * hum_k * a * b * c * this->TemporalRatio);
-    degradedC = degradedC + (hum_old - hum);
-
-    bio = bio_old * exp(-1.0 * bio_k * a * b * c * this->TemporalRatio);
-    degradedC = degradedC + (bio_old - bio);
-
-    // cout << "dpm_old " << dpm_old << " rpm_old " << rpm_old << " hum_old "
-    //     << hum_old << " bio_old " << bio_old << " dpm " << dpm << " rpm " << rpm
-    //     << " hum " << hum << " bio " << bio << endl;
-
-    // Adding all that is not CO2 to bio and hum
-    hum = hum + degradedC * efficiency * allocFractionhum;
-    bio = bio + degradedC * efficiency * allocFractionbio;
-
-    // cout << "bio_new: " << bio << " degradedC  " << degradedC << " efficiency  "
-    //     << efficiency << endl;
+    this->ComputeCPools(R, meanTemp, soilMoisture, usableFieldCapacity,
+        soilCover, clay, resRoots, resSurf, fertC, shootId, rootId, fertId,
+        dpm, rpm, bio, hum);
 
     result->SetTuple1(cellId, dpm + rpm + bio + hum + iom);
 
@@ -565,8 +374,13 @@ int vtkTAG2ERothCModel::RequestData(vtkInformation * vtkNotUsed(request),
     rpmArray->SetTuple1(cellId, rpm);
     bioArray->SetTuple1(cellId, bio);
     humArray->SetTuple1(cellId, hum);
+    }
 
-    pointIds->Delete();
+  // A cell with wrong fraction ids was skipped in the parallel loop
+  if (error)
+    {
+    result->Delete();
+    return -1;
     }
 
   if(input->GetCellData()->HasArray("Layer"))
@@ -587,6 +401,242 @@ int vtkTAG2ERothCModel::RequestData(vtkInformation * vtkNotUsed(request),
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2ERothCModel::SetupCPools(vtkPolyData *input)
+{
+  vtkIdType i;
+  bool hasInputPools = true;
+
+  // Check if the input has the C pools
+  if (!input->GetCellData()->HasArray(ROTHC_POOL_NAME_DPM)
+      || !input->GetCellData()->HasArray(ROTHC_POOL_NAME_RPM)
+      || !input->GetCellData()->HasArray(ROTHC_POOL_NAME_BIO)
+      || !input->GetCellData()->HasArray(ROTHC_POOL_NAME_HUM)
+      || !input->GetCellData()->HasArray(ROTHC_POOL_NAME_IOM))
+    hasInputPools = false;
+
+  // Allocate the pool structure if empty or if it has different
+  // number of points/cells
+  if (this->CPools == NULL
+      || this->CPools->GetNumberOfCells() != input->GetNumberOfCells()
+      || this->CPools->GetNumberOfPoints() != input->GetNumberOfPoints())
+    {
+    vtkPolyData *pools = vtkPolyData::New();
+    pools->CopyStructure(input);
+
+    // Initiated pools without structure are loaded from a checkpoint,
+    // they are kept in case they match the number of input cells
+    if (this->CPools && this->CPoolsInitiated)
+      {
+      for (i = 0; i < this->CPools->GetCellData()->GetNumberOfArrays(); i++)
+        {
+        vtkDataArray *array = this->CPools->GetCellData()->GetArray(i);
+        if (array->GetNumberOfTuples() != input->GetNumberOfCells())
+          {
+          vtkErrorMacro(<< "The number of values of C pool <"
+              << array->GetName() << "> " << array->GetNumberOfTuples()
+              << " differs from the number of input cells "
+              << input->GetNumberOfCells());
+          pools->Delete();
+          return false;
+          }
+        pools->GetCellData()->AddArray(array);
+        }
+      }
+
+    if (this->CPools)
+      this->CPools->Delete();
+    this->CPools = pools;
+    cout << "Allocating C-Pools" << endl;
+    }
+
+  // Copy the arrays from input to the pools
+  if (hasInputPools && this->CPoolsInitiated == 0)
+    {
+    for (i = 0; i < this->CPools->GetCellData()->GetNumberOfArrays(); i++)
+      this->CPools->GetCellData()->RemoveArray(i);
+
+    this->CPools->GetCellData()->AddArray(
+        input->GetCellData()->GetArray(ROTHC_POOL_NAME_DPM));
+    this->CPools->GetCellData()->AddArray(
+        input->GetCellData()->GetArray(ROTHC_POOL_NAME_RPM));
+    this->CPools->GetCellData()->AddArray(
+        input->GetCellData()->GetArray(ROTHC_POOL_NAME_BIO));
+    this->CPools->GetCellData()->AddArray(
+        input->GetCellData()->GetArray(ROTHC_POOL_NAME_HUM));
+    this->CPools->GetCellData()->AddArray(
+        input->GetCellData()->GetArray(ROTHC_POOL_NAME_IOM));
+    cout << "Initializing C-Pools" << endl;
+    this->CPoolsInitiatedOn();
+    }
+
+  // Initiate the C pools
+  if (this->CPoolsInitiated == 0 && hasInputPools == false)
+    {
+    // Check for initial carbon array in the input
+    if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_INITIAL_CARBON))
+      {
+      vtkErrorMacro("Initial soil carbon is missing in input dataset, assuming no initial carbon.");
+      }
+
+    this->CreateCPools(input);
+    }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2ERothCModel::CheckFractionIds(RothC &R, double shootId,
+                                          double rootId, double fertId)
+{
+  if (R.PlantFractions.size() <= shootId || R.PlantFractions.size() <= rootId)
+    {
+    vtkErrorMacro("Shoot/root ids out of plant fraction vector boundaries");
+    return false;
+    }
+  if (R.FertilizerFractions.size() <= fertId)
+    {
+    vtkErrorMacro(
+        "Fertilizer id is out of fertilizer fraction vector boundaries");
+    return false;
+    }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ERothCModel::ComputeCPools(RothC &R, double meanTemp,
+                                       double soilMoisture,
+                                       double usableFieldCapacity,
+                                       double soilCover, double clay,
+                                       double resRoots, double resSurf,
+                                       double fertC, double shootId,
+                                       double rootId, double fertId,
+                                       double &dpm, double &rpm, double &bio,
+                                       double &hum)
+{
+  double a, b, c; // rate modifiers
+  double x1, x2, x3, x4;
+  double a1, a2, a3; // rate modifier parameter
+  double b1, b2, b3;
+  double efficiency; // fraction of degraded C that remains
+  double allocFractionbio, allocFractionhum;
+  double dpm_old, rpm_old, bio_old, hum_old; //old_pools
+
+  dpm_old = dpm;
+  rpm_old = rpm;
+  bio_old = bio;
+  hum_old = hum;
+
+  a1 = R.a.a1.value;
+  a2 = R.a.a2.value;
+  a3 = R.a.a3.value;
+
+  // a of (1 - e^(-abckt)) (Temperature Response)
+  a = a1 / (1.0 + exp(a2 / (meanTemp + a3)));
+
+  // b (moistureResponse)
+  b1 = R.b.b1.value;
+  b2 = R.b.b2.value;
+  b3 = R.b.b3.value;
+
+  if (soilMoisture > usableFieldCapacity * b3)
+    b = 1;
+  else
+    b = b1 + (b2 - b1) * soilMoisture / (usableFieldCapacity * b3);
+
+  // c (soilcover_factor)
+  if(this->EquilibriumRun)
+    {
+    c = 0.6;
+    }
+  else
+    {
+    if (soilCover == 0 || soilCover == this->NullValue)
+      c = 1.0;
+    else
+      c = 0.6;
+    }
+
+  // efficiency , that describes how much of degraded C remains in the system
+  // and is not blown out as CO2
+
+  x1 = R.x.x1.value;
+  x2 = R.x.x2.value;
+  x3 = R.x.x3.value;
+  x4 = R.x.x4.value;
+
+  efficiency = x1 * (x2 + x3 * exp(x4 * clay));
+  efficiency = 1 / (1 + efficiency);
+  allocFractionhum = 0.54;
+  allocFractionbio = 0.46;
+
+#ifdef DEFAULT_ROOTS
+  double dpmRootsFraction = R.PlantFractions[rootId]->DPM.value;
+  double rpmRootsFraction = R.PlantFractions[rootId]->RPM.value;
+  double humRootsFraction = R.PlantFractions[rootId]->HUM.value;
+#else
+  /* Work around, values from a mean calibration */
+  double dpmRootsFraction = 0.2656288362015;
+  double rpmRootsFraction = 0.7343711637985;
+  double humRootsFraction = 0;
+#endif
+  double dpmSurfFraction = R.PlantFractions[shootId]->DPM.value;
+  double rpmSurfFraction = R.PlantFractions[shootId]->RPM.value;
+  double humSurfFraction = R.PlantFractions[shootId]->HUM.value;
+
+  double dpmFertFraction = R.FertilizerFractions[fertId]->DPM.value;
+  double rpmFertFraction = R.FertilizerFractions[fertId]->RPM.value;
+  double humFertFraction = R.FertilizerFractions[fertId]->HUM.value;
+
+  // CPool computation
+  // 1. Add residues from crop and fertilization
+  dpm_old = dpm_old + dpmRootsFraction * resRoots + dpmSurfFraction * resSurf
+      + dpmFertFraction * fertC;
+  rpm_old = rpm_old + rpmRootsFraction * resRoots + rpmSurfFraction * resSurf
+      + rpmFertFraction * fertC;
+  hum_old = hum_old + humRootsFraction * resRoots + humSurfFraction * resSurf
+      + humFertFraction * fertC;
+
+  // Degradation
+  double degradedC = 0;
+  double dpm_k, rpm_k, hum_k, bio_k;
+  dpm_k = R.k.DPM.value;
+  rpm_k = R.k.RPM.value;
+  hum_k = R.k.HUM.value;
+  bio_k = R.k.BIO.value;
+
+  // cout << "a " << a << " b " << b << " c " << c << " dpmRootsFraction "
+  //     << dpmRootsFraction << " dpmSurfFraction " << dpmSurfFraction
+  //     << " dpmFertFraction " << dpmFertFraction << endl;
+
+  dpm = dpm_old * exp(-1.0 * dpm_k * a * b * c * this->TemporalRatio);
+  degradedC = degradedC + (dpm_old - dpm);
+
+  rpm = rpm_old * exp(-1.0 * rpm_k * a * b * c * this->TemporalRatio);
+  degradedC = degradedC + (rpm_old - rpm);
+
+  hum = hum_old * exp(-1.0 * hum_k * a * b * c * this->TemporalRatio);
+  degradedC = degradedC + (hum_old - hum);
+
+  bio = bio_old * exp(-1.0 * bio_k * a * b * c * this->TemporalRatio);
+  degradedC = degradedC + (bio_old - bio);
+
+  // cout << "dpm_old " << dpm_old << " rpm_old " << rpm_old << " hum_old "
+  //     << hum_old << " bio_old " << bio_old << " dpm " << dpm << " rpm " << rpm
+  //     << " hum " << hum << " bio " << bio << endl;
+
+  // Adding all that is not CO2 to bio and hum
+  hum = hum + degradedC * efficiency * allocFractionhum;
+  bio = bio + degradedC * efficiency * allocFractionbio;
+
+  // cout << "bio_new: " << bio << " degradedC  " << degradedC << " efficiency  "
+  //     << efficiency << endl;
+}
+
+//----------------------------------------------------------------------------
+
 void vtkTAG2ERothCModel::CreateCPools(vtkPolyData *input)
 {
   vtkDoubleArray *dpmArray = vtkDoubleArray::New();
@@ -683,6 +733,188 @@ void vtkTAG2ERothCModel::CreateCPools(vtkPolyData *input)
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2ERothCModel::SaveCPools(const char *fileName, int timeStep)
+{
+  int i;
+  vtkIdType j;
+  vtkDataArray *pools[ROTHC_CHECKPOINT_NUMBER_OF_POOLS];
+
+  if (this->CPools == NULL || this->CPoolsInitiated == 0)
+    {
+    vtkErrorMacro(<< "The C pools are not initiated");
+    return false;
+    }
+
+  for (i = 0; i < ROTHC_CHECKPOINT_NUMBER_OF_POOLS; i++)
+    {
+    pools[i] = this->CPools->GetCellData()->GetArray(RothCCheckpointPools[i]);
+    if (pools[i] == NULL)
+      {
+      vtkErrorMacro(<< "C pool <" << RothCCheckpointPools[i] << "> is missing");
+      return false;
+      }
+    if (pools[i]->GetNumberOfTuples() != pools[0]->GetNumberOfTuples() ||
+        pools[i]->GetNumberOfComponents() != pools[0]->GetNumberOfComponents())
+      {
+      vtkErrorMacro(<< "C pool <" << RothCCheckpointPools[i]
+          << "> has a different number of values");
+      return false;
+      }
+    }
+
+  FILE *file = fopen(fileName, "wb");
+  if (file == NULL)
+    {
+    vtkErrorMacro(<< "Unable to open checkpoint file <" << fileName
+        << "> for writing");
+    return false;
+    }
+
+  vtkTypeInt32 byteOrder = ROTHC_CHECKPOINT_BYTE_ORDER;
+  vtkTypeInt32 numberOfPools = ROTHC_CHECKPOINT_NUMBER_OF_POOLS;
+  vtkTypeInt64 numberOfCells = pools[0]->GetNumberOfTuples();
+  vtkTypeInt64 step = timeStep;
+  vtkTypeInt64 numberOfComponents = pools[0]->GetNumberOfComponents();
+  vtkTypeInt64 numberOfValues = numberOfCells * numberOfComponents;
+
+  bool success = fwrite(ROTHC_CHECKPOINT_MAGIC, 1, 8, file) == 8
+      && fwrite(&byteOrder, sizeof(byteOrder), 1, file) == 1
+      && fwrite(&numberOfPools, sizeof(numberOfPools), 1, file) == 1
+      && fwrite(&numberOfCells, sizeof(numberOfCells), 1, file) == 1
+      && fwrite(&step, sizeof(step), 1, file) == 1
+      && fwrite(&numberOfComponents, sizeof(numberOfComponents), 1, file) == 1;
+
+  // Write the pools as contiguous double arrays with interleaved
+  // components, pools of other types are converted
+  std::vector<double> buffer;
+
+  for (i = 0; i < ROTHC_CHECKPOINT_NUMBER_OF_POOLS && success
+      && numberOfValues > 0; i++)
+    {
+    double *data;
+    vtkDoubleArray *array = vtkDoubleArray::SafeDownCast(pools[i]);
+
+    if (array)
+      {
+      data = array->GetPointer(0);
+      }
+    else
+      {
+      buffer.resize(numberOfValues);
+      for (j = 0; j < numberOfCells; j++)
+        {
+        for (int c = 0; c < numberOfComponents; c++)
+          buffer[j * numberOfComponents + c] = pools[i]->GetComponent(j, c);
+        }
+      data = &buffer[0];
+      }
+
+    success = fwrite(data, sizeof(double), numberOfValues, file)
+        == (size_t)numberOfValues;
+    }
+
+  if (fclose(file) != 0)
+    success = false;
+
+  if (!success)
+    vtkErrorMacro(<< "Unable to write checkpoint file <" << fileName << ">");
+
+  return success;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2ERothCModel::LoadCPools(const char *fileName)
+{
+  int i;
+  char magic[8];
+  vtkTypeInt32 byteOrder, numberOfPools;
+  vtkTypeInt64 numberOfCells, step, numberOfComponents;
+
+  FILE *file = fopen(fileName, "rb");
+  if (file == NULL)
+    {
+    vtkErrorMacro(<< "Unable to open checkpoint file <" << fileName
+        << "> for reading");
+    return false;
+    }
+
+  bool success = fread(magic, 1, 8, file) == 8
+      && fread(&byteOrder, sizeof(byteOrder), 1, file) == 1
+      && fread(&numberOfPools, sizeof(numberOfPools), 1, file) == 1
+      && fread(&numberOfCells, sizeof(numberOfCells), 1, file) == 1
+      && fread(&step, sizeof(step), 1, file) == 1
+      && fread(&numberOfComponents, sizeof(numberOfComponents), 1, file) == 1;
+
+  if (!success || memcmp(magic, ROTHC_CHECKPOINT_MAGIC, 8) != 0)
+    {
+    vtkErrorMacro(<< "File <" << fileName << "> is not a C pool checkpoint");
+    fclose(file);
+    return false;
+    }
+
+  if (byteOrder != ROTHC_CHECKPOINT_BYTE_ORDER)
+    {
+    vtkErrorMacro(<< "The byte order of checkpoint file <" << fileName
+        << "> is not supported");
+    fclose(file);
+    return false;
+    }
+
+  // Checkpoints without a component count contain single component pools
+  if (numberOfComponents == 0)
+    numberOfComponents = 1;
+
+  if (numberOfPools != ROTHC_CHECKPOINT_NUMBER_OF_POOLS || numberOfCells < 0
+      || numberOfComponents < 0 || numberOfComponents > VTK_INT_MAX)
+    {
+    vtkErrorMacro(<< "Checkpoint file <" << fileName << "> is corrupt");
+    fclose(file);
+    return false;
+    }
+
+  // The pools are read without structure, the structure is
+  // copied from the input in the next model run
+  vtkPolyData *pools = vtkPolyData::New();
+
+  for (i = 0; i < ROTHC_CHECKPOINT_NUMBER_OF_POOLS && success; i++)
+    {
+    vtkDoubleArray *array = vtkDoubleArray::New();
+    array->SetName(RothCCheckpointPools[i]);
+    array->SetNumberOfComponents((int)numberOfComponents);
+    array->SetNumberOfTuples(numberOfCells);
+
+    vtkTypeInt64 numberOfValues = numberOfCells * numberOfComponents;
+    if (numberOfValues > 0)
+      success = fread(array->GetPointer(0), sizeof(double), numberOfValues, file)
+          == (size_t)numberOfValues;
+
+    pools->GetCellData()->AddArray(array);
+    array->Delete();
+    }
+
+  fclose(file);
+
+  if (!success)
+    {
+    vtkErrorMacro(<< "Unable to read the C pools from checkpoint file <"
+        << fileName << ">");
+    pools->Delete();
+    return false;
+    }
+
+  if (this->CPools)
+    this->CPools->Delete();
+  this->CPools = pools;
+  this->CPoolsTimeStep = (int)step;
+  this->CPoolsInitiatedOn();
+  this->Modified();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 void vtkTAG2ERothCModel::PrintSelf(ostream& os, vtkIndent indent)
 {
   this->Superclass::PrintSelf(os, indent);
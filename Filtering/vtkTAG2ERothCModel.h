@@ -44,6 +44,7 @@
 #include <vtkPolyData.h>
 #include "vtkTAG2EAbstractCalibratableModel.h"
 #include "vtkTAG2ERothCModelParameter.h"
+#include "vtkTAG2ERothCSoilColumnIndex.h"
 
 class vtkTAG2ERothCModel: public vtkTAG2EAbstractCalibratableModel
 {
@@ -97,6 +98,42 @@ vtkTypeRevisionMacro(vtkTAG2ERothCModel, vtkTAG2EAbstractCalibratableModel)
   //! the input data.
   void SetModelParameter(vtkTAG2EAbstractModelParameter* modelParameter);
 
+  //! \brief Write the internal C pools and the time step into a binary
+  //! checkpoint file.
+  //!
+  //! The file starts with a header of 40 bytes:
+  //! - 8 bytes magic "TAG2ECP1"
+  //! - int32 byte order mark 0x01020304
+  //! - int32 number of pools (5)
+  //! - int64 number of cells
+  //! - int64 time step
+  //! - int64 number of components of each pool, e.g. the number of scenarios
+  //!
+  //! followed by the DPM, RPM, BIO, HUM and IOM pools as contiguous arrays
+  //! of number of cells * number of components native doubles with
+  //! interleaved components. The pools are 8 byte aligned and can be memory mapped.
+  //! \param fileName The name of the checkpoint file
+  //! \param timeStep The time step that was computed last
+  //! \return true in case of success
+  bool SaveCPools(const char *fileName, int timeStep);
+
+  //! \brief Read the internal C pools from a binary checkpoint file that
+  //! was written with SaveCPools(). The pools are used in the next
+  //! model run as initiated pools, the number of cells of the input
+  //! must match the number of cells of the checkpoint.
+  //! \param fileName The name of the checkpoint file
+  //! \return true in case of success
+  bool LoadCPools(const char *fileName);
+
+  //! \brief The time step that was read by LoadCPools()
+  vtkGetMacro(CPoolsTimeStep, int);
+
+  //! \brief Set the soil column index that provides the line length,
+  //! it can be shared with other RothC filters
+  vtkSetObjectMacro(SoilColumnIndex, vtkTAG2ERothCSoilColumnIndex);
+  //! \brief Get the soil column index
+  vtkGetObjectMacro(SoilColumnIndex, vtkTAG2ERothCSoilColumnIndex);
+
 protected:
   vtkTAG2ERothCModel();
   ~vtkTAG2ERothCModel();
@@ -108,13 +145,33 @@ protected:
   //! \brief Initiate the internal CPools arrays in case
   //! there where not provided in the input
   virtual void CreateCPools(vtkPolyData *input);
+  //! \brief Allocate the internal C pools and initiate them from the
+  //! input pools or the initial carbon in case they are not initiated yet
+  //! \return false in case the initiated pools do not match the input
+  virtual bool SetupCPools(vtkPolyData *input);
+
+  //BTX
+  //! \brief Check if the shoot, root and fertilizer ids are located
+  //! in the plant and fertilizer fraction vectors of the model parameter
+  bool CheckFractionIds(RothC &R, double shootId, double rootId, double fertId);
+
+  //! \brief Compute the C pools of a single cell for a single time step.
+  //! The DPM, RPM, BIO and HUM pools are updated in place.
+  void ComputeCPools(RothC &R, double meanTemp, double soilMoisture,
+                     double usableFieldCapacity, double soilCover, double clay,
+                     double resRoots, double resSurf, double fertC,
+                     double shootId, double rootId, double fertId,
+                     double &dpm, double &rpm, double &bio, double &hum);
+  //ETX
 
   vtkTAG2ERothCModelParameter *RothCModelParameter; // Do not delete in destructor
   vtkPolyData *CPools;
+  vtkTAG2ERothCSoilColumnIndex *SoilColumnIndex;
   int CPoolsInitiated; // Checks if the pools are initiated
   int EquilibriumRun;
   int AddCPoolsToOutput; // Add internal C pools to the output dataset
   double TemporalRatio; // 1/12 for months or 1/365 for days
+  int CPoolsTimeStep; // The time step of the loaded checkpoint
 
 private:
   vtkTAG2ERothCModel(const vtkTAG2ERothCModel& orig); // Not implemented.
@@ -137,11 +137,8 @@ int vtkTAG2ERothCModelEquilibrium::RequestData(
     vtkInformation * vtkNotUsed(request), vtkInformationVector **inputVector,
     vtkInformationVector *outputVector)
 {
-  vtkIdType i = 0, j = 0;
+  vtkIdType i = 0;
   vtkIdType cellId;
-  bool hasInputPools = true;
-  bool hasFertilizerId = true;
-  int numInputs = inputVector[0]->GetNumberOfInformationObjects();
 
   // Check for model parameter
   if (this->ModelParameter == NULL)
@@ -188,23 +185,6 @@ int vtkTAG2ERothCModelEquilibrium::RequestData(
   // Copy geometry from input
   output->CopyStructure(firstInput);
 
-#ifdef OMP_PARALLELIZED
-  // For line length computation
-  for (i = 0; i < this->TemporalResolution; i++)
-    {
-    vtkPolyData* input = vtkPolyData::GetData(inputVector[0], i);
-    // We must call the following method first in a single thread to
-    // avoid race conditions
-    if (input->GetNumberOfCells() > 0)
-      {
-      vtkIdList *tmp = vtkIdList::New();
-      input->GetCellPoints(0, tmp);
-      input->GetCellType(0);
-      tmp->Delete();
-      }
-    }
-#endif
-
   // Result array
   vtkDoubleArray *result = vtkDoubleArray::New();
   result->SetNumberOfComponents(1);
@@ -219,199 +199,159 @@ int vtkTAG2ERothCModelEquilibrium::RequestData(
   vtkDataArray *rootIdArray = firstInput->GetCellData()->GetArray(
       ROTHC_INPUT_NAME_ROOT_ID);
 
-  cout << "Equilibrium run start" << endl;
-
-  for (j = 0; j < this->NumberOfYears; j++)
+  // The pools are created as double arrays in CreateCPools(),
+  // hence we can access the raw memory
+  double *dpmPool = vtkDoubleArray::SafeDownCast(
+      this->CPools->GetCellData()->GetArray(ROTHC_POOL_NAME_DPM))->GetPointer(0);
+  double *rpmPool = vtkDoubleArray::SafeDownCast(
+      this->CPools->GetCellData()->GetArray(ROTHC_POOL_NAME_RPM))->GetPointer(0);
+  double *bioPool = vtkDoubleArray::SafeDownCast(
+      this->CPools->GetCellData()->GetArray(ROTHC_POOL_NAME_BIO))->GetPointer(0);
+  double *humPool = vtkDoubleArray::SafeDownCast(
+      this->CPools->GetCellData()->GetArray(ROTHC_POOL_NAME_HUM))->GetPointer(0);
+  double *iomPool = vtkDoubleArray::SafeDownCast(
+      this->CPools->GetCellData()->GetArray(ROTHC_POOL_NAME_IOM))->GetPointer(0);
+  double *resultValues = result->GetPointer(0);
+
+  // The precomputed responses, the vectors are empty in case
+  // the input has no cells
+  const double *decayFactors = NULL;
+  const double *efficiencies = NULL;
+  const double *roots = NULL;
+  const double *surface = NULL;
+
+  if (!this->DecayFactors.empty())
     {
-    for (i = 0; i < this->TemporalResolution; i++)
-      {
-      vtkPolyData* input = vtkPolyData::GetData(inputVector[0], i);
-      // Get array pointer for easy access
-      vtkDataArray *dpmArray = this->CPools->GetCellData()->GetArray(
-          ROTHC_POOL_NAME_DPM);
-      vtkDataArray *rpmArray = this->CPools->GetCellData()->GetArray(
-          ROTHC_POOL_NAME_RPM);
-      vtkDataArray *bioArray = this->CPools->GetCellData()->GetArray(
-          ROTHC_POOL_NAME_BIO);
-      vtkDataArray *humArray = this->CPools->GetCellData()->GetArray(
-          ROTHC_POOL_NAME_HUM);
-      vtkDataArray *iomArray = this->CPools->GetCellData()->GetArray(
-          ROTHC_POOL_NAME_IOM);
+    decayFactors = &this->DecayFactors[0];
+    efficiencies = &this->Efficiency[0];
+    roots = &this->Roots[0];
+    surface = &this->Surface[0];
+    }
+  int numberOfSteps = this->TemporalResolution;
+  int numberOfYears = this->NumberOfYears;
+
+  // Constants
+  double allocFractionhum = 0.54;
+  double allocFractionbio = 0.46;
 
+  cout << "Equilibrium run start" << endl;
+
+  // The cells are independent from each other, hence each cell runs
+  // through all years while the pools are kept in local variables
 #ifdef OMP_PARALLELIZED
 #pragma omp parallel for private(cellId)
 #endif
-      for (cellId = 0; cellId < firstInput->GetNumberOfCells(); cellId++)
-        {
-        double lineLength;
-        double p1[3];
-        double p2[3];
-        double a_res, b_res, c_res; // rate modifiers
-        double efficiency; // fraction of degraded C that remains
-        double allocFractionbio, allocFractionhum;
-        double dpm, rpm, bio, hum, iom; // Pools
-        double dpm_old, rpm_old, bio_old, hum_old; //old_pools
-        double meanTemp, fertC, usableFieldCapacity, soilMoisture, soilCover,
-            resRoots, resSurf, clay;
-        double shootId;
-        double rootId;
-
-        // The line length is not needed yet
-        /*
-         vtkIdList *pointIds = vtkIdList::New();
-         input->GetCellPoints(cellId, pointIds);
-
-         // Check cell type, we support only lines
-         if (input->GetCellType(cellId) != VTK_LINE)
-         {
-         vtkErrorMacro("Unsupported cell type.");
-         return -1;
-         }
-
-         // We support only lines with two coordinates
-         if (pointIds->GetNumberOfIds() != 2)
-         {
-         vtkErrorMacro("Unsupported line length.");
-         return -1;
-         }
-
-         // Compute length of the line in vertical direction
-         input->GetPoint(pointIds->GetId(0), p1);
-         input->GetPoint(pointIds->GetId(1), p2);
-         lineLength = fabs(p1[2] - p2[2]);
-         */
-
-        dpmArray->GetTuple(cellId, &dpm);
-        rpmArray->GetTuple(cellId, &rpm);
-        bioArray->GetTuple(cellId, &bio);
-        humArray->GetTuple(cellId, &hum);
-        iomArray->GetTuple(cellId, &iom);
-        dpm_old = dpm;
-        rpm_old = rpm;
-        bio_old = bio;
-        hum_old = hum;
-
-        // Root index 0 is the default value
-        if (rootIdArray)
-          {
-          rootIdArray->GetTuple(cellId, &rootId);
-          if ((int) rootId == this->NullValue)
-            rootId = 0;
-          } else
-          {
-          rootId = 0;
-          }
-
-        // Shoot index 0 is the default value
-        if (shootIdArray)
-          {
-          shootIdArray->GetTuple(cellId, &shootId);
-          if ((int) shootId == this->NullValue)
-            shootId = 0;
-          } else
-          {
-          shootId = 0;
-          }
-
-        // Get the responses
-        a_res = (*this->a[i])[cellId];
-        b_res = (*this->b[i])[cellId];
-        efficiency = (*this->x[i])[cellId];
-        resRoots = (*this->roots[i])[cellId];
-        resSurf = (*this->surface[i])[cellId];
-
-        // Constants
-        // we assume soil cover in the equilibrium run
-        c_res = 0.6;
-        allocFractionhum = 0.54;
-        allocFractionbio = 0.46;
-
-        if (R.PlantFractions.size() <= shootId)
-          {
-          vtkErrorMacro("Plant id is out of plant fraction vector boundaries");
+  for (cellId = 0; cellId < firstInput->GetNumberOfCells(); cellId++)
+    {
+    int year, step;
+    double dpm, rpm, bio, hum, iom; // Pools
+    double shootId;
+    double rootId;
+
+    dpm = dpmPool[cellId];
+    rpm = rpmPool[cellId];
+    bio = bioPool[cellId];
+    hum = humPool[cellId];
+    iom = iomPool[cellId];
+
+    // Root index 0 is the default value
+    if (rootIdArray)
+      {
+      rootIdArray->GetTuple(cellId, &rootId);
+      if ((int) rootId == this->NullValue)
+        rootId = 0;
+      } else
+      {
+      rootId = 0;
+      }
+
+    // Shoot index 0 is the default value
+    if (shootIdArray)
+      {
+      shootIdArray->GetTuple(cellId, &shootId);
+      if ((int) shootId == this->NullValue)
+        shootId = 0;
+      } else
+      {
+      shootId = 0;
+      }
+
+    if (R.PlantFractions.size() <= shootId)
+      {
+      vtkErrorMacro("Plant id is out of plant fraction vector boundaries");
 #ifndef OMP_PARALLELIZED
-          return -1;
+      result->Delete();
+      return -1;
 #else
-          continue;
+      continue;
 #endif
-          }
+      }
+
+    double dpmRootsFraction = R.PlantFractions[rootId]->DPM.value;
+    double rpmRootsFraction = R.PlantFractions[rootId]->RPM.value;
+    double humRootsFraction = R.PlantFractions[rootId]->HUM.value;
+
+    double dpmSurfFraction = R.PlantFractions[shootId]->DPM.value;
+    double rpmSurfFraction = R.PlantFractions[shootId]->RPM.value;
+    double humSurfFraction = R.PlantFractions[shootId]->HUM.value;
 
-        double dpmRootsFraction = R.PlantFractions[rootId]->DPM.value;
-        double rpmRootsFraction = R.PlantFractions[rootId]->RPM.value;
-        double humRootsFraction = R.PlantFractions[rootId]->HUM.value;
+    // The responses of this cell
+    const double *decay = decayFactors + cellId * numberOfSteps * 4;
+    const double *efficiency = efficiencies + cellId * numberOfSteps;
+    const double *resRoots = roots + cellId * numberOfSteps;
+    const double *resSurf = surface + cellId * numberOfSteps;
 
-        double dpmSurfFraction = R.PlantFractions[shootId]->DPM.value;
-        double rpmSurfFraction = R.PlantFractions[shootId]->RPM.value;
-        double humSurfFraction = R.PlantFractions[shootId]->HUM.value;
+    for (year = 0; year < numberOfYears; year++)
+      {
+      for (step = 0; step < numberOfSteps; step++)
+        {
+        double dpm_old, rpm_old, bio_old, hum_old; //old_pools
 
         // CPool computation
         // 1. Add residues from crop and fertilization
-        dpm_old = dpm_old + dpmRootsFraction * resRoots
-            + dpmSurfFraction * resSurf;
-        rpm_old = rpm_old + rpmRootsFraction * resRoots
-            + rpmSurfFraction * resSurf;
-        hum_old = hum_old + humRootsFraction * resRoots
-            + humSurfFraction * resSurf;
-
-        // Degradation
+        dpm_old = dpm + dpmRootsFraction * resRoots[step]
+            + dpmSurfFraction * resSurf[step];
+        rpm_old = rpm + rpmRootsFraction * resRoots[step]
+            + rpmSurfFraction * resSurf[step];
+        hum_old = hum + humRootsFraction * resRoots[step]
+            + humSurfFraction * resSurf[step];
+        bio_old = bio;
+
+        // Degradation with the precomputed decay factors
         double degradedC = 0;
-        double dpm_k, rpm_k, hum_k, bio_k;
-        dpm_k = R.k.DPM.value;
-        rpm_k = R.k.RPM.value;
-        hum_k = R.k.HUM.value;
-        bio_k = R.k.BIO.value;
-
-        // cout << "a " << a << " b " << b << " c " << c << " dpmRootsFraction "
-        //     << dpmRootsFraction << " dpmSurfFraction " << dpmSurfFraction
-        //     << " dpmFertFraction " << dpmFertFraction << endl;
-
-        dpm = dpm_old
-            * exp(
-                -1.0 * dpm_k * a_res * b_res * c_res
-                    / this->TemporalResolution);
+
+        dpm = dpm_old * decay[step * 4];
         degradedC = degradedC + (dpm_old - dpm);
 
-        rpm = rpm_old
-            * exp(
-                -1.0 * rpm_k * a_res * b_res * c_res
-                    / this->TemporalResolution);
+        rpm = rpm_old * decay[step * 4 + 1];
         degradedC = degradedC + (rpm_old - rpm);
 
-        hum = hum_old
-            * exp(
-                -1.0 * hum_k * a_res * b_res * c_res
-                    / this->TemporalResolution);
+        hum = hum_old * decay[step * 4 + 2];
         degradedC = degradedC + (hum_old - hum);
 
-        bio = bio_old
-            * exp(
-                -1.0 * bio_k * a_res * b_res * c_res
-                    / this->TemporalResolution);
+        bio = bio_old * decay[step * 4 + 3];
         degradedC = degradedC + (bio_old - bio);
 
-        // cout << "dpm_old " << dpm_old << " rpm_old " << rpm_old << " hum_old "
-        //     << hum_old << " bio_old " << bio_old << " dpm " << dpm << " rpm " << rpm
-        //     << " hum " << hum << " bio " << bio << endl;
-
         // Adding all that is not CO2 to bio and hum
-        hum = hum + degradedC * efficiency * allocFractionhum;
-        bio = bio + degradedC * efficiency * allocFractionbio;
-
-        // cout << "bio_new: " << bio << " degradedC  " << degradedC << " efficiency  "
-        //     << efficiency << endl;
-
-        result->SetTuple1(cellId, dpm + rpm + bio + hum + iom);
-
-        dpmArray->SetTuple1(cellId, dpm);
-        rpmArray->SetTuple1(cellId, rpm);
-        bioArray->SetTuple1(cellId, bio);
-        humArray->SetTuple1(cellId, hum);
-
-        //pointIds->Delete();
+        hum = hum + degradedC * efficiency[step] * allocFractionhum;
+        bio = bio + degradedC * efficiency[step] * allocFractionbio;
         }
       }
+
+    resultValues[cellId] = dpm + rpm + bio + hum + iom;
+
+    dpmPool[cellId] = dpm;
+    rpmPool[cellId] = rpm;
+    bioPool[cellId] = bio;
+    humPool[cellId] = hum;
     }
 
+  // The pool arrays were modified using raw pointers
+  this->CPools->GetCellData()->GetArray(ROTHC_POOL_NAME_DPM)->Modified();
+  this->CPools->GetCellData()->GetArray(ROTHC_POOL_NAME_RPM)->Modified();
+  this->CPools->GetCellData()->GetArray(ROTHC_POOL_NAME_BIO)->Modified();
+  this->CPools->GetCellData()->GetArray(ROTHC_POOL_NAME_HUM)->Modified();
+
   if (firstInput->GetCellData()->HasArray("Layer"))
     output->GetCellData()->AddArray(
         firstInput->GetCellData()->GetArray("Layer"));
@@ -436,9 +376,8 @@ int vtkTAG2ERothCModelEquilibrium::RequestData(
 int vtkTAG2ERothCModelEquilibrium::ComputeResponses(
     vtkInformationVector **inputVector)
 {
-  vtkIdType i = 0, j = 0;
+  vtkIdType i = 0;
   vtkIdType cellId;
-  bool hasInputPools = true;
   int numInputs = inputVector[0]->GetNumberOfInformationObjects();
 
   cout << "Compute response functions" << endl;
@@ -461,6 +400,8 @@ int vtkTAG2ERothCModelEquilibrium::ComputeResponses(
 
   // We need the first input
   vtkPolyData* firstInput = vtkPolyData::GetData(inputVector[0], i);
+  vtkIdType numberOfCells = firstInput->GetNumberOfCells();
+  int numberOfSteps = this->TemporalResolution;
 
   // the internal parameter object for fast access
   RothC &R = this->RothCModelParameter->GetInternalScheme();
@@ -495,13 +436,43 @@ int vtkTAG2ERothCModelEquilibrium::ComputeResponses(
           <<"Cell data array <" << ROTHC_INPUT_NAME_USABLE_FIELD_CAPACITY << "> is missing ");
       return -1;
       }
+    if (input->GetNumberOfCells() != numberOfCells)
+      {
+      vtkErrorMacro(<< "Input " << i << " has " << input->GetNumberOfCells()
+          << " cells, expected " << numberOfCells);
+      return -1;
+      }
     }
 
-  // Now we add the data arrays from all inputs to the output
+  // The response arrays store the values of a single cell
+  // contiguously for all time steps of a year
+  std::vector<double> aResponse(numberOfCells * numberOfSteps, 0.0);
+  std::vector<double> bResponse(numberOfCells * numberOfSteps, 0.0);
+  this->Efficiency.assign(numberOfCells * numberOfSteps, 0.0);
+  this->Roots.assign(numberOfCells * numberOfSteps, 0.0);
+  this->Surface.assign(numberOfCells * numberOfSteps, 0.0);
+  this->DecayFactors.assign(numberOfCells * numberOfSteps * 4, 0.0);
+
+  // Rate modifier parameter
+  double a1 = R.a.a1.value;
+  double a2 = R.a.a2.value;
+  double a3 = R.a.a3.value;
+  double b1 = R.b.b1.value;
+  double b2 = R.b.b2.value;
+  double b3 = R.b.b3.value;
+  double x1 = R.x.x1.value;
+  double x2 = R.x.x2.value;
+  double x3 = R.x.x3.value;
+  double x4 = R.x.x4.value;
+
   for (i = 0; i < numInputs; i++)
     {
     vtkDataSet* input = vtkDataSet::GetData(inputVector[0], i);
 
+    // We need to aggregate the responses in case of yearly resolution,
+    // hence all inputs are summed up in the first time step
+    int step = (numberOfSteps == ROTHC_YEARLY) ? 0 : i;
+
     vtkDataArray *clayArray = input->GetCellData()->GetArray(
         ROTHC_INPUT_NAME_CLAY);
     vtkDataArray *meanTempArray = input->GetCellData()->GetArray(
@@ -510,8 +481,6 @@ int vtkTAG2ERothCModelEquilibrium::ComputeResponses(
         ROTHC_INPUT_NAME_SOIL_MOISTURE);
     vtkDataArray *usableFieldCArray = input->GetCellData()->GetArray(
         ROTHC_INPUT_NAME_USABLE_FIELD_CAPACITY);
-    vtkDataArray *fertCArray = input->GetCellData()->GetArray(
-        ROTHC_INPUT_NAME_FERTILIZER_CARBON);
 
     // Residuals are optional
     vtkDataArray *resRootsArray = input->GetCellData()->GetArray(
@@ -519,20 +488,12 @@ int vtkTAG2ERothCModelEquilibrium::ComputeResponses(
     vtkDataArray *resSurfArray = input->GetCellData()->GetArray(
         ROTHC_INPUT_NAME_RESIDUALS_SURFACE);
 
-    std::vector<double> *a_resp = new std::vector<double>;
-    std::vector<double> *b_resp = new std::vector<double>;
-    std::vector<double> *x_resp = new std::vector<double>;
-    std::vector<double> *roots_resp = new std::vector<double>;
-    std::vector<double> *surf_resp = new std::vector<double>;
-
-    for (cellId = 0; cellId < input->GetNumberOfCells(); cellId++)
+    for (cellId = 0; cellId < numberOfCells; cellId++)
       {
       double a, b, x; // rate modifiers
-      double x1, x2, x3, x4;
-      double a1, a2, a3; // rate modifier parameter
-      double b1, b2, b3;
       double meanTemp, usableFieldCapacity, soilMoisture, clay, resRoots,
           resSurf;
+      vtkIdType index = cellId * numberOfSteps + step;
 
       // We set them 0 if no residuals are provided
       if (resRootsArray)
@@ -544,78 +505,63 @@ int vtkTAG2ERothCModelEquilibrium::ComputeResponses(
       else
         resSurf = 0.0;
 
-      roots_resp->push_back(resRoots);
-      surf_resp->push_back(resSurf);
-
       clayArray->GetTuple(cellId, &clay);
       meanTempArray->GetTuple(cellId, &meanTemp);
       soilMArray->GetTuple(cellId, &soilMoisture); //[mm]
       usableFieldCArray->GetTuple(cellId, &usableFieldCapacity); // [mm]?
 
-      a1 = R.a.a1.value;
-      a2 = R.a.a2.value;
-      a3 = R.a.a3.value;
-
       // a of (1 - e^(-abckt)) (Temperature Response)
       a = a1 / (1.0 + exp(a2 / (meanTemp + a3)));
 
-      a_resp->push_back(a);
-
       // b (moistureResponse)
-      b1 = R.b.b1.value;
-      b2 = R.b.b2.value;
-      b3 = R.b.b3.value;
-
       if (soilMoisture > usableFieldCapacity * b3)
         b = 1;
       else
         b = b1 + (b2 - b1) * soilMoisture / (usableFieldCapacity * b3);
 
-      b_resp->push_back(b);
-
       // efficiency , that describes how much of degraded C remains in the system
       // and is not blown out as CO2
-
-      x1 = R.x.x1.value;
-      x2 = R.x.x2.value;
-      x3 = R.x.x3.value;
-      x4 = R.x.x4.value;
-
       x = x1 * (x2 + x3 * exp(x4 * clay));
       x = 1 / (1 + x);
 
-      x_resp->push_back(x);
+      aResponse[index] += a;
+      bResponse[index] += b;
+      this->Efficiency[index] += x;
+      // Roots and surface residuals are simply aggregated over time
+      this->Roots[index] += resRoots;
+      this->Surface[index] += resSurf;
       }
-
-    this->a.push_back(a_resp);
-    this->b.push_back(b_resp);
-    this->x.push_back(x_resp);
-    this->roots.push_back(roots_resp);
-    this->surface.push_back(surf_resp);
     }
 
-  // We need to aggregate the arrays in case of yearly resolution
-  // The first vector contains the arithmetic mean
+  // The first time step contains the arithmetic mean
+  // in case of yearly resolution
   if (this->TemporalResolution == ROTHC_YEARLY)
     {
-    for (i = 1; i < numInputs; i++)
+    for (cellId = 0; cellId < numberOfCells; cellId++)
       {
-      vtkDataSet* input = vtkDataSet::GetData(inputVector[0], i);
-      for (cellId = 0; cellId < input->GetNumberOfCells(); cellId++)
-        {
-        (*this->a[0])[cellId] += (*this->a[i])[cellId];
-        (*this->b[0])[cellId] += (*this->b[i])[cellId];
-        (*this->x[0])[cellId] += (*this->x[i])[cellId];
-        // Roots and surface residuals are simply aggregated over time
-        (*this->roots[0])[cellId] += (*this->roots[i])[cellId];
-        (*this->surface[0])[cellId] += (*this->surface[i])[cellId];
-        }
+      aResponse[cellId] /= numInputs;
+      bResponse[cellId] /= numInputs;
+      this->Efficiency[cellId] /= numInputs;
       }
-    for (cellId = 0; cellId < firstInput->GetNumberOfCells(); cellId++)
+    }
+
+  // Precompute the decay factors of the DPM, RPM, HUM and BIO pool,
+  // we assume soil cover in the equilibrium run
+  double c_res = 0.6;
+  double k[4];
+  k[0] = R.k.DPM.value;
+  k[1] = R.k.RPM.value;
+  k[2] = R.k.HUM.value;
+  k[3] = R.k.BIO.value;
+
+  for (i = 0; i < numberOfCells * numberOfSteps; i++)
+    {
+    int pool;
+    for (pool = 0; pool < 4; pool++)
       {
-      (*this->a[0])[cellId] /= numInputs;
-      (*this->b[0])[cellId] /= numInputs;
-      (*this->x[0])[cellId] /= numInputs;
+      this->DecayFactors[i * 4 + pool] = exp(
+          -1.0 * k[pool] * aResponse[i] * bResponse[i] * c_res
+              / this->TemporalResolution);
       }
     }
 
@@ -98,6 +98,8 @@ protected:
   //! \brief Initiate the internal CPools arrays in case
   //! there where not provided in the input
   virtual void CreateCPools(vtkPolyData *input);
+  //! \brief Precompute the decay factors, efficiencies and residuals
+  //! of each cell and time step, which are constant over all years
   virtual int ComputeResponses(vtkInformationVector **inputVector);
 
   vtkTAG2ERothCModelParameter *RothCModelParameter; // Do not delete in destructor
@@ -106,13 +108,12 @@ protected:
   int TemporalResolution; // either 365 days, 12 months or 1 year
   int NumberOfYears;
 
-  // Response arrays
-  std::vector <std::vector<double>* > a;
-  std::vector <std::vector<double>* > b;
-  std::vector <std::vector<double>* > c;
-  std::vector <std::vector<double>* > x;
-  std::vector <std::vector<double>* > roots;
-  std::vector <std::vector<double>* > surface;
+  // Precomputed response arrays, the values of a single cell
+  // are stored contiguously for all time steps of a year
+  std::vector<double> DecayFactors; // DPM, RPM, HUM and BIO decay factor
+  std::vector<double> Efficiency; // Fraction of degraded C that remains
+  std::vector<double> Roots; // Root residuals
+  std::vector<double> Surface; // Surface residuals
 
 private:
   vtkTAG2ERothCModelEquilibrium(const vtkTAG2ERothCModelEquilibrium& orig); // Not implemented.
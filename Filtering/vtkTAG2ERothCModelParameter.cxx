@@ -200,7 +200,57 @@ vtkTAG2ERothCModelParameter::vtkTAG2ERothCModelParameter()
 
 vtkTAG2ERothCModelParameter::~vtkTAG2ERothCModelParameter()
 {
-  ;
+  this->DeleteFractions();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ERothCModelParameter::DeleteFractions()
+{
+  unsigned int i;
+
+  for (i = 0; i < this->R.PlantFractions.size(); i++)
+    delete this->R.PlantFractions[i];
+  this->R.PlantFractions.clear();
+
+  for (i = 0; i < this->R.FertilizerFractions.size(); i++)
+    delete this->R.FertilizerFractions[i];
+  this->R.FertilizerFractions.clear();
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2ERothCModelParameter::DeepCopy(
+    vtkTAG2EAbstractCalibratableModelParameter *parameter)
+{
+  unsigned int i;
+
+  if (!this->Superclass::DeepCopy(parameter))
+    return false;
+
+  vtkTAG2ERothCModelParameter *rothc =
+      vtkTAG2ERothCModelParameter::SafeDownCast(parameter);
+
+  if (rothc == this)
+    return true;
+
+  this->R.a = rothc->R.a;
+  this->R.b = rothc->R.b;
+  this->R.c = rothc->R.c;
+  this->R.k = rothc->R.k;
+  this->R.x = rothc->R.x;
+
+  // The fractions are referenced by pointer and must be duplicated
+  this->DeleteFractions();
+  for (i = 0; i < rothc->R.PlantFractions.size(); i++)
+    this->R.PlantFractions.push_back(
+        new RothCParameterFraction(*rothc->R.PlantFractions[i]));
+
+  for (i = 0; i < rothc->R.FertilizerFractions.size(); i++)
+    this->R.FertilizerFractions.push_back(
+        new RothCParameterFraction(*rothc->R.FertilizerFractions[i]));
+
+  return true;
 }
 
 //----------------------------------------------------------------------------
@@ -780,6 +830,7 @@ bool vtkTAG2ERothCModelParameter::CreateParameterIndex()
 bool vtkTAG2ERothCModelParameter::GenerateInternalSchemeFromXML()
 {
   int i;
+  unsigned int j;
   vtkXMLDataElement *root = this->XMLRoot;
 
   if (root == NULL)
@@ -910,6 +961,8 @@ bool vtkTAG2ERothCModelParameter::GenerateInternalSchemeFromXML()
       "PlantFractions");
   if (plantsXML != NULL)
     {
+    for (j = 0; j < this->R.PlantFractions.size(); j++)
+      delete this->R.PlantFractions[j];
     this->R.PlantFractions.clear();
     for (i = 0; i < plantsXML->GetNumberOfNestedElements(); i++)
       {
@@ -950,6 +1003,8 @@ bool vtkTAG2ERothCModelParameter::GenerateInternalSchemeFromXML()
       "FertilizerFractions");
   if (fertsXML != NULL)
     {
+    for (j = 0; j < this->R.FertilizerFractions.size(); j++)
+      delete this->R.FertilizerFractions[j];
     this->R.FertilizerFractions.clear();
     for (i = 0; i < fertsXML->GetNumberOfNestedElements(); i++)
       {
@@ -243,6 +243,12 @@ vtkTypeRevisionMacro(vtkTAG2ERothCModelParameter,
    */
   virtual bool GenerateXMLFromInternalScheme();
 
+  /**
+   * \brief Copy the RothC parameter including the plant and fertilizer
+   *  fractions and the parameter state of another RothC model parameter
+   */
+  virtual bool DeepCopy(vtkTAG2EAbstractCalibratableModelParameter *parameter);
+
   //BTX
   RothC &GetInternalScheme()
   {
@@ -261,6 +267,8 @@ protected:
   bool ParseRothCParameter(vtkXMLDataElement *XMLRothC, RothCParameter &p);
   virtual bool CreateParameterIndex();
   virtual bool SetParameter(unsigned int index, double value);
+  //!\brief Delete the plant and fertilizer fractions, which are owned by this class
+  void DeleteFractions();
 
   // BTX
   RothC R;
@@ -45,13 +45,8 @@
 #include <vtkIdTypeArray.h>
 #include <vtkCell.h>
 #include <vtkMath.h>
-#include <vtkSortDataArray.h>
 #include "vtkTAG2EDefines.h"
 
-#ifdef MULTIPLE_LAYER_SUPPORT
-#undef MULTIPLE_LAYER_SUPPORT
-#endif
-
 extern "C" {
 #include <math.h>
 }
@@ -70,13 +65,14 @@ vtkTAG2ERothCResidualFilter::vtkTAG2ERothCResidualFilter()
 {
   this->SetNumberOfInputPorts(1);
   this->SetNumberOfOutputPorts(1);
+  this->SoilColumnIndex = vtkTAG2ERothCSoilColumnIndex::New();
 }
 
 //----------------------------------------------------------------------------
 
 vtkTAG2ERothCResidualFilter::~vtkTAG2ERothCResidualFilter()
 {
-  ;
+  this->SetSoilColumnIndex(NULL);
 }
 
 //----------------------------------------------------------------------------
@@ -109,7 +105,6 @@ int vtkTAG2ERothCResidualFilter::RequestData(
     vtkInformationVector *outputVector)
 {
   vtkIdType cellId;
-  double lineLength;
 
   vtkDataSet* input = vtkDataSet::GetData(inputVector[0]);
   vtkDataSet* output = vtkDataSet::GetData(outputVector);
@@ -150,93 +145,19 @@ int vtkTAG2ERothCResidualFilter::RequestData(
   // vtkDataArray *rootDepthArray = input->GetCellData()->GetArray(
   //     ROTHC_INPUT_NAME_ROOT_DEPTH);
 
-  vtkIntArray *layerIdArray = vtkIntArray::New();
-  layerIdArray->SetNumberOfComponents(1);
-  layerIdArray->SetName(ROTHC_INPUT_NAME_LAYER);
-  layerIdArray->SetNumberOfTuples(output->GetNumberOfCells());
-  layerIdArray->FillComponent(0, 0);
-
-#ifdef MULTIPLE_LAYER_SUPPORT
-  vtkUnsignedCharArray *checkIdArray = vtkUnsignedCharArray::New();
-  checkIdArray->SetNumberOfComponents(1);
-  checkIdArray->SetName("CechkId");
-  checkIdArray->SetNumberOfTuples(output->GetNumberOfCells());
-  checkIdArray->FillComponent(0, 0.0);
-
-  vtkDoubleArray *lineLengthArray = vtkDoubleArray::New();
-  lineLengthArray->SetNumberOfComponents(1);
-  lineLengthArray->SetName(ROTHC_INPUT_NAME_LINE_LENGTH);
-  lineLengthArray->SetNumberOfTuples(output->GetNumberOfCells());
-
-  vtkDoubleArray *cumulativeRootFraction = vtkDoubleArray::New();
-  cumulativeRootFraction->SetNumberOfComponents(1);
-  cumulativeRootFraction->SetName(ROTHC_INPUT_NAME_CUMULATIVE_LINE_LENGTH);
-  cumulativeRootFraction->SetNumberOfTuples(output->GetNumberOfCells());
-
-  vtkDoubleArray *lineCenterArray = vtkDoubleArray::New();
-  lineCenterArray->SetNumberOfComponents(3);
-  lineCenterArray->SetName(ROTHC_INPUT_NAME_LINE_CENTER);
-  lineCenterArray->SetNumberOfTuples(output->GetNumberOfCells());
-
-  // Create the arrays that are needed to compute the layer id
-  vtkDoubleArray *centerCoorArray = vtkDoubleArray::New();
-  centerCoorArray->SetNumberOfComponents(1);
-  vtkIdTypeArray *cellIdArray = vtkIdTypeArray::New();
-  cellIdArray->SetNumberOfComponents(1);
-
-  // Compute the layer id and check the topology and line length
-  // Parallelize with OpenMP
-  for (cellId = 0; cellId < input->GetNumberOfCells(); cellId++)
+  // Compute the layer id and check the topology and line length,
+  // the soil column index is only recomputed if the geometry changed
+  if (!this->SoilColumnIndex->Update(vtkPolyData::SafeDownCast(input)))
     {
-    int layer;
-    int numLayer;
-
-    // Jump over checked cells
-    if (checkIdArray->GetValue(cellId))
-      continue;
-
-    // reset the array that stores the neighbors of the current cell
-    centerCoorArray->Reset();
-    cellIdArray->Reset();
-
-    // cout << "Check cell id: " << cellId << endl;
-
-    // Check the cell neighbors
-    if (!this->CheckCellNeighbours(input, cellId, centerCoorArray, cellIdArray,
-        checkIdArray, lineLengthArray, lineCenterArray))
-      return -1;
-
-    // Sort the cell id layer array to identify the layer number
-    vtkSortDataArray::Sort(centerCoorArray, cellIdArray);
-
-    // Check the neighbors
-    numLayer = cellIdArray->GetNumberOfTuples();
-
-    // cout << "Identified layer: " << numLayer << endl;
-
-    // Store the layer id, 0 is top layer
-    for (layer = 0; layer < numLayer; layer++)
-      {
-      layerIdArray->SetValue(cellIdArray->GetValue(layer),
-          numLayer - (layer + 1));
-      }
-
-    lineLength = 0.0;
-    // compute the cumulative line length
+    residualsRootsArray->Delete();
+    residualsSurfaceArray->Delete();
+    return -1;
+    }
 
-    // ATTENTION: We need to implement a depth dependent
-    // residual fraction for roots, see "A global analysis of root distributions for terrestrial biomes"
-    // from Jackson et al 1996
-    for (layer = numLayer - 1; layer >= 0; layer--)
-      {
-      double length = lineLengthArray->GetValue(cellIdArray->GetValue(layer));
-      lineLength += length;
+  vtkIntArray *layerIdArray = vtkIntArray::New();
+  layerIdArray->DeepCopy(this->SoilColumnIndex->GetLayerId());
+  layerIdArray->SetName(ROTHC_INPUT_NAME_LAYER);
 
-      cumulativeRootFraction->SetValue(cellIdArray->GetValue(layer),
-          lineLength);
-      }
-    }
-#endif
   // Compute the residuals
   // ATTENTION: We need to implement a depth dependent
   // residual fraction for roots, see "A global analysis of root distributions for terrestrial biomes"
@@ -296,139 +217,17 @@ int vtkTAG2ERothCResidualFilter::RequestData(
   output->GetCellData()->SetActiveScalars(residualsSurfaceArray->GetName());
   residualsRootsArray->Delete();
   residualsSurfaceArray->Delete();
-#ifdef MULTIPLE_LAYER_SUPPORT
   output->GetCellData()->AddArray(layerIdArray);
-  output->GetCellData()->AddArray(lineCenterArray);
-  output->GetCellData()->AddArray(lineLengthArray);
-  output->GetCellData()->AddArray(cumulativeRootFraction);
-  output->GetCellData()->AddArray(checkIdArray);
+  output->GetCellData()->AddArray(this->SoilColumnIndex->GetLineCenter());
+  output->GetCellData()->AddArray(this->SoilColumnIndex->GetLineLength());
+  output->GetCellData()->AddArray(this->SoilColumnIndex->GetCumulativeLineLength());
   layerIdArray->Delete();
-  lineLengthArray->Delete();
-  cumulativeRootFraction->Delete();
-  checkIdArray->Delete();
-  centerCoorArray->Delete();
-  cellIdArray->Delete();
-  lineCenterArray->Delete();
-#endif
 
   return 1;
 }
 
 //----------------------------------------------------------------------------
 
-double vtkTAG2ERothCResidualFilter::ComputeLineLength(vtkDataSet *input,
-                                                      vtkIdList *pointIds)
-{
-  double p1[3];
-  double p2[3];
-
-  // Compute length of the line in vertical direction
-  input->GetPoint(pointIds->GetId(0), p1);
-  input->GetPoint(pointIds->GetId(1), p2);
-  return fabs(p1[2] - p2[2]);
-}
-
-//----------------------------------------------------------------------------
-
-void vtkTAG2ERothCResidualFilter::ComputeCenterPoint(vtkDataSet *input,
-                                                     vtkIdList *pointIds,
-                                                     double *center)
-{
-  double p1[3];
-  double p2[3];
-
-  // Compute length of the line in vertical direction
-  input->GetPoint(pointIds->GetId(0), p1);
-  input->GetPoint(pointIds->GetId(1), p2);
-
-  center[0] = (p1[0] + p2[0]) / 2.0;
-  center[1] = (p1[1] + p2[1]) / 2.0;
-  center[2] = (p1[2] + p2[2]) / 2.0;
-}
-
-//----------------------------------------------------------------------------
-
-bool vtkTAG2ERothCResidualFilter::CheckCellNeighbours(
-    vtkDataSet *input, vtkIdType cellId, vtkDoubleArray *centerCoorArray,
-    vtkIdTypeArray *cellIdArray, vtkUnsignedCharArray *checkIdArray,
-    vtkDoubleArray *lineLengthArray, vtkDoubleArray *lineCenterArray)
-{
-  double lineLength;
-  double center[3];
-
-  // Return if this cell was already processed
-  if (checkIdArray->GetValue(cellId))
-    return true;
-
-  // cout << "Processing cell id: " << cellId << endl;
-
-  vtkIdList *pointIds = vtkIdList::New();
-
-  // Check cell type, we support only lines
-  if (input->GetCellType(cellId) != VTK_LINE)
-    {
-    vtkErrorMacro("Unsupported cell type.");
-    return false;
-    }
-
-  input->GetCellPoints(cellId, pointIds);
-
-  // We support only lines with two coordinates
-  if (pointIds->GetNumberOfIds() != 2)
-    {
-    vtkErrorMacro("Unsupported line length.");
-    return false;
-    }
-
-  // Compute length of the line in vertical direction
-  lineLength = this->ComputeLineLength(input, pointIds);
-  lineLengthArray->SetTuple1(cellId, lineLength);
-
-  this->ComputeCenterPoint(input, pointIds, center);
-  lineCenterArray->SetTuple3(cellId, center[0], center[1], center[2]);
-
-  // Store the z coordinate and the current cell ids
-  // for later layer id computation
-  centerCoorArray->InsertNextValue(center[2]);
-  cellIdArray->InsertNextValue(cellId);
-
-  // cout << "Center: " << center[2] << endl;
-
-  // Mark the current cell id as processed
-  checkIdArray->SetValue(cellId, true);
-
-  vtkIdList *idList = vtkIdList::New();
-  vtkIdList *neighborCellIds = vtkIdList::New();
-
-  // We need to check the cell neighbors for each vertices of the cell
-  for (vtkIdType i = 0; i < pointIds->GetNumberOfIds(); i++)
-    {
-    idList->Reset();
-    neighborCellIds->Reset();
-
-    idList->InsertNextId(pointIds->GetId(i));
-
-    //get the neighbors of the cell
-    input->GetCellNeighbors(cellId, idList, neighborCellIds);
-
-    for (vtkIdType j = 0; j < neighborCellIds->GetNumberOfIds(); j++)
-      {
-      if (!this->CheckCellNeighbours(input, neighborCellIds->GetId(j),
-          centerCoorArray, cellIdArray, checkIdArray, lineLengthArray,
-          lineCenterArray))
-        return false;
-      }
-    }
-
-  pointIds->Delete();
-  idList->Delete();
-  neighborCellIds->Delete();
-
-  return true;
-}
-
-//----------------------------------------------------------------------------
-
 void vtkTAG2ERothCResidualFilter::PrintSelf(ostream& os, vtkIndent indent)
 {
   this->Superclass::PrintSelf(os, indent);
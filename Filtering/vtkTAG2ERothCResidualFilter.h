@@ -38,7 +38,7 @@
  *
  * Based on the topological structure of the input dataset that must
  * be build up based on lines, the layer id (top == 0) and the cumulative
- * line lentgh are computed.
+ * line lentgh are computed using a vtkTAG2ERothCSoilColumnIndex.
  *
  * ATTENTION: We need to implement a depth dependent
  * residual fraction for roots, see "A global analysis of root distributions for terrestrial biomes"
@@ -54,6 +54,7 @@
 
 #include <vtkPolyData.h>
 #include "vtkTAG2EAbstractCalibratableModel.h"
+#include "vtkTAG2ERothCSoilColumnIndex.h"
 
 class vtkTAG2ERothCResidualFilter: public vtkTAG2EAbstractModel
 {
@@ -71,6 +72,12 @@ vtkTypeRevisionMacro(vtkTAG2ERothCResidualFilter, vtkTAG2EAbstractModel);
   //!\brief This model has no XML description yet
   void SetModelParameter(vtkTAG2EAbstractModelParameter* modelParameter){;}
 
+  //! \brief Set the soil column index that provides the layer id and the
+  //! cumulative line length, it can be shared with other RothC filters
+  vtkSetObjectMacro(SoilColumnIndex, vtkTAG2ERothCSoilColumnIndex);
+  //! \brief Get the soil column index
+  vtkGetObjectMacro(SoilColumnIndex, vtkTAG2ERothCSoilColumnIndex);
+
 protected:
   vtkTAG2ERothCResidualFilter();
   ~vtkTAG2ERothCResidualFilter();
@@ -80,32 +87,7 @@ protected:
   virtual int FillInputPortInformation(int port, vtkInformation* info);
   virtual int FillOutputPortInformation(int port, vtkInformation* info);
 
-  //! \brief Compute the line length of two points from the the input data set
-  //! \param input The input data set
-  //! \param pointIds The ids of the two points
-  virtual double ComputeLineLength(vtkDataSet *input, vtkIdList *pointIds);
-
-  //! \brief Compute the center point of two points from the input data set
-  //! \param input The input data set
-  //! \param pointIds The ids of the two points
-  //! \param center The resulting coordinates, must have a size of 3 doubles
-  virtual void ComputeCenterPoint(vtkDataSet *input,
-                                  vtkIdList *pointIds,
-                                  double *center);
-
-  //! \brief Check the cell neighbors
-  //!
-  //! This method calls itself recursively for each cell neighbor
-  //! of the cellId. The cell id and the computed center coordinate will be
-  //! added to the corresponding arrays. The line length will be computed.
-  //! Visited cells will be marked as checked in the checkIdArray.
-  virtual bool CheckCellNeighbours(vtkDataSet *input,
-                                    vtkIdType cellId,
-                                    vtkDoubleArray *centerCoorArray,
-                                    vtkIdTypeArray *cellIdArray,
-                                    vtkUnsignedCharArray *checkIdArray,
-                                    vtkDoubleArray *lineLengthArray,
-                                    vtkDoubleArray *lineCenterArray);
+  vtkTAG2ERothCSoilColumnIndex *SoilColumnIndex;
   double TimeInterval;
 
 private:
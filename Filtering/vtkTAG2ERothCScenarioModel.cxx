@@ -0,0 +1,456 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#include <vtkPolyData.h>
+#include <vtkCellData.h>
+#include <vtkDoubleArray.h>
+#include <vtkInformation.h>
+#include <vtkInformationVector.h>
+#include <vtkObjectFactory.h>
+#include "vtkTAG2ERothCScenarioModel.h"
+#include "vtkTAG2ERothCDefines.h"
+#include "vtkTAG2EDefines.h"
+
+vtkCxxRevisionMacro(vtkTAG2ERothCScenarioModel, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2ERothCScenarioModel);
+
+//----------------------------------------------------------------------------
+
+// Return the value of a scenario, arrays with a single
+// component provide the same value for all scenarios
+static inline double GetScenarioValue(vtkDataArray *array, vtkIdType cellId,
+                                      int scenario)
+{
+  if (array->GetNumberOfComponents() == 1)
+    return array->GetComponent(cellId, 0);
+  return array->GetComponent(cellId, scenario);
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2ERothCScenarioModel::vtkTAG2ERothCScenarioModel()
+{
+  this->NumberOfScenarios = 1;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2ERothCScenarioModel::~vtkTAG2ERothCScenarioModel()
+{
+  this->RemoveAllScenarioModelParameters();
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ERothCScenarioModel::SetScenarioModelParameter(int scenario,
+    vtkTAG2ERothCModelParameter *parameter)
+{
+  if (scenario < 0)
+    {
+    vtkErrorMacro(<< "The scenario index must be positive");
+    return;
+    }
+
+  if (scenario >= (int)this->ScenarioModelParameters.size())
+    this->ScenarioModelParameters.resize(scenario + 1, NULL);
+
+  if (this->ScenarioModelParameters[scenario] == parameter)
+    return;
+
+  if (this->ScenarioModelParameters[scenario])
+    this->ScenarioModelParameters[scenario]->UnRegister(this);
+
+  this->ScenarioModelParameters[scenario] = parameter;
+
+  if (parameter)
+    {
+    parameter->Register(this);
+    // Generate the internal representation
+    parameter->GenerateInternalSchemeFromXML();
+    }
+
+  this->Modified();
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2ERothCModelParameter *vtkTAG2ERothCScenarioModel::GetScenarioModelParameter(
+    int scenario)
+{
+  if (scenario < 0 || scenario >= (int)this->ScenarioModelParameters.size())
+    return NULL;
+  return this->ScenarioModelParameters[scenario];
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ERothCScenarioModel::RemoveAllScenarioModelParameters()
+{
+  unsigned int i;
+
+  if (this->ScenarioModelParameters.size() == 0)
+    return;
+
+  for (i = 0; i < this->ScenarioModelParameters.size(); i++)
+    {
+    if (this->ScenarioModelParameters[i])
+      this->ScenarioModelParameters[i]->UnRegister(this);
+    }
+
+  this->ScenarioModelParameters.clear();
+  this->Modified();
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2ERothCScenarioModel::ExpandCPools()
+{
+  int i, s;
+  vtkIdType cellId;
+  const char *names[5] = {ROTHC_POOL_NAME_DPM, ROTHC_POOL_NAME_RPM,
+                          ROTHC_POOL_NAME_BIO, ROTHC_POOL_NAME_HUM,
+                          ROTHC_POOL_NAME_IOM};
+
+  for (i = 0; i < 5; i++)
+    {
+    vtkDataArray *pool = this->CPools->GetCellData()->GetArray(names[i]);
+
+    if (pool == NULL)
+      {
+      vtkErrorMacro(<< "C pool <" << names[i] << "> is missing");
+      return false;
+      }
+
+    if (pool->GetNumberOfComponents() == this->NumberOfScenarios)
+      continue;
+
+    if (pool->GetNumberOfComponents() != 1)
+      {
+      vtkErrorMacro(<< "C pool <" << names[i] << "> has "
+          << pool->GetNumberOfComponents() << " components, expected 1 or "
+          << this->NumberOfScenarios);
+      return false;
+      }
+
+    // Replicate the pool for all scenarios, the new array
+    // replaces the pool with the same name
+    vtkDoubleArray *expanded = vtkDoubleArray::New();
+    expanded->SetName(names[i]);
+    expanded->SetNumberOfComponents(this->NumberOfScenarios);
+    expanded->SetNumberOfTuples(pool->GetNumberOfTuples());
+
+    for (cellId = 0; cellId < pool->GetNumberOfTuples(); cellId++)
+      {
+      double value = pool->GetComponent(cellId, 0);
+      for (s = 0; s < this->NumberOfScenarios; s++)
+        expanded->SetComponent(cellId, s, value);
+      }
+
+    this->CPools->GetCellData()->AddArray(expanded);
+    expanded->Delete();
+    }
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2ERothCScenarioModel::RequestData(vtkInformation * vtkNotUsed(request),
+                                            vtkInformationVector **inputVector,
+                                            vtkInformationVector *outputVector)
+{
+  int i, s;
+  vtkIdType cellId;
+  int numberOfScenarios = this->NumberOfScenarios;
+  int error = 0;
+
+  // Check for model parameter
+  if (this->ModelParameter == NULL)
+    {
+    vtkErrorMacro("Model parameter not set or invalid.");
+    return -1;
+    }
+
+  // The internal parameter objects of all scenarios for fast access
+  std::vector<RothC*> parameters(numberOfScenarios);
+  for (s = 0; s < numberOfScenarios; s++)
+    {
+    vtkTAG2ERothCModelParameter *parameter = this->GetScenarioModelParameter(s);
+    if (parameter == NULL)
+      parameter = this->RothCModelParameter;
+    parameters[s] = &parameter->GetInternalScheme();
+    }
+
+  vtkPolyData* input = vtkPolyData::GetData(inputVector[0]);
+  vtkPolyData* output = vtkPolyData::GetData(outputVector);
+
+  // Allocate or initiate the C pools
+  if (!this->SetupCPools(input))
+    return -1;
+
+  // Check the array names
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_CLAY))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_CLAY << "> is missing ");
+    return -1;
+    }
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_MEAN_TEMPERATURE))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_MEAN_TEMPERATURE << "> is missing ");
+    return -1;
+    }
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_SOILCOVER))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_SOILCOVER << "> is missing ");
+    return -1;
+    }
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_SOIL_MOISTURE))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_SOIL_MOISTURE << "> is missing ");
+    return -1;
+    }
+  if (!input->GetCellData()->HasArray(ROTHC_INPUT_NAME_USABLE_FIELD_CAPACITY))
+    {
+    vtkErrorMacro(
+        <<"Cell data array <" << ROTHC_INPUT_NAME_USABLE_FIELD_CAPACITY << "> is missing ");
+    return -1;
+    }
+
+  // Check the line cells, the soil column index is only
+  // recomputed if the geometry changed
+  if (!this->SoilColumnIndex->Update(input))
+    return -1;
+
+  // The pools need a component for each scenario
+  if (!this->ExpandCPools())
+    return -1;
+
+  // Get array pointer for easy access
+  vtkDataArray *dpmArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_DPM);
+  vtkDataArray *rpmArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_RPM);
+  vtkDataArray *bioArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_BIO);
+  vtkDataArray *humArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_HUM);
+  vtkDataArray *iomArray = this->CPools->GetCellData()->GetArray(
+      ROTHC_POOL_NAME_IOM);
+  vtkDataArray *clayArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_CLAY);
+  vtkDataArray *meanTempArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_MEAN_TEMPERATURE);
+  vtkDataArray *soilCoverArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_SOILCOVER);
+  vtkDataArray *soilMArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_SOIL_MOISTURE);
+  vtkDataArray *usableFieldCArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_USABLE_FIELD_CAPACITY);
+
+  // The optional scenario arrays
+  vtkDataArray *resRootsArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_RESIDUALS_ROOTS);
+  vtkDataArray *resSurfArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_RESIDUALS_SURFACE);
+  vtkDataArray *fertCArray = input->GetCellData()->GetArray(
+      ROTHC_INPUT_NAME_FERTILIZER_CARBON);
+  vtkDataArray *shootIdArray = input->GetCellData()->GetArray(ROTHC_INPUT_NAME_SHOOT_ID);
+  vtkDataArray *rootIdArray = input->GetCellData()->GetArray(ROTHC_INPUT_NAME_ROOT_ID);
+  vtkDataArray *fertIdArray = input->GetCellData()->GetArray(
+        ROTHC_INPUT_NAME_FERTILIZER_ID);
+
+  vtkDataArray *scenarioArrays[6] = {resRootsArray, resSurfArray, fertCArray,
+                                     shootIdArray, rootIdArray, fertIdArray};
+
+  for (i = 0; i < 6; i++)
+    {
+    if (scenarioArrays[i] && scenarioArrays[i]->GetNumberOfComponents() != 1
+        && scenarioArrays[i]->GetNumberOfComponents() != numberOfScenarios)
+      {
+      vtkErrorMacro(<< "Cell data array <" << scenarioArrays[i]->GetName()
+          << "> has " << scenarioArrays[i]->GetNumberOfComponents()
+          << " components, expected 1 or " << numberOfScenarios);
+      return -1;
+      }
+    }
+
+  // Copy geometry from input
+  output->CopyStructure(input);
+
+  // Result array with a component for each scenario
+  vtkDoubleArray *result = vtkDoubleArray::New();
+  result->SetNumberOfComponents(numberOfScenarios);
+  result->SetName(this->ResultArrayName);
+  result->SetNumberOfTuples(output->GetNumberOfCells());
+
+  // Parallelize with OpenMP
+#ifdef OMP_PARALLELIZED
+#pragma omp parallel for private(cellId, s) shared(input, fertIdArray, shootIdArray,\
+		rootIdArray, fertCArray, usableFieldCArray, soilMArray, resRootsArray,\
+		resSurfArray, soilCoverArray, meanTempArray, clayArray, iomArray,\
+		humArray, bioArray, rpmArray, dpmArray, result, parameters, numberOfScenarios,\
+		error)
+#endif
+  for (cellId = 0; cellId < input->GetNumberOfCells(); cellId++)
+    {
+    double dpm, rpm, bio, hum, iom; // Pools
+    double meanTemp, fertC, usableFieldCapacity, soilMoisture, soilCover,
+        resRoots, resSurf, clay;
+    double fertId, shootId, rootId;
+
+    // The forcing is read once for all scenarios
+    clayArray->GetTuple(cellId, &clay);
+    meanTempArray->GetTuple(cellId, &meanTemp);
+    soilCoverArray->GetTuple(cellId, &soilCover); // 0 or 1 ?
+    soilMArray->GetTuple(cellId, &soilMoisture); //[mm]
+    usableFieldCArray->GetTuple(cellId, &usableFieldCapacity); // [mm]?
+
+    for (s = 0; s < numberOfScenarios; s++)
+      {
+      RothC &R = *parameters[s];
+
+      // We set them 0 if no residuals are provided
+      if(resRootsArray)
+        resRoots = GetScenarioValue(resRootsArray, cellId, s); // [ tC /ha/layer]
+      else
+        resRoots = 0.0;
+      if(resSurfArray)
+        resSurf = GetScenarioValue(resSurfArray, cellId, s); // [ tC /ha/layer]
+      else
+        resSurf = 0.0;
+
+      if(!fertCArray || this->EquilibriumRun)
+        fertC = 0.0;
+      else
+        fertC = GetScenarioValue(fertCArray, cellId, s); // [ tC /ha/layer]
+
+      dpm = dpmArray->GetComponent(cellId, s);
+      rpm = rpmArray->GetComponent(cellId, s);
+      bio = bioArray->GetComponent(cellId, s);
+      hum = humArray->GetComponent(cellId, s);
+      iom = iomArray->GetComponent(cellId, s);
+
+      // Set the result to NULL in case some values are empty (NULL)
+      if (clay == this->NullValue || meanTemp == this->NullValue
+          || soilMoisture == this->NullValue
+          || usableFieldCapacity == this->NullValue || dpm == this->NullValue
+          || rpm == this->NullValue || bio == this->NullValue
+          || hum == this->NullValue || iom == this->NullValue)
+        {
+        result->SetComponent(cellId, s, this->NullValue);
+        continue;
+        }
+
+      // Root index 0 is the default value
+      rootId = 0;
+      if (rootIdArray)
+        {
+        rootId = GetScenarioValue(rootIdArray, cellId, s);
+        if ((int)rootId == this->NullValue)
+          rootId = 0;
+        }
+
+      // Shoot index 0 is the default value
+      shootId = 0;
+      if (shootIdArray)
+        {
+        shootId = GetScenarioValue(shootIdArray, cellId, s);
+        if ((int)shootId == this->NullValue)
+          shootId = 0;
+        }
+
+      fertId = 0;
+      if (fertIdArray)
+        {
+        fertId = GetScenarioValue(fertIdArray, cellId, s);
+        if ((int)fertId == this->NullValue)
+          fertId = 0;
+        }
+
+      if (!this->CheckFractionIds(R, shootId, rootId, fertId))
+        {
+#ifndef OMP_PARALLELIZED
+        result->Delete();
+        return -1;
+#else
+        error = 1;
+        continue;
+#endif
+        }
+
+      this->ComputeCPools(R, meanTemp, soilMoisture, usableFieldCapacity,
+          soilCover, clay, resRoots, resSurf, fertC, shootId, rootId, fertId,
+          dpm, rpm, bio, hum);
+
+      result->SetComponent(cellId, s, dpm + rpm + bio + hum + iom);
+
+      dpmArray->SetComponent(cellId, s, dpm);
+      rpmArray->SetComponent(cellId, s, rpm);
+      bioArray->SetComponent(cellId, s, bio);
+      humArray->SetComponent(cellId, s, hum);
+      }
+    }
+
+  // A cell with wrong fraction ids was skipped in the parallel loop
+  if (error)
+    {
+    result->Delete();
+    return -1;
+    }
+
+  if(input->GetCellData()->HasArray(ROTHC_INPUT_NAME_LAYER))
+    output->GetCellData()->AddArray(input->GetCellData()->GetArray(ROTHC_INPUT_NAME_LAYER));
+  output->GetCellData()->AddArray(result);
+  output->GetCellData()->SetActiveScalars(result->GetName());
+
+  if (this->AddCPoolsToOutput)
+    {
+    for (i = 0; i < this->CPools->GetCellData()->GetNumberOfArrays(); i++)
+      output->GetCellData()->AddArray(this->CPools->GetCellData()->GetArray(i));
+    }
+
+  result->Delete();
+
+  return 1;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ERothCScenarioModel::PrintSelf(ostream& os, vtkIndent indent)
+{
+  this->Superclass::PrintSelf(os, indent);
+  os << indent << "NumberOfScenarios: " << this->NumberOfScenarios << endl;
+}
@@ -0,0 +1,114 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+/**
+ * \brief Scenario batched RothC model
+ *
+ * This class computes the RothC model for many scenarios in a single
+ * pass over the cells. The scenarios share the geometry and the forcing
+ * data of the input, the forcing is read only once for each cell.
+ *
+ * Each scenario can have its own RothC model parameter, scenarios without
+ * a dedicated parameter use the model parameter of this class.
+ * The residuals, the fertilizer carbon and the shoot, root and fertilizer
+ * ids can be provided for each scenario as input arrays with one
+ * component per scenario. Arrays with a single component are used
+ * for all scenarios.
+ *
+ * The C pools and the soil carbon result are arrays with one
+ * component per scenario. Input C pools with a single component
+ * are replicated for all scenarios.
+ *
+ * Use this class as follows (Python):
+ *
+ * model = vtkTAG2ERothCScenarioModel()
+ * model.SetModelParameter(parameter)
+ * model.SetNumberOfScenarios(50)
+ * model.SetScenarioModelParameter(1, otherParameter)
+ * model.SetInput(input)
+ * model.Update()
+ *
+ */
+
+#ifndef vtkTAG2ERothCScenarioModel_H
+#define	vtkTAG2ERothCScenarioModel_H
+
+#include <vector>
+#include "vtkTAG2ERothCModel.h"
+
+class vtkTAG2ERothCScenarioModel: public vtkTAG2ERothCModel
+{
+public:
+vtkTypeRevisionMacro(vtkTAG2ERothCScenarioModel, vtkTAG2ERothCModel);
+
+  void PrintSelf(ostream& os, vtkIndent indent);
+  static vtkTAG2ERothCScenarioModel *New();
+
+  //! \brief Set the number of scenarios that are computed at once
+  vtkSetClampMacro(NumberOfScenarios, int, 1, VTK_INT_MAX);
+  //! \brief Get the number of scenarios
+  vtkGetMacro(NumberOfScenarios, int);
+
+  //! \brief Set the model parameter of a single scenario. The model parameter
+  //! of this class is used for scenarios without a dedicated parameter.
+  //! \param scenario The index of the scenario
+  //! \param parameter The RothC model parameter, NULL to remove the
+  //! dedicated parameter of the scenario
+  void SetScenarioModelParameter(int scenario, vtkTAG2ERothCModelParameter *parameter);
+  //! \brief Get the dedicated model parameter of a scenario, NULL if not set
+  vtkTAG2ERothCModelParameter *GetScenarioModelParameter(int scenario);
+  //! \brief Remove all dedicated scenario model parameter
+  void RemoveAllScenarioModelParameters();
+
+protected:
+  vtkTAG2ERothCScenarioModel();
+  ~vtkTAG2ERothCScenarioModel();
+
+  virtual int RequestData(vtkInformation *, vtkInformationVector **,
+      vtkInformationVector *);
+
+  //! \brief Replicate the C pools with a single component for all scenarios
+  //! \return false in case a pool has a wrong number of components
+  bool ExpandCPools();
+
+  int NumberOfScenarios;
+
+  //BTX
+  std::vector<vtkTAG2ERothCModelParameter*> ScenarioModelParameters;
+  //ETX
+
+private:
+  vtkTAG2ERothCScenarioModel(const vtkTAG2ERothCScenarioModel& orig); // Not implemented.
+  void operator=(const vtkTAG2ERothCScenarioModel&); // Not implemented.
+};
+
+#endif	/* vtkTAG2ERothCScenarioModel_H */
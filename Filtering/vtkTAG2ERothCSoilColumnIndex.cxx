@@ -0,0 +1,315 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ */
+
+#include <vtkPolyData.h>
+#include <vtkPoints.h>
+#include <vtkCellArray.h>
+#include <vtkDoubleArray.h>
+#include <vtkIntArray.h>
+#include <vtkIdTypeArray.h>
+#include <vtkObjectFactory.h>
+#include <vector>
+#include <algorithm>
+#include "vtkTAG2ERothCSoilColumnIndex.h"
+#include "vtkTAG2ERothCDefines.h"
+
+extern "C" {
+#include <math.h>
+}
+
+vtkCxxRevisionMacro(vtkTAG2ERothCSoilColumnIndex, "$Revision: 1.0 $");
+vtkStandardNewMacro(vtkTAG2ERothCSoilColumnIndex);
+
+//----------------------------------------------------------------------------
+
+// Sort the cells of a column from the top to the bottom
+class vtkTAG2ERothCSoilColumnIndexCompare
+{
+public:
+  vtkTAG2ERothCSoilColumnIndexCompare(std::vector<double> &z) : Z(z) {}
+  bool operator()(vtkIdType a, vtkIdType b) const
+  {
+    return this->Z[a] > this->Z[b];
+  }
+  std::vector<double> &Z;
+};
+
+//----------------------------------------------------------------------------
+
+// Find the root of a point in the union-find forest using path halving
+static vtkIdType FindRoot(std::vector<vtkIdType> &parent, vtkIdType id)
+{
+  while (parent[id] != id)
+    {
+    parent[id] = parent[parent[id]];
+    id = parent[id];
+    }
+  return id;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2ERothCSoilColumnIndex::vtkTAG2ERothCSoilColumnIndex()
+{
+  this->LineLength = NULL;
+  this->LineCenter = NULL;
+  this->CumulativeLineLength = NULL;
+  this->LayerId = NULL;
+  this->ColumnId = NULL;
+  this->NumberOfColumns = 0;
+  this->CachedPoints = NULL;
+  this->CachedLines = NULL;
+  this->CachedPointsMTime = 0;
+  this->CachedLinesMTime = 0;
+  this->CachedNumberOfCells = 0;
+}
+
+//----------------------------------------------------------------------------
+
+vtkTAG2ERothCSoilColumnIndex::~vtkTAG2ERothCSoilColumnIndex()
+{
+  if (this->LineLength)
+    this->LineLength->Delete();
+  if (this->LineCenter)
+    this->LineCenter->Delete();
+  if (this->CumulativeLineLength)
+    this->CumulativeLineLength->Delete();
+  if (this->LayerId)
+    this->LayerId->Delete();
+  if (this->ColumnId)
+    this->ColumnId->Delete();
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2ERothCSoilColumnIndex::Update(vtkPolyData *input)
+{
+  if (input == NULL)
+    {
+    vtkErrorMacro(<< "No input available");
+    return false;
+    }
+
+  vtkPoints *points = input->GetPoints();
+  vtkCellArray *lines = input->GetLines();
+
+  // Check if the geometry has changed since the last build
+  if (this->LineLength != NULL && points == this->CachedPoints &&
+      lines == this->CachedLines &&
+      input->GetNumberOfCells() == this->CachedNumberOfCells &&
+      (points == NULL || points->GetMTime() == this->CachedPointsMTime) &&
+      (lines == NULL || lines->GetMTime() == this->CachedLinesMTime))
+    return true;
+
+  if (!this->Build(input))
+    return false;
+
+  this->CachedPoints = points;
+  this->CachedLines = lines;
+  this->CachedPointsMTime = points ? points->GetMTime() : 0;
+  this->CachedLinesMTime = lines ? lines->GetMTime() : 0;
+  this->CachedNumberOfCells = input->GetNumberOfCells();
+
+  this->Modified();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2ERothCSoilColumnIndex::Build(vtkPolyData *input)
+{
+  vtkIdType cellId, pointId, column, i;
+  vtkIdType npts, *pts;
+  double p1[3];
+  double p2[3];
+
+  vtkIdType numberOfCells = input->GetNumberOfCells();
+  vtkIdType numberOfPoints = input->GetNumberOfPoints();
+  vtkCellArray *lines = input->GetLines();
+
+  // Check cell type, we support only lines
+  if (lines == NULL || lines->GetNumberOfCells() != numberOfCells)
+    {
+    vtkErrorMacro("Unsupported cell type. Only lines are supported.");
+    return false;
+    }
+
+  // Create new arrays, so that arrays which are in use by
+  // filter outputs are not modified
+  vtkDoubleArray *lineLength = vtkDoubleArray::New();
+  lineLength->SetNumberOfComponents(1);
+  lineLength->SetName(ROTHC_INPUT_NAME_LINE_LENGTH);
+  lineLength->SetNumberOfTuples(numberOfCells);
+
+  vtkDoubleArray *lineCenter = vtkDoubleArray::New();
+  lineCenter->SetNumberOfComponents(3);
+  lineCenter->SetName(ROTHC_INPUT_NAME_LINE_CENTER);
+  lineCenter->SetNumberOfTuples(numberOfCells);
+
+  vtkDoubleArray *cumulativeLineLength = vtkDoubleArray::New();
+  cumulativeLineLength->SetNumberOfComponents(1);
+  cumulativeLineLength->SetName(ROTHC_INPUT_NAME_CUMULATIVE_LINE_LENGTH);
+  cumulativeLineLength->SetNumberOfTuples(numberOfCells);
+
+  vtkIntArray *layerId = vtkIntArray::New();
+  layerId->SetNumberOfComponents(1);
+  layerId->SetName(ROTHC_INPUT_NAME_LAYER);
+  layerId->SetNumberOfTuples(numberOfCells);
+
+  vtkIdTypeArray *columnId = vtkIdTypeArray::New();
+  columnId->SetNumberOfComponents(1);
+  columnId->SetName("ColumnId");
+  columnId->SetNumberOfTuples(numberOfCells);
+
+  std::vector<vtkIdType> parent(numberOfPoints);
+  std::vector<vtkIdType> firstPoint(numberOfCells);
+  std::vector<double> centerZ(numberOfCells);
+
+  for (pointId = 0; pointId < numberOfPoints; pointId++)
+    parent[pointId] = pointId;
+
+  // Compute the line length and center and join the points of each line
+  lines->InitTraversal();
+  for (cellId = 0; cellId < numberOfCells; cellId++)
+    {
+    lines->GetNextCell(npts, pts);
+
+    // We support only lines with two coordinates
+    if (npts != 2)
+      {
+      vtkErrorMacro("Unsupported line length.");
+      lineLength->Delete();
+      lineCenter->Delete();
+      cumulativeLineLength->Delete();
+      layerId->Delete();
+      columnId->Delete();
+      return false;
+      }
+
+    input->GetPoint(pts[0], p1);
+    input->GetPoint(pts[1], p2);
+
+    // Compute length of the line in vertical direction
+    lineLength->SetValue(cellId, fabs(p1[2] - p2[2]));
+    lineCenter->SetTuple3(cellId, (p1[0] + p2[0]) / 2.0,
+        (p1[1] + p2[1]) / 2.0, (p1[2] + p2[2]) / 2.0);
+    centerZ[cellId] = (p1[2] + p2[2]) / 2.0;
+    firstPoint[cellId] = pts[0];
+
+    vtkIdType root1 = FindRoot(parent, pts[0]);
+    vtkIdType root2 = FindRoot(parent, pts[1]);
+    if (root1 != root2)
+      parent[root2] = root1;
+    }
+
+  // Assign the column ids and count the cells of each column
+  std::vector<vtkIdType> columnOfRoot(numberOfPoints, -1);
+  std::vector<vtkIdType> offset;
+
+  this->NumberOfColumns = 0;
+  for (cellId = 0; cellId < numberOfCells; cellId++)
+    {
+    vtkIdType root = FindRoot(parent, firstPoint[cellId]);
+    if (columnOfRoot[root] < 0)
+      {
+      columnOfRoot[root] = this->NumberOfColumns++;
+      offset.push_back(0);
+      }
+    column = columnOfRoot[root];
+    columnId->SetValue(cellId, column);
+    offset[column]++;
+    }
+
+  // Counting sort of the cells by column
+  vtkIdType sum = 0;
+  for (column = 0; column < this->NumberOfColumns; column++)
+    {
+    vtkIdType count = offset[column];
+    offset[column] = sum;
+    sum += count;
+    }
+  offset.push_back(sum);
+
+  std::vector<vtkIdType> order(numberOfCells);
+  std::vector<vtkIdType> position(offset.begin(), offset.end() - 1);
+
+  for (cellId = 0; cellId < numberOfCells; cellId++)
+    order[position[columnId->GetValue(cellId)]++] = cellId;
+
+  // Sort each column from top to bottom and compute the layer
+  // id as well as the cumulative line length
+  vtkTAG2ERothCSoilColumnIndexCompare compare(centerZ);
+
+  for (column = 0; column < this->NumberOfColumns; column++)
+    {
+    double length = 0.0;
+
+    std::sort(order.begin() + offset[column], order.begin() + offset[column + 1],
+        compare);
+
+    for (i = offset[column]; i < offset[column + 1]; i++)
+      {
+      cellId = order[i];
+      length += lineLength->GetValue(cellId);
+      layerId->SetValue(cellId, i - offset[column]);
+      cumulativeLineLength->SetValue(cellId, length);
+      }
+    }
+
+  if (this->LineLength)
+    this->LineLength->Delete();
+  if (this->LineCenter)
+    this->LineCenter->Delete();
+  if (this->CumulativeLineLength)
+    this->CumulativeLineLength->Delete();
+  if (this->LayerId)
+    this->LayerId->Delete();
+  if (this->ColumnId)
+    this->ColumnId->Delete();
+
+  this->LineLength = lineLength;
+  this->LineCenter = lineCenter;
+  this->CumulativeLineLength = cumulativeLineLength;
+  this->LayerId = layerId;
+  this->ColumnId = columnId;
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
+void vtkTAG2ERothCSoilColumnIndex::PrintSelf(ostream& os, vtkIndent indent)
+{
+  this->Superclass::PrintSelf(os, indent);
+  os << indent << "NumberOfColumns: " << this->NumberOfColumns << endl;
+}
@@ -0,0 +1,127 @@
+/*
+ *  Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+ *
+ * Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+ *          Rene Dechow, rene.dechow@vti.bund.de
+ *
+ * Copyright:
+ *
+ * Johann Heinrich von Thünen-Institut
+ * Institut für Agrarrelevante Klimaforschung
+ *
+ * Phone: +49 (0)531 596 2601
+ *
+ * Fax:+49 (0)531 596 2699
+ *
+ * Mail: ak@vti.bund.de
+ *
+ * Bundesallee 50
+ * 38116 Braunschweig
+ * Germany
+ *
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; version 2 of the License.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+
+/**
+ * \brief Cached soil column topology of a line based RothC grid
+ *
+ * The RothC filters work on poly data that consists of vertical lines,
+ * each line represents a soil layer. Lines that share points belong to
+ * the same soil column. This class computes for each cell:
+ *
+ * - the vertical line length
+ * - the line center coordinate
+ * - the layer id, 0 is the top layer
+ * - the column id
+ * - the cumulative line length from the top of the column
+ *
+ * The columns are identified with a union-find of the line points and the
+ * cells are grouped with a counting sort, hence no recursion is used and the
+ * grouping is linear in the number of cells. The result is cached and only
+ * recomputed when the points or the lines of the input have been modified.
+ * Since vtkPolyData::CopyStructure() shares the points and lines, a single
+ * instance can be shared by all filters of a RothC pipeline.
+ *
+ * Use this class as follows (Python):
+ *
+ * index = vtkTAG2ERothCSoilColumnIndex()
+ *
+ * residuals.SetSoilColumnIndex(index)
+ * soilMoisture.SetSoilColumnIndex(index)
+ * rothc.SetSoilColumnIndex(index)
+ *
+ */
+
+#ifndef vtkTAG2ERothCSoilColumnIndex_H
+#define	vtkTAG2ERothCSoilColumnIndex_H
+
+#include <vtkObject.h>
+
+class vtkPolyData;
+class vtkPoints;
+class vtkCellArray;
+class vtkDoubleArray;
+class vtkIntArray;
+class vtkIdTypeArray;
+
+class vtkTAG2ERothCSoilColumnIndex: public vtkObject
+{
+public:
+vtkTypeRevisionMacro(vtkTAG2ERothCSoilColumnIndex, vtkObject);
+
+  void PrintSelf(ostream& os, vtkIndent indent);
+  static vtkTAG2ERothCSoilColumnIndex *New();
+
+  //! \brief Compute the soil column topology of the input in case
+  //! the points or lines of the input have been modified since the last call.
+  //! \param input The poly data that must contain only lines with two points
+  //! \return true in case of success, false if the input contains unsupported cells
+  bool Update(vtkPolyData *input);
+
+  //! \brief The vertical line length of each cell
+  vtkGetObjectMacro(LineLength, vtkDoubleArray);
+  //! \brief The center coordinate of each cell (3 components)
+  vtkGetObjectMacro(LineCenter, vtkDoubleArray);
+  //! \brief The cumulative line length from the top of the column of each cell
+  vtkGetObjectMacro(CumulativeLineLength, vtkDoubleArray);
+  //! \brief The layer id of each cell, 0 is the top layer
+  vtkGetObjectMacro(LayerId, vtkIntArray);
+  //! \brief The column id of each cell
+  vtkGetObjectMacro(ColumnId, vtkIdTypeArray);
+  //! \brief The number of identified soil columns
+  vtkGetMacro(NumberOfColumns, vtkIdType);
+
+protected:
+  vtkTAG2ERothCSoilColumnIndex();
+  ~vtkTAG2ERothCSoilColumnIndex();
+
+  //! \brief Compute all arrays of the index
+  bool Build(vtkPolyData *input);
+
+  vtkDoubleArray *LineLength;
+  vtkDoubleArray *LineCenter;
+  vtkDoubleArray *CumulativeLineLength;
+  vtkIntArray *LayerId;
+  vtkIdTypeArray *ColumnId;
+  vtkIdType NumberOfColumns;
+
+  // The geometry that was used to build the index
+  vtkPoints *CachedPoints;
+  vtkCellArray *CachedLines;
+  unsigned long CachedPointsMTime;
+  unsigned long CachedLinesMTime;
+  vtkIdType CachedNumberOfCells;
+
+private:
+  vtkTAG2ERothCSoilColumnIndex(const vtkTAG2ERothCSoilColumnIndex& orig); // Not implemented.
+  void operator=(const vtkTAG2ERothCSoilColumnIndex&); // Not implemented.
+};
+
+#endif	/* vtkTAG2ERothCSoilColumnIndex_H */
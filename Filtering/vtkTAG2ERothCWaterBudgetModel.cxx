@@ -65,13 +65,14 @@ vtkTAG2ERothCWaterBudgetModel::vtkTAG2ERothCWaterBudgetModel()
   this->SetNumberOfInputPorts(1);
   this->SetNumberOfOutputPorts(1);
   this->SetResultArrayName(ROTHC_INPUT_NAME_SOIL_MOISTURE);
+  this->SoilColumnIndex = vtkTAG2ERothCSoilColumnIndex::New();
 }
 
 //----------------------------------------------------------------------------
 
 vtkTAG2ERothCWaterBudgetModel::~vtkTAG2ERothCWaterBudgetModel()
 {
-  ;
+  this->SetSoilColumnIndex(NULL);
 }
 
 //----------------------------------------------------------------------------
@@ -138,7 +139,6 @@ int vtkTAG2ERothCWaterBudgetModel::RequestData(
 
   // Copy geometry from input
   output->CopyStructure(input);
-  input->BuildCells();
 
   // Result array usable Fieldcapacity
   vtkDoubleArray *resultUsableFieldCapacity = vtkDoubleArray::New();
@@ -166,64 +166,33 @@ int vtkTAG2ERothCWaterBudgetModel::RequestData(
 
   int cellNum = input->GetNumberOfCells();
 
-#ifdef OMP_PARALLELIZED
-  // We must call the following method first in a single thread to
-  // avoid race conditions
-  if(input->GetNumberOfCells() > 0) {
-    vtkIdList *tmp = vtkIdList::New();
-    input->GetCellPoints(0, tmp);
-    input->GetCellType(0);
-    tmp->Delete();
-  }
-#endif
+  // Compute the line length of the cells, the soil column
+  // index is only recomputed if the geometry changed
+  if (!this->SoilColumnIndex->Update(input))
+    {
+    resultUsableFieldCapacity->Delete();
+    resultWaterContentNew->Delete();
+    return -1;
+    }
+
+  vtkDoubleArray *lineLengthArray = this->SoilColumnIndex->GetLineLength();
 
   // Parallelize with OpenMP
 #ifdef OMP_PARALLELIZED
 #pragma omp parallel for private(cellId) shared(input, etpotArray, \
     precipitationArray, soilCoverArray, clayArray, waterContentArray,\
-    resultUsableFieldCapacity, resultWaterContentNew, cellNum)
+    resultUsableFieldCapacity, resultWaterContentNew, cellNum, lineLengthArray)
 #endif
   for (cellId = 0; cellId < cellNum; cellId++)
     {
-    double lineLength, c;
-    double p1[3];
-    double p2[3];
-    double etpot, precipitation, soilCover, waterContent, res;
+    double lineLength;
+    double etpot, precipitation, soilCover, waterContent;
     double waterContentNew;
     double usableFieldcapacity; //[cm³/cm³]
     double clay; //[%]
 
-    vtkIdList *pointIds = vtkIdList::New();
-    vtkIdType pointId;
-
-    input->GetCellPoints(cellId, pointIds);
-
-    // Check cell type, we support only lines
-    if (input->GetCellType(cellId) != VTK_LINE)
-      {
-      vtkErrorMacro("Unsupported cell type: " << input->GetCellType(cellId));
-#ifndef OMP_PARALLELIZED
-      return -1;
-#else
-      continue;
-#endif
-      }
-
-    // We support only lines with two coordinates
-    if (pointIds->GetNumberOfIds() != 2)
-      {
-      vtkErrorMacro("Unsupported number of line coordinates: " << pointIds->GetNumberOfIds());
-#ifndef OMP_PARALLELIZED
-      return -1;
-#else
-      continue;
-#endif
-      }
-
-    // Compute length of the line in vertical direction
-    input->GetPoint(pointIds->GetId(0), p1);
-    input->GetPoint(pointIds->GetId(1), p2);
-    lineLength = fabs(p1[2] - p2[2]); //m
+    // The length of the line in vertical direction
+    lineLength = lineLengthArray->GetValue(cellId); //m
 
     etpotArray->GetTuple(cellId, &etpot);
     precipitationArray->GetTuple(cellId, &precipitation);
@@ -231,7 +200,8 @@ int vtkTAG2ERothCWaterBudgetModel::RequestData(
     clayArray->GetTuple(cellId, &clay);
 
     // compute the usable field capacity
-    usableFieldcapacity = (20 + 1.3 * clay - 0.01 * clay * clay) / 230.0;
+    usableFieldcapacity =
+        vtkTAG2ERothCWaterBudgetModel::ComputeUsableFieldCapacity(clay);
 
     if (waterContentArray != NULL)
       {
@@ -245,15 +215,8 @@ int vtkTAG2ERothCWaterBudgetModel::RequestData(
      usableFieldcapacity /= 1.8;
      */
     // compute water budget for 1 horizon
-    if ((precipitation - etpot) < 0)
-      {
-      waterContentNew = MAX(0, waterContent+(precipitation - etpot)/
-          (lineLength*1000));
-      } else
-      {
-      waterContentNew = MIN(usableFieldcapacity,waterContent +
-          (precipitation - etpot)/(lineLength*1000));
-      }
+    waterContentNew = vtkTAG2ERothCWaterBudgetModel::ComputeWaterContent(
+        waterContent, precipitation, etpot, usableFieldcapacity, lineLength);
     /*
     cout << "ETpot " << etpot << " usableFieldcapacity " << usableFieldcapacity
         << " waterContentNew " << waterContentNew << " Precipitation "
@@ -261,8 +224,6 @@ int vtkTAG2ERothCWaterBudgetModel::RequestData(
     */
     resultUsableFieldCapacity->SetTuple1(cellId, usableFieldcapacity);
     resultWaterContentNew->SetTuple1(cellId, waterContentNew);
-
-    pointIds->Delete();
     }
 
   output->GetCellData()->AddArray(resultUsableFieldCapacity);
@@ -278,6 +239,32 @@ int vtkTAG2ERothCWaterBudgetModel::RequestData(
 
 //----------------------------------------------------------------------------
 
+double vtkTAG2ERothCWaterBudgetModel::ComputeUsableFieldCapacity(double clay)
+{
+  return (20 + 1.3 * clay - 0.01 * clay * clay) / 230.0;
+}
+
+//----------------------------------------------------------------------------
+
+double vtkTAG2ERothCWaterBudgetModel::ComputeWaterContent(double waterContent,
+                                                          double precipitation,
+                                                          double etpot,
+                                                          double usableFieldCapacity,
+                                                          double lineLength)
+{
+  if ((precipitation - etpot) < 0)
+    {
+    return MAX(0, waterContent+(precipitation - etpot)/
+        (lineLength*1000));
+    } else
+    {
+    return MIN(usableFieldCapacity,waterContent +
+        (precipitation - etpot)/(lineLength*1000));
+    }
+}
+
+//----------------------------------------------------------------------------
+
 void vtkTAG2ERothCWaterBudgetModel::PrintSelf(ostream& os, vtkIndent indent)
 {
   this->Superclass::PrintSelf(os, indent);
@@ -50,6 +50,7 @@
 
 #include <vtkPolyData.h>
 #include "vtkTAG2EAbstractCalibratableModel.h"
+#include "vtkTAG2ERothCSoilColumnIndex.h"
 
 class vtkTAG2ERothCWaterBudgetModel: public vtkTAG2EAbstractModel
 {
@@ -63,6 +64,26 @@ vtkTypeRevisionMacro(vtkTAG2ERothCWaterBudgetModel, vtkTAG2EAbstractModel);
   //!\brief This model has no XML description yet
   void SetModelParameter(vtkTAG2EAbstractModelParameter* modelParameter){;}
 
+  //! \brief Set the soil column index that provides the line length,
+  //! it can be shared with other RothC filters
+  vtkSetObjectMacro(SoilColumnIndex, vtkTAG2ERothCSoilColumnIndex);
+  //! \brief Get the soil column index
+  vtkGetObjectMacro(SoilColumnIndex, vtkTAG2ERothCSoilColumnIndex);
+
+  //!\brief Compute the usable field capacity in [cm³/cm³] from the clay content in [%]
+  static double ComputeUsableFieldCapacity(double clay);
+
+  //!\brief Compute the water budget of a single soil layer
+  //!\param waterContent The water content of the last time step
+  //!\param precipitation The precipitation in mm
+  //!\param etpot The potential evapotranspiration in mm
+  //!\param usableFieldCapacity The usable field capacity of the layer
+  //!\param lineLength The thickness of the layer in m
+  //!\return The new water content
+  static double ComputeWaterContent(double waterContent, double precipitation,
+                                    double etpot, double usableFieldCapacity,
+                                    double lineLength);
+
 protected:
   vtkTAG2ERothCWaterBudgetModel();
   ~vtkTAG2ERothCWaterBudgetModel();
@@ -72,6 +93,8 @@ protected:
   virtual int FillInputPortInformation(int port, vtkInformation* info);
   virtual int FillOutputPortInformation(int port, vtkInformation* info);
 
+  vtkTAG2ERothCSoilColumnIndex *SoilColumnIndex;
+
 private:
   vtkTAG2ERothCWaterBudgetModel(const vtkTAG2ERothCWaterBudgetModel& orig); // Not implemented.
   void operator=(const vtkTAG2ERothCWaterBudgetModel&); // Not implemented.
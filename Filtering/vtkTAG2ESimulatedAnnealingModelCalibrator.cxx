@@ -40,7 +40,10 @@
 #include <vtkInformation.h>
 #include <vtkInformationVector.h>
 #include "vtkTAG2ESimulatedAnnealingModelCalibrator.h"
+#include "vtkTAG2EFuzzyInferenceModel.h"
 #include "vtkTAG2EFuzzyInferenceModelParameter.h"
+#include "tag2eFIS.h"
+#include <vector>
 #include <stdlib.h>
 #include <time.h>
 #include <math.h>
@@ -58,6 +61,7 @@ vtkTAG2ESimulatedAnnealingModelCalibrator::vtkTAG2ESimulatedAnnealingModelCalibr
   this->TMinimizer = 1.001;
   this->MaxNumberOfIterations = 5000;
   this->InitialT = 1;
+  this->SolveResponses = 0;
   time_t t = time(NULL);
   this->Seed = (unsigned int) t;
   this->BestFitModelParameter = NULL;
@@ -79,13 +83,11 @@ int vtkTAG2ESimulatedAnnealingModelCalibrator::RequestData(
     vtkInformation *vtkNotUsed(request), vtkInformationVector **inputVector,
     vtkInformationVector *outputVector)
 {
-  int i;
-  double error;
-  double modelAssessment;
-  double lastAcceptedError;
-  double bestFitError;
-  double bestFitModelAssessment;
-  vtkXMLDataElement *root = vtkXMLDataElement::New();
+  int ret;
+  int createDOFArray = 0;
+  int calibrateResponses = 0;
+  vtkTAG2EFuzzyInferenceModel *fuzzyModel = NULL;
+  vtkTAG2EFuzzyInferenceModelParameter *fuzzyParameter = NULL;
 
   vtkDataSet* input = vtkDataSet::GetData(inputVector[0]);
   vtkDataSet* output = vtkDataSet::GetData(outputVector);
@@ -102,6 +104,56 @@ int vtkTAG2ESimulatedAnnealingModelCalibrator::RequestData(
     return 0;
     }
 
+  if (this->SolveResponses)
+    {
+    fuzzyModel = vtkTAG2EFuzzyInferenceModel::SafeDownCast(this->Model);
+    fuzzyParameter =
+        vtkTAG2EFuzzyInferenceModelParameter::SafeDownCast(this->ModelParameter);
+
+    if (fuzzyModel == NULL || fuzzyParameter == NULL)
+      {
+      vtkErrorMacro( << "The responses can only be solved for fuzzy inference models");
+      return 0;
+      }
+
+    // The deegrees of fulfillment are needed to solve the responses,
+    // hence only the fuzzy sets are modified randomly. The settings of
+    // the model and the parameter are restored after the calibration.
+    createDOFArray = fuzzyModel->GetCreateDOFArray();
+    calibrateResponses = fuzzyParameter->GetCalibrateResponses();
+    fuzzyModel->CreateDOFArrayOn();
+    fuzzyParameter->CalibrateResponsesOff();
+    }
+
+  ret = this->Anneal(input, output);
+
+  if (this->SolveResponses)
+    {
+    fuzzyModel->SetCreateDOFArray(createDOFArray);
+    fuzzyParameter->SetCalibrateResponses(calibrateResponses);
+
+    vtkTAG2EFuzzyInferenceModelParameter *bestFitParameter =
+        vtkTAG2EFuzzyInferenceModelParameter::SafeDownCast(
+            this->BestFitModelParameter);
+    if (bestFitParameter)
+      bestFitParameter->SetCalibrateResponses(calibrateResponses);
+    }
+
+  return ret;
+}
+
+//----------------------------------------------------------------------------
+
+int vtkTAG2ESimulatedAnnealingModelCalibrator::Anneal(vtkDataSet *input,
+    vtkDataSet *output)
+{
+  int i;
+  double error;
+  double modelAssessment;
+  double lastAcceptedError;
+  double bestFitError;
+  double bestFitModelAssessment;
+
   // Initiate the random number generator
   srand(this->Seed);
 
@@ -109,14 +161,29 @@ int vtkTAG2ESimulatedAnnealingModelCalibrator::RequestData(
   if (this->BestFitModelParameter)
     this->BestFitModelParameter->Delete();
 
-  // We store the parameter of the best fit separately in an instance of the same type
-  this->BestFitModelParameter = this->ModelParameter->NewInstance();
-  this->ModelParameter->GetXMLRepresentation(root);
-  this->BestFitModelParameter->SetXMLRepresentation(root);
+  // We store the parameter of the best fit separately in a copy of the same type
+  this->BestFitModelParameter = this->ModelParameter->Clone();
+  if (this->BestFitModelParameter == NULL)
+    {
+    vtkErrorMacro( << "Unable to copy the model parameter");
+    return 0;
+    }
 
   // The initial run of the model with initialization
   this->Model->SetModelParameter(this->ModelParameter);
   this->Model->Update();
+
+  // Start with the best responses of the initial fuzzy sets
+  if (this->SolveResponses)
+    {
+    if (!this->SolveFuzzyResponses(input))
+      return 0;
+    this->Model->Modified();
+    this->Model->Update();
+    // The initial best fit must contain the solved responses
+    this->BestFitModelParameter->DeepCopy(this->ModelParameter);
+    }
+
   bestFitModelAssessment = modelAssessment =
       this->Model->GetModelAssessmentFactor();
 
@@ -174,6 +241,18 @@ int vtkTAG2ESimulatedAnnealingModelCalibrator::RequestData(
     // In case the new error is lower as the last configuration
     if (diff <= 0.0)
       {
+      // Solve the responses of the accepted fuzzy sets, the error can only decrease
+      if (this->SolveResponses)
+        {
+        if (!this->SolveFuzzyResponses(input))
+          return 0;
+        this->Model->Modified();
+        this->Model->Update();
+        modelAssessment = this->Model->GetModelAssessmentFactor();
+        error = vtkTAG2EAbstractModelCalibrator::CompareDataSets(
+            this->Model->GetOutput(), input, this->Model->GetUseCellData(), 0,
+            false) * modelAssessment;
+        }
       lastAcceptedError = error;
       // Store the best fit
       if (error < bestFitError)
@@ -183,8 +262,7 @@ int vtkTAG2ESimulatedAnnealingModelCalibrator::RequestData(
         std::cout << "Store best result at iteration " << i << " with error "
             << bestFitError << std::endl;
         output->ShallowCopy(this->Model->GetOutput());
-        this->ModelParameter->GetXMLRepresentation(root);
-        this->BestFitModelParameter->SetXMLRepresentation(root);
+        this->BestFitModelParameter->DeepCopy(this->ModelParameter);
         }
       } else
       {
@@ -206,6 +284,29 @@ int vtkTAG2ESimulatedAnnealingModelCalibrator::RequestData(
           }
         } else
         {
+        // Solve the responses of the accepted fuzzy sets
+        if (this->SolveResponses)
+          {
+          if (!this->SolveFuzzyResponses(input))
+            return 0;
+          this->Model->Modified();
+          this->Model->Update();
+          modelAssessment = this->Model->GetModelAssessmentFactor();
+          error = vtkTAG2EAbstractModelCalibrator::CompareDataSets(
+              this->Model->GetOutput(), input, this->Model->GetUseCellData(),
+              0, false) * modelAssessment;
+
+          // The solved responses may result in a new best fit
+          if (error < bestFitError)
+            {
+            bestFitError = error;
+            bestFitModelAssessment = modelAssessment;
+            std::cout << "Store best result at iteration " << i
+                << " with error " << bestFitError << std::endl;
+            output->ShallowCopy(this->Model->GetOutput());
+            this->BestFitModelParameter->DeepCopy(this->ModelParameter);
+            }
+          }
         lastAcceptedError = error;
         this->InitialT /= this->TMinimizer;
         }
@@ -229,8 +330,99 @@ int vtkTAG2ESimulatedAnnealingModelCalibrator::RequestData(
       << bestFitError << " model assessment factor " << bestFitModelAssessment
       << std::endl;
 
-  root->Delete();
-
   return 1;
 
 }
+
+//----------------------------------------------------------------------------
+
+bool vtkTAG2ESimulatedAnnealingModelCalibrator::SolveFuzzyResponses(
+    vtkDataSet *target)
+{
+  vtkIdType id;
+  int k;
+  vtkDataArray *result;
+  vtkDataArray *values;
+  vtkDataArray *dof;
+
+  vtkTAG2EFuzzyInferenceModel *model = vtkTAG2EFuzzyInferenceModel::SafeDownCast(
+      this->Model);
+  vtkTAG2EFuzzyInferenceModelParameter *parameter =
+      vtkTAG2EFuzzyInferenceModelParameter::SafeDownCast(this->ModelParameter);
+
+  if (model == NULL || parameter == NULL)
+    {
+    vtkErrorMacro( << "The responses can only be solved for fuzzy inference models");
+    return false;
+    }
+
+  vtkDataSet *output = model->GetOutput();
+  int numberOfRules = parameter->GetNumberOfRules();
+  double nullValue = model->GetNullValue();
+
+  if (model->GetUseCellData())
+    {
+    result = output->GetCellData()->GetScalars();
+    dof = output->GetCellData()->GetArray("DOF");
+    values = target->GetCellData()->GetScalars();
+    } else
+    {
+    result = output->GetPointData()->GetScalars();
+    dof = output->GetPointData()->GetArray("DOF");
+    values = target->GetPointData()->GetScalars();
+    }
+
+  if (result == NULL || values == NULL || dof == NULL)
+    {
+    vtkErrorMacro( << "The model result, the target values or the DOF array are missing");
+    return false;
+    }
+
+  if (dof->GetNumberOfComponents() != numberOfRules
+      || result->GetNumberOfTuples() != values->GetNumberOfTuples())
+    {
+    vtkErrorMacro( << "The DOF array or the target values do not match the model result");
+    return false;
+    }
+
+  // Collect the deegrees of fulfillment and the target values of all valid points
+  std::vector<double> DOF;
+  std::vector<double> Target;
+  std::vector<double> Responses;
+
+  DOF.reserve(result->GetNumberOfTuples() * numberOfRules);
+  Target.reserve(result->GetNumberOfTuples());
+
+  for (id = 0; id < result->GetNumberOfTuples(); id++)
+    {
+    double t = values->GetTuple1(id);
+
+    if (result->GetTuple1(id) == nullValue || t == nullValue)
+      continue;
+
+    for (k = 0; k < numberOfRules; k++)
+      DOF.push_back(dof->GetComponent(id, k));
+    Target.push_back(t);
+    }
+
+  if (Target.size() == 0)
+    {
+    vtkErrorMacro( << "No valid points available to solve the responses");
+    return false;
+    }
+
+  if (!tag2eFIS::ComputeLeastSquaresResponses(&DOF[0], &Target[0],
+      Target.size(), numberOfRules, parameter->GetInternalScheme(), Responses))
+    {
+    vtkErrorMacro( << "Unable to compute the least squares responses");
+    return false;
+    }
+
+  for (k = 0; k < numberOfRules; k++)
+    {
+    if (!parameter->SetResponseValue(k, Responses[k]))
+      return false;
+    }
+
+  return true;
+}
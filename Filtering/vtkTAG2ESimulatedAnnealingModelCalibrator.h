@@ -82,6 +82,12 @@ public:
     //! initialization, default current time
     vtkSetMacro(Seed, unsigned int);
     vtkGetMacro(Seed, unsigned int);
+    //!\brief Solve the responses of a fuzzy inference model with bounded least
+    //! squares after each accepted modification and anneal only the fuzzy sets.
+    //! The model must be of type vtkTAG2EFuzzyInferenceModel, default off
+    vtkSetMacro(SolveResponses, int);
+    vtkGetMacro(SolveResponses, int);
+    vtkBooleanMacro(SolveResponses, int);
     
     //!\brief Return the best fit error of the calibration run
     vtkGetMacro(BestFitError, double);
@@ -97,7 +103,21 @@ protected:
 
     virtual int RequestData(vtkInformation *, vtkInformationVector **, vtkInformationVector *);
 
+    //!\brief Run the simulated annealing of the model parameter
+    //!\param input The dataset with the target values as active scalars
+    //!\param output The dataset that receives the model result of the best fit
+    //!\return 1 in case of success, 0 otherwise
+    int Anneal(vtkDataSet *input, vtkDataSet *output);
+
+    //!\brief Compute the least squares responses of the fuzzy inference model
+    //! using the deegrees of fulfillment of the last model run and set them in
+    //! the model parameter
+    //!\param target The dataset with the target values as active scalars
+    //!\return false in case the responses can not be computed
+    bool SolveFuzzyResponses(vtkDataSet *target);
+
     int MaxNumberOfIterations;
+    int SolveResponses;
     unsigned int Seed;
     double StandardDeviation;
     double BreakCriteria;
@@ -158,22 +158,8 @@ int vtkTAG2ETurcETPotModel::RequestData(vtkInformation * vtkNotUsed(request),
       continue;
       }
 
-    // The global radiation can be in J/(cm^2*s) or in W/m^2
-    // Here we compute J/(cm^2 * s) from w/m^2
-    if(this->RadiationInWatt == 1)
-      globalRadiation = globalRadiation *36.0 * 24.0/100.0;
-
-    double etp = 0.0031 *
-                ((meanTemperature / (meanTemperature + 15.0)) *
-                (globalRadiation + 209.0));
-
-    if (etp < 0.0)
-      etp = 0.0;
-
-    else if (etp > 7.0)
-      etp = 7.0;
-
-    result->SetTuple1(cellId, etp * this->TimeInterval);
+    result->SetTuple1(cellId, vtkTAG2ETurcETPotModel::ComputeETpot(globalRadiation,
+        meanTemperature, this->TimeInterval, this->RadiationInWatt));
     }
 
   output->GetCellData()->AddArray(result);
@@ -185,6 +171,31 @@ int vtkTAG2ETurcETPotModel::RequestData(vtkInformation * vtkNotUsed(request),
 
 //----------------------------------------------------------------------------
 
+double vtkTAG2ETurcETPotModel::ComputeETpot(double globalRadiation,
+                                            double meanTemperature,
+                                            double timeInterval,
+                                            int radiationInWatt)
+{
+  // The global radiation can be in J/(cm^2*s) or in W/m^2
+  // Here we compute J/(cm^2 * s) from w/m^2
+  if(radiationInWatt == 1)
+    globalRadiation = globalRadiation *36.0 * 24.0/100.0;
+
+  double etp = 0.0031 *
+              ((meanTemperature / (meanTemperature + 15.0)) *
+              (globalRadiation + 209.0));
+
+  if (etp < 0.0)
+    etp = 0.0;
+
+  else if (etp > 7.0)
+    etp = 7.0;
+
+  return etp * timeInterval;
+}
+
+//----------------------------------------------------------------------------
+
 void vtkTAG2ETurcETPotModel::PrintSelf(ostream& os, vtkIndent indent)
 {
   this->Superclass::PrintSelf(os, indent);
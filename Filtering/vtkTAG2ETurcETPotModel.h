@@ -61,6 +61,15 @@ vtkTypeRevisionMacro(vtkTAG2ETurcETPotModel, vtkTAG2EAbstractModel);
   //!\brief This model has no XML description yet
   void SetModelParameter(vtkTAG2EAbstractModelParameter* modelParameter){;}
 
+  //!\brief Compute the potential evapotranspiration of a single cell
+  //!\param globalRadiation The global radiation in J/(cm^2 * d) or in W/m^2
+  //!\param meanTemperature The mean temperature in C°
+  //!\param timeInterval The time interval in days
+  //!\param radiationInWatt Set this true if the radiation is in W/m^2
+  //!\return The potential evapotranspiration of the time interval
+  static double ComputeETpot(double globalRadiation, double meanTemperature,
+                             double timeInterval, int radiationInWatt);
+
 protected:
   vtkTAG2ETurcETPotModel();
   ~vtkTAG2ETurcETPotModel();
@@ -49,6 +49,8 @@
 #include "vtkTAG2EWeightingModelParameter.h"
 #include "vtkTAG2EAbstractModelParameter.h"
 
+#define MAX_WEIGHT_ID 16777216
+
 vtkCxxRevisionMacro(vtkTAG2EWeightingModel, "$Revision: 1.0 $");
 vtkStandardNewMacro(vtkTAG2EWeightingModel);
 
@@ -114,13 +116,95 @@ void vtkTAG2EWeightingModel::SetModelParameter(
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2EWeightingModel::UpdateWeightTable()
+{
+  unsigned int i;
+  int maxId = -1;
+
+  // Check if the weight table is up to date
+  if (this->WeightTableTime.GetMTime() > this->GetMTime()
+      && this->WeightTableTime.GetMTime()
+          > this->WeightingModelParameter->GetMTime())
+    return true;
+
+  Weighting &W = this->WeightingModelParameter->GetInternalScheme();
+
+  for (i = 0; i < W.Weights.size(); i++)
+    {
+    if (W.Weights[i].id < 0 || W.Weights[i].id >= MAX_WEIGHT_ID)
+      {
+      vtkErrorMacro(<< "Weight id " << W.Weights[i].id
+          << " is out of range [0:" << MAX_WEIGHT_ID << ")");
+      return false;
+      }
+    if (W.Weights[i].id > maxId)
+      maxId = W.Weights[i].id;
+    }
+
+  this->WeightTable.assign(maxId + 1, 0.0);
+  this->WeightTableValid.assign(maxId + 1, 0);
+
+  for (i = 0; i < W.Weights.size(); i++)
+    {
+    int id = W.Weights[i].id;
+    if (this->WeightTableValid[id])
+      {
+      vtkErrorMacro(<< "Weight id " << id << " is not unique");
+      this->WeightTable.clear();
+      this->WeightTableValid.clear();
+      return false;
+      }
+    this->WeightTable[id] = W.Weights[i].value;
+    this->WeightTableValid[id] = 1;
+    }
+
+  this->WeightTableTime.Modified();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+// This templated function applies the weight table for any type of factor
+
+template<class T>
+void vtkTAG2EWeightingModelExecute(const double *scalars, const T *factors,
+    vtkIdType num, const double *weights, const char *valid,
+    int numberOfWeights, double nullValue, double *result)
+{
+  vtkIdType i;
+
+#ifdef OMP_PARALLELIZED
+#pragma omp parallel for private(i) shared(scalars, factors, weights, valid, result)
+#endif
+  for (i = 0; i < num; i++)
+    {
+    double val = scalars[i];
+    double factor = static_cast<double>(factors[i]);
+    int id;
+
+    if (val == nullValue || factor == nullValue || !(factor >= 0)
+        || factor >= numberOfWeights)
+      {
+      result[i] = nullValue;
+      continue;
+      }
+
+    id = (int) factor;
+    if (!valid[id])
+      {
+      result[i] = nullValue;
+      continue;
+      }
+    result[i] = weights[id] * val;
+    }
+}
+
+//----------------------------------------------------------------------------
+
 int vtkTAG2EWeightingModel::RequestData(vtkInformation * vtkNotUsed(request),
     vtkInformationVector **inputVector, vtkInformationVector *outputVector)
 {
-  unsigned int i;
-  double val, value;
-  unsigned int id;
-  int num = 0;
+  vtkIdType num = 0;
   vtkDataArray *scalars, *factors;
   vtkDataSetAttributes *attrData;
 
@@ -134,21 +218,15 @@ int vtkTAG2EWeightingModel::RequestData(vtkInformation * vtkNotUsed(request),
   // the internal parameter object for fast access
   Weighting &W = this->WeightingModelParameter->GetInternalScheme();
 
+  if (!this->UpdateWeightTable())
+    return -1;
+
   vtkDataSet* input = vtkDataSet::GetData(inputVector[0]);
   vtkDataSet* output = vtkDataSet::GetData(outputVector);
 
-  output->DeepCopy(input);
-
-  // Result array
-  vtkDoubleArray *result = vtkDoubleArray::New();
-  result->SetNumberOfComponents(1);
-  result->SetName(this->ResultArrayName);
-
-  if (this->UseCellData)
-    result->SetNumberOfTuples(input->GetNumberOfCells());
-  else
-    result->SetNumberOfTuples(input->GetNumberOfPoints());
-  result->FillComponent(0, 0.0);
+  // The result array is added to the output attributes only,
+  // hence the input arrays can be shared
+  output->ShallowCopy(input);
 
   if (this->UseCellData)
     {
@@ -161,6 +239,12 @@ int vtkTAG2EWeightingModel::RequestData(vtkInformation * vtkNotUsed(request),
     }
 
   scalars = attrData->GetScalars();
+  if (scalars == NULL || scalars->GetNumberOfComponents() != 1)
+    {
+    vtkErrorMacro(<< "Active scalars with a single component are missing");
+    return -1;
+    }
+
   if (attrData->HasArray(W.Factor.name.c_str()))
     {
     factors = attrData->GetArray(W.Factor.name.c_str());
@@ -180,21 +264,52 @@ int vtkTAG2EWeightingModel::RequestData(vtkInformation * vtkNotUsed(request),
     return -1;
     }
 
-  for (i = 0; i < num; i++)
+  if (factors->GetNumberOfComponents() != 1)
     {
-    val = scalars->GetTuple1(i);
-    id = (int) factors->GetTuple1(i);
-    if (val == this->NullValue || id < 0 || id > W.Weights.size())
-      {
-      result->SetValue(i, this->NullValue);
-      continue;
-      }
-    value = W.Weights[id].value * val;
-    //std::cout << "Factor " << i << " with id: " << id << " Weight: " <<  W.Weights[id].value <<
-    //             " value " << val << " result: " << value<< std::endl;
-    result->SetValue(i, value);
+    vtkErrorMacro(<< "Factor array " << W.Factor.name.c_str()
+        << " must have a single component");
+    return -1;
+    }
+
+  // Result array
+  vtkDoubleArray *result = vtkDoubleArray::New();
+  result->SetNumberOfComponents(1);
+  result->SetName(this->ResultArrayName);
+  result->SetNumberOfTuples(num);
+
+  // The scalars are converted in case they are not of type double
+  vtkDoubleArray *doubleScalars = vtkDoubleArray::SafeDownCast(scalars);
+  if (doubleScalars)
+    {
+    doubleScalars->Register(this);
+    } else
+    {
+    doubleScalars = vtkDoubleArray::New();
+    doubleScalars->DeepCopy(scalars);
     }
 
+  // Avoid the access of empty vectors
+  const double *weights = NULL;
+  const char *valid = NULL;
+  if (!this->WeightTable.empty())
+    {
+    weights = &this->WeightTable[0];
+    valid = &this->WeightTableValid[0];
+    }
+
+  switch (factors->GetDataType())
+    {
+  vtkTemplateMacro(
+      vtkTAG2EWeightingModelExecute(doubleScalars->GetPointer(0), static_cast<VTK_TT *> (factors->GetVoidPointer(0)), num, weights, valid, (int)this->WeightTable.size(), this->NullValue, result->GetPointer(0)));
+  default:
+    vtkErrorMacro(<< "Unsupported data type of factor array " << W.Factor.name.c_str());
+    doubleScalars->UnRegister(this);
+    result->Delete();
+    return -1;
+    }
+
+  doubleScalars->UnRegister(this);
+
   if (this->UseCellData)
     {
     output->GetCellData()->AddArray(result);
@@ -211,6 +326,109 @@ int vtkTAG2EWeightingModel::RequestData(vtkInformation * vtkNotUsed(request),
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2EWeightingModel::FitWeights(vtkDataSet *target)
+{
+  vtkIdType i, num;
+  unsigned int k;
+  vtkDataSetAttributes *attrData, *targetData;
+
+  if (this->ModelParameter == NULL)
+    {
+    vtkErrorMacro("Model parameter not set or invalid.");
+    return false;
+    }
+
+  vtkDataSet *input = vtkDataSet::SafeDownCast(this->GetInput());
+
+  if (input == NULL || target == NULL)
+    {
+    vtkErrorMacro(<< "The input and the target dataset are required");
+    return false;
+    }
+
+  Weighting &W = this->WeightingModelParameter->GetInternalScheme();
+
+  if (!this->UpdateWeightTable())
+    return false;
+
+  if (this->UseCellData)
+    {
+    attrData = input->GetCellData();
+    targetData = target->GetCellData();
+    num = input->GetNumberOfCells();
+    } else
+    {
+    attrData = input->GetPointData();
+    targetData = target->GetPointData();
+    num = input->GetNumberOfPoints();
+    }
+
+  vtkDataArray *scalars = attrData->GetScalars();
+  vtkDataArray *targets = targetData->GetScalars();
+  vtkDataArray *factors = attrData->GetArray(W.Factor.name.c_str());
+
+  if (scalars == NULL || targets == NULL || factors == NULL)
+    {
+    vtkErrorMacro(<< "The input scalars, the factor array "
+        << W.Factor.name.c_str() << " or the target scalars are missing");
+    return false;
+    }
+
+  if (targets->GetNumberOfTuples() != num)
+    {
+    vtkErrorMacro(<< "The target dataset has a different number of values");
+    return false;
+    }
+
+  // Sum up the least squares terms for each factor id
+  this->CrossSums.assign(this->WeightTable.size(), 0.0);
+  this->SquareSums.assign(this->WeightTable.size(), 0.0);
+
+  for (i = 0; i < num; i++)
+    {
+    double val = scalars->GetTuple1(i);
+    double t = targets->GetTuple1(i);
+    double factor = factors->GetTuple1(i);
+
+    if (val == this->NullValue || t == this->NullValue
+        || factor == this->NullValue || !(factor >= 0)
+        || factor >= this->WeightTable.size())
+      continue;
+
+    int id = (int) factor;
+    if (!this->WeightTableValid[id])
+      continue;
+
+    this->CrossSums[id] += val * t;
+    this->SquareSums[id] += val * val;
+    }
+
+  for (k = 0; k < W.Weights.size(); k++)
+    {
+    WeightingWeight &Weight = W.Weights[k];
+
+    if (Weight.constant || this->SquareSums[Weight.id] == 0.0)
+      continue;
+
+    double value = this->CrossSums[Weight.id] / this->SquareSums[Weight.id];
+
+    // The squared error is a parabola in each weight,
+    // hence the bounded solution is the clamped value
+    if (value < Weight.min)
+      value = Weight.min;
+    if (value > Weight.max)
+      value = Weight.max;
+
+    this->WeightingModelParameter->SetWeightValue(k, value);
+    }
+
+  this->Modified();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 void vtkTAG2EWeightingModel::PrintSelf(ostream& os, vtkIndent indent)
 {
   this->Superclass::PrintSelf(os, indent);
@@ -35,11 +35,16 @@
  * the point data of the temporal input data sets. The  fuzzy inference 
  * must be provided as as XML model parameter representation which is of type
  * vtkTAG2EWeightingModelParameter.
+ *
+ * The active scalars of the input are multiplied with the weight
+ * which id matches the value of the factor array. Values with factor
+ * ids without weight are set to the null value.
  */
 
 #ifndef vtkTAG2EWeightingModel_H
 #define	vtkTAG2EWeightingModel_H
 
+#include <vector>
 #include "vtkTAG2EAbstractCalibratableModel.h"
 #include "vtkTAG2EWeightingModelParameter.h"
 
@@ -62,6 +67,17 @@ vtkTypeRevisionMacro(vtkTAG2EWeightingModel, vtkTAG2EAbstractCalibratableModel)
   //! the input data.
   void SetModelParameter(vtkTAG2EAbstractModelParameter* modelParameter);
 
+  //!\brief Compute the weights which minimize the squared difference between
+  //! the weighted input scalars and the active scalars of the target dataset.
+  //!
+  //! For fixed input scalars the optimal weight of each factor id is the
+  //! least squares solution sum(x*t)/sum(x*x), which is clamped to the weight
+  //! range. Constant weights and weights without valid data are kept.
+  //! The model must be updated before the weights can be fitted.
+  //!\param target The dataset with the measured values as active scalars
+  //!\return true in case of success
+  bool FitWeights(vtkDataSet *target);
+
 protected:
   vtkTAG2EWeightingModel();
   ~vtkTAG2EWeightingModel();
@@ -71,8 +87,20 @@ protected:
   virtual int FillInputPortInformation(int port, vtkInformation* info);
   virtual int FillOutputPortInformation(int port, vtkInformation* info);
 
+  //! \brief Build the dense weight table which maps the factor id to its weight.
+  //! The table is only rebuilt in case the model parameter was modified.
+  bool UpdateWeightTable();
+
   vtkTAG2EWeightingModelParameter *WeightingModelParameter;
 
+  //BTX
+  std::vector<double> WeightTable; // The weight of each factor id
+  std::vector<char> WeightTableValid; // True in case the factor id has a weight
+  std::vector<double> CrossSums; // Sum of input times target of each factor id
+  std::vector<double> SquareSums; // Sum of squared input of each factor id
+  //ETX
+  vtkTimeStamp WeightTableTime;
+
 private:
   vtkTAG2EWeightingModel(const vtkTAG2EWeightingModel& orig); // Not implemented.
   void operator=(const vtkTAG2EWeightingModel&); // Not implemented.
@@ -55,6 +55,23 @@ vtkTAG2EWeightingModelParameter::~vtkTAG2EWeightingModelParameter()
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2EWeightingModelParameter::DeepCopy(
+    vtkTAG2EAbstractCalibratableModelParameter *parameter)
+{
+  if (!this->Superclass::DeepCopy(parameter))
+    return false;
+
+  vtkTAG2EWeightingModelParameter *weighting =
+      vtkTAG2EWeightingModelParameter::SafeDownCast(parameter);
+
+  if (weighting != this)
+    this->W = weighting->W;
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 bool vtkTAG2EWeightingModelParameter::GenerateXMLFromInternalScheme()
 {
   unsigned int i;
@@ -132,6 +149,37 @@ bool vtkTAG2EWeightingModelParameter::SetParameter(unsigned int index,
 
 //----------------------------------------------------------------------------
 
+bool vtkTAG2EWeightingModelParameter::SetWeightValue(unsigned int position,
+    double value)
+{
+  unsigned int count = 0;
+  unsigned int i;
+
+  if (position >= this->W.Weights.size())
+    {
+    vtkErrorMacro(<< "Weight position " << position << " is out of range");
+    return false;
+    }
+
+  // The count mechanism must be identical with CreateParameterIndex
+  for (i = 0; i < position; i++)
+    {
+    if (this->W.Weights[i].constant == false)
+      count++;
+    }
+
+  if (this->W.Weights[position].constant == false
+      && count < this->ParameterValues.size())
+    this->ParameterValues[count] = value;
+
+  this->W.Weights[position].value = value;
+  this->Modified();
+
+  return true;
+}
+
+//----------------------------------------------------------------------------
+
 bool vtkTAG2EWeightingModelParameter::CreateParameterIndex()
 {
   unsigned int i;
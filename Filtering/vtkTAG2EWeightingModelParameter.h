@@ -83,6 +83,10 @@ public:
 
     virtual bool GenerateInternalSchemeFromXML();
     virtual bool GenerateXMLFromInternalScheme();
+
+    //!\brief Copy the weighting scheme and the parameter state of
+    //! another weighting model parameter
+    virtual bool DeepCopy(vtkTAG2EAbstractCalibratableModelParameter *parameter);
     
     //BTX
     Weighting &GetInternalScheme() {
@@ -90,6 +94,12 @@ public:
     }
     //ETX
 
+    //!\brief Set the value of a weight and keep the calibration state in sync
+    //!\param position The position of the weight in the weight list
+    //!\param value The new weight value
+    //!\return false in case the position is out of range
+    bool SetWeightValue(unsigned int position, double value);
+
 protected:
 
     vtkTAG2EWeightingModelParameter();
@@ -34,6 +34,8 @@
 #  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 #  GNU General Public License for more details.
 
+import grass.script as grass
+import os
 import sys
 
 #include the VTK and vtkGRASSBridge Python libraries
@@ -47,6 +49,268 @@ from libvtkGRASSBridgeCommonPython import *
 ################################################################################
 ################################################################################
 
+def CreateModelPipeline(dataset, paramFile, weighted, computeSigma, nullValue, messages,
+                        lookupTable=False):
+    """Create the (weighted) fuzzy inference model pipeline
+
+       Returns the first and the last model of the pipeline. The input
+       of the first model can be replaced to process several datasets
+       with the same parameter. In case lookupTable is True the fuzzy
+       inference model interpolates the result in a precomputed lookup table.
+    """
+    if weighted:
+
+        xmlRoot = vtkXMLDataElement()
+        xmlRootFIS = vtkXMLDataElement()
+        xmlRootW = vtkXMLDataElement()
+
+        if not vtkTAG2EAbstractModelParameter.ReadXMLFile(paramFile, xmlRoot):
+            messages.FatalError("Unable to read the parameter file " + paramFile)
+
+        if xmlRoot.GetName() != "MetaModel":
+            messages.FatalError("Wrong input XML file. Missing MetaModel element.")
+            
+        xmlRootFIS.DeepCopy(xmlRoot.FindNestedElementWithName("FuzzyInferenceScheme"))
+
+        if xmlRootFIS.GetName() != "FuzzyInferenceScheme":
+            messages.FatalError("Wrong input XML file. Missing FuzzyInferenceScheme element.")
+
+        xmlRootW.DeepCopy(xmlRoot.FindNestedElementWithName("Weighting"))
+
+        if xmlRootW.GetName() != "Weighting":
+            messages.FatalError("Wrong input XML file. Missing Weighting element.")
+
+        # Set up the parameter and the model of the meta model
+        parameterFIS = vtkTAG2EFuzzyInferenceModelParameter()
+        parameterFIS.SetXMLRepresentation(xmlRootFIS)
+        parameterFIS.DebugOff()
+
+        modelFIS = vtkTAG2EFuzzyInferenceModel()
+        modelFIS.SetInput(dataset)
+        modelFIS.SetModelParameter(parameterFIS)
+        modelFIS.UseCellDataOff()
+        if computeSigma:
+            modelFIS.ComputeSigmaOn()
+        modelFIS.SetNullValue(nullValue)
+        if lookupTable:
+            modelFIS.UseLookupTableOn()
+
+        parameterW = vtkTAG2EWeightingModelParameter()
+        parameterW.SetXMLRepresentation(xmlRootW)
+        parameterW.DebugOff()
+
+        modelW = vtkTAG2EWeightingModel()
+        modelW.SetInputConnection(modelFIS.GetOutputPort())
+        modelW.SetModelParameter(parameterW)
+        modelW.UseCellDataOff()
+        modelW.SetNullValue(nullValue)
+
+        return modelFIS, modelW
+
+    else:
+        # Set up the parameter and the model
+        parameter = vtkTAG2EFuzzyInferenceModelParameter()
+        parameter.SetFileName(paramFile)
+        parameter.Read()
+
+        model = vtkTAG2EFuzzyInferenceModel()
+        model.SetInput(dataset)
+        model.SetModelParameter(parameter)
+        model.UseCellDataOff()
+        if computeSigma:
+            model.ComputeSigmaOn()
+        model.SetNullValue(nullValue)
+        if lookupTable:
+            model.UseLookupTableOn()
+
+        return model, model
+
+################################################################################
+
+def ReadRowBlock(readers, aliases, start, end):
+    """Read the rows [start, end) of all raster map readers and
+       return them as image data with one point data array per alias
+    """
+    dataset = vtkImageData()
+
+    for count in range(len(readers)):
+        # Stack the rows along the y axis
+        append = vtkImageAppend()
+        append.SetAppendAxis(1)
+
+        for row in range(start, end):
+            rowData = vtkDoubleArray()
+            rowData.DeepCopy(readers[count].GetRow(row))
+
+            rowImage = vtkImageData()
+            rowImage.SetDimensions(rowData.GetNumberOfTuples(), 1, 1)
+            rowImage.SetScalarTypeToDouble()
+            rowImage.SetNumberOfScalarComponents(1)
+            rowImage.GetPointData().SetScalars(rowData)
+            append.AddInput(rowImage)
+
+        append.Update()
+        scalars = append.GetOutput().GetPointData().GetScalars()
+        scalars.SetName(aliases[count])
+
+        if count == 0:
+            dataset.CopyStructure(append.GetOutput())
+            dataset.GetPointData().SetScalars(scalars)
+        else:
+            dataset.GetPointData().AddArray(scalars)
+
+    return dataset
+
+################################################################################
+
+def WriteRowBlock(writer, dataset, arrayName, cols, rows):
+    """Write the rows of the array arrayName of a row block image data
+       into an opened raster map writer
+    """
+    voi = vtkExtractVOI()
+    voi.SetInput(dataset)
+
+    for row in range(rows):
+        voi.SetVOI(0, cols - 1, row, row, 0, 0)
+        voi.Update()
+        writer.PutNextRow(voi.GetOutput().GetPointData().GetArray(arrayName))
+
+################################################################################
+
+def RunStreaming(raster_maps, raster_alias, paramFile, weighted, outputName, sdName,
+                 chunkSize, nullValue, messages, lookupTable=False):
+    """Process the raster maps block wise with chunkSize rows at once
+
+       Only the rows of the current block are kept in memory, the
+       result and the standard deviation are written row by row.
+    """
+    readers = []
+    aliases = []
+
+    for count in range(raster_maps.GetNumberOfValues()):
+        reader = vtkGRASSRasterMapReader()
+        reader.SetNullValue(nullValue)
+        reader.UseNullValueOn()
+        reader.OpenMap(raster_maps.GetValue(count))
+        readers.append(reader)
+        aliases.append(raster_alias.GetValue(count))
+
+    rows = readers[0].GetNumberOfRows()
+    cols = readers[0].GetNumberOfCols()
+
+    writer = vtkGRASSRasterMapWriter()
+    writer.SetMapTypeToDCELL()
+    writer.SetNullValue(nullValue)
+    writer.UseNullValueOn()
+    writer.OpenMap(outputName)
+
+    sdWriter = None
+    if sdName:
+        sdWriter = vtkGRASSRasterMapWriter()
+        sdWriter.SetMapTypeToDCELL()
+        sdWriter.SetNullValue(nullValue)
+        sdWriter.UseNullValueOn()
+        sdWriter.OpenMap(sdName)
+
+    firstModel, lastModel = CreateModelPipeline(vtkImageData(), paramFile, weighted,
+                                                bool(sdName), nullValue, messages, lookupTable)
+
+    for start in range(0, rows, chunkSize):
+        end = min(start + chunkSize, rows)
+        messages.VerboseMessage("Processing rows %i to %i of %i" % (start, end - 1, rows))
+
+        firstModel.SetInput(ReadRowBlock(readers, aliases, start, end))
+        lastModel.Update()
+
+        WriteRowBlock(writer, lastModel.GetOutput(), "result", cols, end - start)
+        if sdWriter:
+            WriteRowBlock(sdWriter, lastModel.GetOutput(), "Sigma", cols, end - start)
+
+    for reader in readers:
+        reader.CloseMap()
+
+    writer.CloseMap()
+    if sdWriter:
+        sdWriter.CloseMap()
+
+################################################################################
+
+def RunTiled(raster_maps, raster_alias, paramFile, weighted, outputName, sdName,
+             chunkSize, numberOfProcesses, messages, lookupTable=False):
+    """Split the current region into row tiles, process each tile in a
+       separate r.fuzzy.model process with its own region and patch the
+       tile results into the output raster maps
+    """
+    region = grass.region()
+    rows = int(region["rows"])
+
+    if numberOfProcesses > rows:
+        numberOfProcesses = rows
+
+    tileRows = rows // numberOfProcesses
+    if rows % numberOfProcesses != 0:
+        tileRows += 1
+
+    inputs = ",".join([raster_maps.GetValue(i) for i in range(raster_maps.GetNumberOfValues())])
+    aliases = ",".join([raster_alias.GetValue(i) for i in range(raster_alias.GetNumberOfValues())])
+
+    flags = ""
+    if weighted:
+        flags += "w"
+    if lookupTable:
+        flags += "l"
+
+    procList = []
+    tileOutputs = []
+    tileSds = []
+
+    # Parallel tile runs
+    for start in range(0, rows, tileRows):
+        end = min(start + tileRows, rows)
+        tile_id = "%s_tile_%i_%i" % (outputName, os.getpid(), len(procList))
+
+        # The tile region covers the rows [start, end) of the current region
+        env = os.environ.copy()
+        env["GRASS_REGION"] = grass.region_env(n=float(region["n"]) - start * float(region["nsres"]),
+                                               s=float(region["n"]) - end * float(region["nsres"]),
+                                               e=region["e"], w=region["w"],
+                                               nsres=region["nsres"], ewres=region["ewres"])
+
+        tileOutputs.append(tile_id)
+        tileSd = None
+        if sdName:
+            tileSd = tile_id + "_sd"
+            tileSds.append(tileSd)
+
+        messages.VerboseMessage("Processing rows %i to %i of %i in a separate process" % (start, end - 1, rows))
+
+        procList.append(grass.start_command("r.fuzzy.model", flags=flags, overwrite=True,
+                                            input=inputs, alias=aliases, parameter=paramFile,
+                                            output=tile_id, sd=tileSd, rows=chunkSize,
+                                            nprocs=1, env=env))
+
+    # Wait for all created processes
+    failed = False
+    for proc in procList:
+        if proc.wait() != 0:
+            failed = True
+
+    # Mosaic the tiles in the current region
+    if not failed:
+        grass.run_command("r.patch", overwrite=True, input=",".join(tileOutputs), output=outputName)
+        if sdName:
+            grass.run_command("r.patch", overwrite=True, input=",".join(tileSds), output=sdName)
+
+    grass.run_command("g.remove", flags="f", type="raster", quiet=True,
+                      name=",".join(tileOutputs + tileSds))
+
+    if failed:
+        messages.FatalError("Unable to compute the fuzzy inference model for all tiles")
+
+################################################################################
+################################################################################
+################################################################################
+
 def main():
     # Initiate GRASS
     init = vtkGRASSInit()
@@ -82,10 +346,30 @@ def main():
     weighting.SetDescription("Input is weighted fuzzy inference scheme")
     weighting.SetKey('w')
 
+    lookup = vtkGRASSFlag()
+    lookup.SetDescription("Interpolate the fuzzy inference result in a precomputed lookup table instead of the exact computation")
+    lookup.SetKey('l')
+
     vtkout = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetFileOutputType(), "vtkout")
     vtkout.RequiredOff()
     vtkout.SetDescription("The file name of the best fitted model result exported as VTK image data output (.vtk)")
 
+    rows = vtkGRASSOption()
+    rows.SetKey("rows")
+    rows.MultipleOff()
+    rows.RequiredOff()
+    rows.SetDefaultAnswer("0")
+    rows.SetDescription("The number of raster rows processed at once, 0 reads the raster maps completely into memory")
+    rows.SetTypeToInteger()
+
+    nprocs = vtkGRASSOption()
+    nprocs.SetKey("nprocs")
+    nprocs.MultipleOff()
+    nprocs.RequiredOff()
+    nprocs.SetDefaultAnswer("1")
+    nprocs.SetDescription("The number of processes, the region is split into row tiles that are computed in parallel")
+    nprocs.SetTypeToInteger()
+
     paramter = vtkStringArray()
     for arg in sys.argv:
         paramter.InsertNextValue(str(arg))
@@ -95,8 +379,6 @@ def main():
 
     messages = vtkGRASSMessagingInterface()
 
-    messages.VerboseMessage("Reading raster maps into memory")
-    
     raster_maps = vtkStringArray()
     input.GetAnswers(raster_maps)
      
@@ -110,9 +392,41 @@ def main():
     if raster_alias.GetNumberOfValues() == 0:
         input.GetAnswers(raster_alias)
 
-    dataset = vtkImageData()
     nullValue = -999999
-    
+    chunkSize = int(rows.GetAnswer())
+
+    if chunkSize < 0:
+        messages.FatalError("The number of rows must be positive")
+
+    numberOfProcesses = int(nprocs.GetAnswer())
+
+    if numberOfProcesses < 1:
+        messages.FatalError("The number of processes must be positive")
+
+    # Compute the region tiles in parallel processes
+    if numberOfProcesses > 1:
+        if vtkout.GetAnswer():
+            messages.Warning("The VTK image data output is not supported in tiled mode")
+
+        RunTiled(raster_maps, raster_alias, paramXML.GetAnswer(), weighting.GetAnswer(),
+                 output.GetAnswer(), sd.GetAnswer(), chunkSize, numberOfProcesses, messages,
+                 lookup.GetAnswer())
+        return 0
+
+    # Process the raster maps block wise to bound the memory consumption
+    if chunkSize > 0:
+        if vtkout.GetAnswer():
+            messages.Warning("The VTK image data output is not supported in row block mode")
+
+        RunStreaming(raster_maps, raster_alias, paramXML.GetAnswer(), weighting.GetAnswer(),
+                     output.GetAnswer(), sd.GetAnswer(), chunkSize, nullValue, messages,
+                     lookup.GetAnswer())
+        return 0
+
+    messages.VerboseMessage("Reading raster maps into memory")
+
+    dataset = vtkImageData()
+
     # Read all raster maps into memory
     for count in range(raster_maps.GetNumberOfValues()):
         map_name = raster_maps.GetValue(count)
@@ -131,75 +445,15 @@ def main():
         else:
             dataset.GetPointData().AddArray(map.GetOutput().GetPointData().GetScalars())
 
-    outputDS = vtkImageData()
-
-    if weighting.GetAnswer():
-
-        reader = vtkXMLDataParser()
-        reader.SetFileName(paramXML.GetAnswer())
-        reader.Parse()
+    firstModel, lastModel = CreateModelPipeline(dataset, paramXML.GetAnswer(), weighting.GetAnswer(),
+                                                sd.GetAnswer(), nullValue, messages, lookup.GetAnswer())
+    lastModel.Update()
 
-        xmlRoot = vtkXMLDataElement()
-        xmlRootFIS = vtkXMLDataElement()
-        xmlRootW = vtkXMLDataElement()
-
-        xmlRoot.DeepCopy(reader.GetRootElement())
-
-        if xmlRoot.GetName() != "MetaModel":
-            messages.FatalError("Wrong input XML file. Missing MetaModel element.")
-            
-        xmlRootFIS.DeepCopy(xmlRoot.FindNestedElementWithName("FuzzyInferenceScheme"))
-
-        if xmlRootFIS.GetName() != "FuzzyInferenceScheme":
-            messages.FatalError("Wrong input XML file. Missing FuzzyInferenceScheme element.")
+    if lookup.GetAnswer():
+        messages.VerboseMessage("Estimated lookup table interpolation error: %g" % firstModel.GetLookupTableErrorEstimate())
 
-        xmlRootW.DeepCopy(xmlRoot.FindNestedElementWithName("Weighting"))
-
-        if xmlRootW.GetName() != "Weighting":
-            messages.FatalError("Wrong input XML file. Missing Weighting element.")
-
-        # Set up the parameter and the model of the meta model
-        parameterFIS = vtkTAG2EFuzzyInferenceModelParameter()
-        parameterFIS.SetXMLRepresentation(xmlRootFIS)
-        parameterFIS.DebugOff()
-
-        modelFIS = vtkTAG2EFuzzyInferenceModel()
-        modelFIS.SetInput(dataset)
-        modelFIS.SetModelParameter(parameterFIS)
-        modelFIS.UseCellDataOff()
-        if sd.GetAnswer():
-            modelFIS.ComputeSigmaOn()
-        modelFIS.SetNullValue(nullValue)
-
-        parameterW = vtkTAG2EWeightingModelParameter()
-        parameterW.SetXMLRepresentation(xmlRootW)
-        parameterW.DebugOff()
-
-        modelW = vtkTAG2EWeightingModel()
-        modelW.SetInputConnection(modelFIS.GetOutputPort())
-        modelW.SetModelParameter(parameterW)
-        modelW.UseCellDataOff()
-        modelW.SetNullValue(nullValue)
-        modelW.Update()
-
-        outputDS.ShallowCopy(modelW.GetOutput())
-
-    else:
-        # Set up the parameter and the model
-        parameter = vtkTAG2EFuzzyInferenceModelParameter()
-        parameter.SetFileName(paramXML.GetAnswer())
-        parameter.Read()
-
-        model = vtkTAG2EFuzzyInferenceModel()
-        model.SetInput(dataset)
-        model.SetModelParameter(parameter)
-        model.UseCellDataOff()
-        if sd.GetAnswer():
-            model.ComputeSigmaOn()
-        model.SetNullValue(nullValue)
-        model.Update()
-
-        outputDS.ShallowCopy(model.GetOutput())
+    outputDS = vtkImageData()
+    outputDS.ShallowCopy(lastModel.GetOutput())
 
     messages.VerboseMessage("Writing first result raster map")
 
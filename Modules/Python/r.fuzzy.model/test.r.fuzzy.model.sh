@@ -22,3 +22,11 @@ v.db.join  map=model column=cat otable=map2 ocolumn=cat --v
 v.fuzzy.model  input=model param=param.xml mcol=model sigparam=param_sigma.xml output=model_result
 # Compute the model result and the cell specific standard deviation
 r.fuzzy.model  input=map1,map2 param=param_sigma.xml output=model_result sd=model_sd
+# Compute the same model in row block mode, the results must be identical
+r.fuzzy.model  input=map1,map2 param=param_sigma.xml output=model_result_rows sd=model_sd_rows rows=7
+r.mapcalc  expr="model_result_diff = model_result - model_result_rows"
+r.univar model_result_diff
+# Compute the same model with four processes on region tiles
+r.fuzzy.model  input=map1,map2 param=param_sigma.xml output=model_result_tiles sd=model_sd_tiles nprocs=4
+r.mapcalc  expr="model_result_diff = model_result - model_result_tiles"
+r.univar model_result_diff
@@ -122,26 +122,31 @@ def main():
 
     poolDPM = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetRasterInputType())
     poolDPM.SetKey("dpmpool")
+    poolDPM.RequiredOff()
     poolDPM.SetDescription("Input raster map specifying the DPM pool [tC/ha] at the start "
                            "of the computation (usually from generated by equilibrium run)")
 
     poolRPM = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetRasterInputType())
     poolRPM.SetKey("rpmpool")
+    poolRPM.RequiredOff()
     poolRPM.SetDescription("Input raster map specifying the RPM pool [tC/ha] at the start "
                            "of the computation (usually from generated by equilibrium run)")
 
     poolHUM = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetRasterInputType())
     poolHUM.SetKey("humpool")
+    poolHUM.RequiredOff()
     poolHUM.SetDescription("Input raster map specifying the HUM pool [tC/ha] at the start "
                            "of the computation (usually from generated by equilibrium run)")
 
     poolBIO = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetRasterInputType())
     poolBIO.SetKey("biopool")
+    poolBIO.RequiredOff()
     poolBIO.SetDescription("Input raster map specifying the BIO pool [tC/ha] at the start "
                            "of the computation (usually from generated by equilibrium run)")
 
     poolIOM = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetRasterInputType())
     poolIOM.SetKey("iompool")
+    poolIOM.RequiredOff()
     poolIOM.SetDescription("Input raster map specifying the IOM pool [tC/ha] at the start "
                            "of the computation (usually from generated by equilibrium run)")
 
@@ -152,6 +157,19 @@ def main():
     baseName.RequiredOn()
     baseName.SetDescription("The base name of the new created raster maps")
 
+    resume = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetFileInputType())
+    resume.SetKey("resume")
+    resume.RequiredOff()
+    resume.SetDescription("The binary checkpoint file to resume a former computation. "
+                          "The pool maps are not required in this case and the time "
+                          "steps that were already computed are skipped.")
+
+    checkpoint = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetFileOutputType())
+    checkpoint.SetKey("checkpoint")
+    checkpoint.RequiredOff()
+    checkpoint.SetDescription("The binary checkpoint file to store the pools "
+                              "at the end of the computation")
+
     # Soil organic carbon Space time raster datasets
     soc = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetSTRDSOutputType())
     soc.SetKey("soc")
@@ -199,9 +217,17 @@ def main():
                                            temperature.GetAnswer(), False,
                                  "|", "equal,during,contains", False, True)
 
-    pools = read_pools(poolDPM=poolDPM.GetAnswer(), poolRPM=poolRPM.GetAnswer(),
-                       poolHUM=poolHUM.GetAnswer(), poolBIO=poolBIO.GetAnswer(),
-                       poolIOM=poolIOM.GetAnswer())
+    pools = None
+    if not resume.GetAnswer():
+        if not poolDPM.GetAnswer() or not poolRPM.GetAnswer() or \
+           not poolHUM.GetAnswer() or not poolBIO.GetAnswer() or \
+           not poolIOM.GetAnswer():
+            print("ERROR: The pool maps must be set in case no checkpoint is resumed")
+            return -1
+
+        pools = read_pools(poolDPM=poolDPM.GetAnswer(), poolRPM=poolRPM.GetAnswer(),
+                           poolHUM=poolHUM.GetAnswer(), poolBIO=poolBIO.GetAnswer(),
+                           poolIOM=poolIOM.GetAnswer())
 
     xml = None
     if xmlParam.GetAnswer():
@@ -211,7 +237,8 @@ def main():
         xml.GenerateInternalSchemeFromXML()
 
     RothCModelRun(mapmatrix, pools, clayContent.GetAnswer(), soc.GetAnswer(),
-                  baseName.GetAnswer(), xml, -99999, bool(init.Overwrite()))
+                  baseName.GetAnswer(), xml, -99999, bool(init.Overwrite()),
+                  checkpoint.GetAnswer(), resume.GetAnswer())
 
     return 0
 
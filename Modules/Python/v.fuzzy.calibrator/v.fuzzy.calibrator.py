@@ -232,6 +232,18 @@ def main():
     weighting.SetDescription("Use weighting for input data calibration. A weightingfactor and the number of weights must be provided.")
     weighting.SetKey('w')
 
+    fitWeights = vtkGRASSFlag()
+    fitWeights.SetDescription("Compute the weights with least squares after each model run, "\
+                              "only the fuzzy inference parameter are calibrated with simulated annealing. "\
+                              "Requires weighting.")
+    fitWeights.SetKey('l')
+
+    solveResponses = vtkGRASSFlag()
+    solveResponses.SetDescription("Compute the responses with bounded least squares after each accepted "\
+                                  "modification, only the fuzzy sets are calibrated with simulated annealing. "\
+                                  "Not available with weighting.")
+    solveResponses.SetKey('r')
+
     alterCriterion = vtkGRASSFlag()
     alterCriterion.SetDescription("Use an alternative information criterion computation")
     alterCriterion.SetKey('i')
@@ -241,7 +253,8 @@ def main():
     output.SetDescription("The best fitted model result as vector map")
 
     paramXML = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetFileOutputType(), "parameter")
-    paramXML.SetDescription("Output name of the calibrated XML (weighted) fuzzy inference parameter file")
+    paramXML.SetDescription("Output name of the calibrated XML (weighted) fuzzy inference parameter file. "\
+                             "Files with the extension .bin are written in the fast loading binary format.")
 
     logfile = vtkGRASSOptionFactory().CreateInstance(vtkGRASSOptionFactory.GetFileOutputType(), "log")
     logfile.SetDescription("The name of the logfile to store the model error and AKAIKE criteria")
@@ -267,6 +280,10 @@ def main():
     if weighting.GetAnswer() == True:
         if not weightingFactor.GetAnswer():
             messages.FatalError("The name of the weighting column name must be provided")
+        if solveResponses.GetAnswer() == True:
+            messages.FatalError("The least squares response computation is not available with weighting")
+    elif fitWeights.GetAnswer() == True:
+        messages.FatalError("The least squares weight computation requires weighting")
 
     # Create the names for the vector import and the (weighted) fuzzy inference scheme generation
     columns = vtkStringArray()
@@ -324,10 +341,10 @@ def main():
     # In case an initial FIS or WFIS XML file is provided, add only the new factors
     # to the XML representation
     if initparamXML.GetAnswer():
-        # Read the XML file
-        reader = vtkXMLDataParser()
-        reader.SetFileName(initparamXML.GetAnswer())
-        reader.Parse()
+        # Read the XML or binary parameter file
+        xmlInput = vtkXMLDataElement()
+        if not vtkTAG2EAbstractModelParameter.ReadXMLFile(initparamXML.GetAnswer(), xmlInput):
+            messages.FatalError("Unable to read the initial parameter file " + initparamXML.GetAnswer())
 
         xmlRootFIS = vtkXMLDataElement()
         xmlRootW = vtkXMLDataElement()
@@ -336,7 +353,7 @@ def main():
         if weighting.GetAnswer():        
 
             xmlRoot = vtkXMLDataElement()
-            xmlRoot.DeepCopy(reader.GetRootElement())
+            xmlRoot.DeepCopy(xmlInput)
             
             if xmlRoot.GetName() != "MetaModel":
                 messages.FatalError("Wrong input XML file. Missing MetaModel element.")
@@ -365,7 +382,7 @@ def main():
 
             pass
         else:
-            xmlRootFIS.DeepCopy(reader.GetRootElement())
+            xmlRootFIS.DeepCopy(xmlInput)
             # In case the FIS exists, add only the factors which are not already present
             xmlRootFIS = MergeFuzzyInferenceSchemes(xmlRootFIS, names, 
                                                     fuzzySetNum, target.GetAnswer(), 
@@ -424,6 +441,10 @@ def main():
         meta.InsertModelParameter(modelW, parameterW, "vtkTAG2EWeightingModel")
         meta.SetLastModelParameterInPipeline(modelW, parameterW, "vtkTAG2EWeightingModel")
         meta.SetTargetDataSet(polyData)
+        
+        # The weights are computed analytically for each fuzzy inference result
+        if fitWeights.GetAnswer():
+            meta.InsertFittedModel("vtkTAG2EWeightingModel")
 
         bestFitParameter, bestFitOutput, bestFitError, ModelAssessmentFactor = \
                           Calibration.MetaModelSimulatedAnnealingImproved(\
@@ -431,7 +452,9 @@ def main():
                           float(breakcrit.GetAnswer()), float(treduce.GetAnswer()),\
                           float(sdreduce.GetAnswer()))
 
-        bestFitParameter.PrintXML(paramXML.GetAnswer())
+        # Write the XML or binary parameter file
+        if not vtkTAG2EAbstractModelParameter.WriteXMLFile(paramXML.GetAnswer(), bestFitParameter):
+            messages.FatalError("Unable to write the parameter file " + paramXML.GetAnswer())
         
         outputDS.ShallowCopy(bestFitOutput)
 
@@ -456,6 +479,7 @@ def main():
         caliModel.SetModelParameter(parameter)
         caliModel.SetMaxNumberOfIterations(int(iterations.GetAnswer()))
         caliModel.SetInitialT(1)
+        caliModel.SetSolveResponses(int(solveResponses.GetAnswer()))
         caliModel.SetTMinimizer(float(treduce.GetAnswer()))
         caliModel.SetStandardDeviation(float(sd.GetAnswer()))
         caliModel.SetBreakCriteria(float(breakcrit.GetAnswer()))
@@ -119,15 +119,12 @@ def main():
 
     if weighting.GetAnswer():
 
-        reader = vtkXMLDataParser()
-        reader.SetFileName(paramXML.GetAnswer())
-        reader.Parse()
-
         xmlRoot = vtkXMLDataElement()
         xmlRootFIS = vtkXMLDataElement()
         xmlRootW = vtkXMLDataElement()
 
-        xmlRoot.DeepCopy(reader.GetRootElement())
+        if not vtkTAG2EAbstractModelParameter.ReadXMLFile(paramXML.GetAnswer(), xmlRoot):
+            messages.FatalError("Unable to read the parameter file " + paramXML.GetAnswer())
 
         if xmlRoot.GetName() != "MetaModel":
             messages.FatalError("Wrong input XML file. Missing MetaModel element.")
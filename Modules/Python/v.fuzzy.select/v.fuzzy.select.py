@@ -108,7 +108,7 @@ def selectBestModel(minBIC, errorList, BICList, AICList, MAFList, RsquaredList):
 ################################################################################
 
 def StartCalibration(id, dir, inputvector, target, factornames, fuzzysets, iterations, runs, 
-        treduce, sdreduce, breakcrit, bootstrapOn=False, samplingfactor=None):
+        treduce, sdreduce, breakcrit, bootstrapOn=False, samplingfactor=None, extension=".xml"):
 
     minBIC = 999999
     flags=""
@@ -132,7 +132,7 @@ def StartCalibration(id, dir, inputvector, target, factornames, fuzzysets, itera
                           input=inputvector, factors=factornames,\
                           target=target, fuzzysets=fuzzysets, iterations=iterations, \
                           samplingfactor=samplingfactor, \
-                          parameter=os.path.join(dir, (run_id + ".xml")), \
+                          parameter=os.path.join(dir, (run_id + extension)), \
                           log=os.path.join(dir, (run_id + ".log")), treduce=treduce, \
                           sdreduce=sdreduce, breakcrit=breakcrit))
 
@@ -169,7 +169,8 @@ def StartCalibration(id, dir, inputvector, target, factornames, fuzzysets, itera
 ################################################################################
 
 def StartWeightedCalibration(id, dir, inputvector, target, factornames, fuzzysets, iterations, runs, 
-        WeightNum, WeightFactor, treduce, sdreduce, breakcrit, bootstrapOn=False, samplingfactor=None):
+        WeightNum, WeightFactor, treduce, sdreduce, breakcrit, bootstrapOn=False, samplingfactor=None,
+        extension=".xml"):
 
     minBIC = 999999
     flags="w"
@@ -189,7 +190,7 @@ def StartWeightedCalibration(id, dir, inputvector, target, factornames, fuzzyset
 
         procList.append(grass.start_command("v.fuzzy.calibrator", flags=flags, overwrite=True, input=inputvector, factors=factornames,\
               target=target, fuzzysets=fuzzysets, iterations=iterations, \
-              parameter=os.path.join(dir, (run_id + ".xml")), \
+              parameter=os.path.join(dir, (run_id + extension)), \
               log=os.path.join(dir, (run_id + ".log")), treduce=treduce, sdreduce=sdreduce,\
               weightnum=WeightNum, weightfactor=WeightFactor))
         
@@ -332,6 +333,16 @@ def main():
     sdreduce.SetDescription("This factor is used to reduce the standard deviation each step")  
     sdreduce.SetTypeToDouble()                                                                 
  
+    parameterFormat = vtkGRASSOption()
+    parameterFormat.SetKey("format")
+    parameterFormat.MultipleOff()
+    parameterFormat.RequiredOff()
+    parameterFormat.SetDefaultAnswer("xml")
+    parameterFormat.SetDefaultOptions("xml,bin")
+    parameterFormat.SetDescription("The file format of the calibrated parameter files of the single runs, "\
+                                   "binary files can only be read with the TAG2E model parameter classes")
+    parameterFormat.SetTypeToString()
+
     bagging = vtkGRASSFlag()
     bagging.SetDescription("Use boostrap aggregation (bagging) for input data selection")
     bagging.SetKey('b')
@@ -378,6 +389,7 @@ def main():
     Iterations = int(iterations.GetAnswer())
     runs = int(runs.GetAnswer())
     searchDepth = int(sdepth.GetAnswer())
+    Extension = "." + parameterFormat.GetAnswer()
     
     tmpdir = grass.tempdir()
 
@@ -433,7 +445,8 @@ def main():
                                                      sdreduce.GetAnswer(), 
                                                      breakcrit.GetAnswer(), 
                                                      bagging.GetAnswer(), 
-                                                     samplingFactor.GetAnswer())
+                                                     samplingFactor.GetAnswer(),
+                                                     Extension)
 
                     CalibrationResult[id] = {"NAME":a, "FIS":b, "ERROR":error, 
                                              "BIC":BIC, "AIC":AIC, "MAF":MAF, 
@@ -446,7 +459,8 @@ def main():
                                                         sdreduce.GetAnswer(), 
                                                         breakcrit.GetAnswer(), 
                                                         bagging.GetAnswer(), 
-                                                        samplingFactor.GetAnswer())
+                                                        samplingFactor.GetAnswer(),
+                                                        Extension)
                 
                     CalibrationResult[id] = {"NAME":a, "FIS":b, "ERROR":error, 
                                          "BIC":BIC, "AIC":AIC, "MAF":MAF, 
@@ -2,6 +2,7 @@ from optparse import OptionParser
 from datetime import datetime
 from vtk import *
 import os
+import multiprocessing
 
 from libvtkTAG2ECommonPython import *
 from libvtkTAG2EFilteringPython import *
@@ -281,6 +282,181 @@ class SiteToVTK:
             ds["SoilCarbon"] = SoilCarbon
             self.datasets.append(ds)
     
+###############################################################################
+
+def ReadSiteIds(filename):
+    """!Read the group ids of all sites from the SOC main text file
+    
+       @param filename: The SOC main text file
+       @return A sorted list of unique group ids
+    """
+    file = open(filename, "r")
+    lines = file.readlines()
+    file.close()
+    
+    gids = set()
+    for line in lines[2:]:
+        list = line.split(";")
+        if len(list) > 9:
+            gids.add(int(list[9]))
+    
+    return sorted(gids)
+
+###############################################################################
+
+class SitesToVTK:
+    """!Convert the plots of many sites into a single polydata time series
+    
+       The line cells of all plots of all sites are concatenated into one
+       polydata for each month, so that the monthly model pipeline is
+       computed only once for all sites. The cell array "SiteId" stores
+       the group id of each cell.
+       
+       The time series of the sites are aligned by their month index.
+       Sites with shorter time series are padded with null values for
+       temperature and radiation, the RothC model keeps the C pools
+       of these cells unchanged in the padded months.
+    """
+    def __init__(self, sites, NullValue=-99999):
+        self.sites = sites
+        self.NullValue = NullValue
+        self.datasets = []
+        self.siteIds = None
+        self.numberOfMonths = {}
+        self.convert()
+    
+    def convert(self, sites=None):
+        if sites:
+            self.sites = sites
+        
+        self.datasets = []
+        self.numberOfMonths = {}
+        
+        plots = []
+        for site in self.sites:
+            self.numberOfMonths[site.gid] = len(site.timeSeriesData[site.plots[0].name])
+            for plot in site.plots:
+                plots.append((site, plot))
+        
+        num = len(plots)
+        months = max(self.numberOfMonths.values())
+        
+        # The geometry and the site ids are shared by all datasets
+        points = vtkPoints()
+        lines = vtkCellArray()
+        
+        self.siteIds = vtkIntArray()
+        self.siteIds.SetNumberOfTuples(num)
+        self.siteIds.SetName("SiteId")
+        
+        ClayArray = vtkDoubleArray()
+        ClayArray.SetNumberOfTuples(num)
+        ClayArray.SetName("Clay")
+        
+        InitialSoilCarbonArray = vtkDoubleArray()
+        InitialSoilCarbonArray.SetNumberOfTuples(num)
+        InitialSoilCarbonArray.SetName("InitialCarbon")
+        
+        count = 0
+        for site, plot in plots:
+            ids = vtkIdList()
+            ids.InsertNextId(points.InsertNextPoint(plot.x, plot.y, 0))
+            ids.InsertNextId(points.InsertNextPoint(plot.x, plot.y, plot.depth))
+            lines.InsertNextCell(ids)
+            
+            self.siteIds.SetValue(count, site.gid)
+            ClayArray.SetValue(count, plot.clay)
+            InitialSoilCarbonArray.SetValue(count, plot.initCorg)
+            count += 1
+        
+        for i in xrange(months):
+            
+            GlobalRadiationArray = vtkDoubleArray()
+            GlobalRadiationArray.SetNumberOfTuples(num)
+            GlobalRadiationArray.SetName("GlobalRadiation")
+            
+            MeanTemperatureArray = vtkDoubleArray()
+            MeanTemperatureArray.SetNumberOfTuples(num)
+            MeanTemperatureArray.SetName("MeanTemperature")
+            
+            PrecipitationArray = vtkDoubleArray()
+            PrecipitationArray.SetNumberOfTuples(num)
+            PrecipitationArray.SetName("Precipitation")
+            
+            SoilCoverArray = vtkDoubleArray()
+            SoilCoverArray.SetNumberOfTuples(num)
+            SoilCoverArray.SetName("SoilCover")
+            
+            FertilizerCarbonArray = vtkDoubleArray()
+            FertilizerCarbonArray.SetNumberOfTuples(num)
+            FertilizerCarbonArray.SetName("FertilizerCarbon")
+            
+            ResidualsArray = vtkDoubleArray()
+            ResidualsArray.SetNumberOfTuples(num)
+            ResidualsArray.SetName("Residuals")
+            
+            count = 0
+            for site, plot in plots:
+                if i < self.numberOfMonths[site.gid]:
+                    data = site.timeSeriesData[plot.name][i]
+                    GlobalRadiationArray.SetValue(count, data.rad)
+                    MeanTemperatureArray.SetValue(count, data.temp)
+                    PrecipitationArray.SetValue(count, data.precip)
+                    
+                    if int(data.cropType) == 9999:
+                        SoilCoverArray.SetValue(count, False)
+                    else:
+                        SoilCoverArray.SetValue(count, True)
+                    
+                    FertilizerCarbonArray.SetValue(count, data.fertCInput)
+                    ResidualsArray.SetValue(count, data.cropCInput)
+                else:
+                    # Padding of shorter time series
+                    GlobalRadiationArray.SetValue(count, self.NullValue)
+                    MeanTemperatureArray.SetValue(count, self.NullValue)
+                    PrecipitationArray.SetValue(count, 0)
+                    SoilCoverArray.SetValue(count, False)
+                    FertilizerCarbonArray.SetValue(count, 0)
+                    ResidualsArray.SetValue(count, 0)
+                count += 1
+            
+            ETpot = vtkPolyData()
+            ETpot.SetPoints(points)
+            ETpot.SetLines(lines)
+            ETpot.GetCellData().AddArray(GlobalRadiationArray)
+            ETpot.GetCellData().AddArray(MeanTemperatureArray)
+            
+            WaterBudget = vtkPolyData()
+            WaterBudget.SetPoints(points)
+            WaterBudget.SetLines(lines)
+            WaterBudget.GetCellData().AddArray(PrecipitationArray)
+            WaterBudget.GetCellData().AddArray(SoilCoverArray)
+            WaterBudget.GetCellData().AddArray(ClayArray)
+            
+            RothC = vtkPolyData()
+            RothC.SetPoints(points)
+            RothC.SetLines(lines)
+            RothC.GetCellData().AddArray(ClayArray)
+            if i == 0:
+                RothC.GetCellData().AddArray(InitialSoilCarbonArray)
+            RothC.GetCellData().AddArray(SoilCoverArray)
+            RothC.GetCellData().AddArray(MeanTemperatureArray)
+            RothC.GetCellData().AddArray(ResidualsArray)
+            RothC.GetCellData().AddArray(FertilizerCarbonArray)
+            RothC.GetCellData().AddArray(self.siteIds)
+            
+            Residuals = vtkPolyData()
+            Residuals.SetPoints(points)
+            Residuals.SetLines(lines)
+            Residuals.GetCellData().SetScalars(ResidualsArray)
+            
+            ds = {}
+            ds["ETpot"] = ETpot
+            ds["WaterBudget"] = WaterBudget
+            ds["RothC"] = RothC
+            ds["Residuals"] = Residuals
+            self.datasets.append(ds)
+    
 ###############################################################################            
             
 def run(ETpotInputs, WaterBudgetInputs, RothCInputs, ResidualsInput,
@@ -334,7 +510,6 @@ def run(ETpotInputs, WaterBudgetInputs, RothCInputs, ResidualsInput,
     RothC = vtkTAG2ERothCModel()
     RothC.SetModelParameter(RothCParameter)
     RothC.AddCPoolsToOutputOn()
-    RothC.CPoolsInitiatedOn()
     RothC.SetNullValue(NullValue)
     
     dc1 = vtkTAG2EDataSetJoinFilter()
@@ -376,7 +551,171 @@ def run(ETpotInputs, WaterBudgetInputs, RothCInputs, ResidualsInput,
     
 ###############################################################################
 
+def SplitSites(dataset, siteIds):
+    """!Split a site batched dataset into site specific datasets
+    
+       @param dataset: The vtkPolyData with the cells of all sites
+       @param siteIds: The vtkIntArray with the group id of each cell
+       
+       @return A dictionary with the group id as key and the site
+               specific vtkPolyData as value
+    """
+    cells = {}
+    for cellId in xrange(dataset.GetNumberOfCells()):
+        cells.setdefault(siteIds.GetValue(cellId), []).append(cellId)
+    
+    result = {}
+    for gid, cellIds in cells.iteritems():
+        num = len(cellIds)
+        
+        output = vtkPolyData()
+        output.Allocate(num, num)
+        output.GetCellData().CopyAllocate(dataset.GetCellData(), num)
+        points = vtkPoints()
+        
+        for newId, cellId in enumerate(cellIds):
+            pointIds = vtkIdList()
+            dataset.GetCellPoints(cellId, pointIds)
+            ids = vtkIdList()
+            for i in xrange(pointIds.GetNumberOfIds()):
+                ids.InsertNextId(points.InsertNextPoint(dataset.GetPoint(pointIds.GetId(i))))
+            output.InsertNextCell(dataset.GetCellType(cellId), ids)
+            output.GetCellData().CopyData(dataset.GetCellData(), cellId, newId)
+        
+        output.SetPoints(points)
+        result[gid] = output
+    
+    return result
+
+###############################################################################
+
+def RunSites(sites, RothCParameter=None, NullValue=-99999):
+    """!Compute the RothC model for many sites at once
+    
+       The plots of all sites are converted into a single polydata time
+       series, the monthly model pipeline runs once for all sites and
+       the result is split into site specific datasets. The C pools are
+       initiated from the initial carbon of the plots.
+    
+       @param sites: A list of Site objects
+       @param RothCParameter: The parameter object for the RothC Model
+       @param NullValue: The Null value that represents unknown values
+       
+       @return A dictionary with the group id as key and a vtkPolyData
+               with RothC pools and soil carbon as value
+    """
+    ds = SitesToVTK(sites, NullValue)
+    
+    ETpotInputs = []
+    WaterBudgetInputs = []
+    RothCInputs = []
+    ResidualsInput = []
+    
+    for i in range(len(ds.datasets)):
+        ETpotInputs.append(ds.datasets[i]["ETpot"])
+        WaterBudgetInputs.append(ds.datasets[i]["WaterBudget"])
+        RothCInputs.append(ds.datasets[i]["RothC"])
+        ResidualsInput.append(ds.datasets[i]["Residuals"])
+    
+    output = run(ETpotInputs, WaterBudgetInputs, RothCInputs, ResidualsInput,
+                 RothCParameter, NullValue)
+    
+    result = SplitSites(output, ds.siteIds)
+    
+    # The soil carbon of sites with shorter time series is null in the
+    # last padded month, hence it is computed from the unchanged pools
+    for gid, dataset in result.iteritems():
+        if ds.numberOfMonths[gid] == len(ds.datasets):
+            continue
+        cd = dataset.GetCellData()
+        pools = [cd.GetArray(name) for name in ["DPM", "RPM", "BIO", "HUM", "IOM"]]
+        for cellId in xrange(dataset.GetNumberOfCells()):
+            values = [pool.GetValue(cellId) for pool in pools]
+            if NullValue in values:
+                continue
+            cd.GetArray("SoilCarbon").SetValue(cellId, sum(values))
+    
+    return result
+
+###############################################################################
+
+def RunSiteBatch(args):
+    """!Compute a batch of sites and write the site specific results
+    
+       This function is used as process pool worker, hence all
+       VTK objects are created and written inside the worker.
+    
+       @param args: A tuple with the SOC main text file, the directory
+                    of the SOC inp files, the list of group ids, the
+                    output directory and the null value
+       
+       @return The list of computed group ids
+    """
+    filename, directory, gids, outdir, NullValue = args
+    
+    sites = []
+    for gid in gids:
+        sites.append(Site(gid, filename, directory))
+    
+    result = RunSites(sites, None, NullValue)
+    
+    for gid, dataset in result.iteritems():
+        writer = vtkPolyDataWriter()
+        writer.SetInput(dataset)
+        writer.SetFileName(os.path.join(outdir, "site_%i.vtk" % gid))
+        writer.Write()
+    
+    return sorted(result.keys())
+
+###############################################################################
+
+def RunSiteBatches(filename, directory, gids, outdir, batchSize=50,
+                   processes=1, NullValue=-99999):
+    """!Compute many sites in batches, optionally distributed across
+       a process pool
+    
+       @param filename: The SOC main text file
+       @param directory: The directory containing the SOC inp files
+       @param gids: The list of group ids of the sites to compute
+       @param outdir: The directory to write the site specific VTK files
+       @param batchSize: The number of sites that are computed at once
+       @param processes: The number of worker processes, 1 computes
+                         all batches in this process
+       @param NullValue: The Null value that represents unknown values
+       
+       @return The list of computed group ids
+    """
+    batches = []
+    for i in xrange(0, len(gids), batchSize):
+        batches.append((filename, directory, gids[i:i + batchSize], outdir, NullValue))
+    
+    if processes > 1:
+        pool = multiprocessing.Pool(processes)
+        result = pool.map(RunSiteBatch, batches)
+        pool.close()
+        pool.join()
+    else:
+        result = map(RunSiteBatch, batches)
+    
+    computed = []
+    for batch in result:
+        computed += batch
+    
+    return computed
+    
+###############################################################################
+
 def main(options, args):    
+    # Compute many sites in batches
+    if options.outdir:
+        if options.group_id == "all":
+            gids = ReadSiteIds(options.filename)
+        else:
+            gids = [int(gid) for gid in options.group_id.split(",")]
+        RunSiteBatches(options.filename, options.directory, gids, options.outdir,
+                       options.batch_size, options.processes)
+        return
+    
     # Parse the site specific file for a specific group
     site = Site(options.group_id, options.filename, options.directory)
     ds = SiteToVTK(site)    
@@ -441,9 +780,17 @@ if __name__ == "__main__":
     parser.add_option("-d", "--directory", dest="directory",
                   help="The directory containing the SOC inp files", metavar="DIR")    
     parser.add_option("-i", "--id", dest="group_id",
-                  help="The group id of the site to convert")
+                  help="The group id of the site to convert, a comma separated list of "\
+                       "group ids or \"all\" in case an output directory is specified")
     parser.add_option("-o", "--outfile", dest="outfilename",
                       help="The resulting site specific output VTK file name", metavar="FILE")
+    parser.add_option("-O", "--outdir", dest="outdir",
+                      help="Compute the sites in batches and write the site specific "\
+                           "output VTK files into this directory", metavar="DIR")
+    parser.add_option("-b", "--batch-size", dest="batch_size", type="int", default=50,
+                      help="The number of sites that are computed at once")
+    parser.add_option("-p", "--processes", dest="processes", type="int", default=1,
+                      help="The number of worker processes to compute the site batches")
     parser.add_option("-q", "--quiet",
                       action="store_false", dest="verbose", default=True,
                       help="don't print status messages to stdout")
@@ -453,4 +800,4 @@ if __name__ == "__main__":
     if not options.filename or not options.directory or not options.group_id:
         parser.error("You need to specify filename and directory")
     
-    cProfile.run(main(options, args)
+    main(options, args)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+#
+# Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+#
+# Purpose: Measure the speed of the fuzzy inference and calibration hot paths
+#
+# Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+#          Rene Dechow, rene.dechow@vti.bund.de
+#
+# Copyright:
+#
+# Johann Heinrich von Thuenen-Institut
+# Institut fuer Agrarrelevante Klimaforschung
+#
+# Phone: +49 (0)531 596 2601
+#
+# Fax:+49 (0)531 596 2699
+#
+# Mail: ak@vti.bund.de
+#
+# Bundesallee 50
+# 38116 Braunschweig
+# Germany
+#
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+from optparse import OptionParser
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from vtk import *
+
+from libvtkTAG2ECommonPython import *
+from libvtkTAG2EFilteringPython import *
+from libvtkGRASSBridgeCommonPython import *
+
+from XMLFuzzyInferenceGenerator import *
+
+###############################################################################
+
+def PeakMemory():
+    """Return the peak resident memory of this process in kilobytes"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+###############################################################################
+
+def CreateDataSet(numberOfPoints, numberOfFactors, seed):
+    """Create a synthetic point dataset with numberOfFactors factor arrays
+       named f0 ... fn in the range [0:100] and a noisy linear target array
+       which is set as active scalars
+    """
+    random.seed(seed)
+
+    ds = vtkPolyData()
+    points = vtkPoints()
+    factors = []
+
+    for f in range(numberOfFactors):
+        array = vtkDoubleArray()
+        array.SetName("f%i" % f)
+        array.SetNumberOfTuples(numberOfPoints)
+        factors.append(array)
+
+    target = vtkDoubleArray()
+    target.SetName("target")
+    target.SetNumberOfTuples(numberOfPoints)
+
+    for i in range(numberOfPoints):
+        points.InsertNextPoint(i, 0, 0)
+        value = 0.0
+        for f in range(numberOfFactors):
+            x = random.uniform(0, 100)
+            factors[f].SetValue(i, x)
+            value += x
+        target.SetValue(i, value / numberOfFactors + random.gauss(0, 1))
+
+    ds.SetPoints(points)
+    for array in factors:
+        ds.GetPointData().AddArray(array)
+    ds.GetPointData().AddArray(target)
+    ds.GetPointData().SetActiveScalars(target.GetName())
+
+    return ds
+
+###############################################################################
+
+def Measure(function, repeat):
+    """Call function repeat times and return the minimum wall time in seconds"""
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        function()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+###############################################################################
+
+def RunBenchmarks(options):
+    """Run all benchmarks and return the results as dictionary"""
+
+    factorNames = ["f%i" % f for f in range(options.factors)]
+
+    ds = CreateDataSet(options.points, options.factors, options.seed)
+
+    root = BuildXML(factorNames, [options.sets] * options.factors, "target", ds, 9999)
+
+    parameter = vtkTAG2EFuzzyInferenceModelParameter()
+    parameter.SetXMLRepresentation(root)
+    parameter.GenerateInternalSchemeFromXML()
+
+    results = {}
+
+    # The fuzzy inference computation of single points
+    sampler = vtkTAG2EFuzzyInferenceModelParameterToImageData()
+    sampler.SetFuzzyModelParameter(parameter)
+    sampler.SetXAxisExtent(options.points)
+    sampler.SetYAxisExtent(1)
+    sampler.SetZAxisExtent(1)
+
+    def fis():
+        sampler.Modified()
+        sampler.Update()
+
+    seconds = Measure(fis, options.repeat)
+    results["ComputeFISResult"] = {"seconds":seconds, "points/s":options.points / seconds}
+
+    # Reading the model parameter from XML and binary files
+    reads = 100
+    for name, extension in (("ReadParameterXML", ".xml"), ("ReadParameterBinary", ".bin")):
+        fileName = os.path.join(tempfile.gettempdir(), "TAG2EBenchmark" + extension)
+        parameter.SetFileName(fileName)
+        parameter.Write()
+
+        reader = vtkTAG2EFuzzyInferenceModelParameter()
+        reader.SetFileName(fileName)
+
+        def read(reader=reader):
+            for i in range(reads):
+                reader.Read()
+
+        seconds = Measure(read, options.repeat)
+        results[name] = {"seconds":seconds, "reads/s":reads / seconds}
+        os.remove(fileName)
+
+    # The fuzzy inference model
+    model = vtkTAG2EFuzzyInferenceModel()
+    model.SetInput(ds)
+    model.SetModelParameter(parameter)
+    model.UseCellDataOff()
+
+    def fim():
+        model.Modified()
+        model.Update()
+
+    seconds = Measure(fim, options.repeat)
+    results["FuzzyInferenceModel"] = {"seconds":seconds, "points/s":options.points / seconds}
+
+    # The comparison of the model result and the target
+    output = vtkPolyData()
+    output.ShallowCopy(model.GetOutput())
+
+    def compare():
+        vtkTAG2EAbstractModelCalibrator.CompareDataSets(output, ds, False, False, False)
+
+    seconds = Measure(compare, options.repeat)
+    results["CompareDataSets"] = {"seconds":seconds, "points/s":options.points / seconds}
+
+    # Simulated annealing with a fixed seed
+    def annealing():
+        caliParameter = vtkTAG2EFuzzyInferenceModelParameter()
+        caliParameter.SetXMLRepresentation(root)
+
+        caliModel = vtkTAG2EFuzzyInferenceModel()
+        caliModel.SetInput(ds)
+        caliModel.SetModelParameter(caliParameter)
+        caliModel.UseCellDataOff()
+
+        calibrator = vtkTAG2ESimulatedAnnealingModelCalibrator()
+        calibrator.SetInput(ds)
+        calibrator.SetModel(caliModel)
+        calibrator.SetModelParameter(caliParameter)
+        calibrator.SetMaxNumberOfIterations(options.iterations)
+        calibrator.SetBreakCriteria(0.0)
+        calibrator.SetSeed(options.seed)
+        calibrator.Update()
+
+    seconds = Measure(annealing, options.repeat)
+    results["SimulatedAnnealing"] = {"seconds":seconds, "iterations/s":options.iterations / seconds}
+
+    return {"configuration":{"points":options.points, "factors":options.factors,
+                             "sets":options.sets, "iterations":options.iterations,
+                             "repeat":options.repeat, "seed":options.seed},
+            "benchmarks":results,
+            "peak memory kB":PeakMemory()}
+
+###############################################################################
+
+def Throughput(result):
+    """Return the throughput value of a single benchmark result"""
+    for key in result.keys():
+        if key.endswith("/s"):
+            return key, result[key]
+    return None, None
+
+###############################################################################
+
+def CompareWithBaseline(report, baseline, tolerance):
+    """Compare the throughput of all benchmarks with a stored baseline.
+       Returns the list of benchmarks that are slower than the baseline
+       by more than the relative tolerance.
+    """
+    regressions = []
+
+    if report["configuration"] != baseline["configuration"]:
+        print "Warning: The benchmark configuration differs from the baseline"
+
+    for name in sorted(report["benchmarks"].keys()):
+        if name not in baseline["benchmarks"]:
+            print "%-22s no baseline available" % name
+            continue
+
+        unit, current = Throughput(report["benchmarks"][name])
+        unit, reference = Throughput(baseline["benchmarks"][name])
+        ratio = current / reference
+
+        status = "ok"
+        if ratio < 1.0 - tolerance:
+            status = "REGRESSION"
+            regressions.append(name)
+
+        print "%-22s %14.1f %-12s baseline %14.1f ratio %.3f %s" % \
+              (name, current, unit, reference, ratio, status)
+
+    return regressions
+
+###############################################################################
+
+def main(options, args):
+
+    report = RunBenchmarks(options)
+
+    if options.verbose:
+        for name in sorted(report["benchmarks"].keys()):
+            unit, value = Throughput(report["benchmarks"][name])
+            print "%-22s %14.1f %s" % (name, value, unit)
+        print "Peak memory %i kB" % report["peak memory kB"]
+
+    if options.outfilename:
+        file = open(options.outfilename, "w")
+        json.dump(report, file, indent=2, sort_keys=True)
+        file.close()
+    elif not options.baseline:
+        print json.dumps(report, indent=2, sort_keys=True)
+
+    if options.baseline:
+        file = open(options.baseline, "r")
+        baseline = json.load(file)
+        file.close()
+
+        regressions = CompareWithBaseline(report, baseline, options.tolerance)
+        if regressions:
+            print "Performance regression in: " + ", ".join(regressions)
+            return 1
+
+    return 0
+
+###############################################################################
+
+if __name__ == "__main__":
+    parser = OptionParser()
+    parser.add_option("-n", "--points", dest="points", type="int", default=100000,
+                      help="The number of points of the synthetic dataset")
+    parser.add_option("-f", "--factors", dest="factors", type="int", default=2,
+                      help="The number of factors of the fuzzy inference scheme")
+    parser.add_option("-s", "--sets", dest="sets", type="int", default=3,
+                      help="The number of fuzzy sets of each factor (2 - 5)")
+    parser.add_option("-i", "--iterations", dest="iterations", type="int", default=200,
+                      help="The number of simulated annealing iterations")
+    parser.add_option("-r", "--repeat", dest="repeat", type="int", default=3,
+                      help="The number of repetitions, the fastest run is reported")
+    parser.add_option("--seed", dest="seed", type="int", default=1,
+                      help="The seed of the random number generators")
+    parser.add_option("-o", "--outfile", dest="outfilename",
+                      help="Store the benchmark report as JSON file", metavar="FILE")
+    parser.add_option("-b", "--baseline", dest="baseline",
+                      help="Compare the results with a stored JSON benchmark report", metavar="FILE")
+    parser.add_option("-t", "--tolerance", dest="tolerance", type="float", default=0.1,
+                      help="The allowed relative throughput loss compared to the baseline")
+    parser.add_option("-q", "--quiet",
+                      action="store_false", dest="verbose", default=True,
+                      help="don't print status messages to stdout")
+
+    (options, args) = parser.parse_args()
+
+    if options.sets < 2 or options.sets > 5:
+        parser.error("The number of fuzzy sets must be between 2 and 5")
+
+    sys.exit(main(options, args))
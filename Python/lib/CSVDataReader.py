@@ -34,63 +34,269 @@ from libvtkTAG2ECommonPython import *
 from libvtkTAG2EFilteringPython import *
 from libvtkGRASSBridgeCommonPython import *
 
+import itertools
 import random
 import BootstrapAggregating
 
-def ReadTextData(inputFile, scalarName, bagging = True):
+# NumPy is optional, it is used to parse and store the columns in bulk
+try:
+    import numpy
+    from vtk.util import numpy_support
+except ImportError:
+    numpy = None
+
+# The number of rows that are parsed at once
+DEFAULT_CHUNK_SIZE = 100000
+
+################################################################################
+################################################################################
+################################################################################
+
+def ReadHeader(file):
+    """Read the header line of an open CSV file and return the column names"""
 
-    file = open(inputFile)
     headerLine = file.readline()
-    names = headerLine.split(',')
+    if headerLine == "":
+        raise IOError("The CSV file has no header line")
 
     nameArray = []
-    for i in range(0, len(names)):
-        nameArray.append(str(names[i]).rstrip('\r\n'))
+    for name in headerLine.split(','):
+        nameArray.append(str(name).strip())
 
-    dataset = vtkPolyData()
-    dataset.Allocate(1,1)
-
-    points = vtkPoints()
+    return nameArray
 
-    dataArrays = vtkDataSetAttributes()
+################################################################################
+################################################################################
+################################################################################
 
-    for name in nameArray:
-        array = vtkDoubleArray()
-        array.SetName(name)
-        dataArrays.AddArray(array)
+def CountRows(inputFile):
+    """Count the number of data rows of a CSV file without parsing it.
+       The file is read in large binary blocks. Empty lines at the end
+       of the file are counted too, the arrays are shrunk while reading.
+    """
 
+    file = open(inputFile, "rb")
+    count = 0
+    last = ""
     while True:
-
-        line = file.readline()
-        if line == "":
+        block = file.read(1 << 20)
+        if block == "":
             break
-        tmpArray = line.split(',')
+        count += block.count("\n")
+        last = block[-1]
+    file.close()
 
-        data = {}
-        year = float(tmpArray[0])
-        y = float(tmpArray[1])
-        x = float(tmpArray[2])
+    # The last line has no line break
+    if last != "" and last != "\n":
+        count += 1
 
-        ids = vtkIdList()
-        ids.InsertNextId(points.InsertNextPoint(x, y, 0))
+    # Remove the header
+    return max(count - 1, 0)
 
-        dataset.InsertNextCell(vtk.VTK_VERTEX, ids)
+################################################################################
+################################################################################
+################################################################################
 
-        count = 0
-        for i in range(0, len(tmpArray)):
-            data[nameArray[count]] = float(tmpArray[i])
-            count += 1
+def ParseRows(lines, numberOfColumns):
+    """Parse a list of CSV lines into a row major table of numberOfColumns
+       columns. The table is a two dimensional NumPy array in case NumPy is
+       available, otherwise a list of float lists. Empty lines are skipped.
+    """
 
-        for key in data.keys():
-            dataArrays.GetArray(key).InsertNextValue(data[key])
+    lines = [line for line in lines if line.strip() != ""]
 
-    file.close()
+    if numpy is not None:
+        if len(lines) == 0:
+            return numpy.zeros((0, numberOfColumns))
+        # The whole chunk is converted by a single call to the C parser of NumPy
+        text = ",".join([line.rstrip("\r\n") for line in lines])
+        values = numpy.fromstring(text, dtype=numpy.float64, sep=",")
+        if values.size != len(lines) * numberOfColumns:
+            raise IOError("Wrong number of columns or invalid values in the CSV data")
+        return values.reshape((len(lines), numberOfColumns))
+
+    table = []
+    for line in lines:
+        row = [float(value) for value in line.split(',')]
+        if len(row) != numberOfColumns:
+            raise IOError("Wrong number of columns in the CSV data")
+        table.append(row)
+    return table
+
+################################################################################
+################################################################################
+################################################################################
+
+def CreateArray(name, numberOfTuples, numberOfComponents=1):
+    """Create a pre-sized vtkDoubleArray"""
+
+    array = vtkDoubleArray()
+    array.SetName(name)
+    array.SetNumberOfComponents(numberOfComponents)
+    array.SetNumberOfTuples(numberOfTuples)
+
+    return array
+
+################################################################################
+################################################################################
+################################################################################
+
+def FillArrays(table, arrays, coordinates, offset):
+    """Write the columns of a parsed table into the pre-sized data arrays and
+       the point coordinate array starting at tuple offset. The NumPy path
+       writes directly into the memory of the VTK arrays, no copies are made.
+    """
+
+    if numpy is not None:
+        numberOfRows = table.shape[0]
+        if numberOfRows == 0:
+            return 0
+        for column in range(len(arrays)):
+            view = numpy_support.vtk_to_numpy(arrays[column])
+            view[offset:offset + numberOfRows] = table[:, column]
+        # Longitude is x, latitude is y
+        view = numpy_support.vtk_to_numpy(coordinates)
+        view[offset:offset + numberOfRows, 0] = table[:, 2]
+        view[offset:offset + numberOfRows, 1] = table[:, 1]
+        view[offset:offset + numberOfRows, 2] = 0.0
+        return numberOfRows
+
+    numberOfRows = len(table)
+    for row in range(numberOfRows):
+        values = table[row]
+        for column in range(len(arrays)):
+            arrays[column].SetValue(offset + row, values[column])
+        coordinates.SetTuple3(offset + row, values[2], values[1], 0.0)
+    return numberOfRows
+
+################################################################################
+################################################################################
+################################################################################
+
+def CreateVertexCells(numberOfCells):
+    """Create a cell array with a vertex cell for each point in a single step"""
+
+    ids = vtkIdTypeArray()
+    ids.SetNumberOfTuples(2 * numberOfCells)
+
+    if numpy is not None and numberOfCells > 0:
+        view = numpy_support.vtk_to_numpy(ids).reshape((numberOfCells, 2))
+        view[:, 0] = 1
+        view[:, 1] = numpy.arange(numberOfCells)
+    else:
+        for i in range(numberOfCells):
+            ids.SetValue(2 * i, 1)
+            ids.SetValue(2 * i + 1, i)
+
+    cells = vtkCellArray()
+    cells.SetCells(numberOfCells, ids)
+
+    return cells
+
+################################################################################
+################################################################################
+################################################################################
+
+def BuildDataSet(arrays, coordinates, numberOfRows, scalarName):
+    """Build the vertex poly data from the filled data and coordinate arrays"""
+
+    for array in arrays:
+        array.SetNumberOfTuples(numberOfRows)
+    coordinates.SetNumberOfTuples(numberOfRows)
 
-    dataset.GetCellData().DeepCopy(dataArrays)
+    points = vtkPoints()
+    points.SetData(coordinates)
+
+    dataset = vtkPolyData()
     dataset.SetPoints(points)
+    dataset.SetVerts(CreateVertexCells(numberOfRows))
+
+    for array in arrays:
+        dataset.GetCellData().AddArray(array)
 
-    if dataset.GetCellData().HasArray(scalarName):
+    if scalarName is not None and dataset.GetCellData().HasArray(scalarName):
         dataset.GetCellData().SetActiveScalars(scalarName)
+
+    return dataset
+
+################################################################################
+################################################################################
+################################################################################
+
+def ReadTextDataSet(inputFile, scalarName=None, chunkSize=DEFAULT_CHUNK_SIZE):
+    """Read a CSV file into a vtkPolyData with a vertex cell for each row.
+
+       The first line must contain the column names, the second and third
+       column are the latitude and longitude of the rows. All columns are
+       stored as vtkDoubleArray cell data. The number of rows is counted
+       first, so that the arrays are allocated only once. The rows are parsed
+       in chunks of chunkSize rows to limit the temporary memory.
+    """
+
+    numberOfRows = CountRows(inputFile)
+
+    file = open(inputFile)
+    nameArray = ReadHeader(file)
+
+    if len(nameArray) < 3:
+        file.close()
+        raise IOError("The CSV file needs at least the year, latitude and longitude columns")
+
+    arrays = [CreateArray(name, numberOfRows) for name in nameArray]
+    coordinates = CreateArray("Coordinates", numberOfRows, 3)
+
+    offset = 0
+    while True:
+        lines = list(itertools.islice(file, chunkSize))
+        if len(lines) == 0:
+            break
+        table = ParseRows(lines, len(nameArray))
+        if offset + len(table) > numberOfRows:
+            file.close()
+            raise IOError("The CSV file was modified while reading")
+        offset += FillArrays(table, arrays, coordinates, offset)
+
+    file.close()
+
+    return BuildDataSet(arrays, coordinates, offset, scalarName)
+
+################################################################################
+################################################################################
+################################################################################
+
+def ReadTextDataChunks(inputFile, scalarName=None, chunkSize=DEFAULT_CHUNK_SIZE):
+    """Generator that reads a CSV file in chunks of chunkSize rows and yields
+       a vtkPolyData for each chunk. Use this to process files that
+       are larger than the available memory.
+    """
+
+    file = open(inputFile)
+    nameArray = ReadHeader(file)
+
+    if len(nameArray) < 3:
+        file.close()
+        raise IOError("The CSV file needs at least the year, latitude and longitude columns")
+
+    try:
+        while True:
+            lines = list(itertools.islice(file, chunkSize))
+            if len(lines) == 0:
+                break
+            table = ParseRows(lines, len(nameArray))
+            arrays = [CreateArray(name, len(table)) for name in nameArray]
+            coordinates = CreateArray("Coordinates", len(table), 3)
+            numberOfRows = FillArrays(table, arrays, coordinates, 0)
+            yield BuildDataSet(arrays, coordinates, numberOfRows, scalarName)
+    finally:
+        file.close()
+
+################################################################################
+################################################################################
+################################################################################
+
+def ReadTextData(inputFile, scalarName, bagging = True, chunkSize=DEFAULT_CHUNK_SIZE):
+
+    dataset = ReadTextDataSet(inputFile, scalarName, chunkSize)
         
     output = vtkPolyData()
 
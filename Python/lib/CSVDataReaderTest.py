@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+#
+# Toolkit for Agriculture Greenhouse Gas Emission Estimation TAG2E
+#
+# Authors: Soeren Gebbert, soeren.gebbert@vti.bund.de
+#          Rene Dechow, rene.dechow@vti.bund.de
+#
+# Copyright:
+#
+# Johann Heinrich von Thuenen-Institut
+# Institut fuer Agrarrelevante Klimaforschung
+#
+# Phone: +49 (0)531 596 2601
+#
+# Fax:+49 (0)531 596 2699
+#
+# Mail: ak@vti.bund.de
+#
+# Bundesallee 50
+# 38116 Braunschweig
+# Germany
+#
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; version 2 of the License.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+
+
+#include the VTK and vtkGRASSBridge Python libraries
+import unittest
+
+from vtk import *
+
+from libvtkTAG2ECommonPython import *
+from libvtkTAG2EFilteringPython import *
+from libvtkGRASSBridgeCommonPython import *
+import CSVDataReader
+
+class CSVDataReaderTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.fileName = "/tmp/csv_reader_test.txt"
+        self.numberOfRows = 1001
+
+        file = open(self.fileName, "w")
+        file.write("year,lat,lon,n2o,fertN\r\n")
+        for i in range(self.numberOfRows):
+            file.write("%i,%g,%g,%g,%i\n" % (1983 + i % 10, 50 + i * 0.001, i * 0.01, i * 0.5, i))
+        # Trailing empty line
+        file.write("\n")
+        file.close()
+
+    def test1ReadDataSet(self):
+
+        dataset = CSVDataReader.ReadTextDataSet(self.fileName, "n2o", 100)
+
+        self.assertEqual(dataset.GetNumberOfCells(), self.numberOfRows)
+        self.assertEqual(dataset.GetNumberOfPoints(), self.numberOfRows)
+        self.assertEqual(dataset.GetCellData().GetScalars().GetName(), "n2o")
+        self.assertEqual(dataset.GetCellData().GetNumberOfArrays(), 5)
+
+        for i in range(0, self.numberOfRows, 7):
+            self.assertEqual(dataset.GetCellData().GetArray("fertN").GetValue(i), i)
+            self.assertAlmostEqual(dataset.GetCellData().GetScalars().GetValue(i), i * 0.5)
+            point = dataset.GetPoint(dataset.GetCell(i).GetPointId(0))
+            self.assertAlmostEqual(point[0], i * 0.01)
+            self.assertAlmostEqual(point[1], 50 + i * 0.001)
+
+    def test2ReadChunks(self):
+
+        count = 0
+        for dataset in CSVDataReader.ReadTextDataChunks(self.fileName, "n2o", 300):
+            self.assertTrue(dataset.GetNumberOfCells() <= 300)
+            for i in range(dataset.GetNumberOfCells()):
+                self.assertEqual(dataset.GetCellData().GetArray("fertN").GetValue(i), count + i)
+            count += dataset.GetNumberOfCells()
+
+        self.assertEqual(count, self.numberOfRows)
+
+    def test3ReadTextData(self):
+
+        dataset, timesource = CSVDataReader.ReadTextData(self.fileName, "n2o", False)
+
+        self.assertEqual(dataset.GetNumberOfCells(), self.numberOfRows)
+        self.assertEqual(dataset.GetCellData().GetScalars().GetName(), "n2o")
+
+if __name__ == '__main__':
+    suite1 = unittest.TestLoader().loadTestsFromTestCase(CSVDataReaderTest)
+    unittest.TextTestRunner(verbosity=2).run(suite1)
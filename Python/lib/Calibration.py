@@ -31,6 +31,8 @@
 #  GNU General Public License for more details.
 import random
 import math
+import time
+import multiprocessing
 
 from libvtkTAG2ECommonPython import *
 from libvtkTAG2EFilteringPython import *
@@ -139,3 +141,188 @@ def MetaModelSimulatedAnnealingImproved(metaModel, maxiter = 1000, initialT = 1,
     
     return bestFitModelParameter, bestFitDataSet, bestFitError, bestFitModelAssessment
 
+################################################################################
+################################################################################
+################################################################################
+
+# The model, the model parameter and the target dataset of a worker process
+_DEWorkerState = {}
+
+def _SetParameterValues(parameter, values):
+    """!Set all calibratable parameter values of a model parameter
+
+       Parameter which depend on each other may be valid only if they
+       are set in a specific order, hence the invalid parameter are set
+       again until no progress is made. Values outside of the parameter
+       ranges are clamped.
+
+       @param parameter: The calibratable model parameter
+       @param values: The list of all calibratable parameter values
+
+       @return False in case the values result in an invalid configuration
+    """
+    pending = range(len(values))
+
+    while len(pending) > 0:
+        failed = []
+        for index in pending:
+            value = min(max(values[index], parameter.GetParameterMinimum(index)),
+                        parameter.GetParameterMaximum(index))
+            if not parameter.SetParameterValue(index, value):
+                failed.append(index)
+
+        if len(failed) == len(pending):
+            return False
+
+        pending = failed
+
+    return True
+
+def _InitDEWorker(createModel, target):
+    """!Create the model and the model parameter of a worker process
+
+       This function is used as process pool initializer, hence each
+       worker computes the probes with its own VTK objects.
+
+       @param createModel: A function without arguments which returns the
+                           model with connected input and its model parameter
+       @param target: The dataset with the measured data
+    """
+    model, parameter = createModel()
+    model.SetModelParameter(parameter)
+    _DEWorkerState["model"] = model
+    _DEWorkerState["parameter"] = parameter
+    _DEWorkerState["target"] = target
+
+def _EvaluateDEProbes(probes):
+    """!Compute the errors of a batch of probes
+
+       @param probes: A list of parameter value lists
+
+       @return The list of errors, invalid probes have the error 1.0E20
+    """
+    model = _DEWorkerState["model"]
+    parameter = _DEWorkerState["parameter"]
+    target = _DEWorkerState["target"]
+
+    errors = []
+    for values in probes:
+        if not _SetParameterValues(parameter, values):
+            # TAG2E_DIFFERENTIAL_EVOLUTION_INVALID_VALUE
+            errors.append(1.0E20)
+            continue
+
+        model.Modified()
+        model.Update()
+        error = vtkTAG2EAbstractModelCalibrator.CompareDataSets(model.GetOutput(),
+                target, model.GetUseCellData(), 0, False) * model.GetModelAssessmentFactor()
+        errors.append(error)
+
+    return errors
+
+def DifferentialEvolution(createModel, target, populationSize=20,
+                          maxGenerations=100, differentialWeight=0.7,
+                          crossoverProbability=0.9, tolerance=0.000001,
+                          seed=None, processes=1):
+    """!Calibrate a model with differential evolution, the probes of each
+       generation are optionally computed in a process pool
+
+       This is the process based counterpart of
+       vtkTAG2EDifferentialEvolutionModelCalibrator. Each worker process
+       creates its own model and model parameter with createModel. The
+       random numbers are only drawn in this process, hence the result
+       depends only on the seed and not on the number of processes.
+
+       @param createModel: A function without arguments which returns the
+                           model with connected input and its model parameter,
+                           the current parameter values are the start point
+       @param target: The dataset with the measured data as active scalars
+       @param populationSize: The number of members of the population
+       @param maxGenerations: The maximum number of generations
+       @param differentialWeight: The weight of the difference vector
+       @param crossoverProbability: The crossover probability
+       @param tolerance: The relative break tolerance of the population errors
+       @param seed: The seed of the random number generator, default current time
+       @param processes: The number of worker processes, 1 computes
+                         all probes in this process
+
+       @return A tuple with the best fit model parameter, the model result
+               of the best fit, the best fit error and the model
+               assessment factor of the best fit
+    """
+    if seed is None:
+        seed = int(time.time())
+
+    model, parameter = createModel()
+    model.SetModelParameter(parameter)
+    numberOfParameter = parameter.GetNumberOfCalibratableParameter()
+
+    if numberOfParameter == 0:
+        raise RuntimeError("The model parameter has no calibratable parameter")
+
+    search = vtkTAG2EDifferentialEvolutionMethod()
+    search.SetPopulationSize(populationSize)
+    search.SetMaxNumberOfGenerations(maxGenerations)
+    search.SetDifferentialWeight(differentialWeight)
+    search.SetCrossoverProbability(crossoverProbability)
+    search.SetTolerance(tolerance)
+    search.SetSeed(seed)
+
+    # The current parameter values are the first member of the population
+    search.SetNumberOfParameters(numberOfParameter)
+    for i in range(numberOfParameter):
+        search.SetParameter(i, parameter.GetParameterValue(i),
+                            parameter.GetParameterMinimum(i),
+                            parameter.GetParameterMaximum(i))
+
+    if processes > 1:
+        pool = multiprocessing.Pool(processes, _InitDEWorker, (createModel, target))
+        evaluate = pool.map
+    else:
+        _InitDEWorker(lambda: (model, parameter), target)
+        evaluate = map
+
+    # The pool is closed in any case, also if an evaluation fails
+    try:
+        search.Init()
+
+        # This is the main loop, each step evaluates a generation
+        while not search.IsFinished():
+            probes = []
+            for probe in range(search.GetNumberOfProbes()):
+                probes.append([search.GetProbeParameter(probe, i) for i in range(numberOfParameter)])
+
+            # One batch of probes for each process
+            batchSize = int(math.ceil(len(probes)/float(processes)))
+            batches = [probes[i:i + batchSize] for i in xrange(0, len(probes), batchSize)]
+
+            probe = 0
+            for errors in evaluate(_EvaluateDEProbes, batches):
+                for error in errors:
+                    search.SetProbeValue(probe, error)
+                    probe += 1
+
+            search.Evaluate()
+    finally:
+        if processes > 1:
+            pool.close()
+            pool.join()
+
+    bestFitError = search.GetBestValue()
+
+    # Compute the model result of the best fit
+    values = [search.GetBestParameter(i) for i in range(numberOfParameter)]
+    if bestFitError >= 1.0E20 or not _SetParameterValues(parameter, values):
+        raise RuntimeError("No valid model parameter configuration found")
+
+    model.Modified()
+    model.Update()
+    bestFitModelAssessment = model.GetModelAssessmentFactor()
+    bestFitDataSet = target.NewInstance()
+    bestFitDataSet.ShallowCopy(model.GetOutput())
+
+    print "Finished after ", search.GetGeneration(), " generations and ", \
+          search.GetNumberOfEvaluations(), " evaluations with best fit ", \
+          bestFitError, " and Model assessment ", bestFitModelAssessment
+
+    return parameter, bestFitDataSet, bestFitError, bestFitModelAssessment
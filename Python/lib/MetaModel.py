@@ -46,6 +46,7 @@ class MetaModel():
         self.lastModifiedModelParameter = None
         self.lastModelInPipeline = None
         self.wasModified = 0
+        self.fittedModels = []
             
     def InsertModelParameter(self, model, parameter, modelName):
         self.models[modelName] = model
@@ -62,24 +63,43 @@ class MetaModel():
         if new:
             self.identifier.append(modelName)
         
+    def InsertFittedModel(self, modelName):
+        """Fit the parameter of an inserted model analytically after
+           the upstream models are computed, instead of modifying them
+           randomly. The model must provide the method FitWeights(target),
+           like vtkTAG2EWeightingModel."""
+        if modelName not in self.models:
+            raise IOError("Model " + modelName + " is not part of the meta model")
+        if modelName not in self.fittedModels:
+            self.fittedModels.append(modelName)
+        
     def ModifyParameterRandomly(self, sd):
         # Choose a randomly selected model parameter
         # And call ModifyParameterRandomly(sd)
+        # The parameter of fitted models are excluded
+
+        identifier = []
+        for key in self.identifier:
+            if key not in self.fittedModels:
+                identifier.append(key)
 
         idrange = []
         pnum = 0
-        for key in self.identifier:
+        for key in identifier:
             num = self.parameters[key].GetNumberOfCalibratableParameter()
             pnum += num
             idrange.append(pnum)
 
+        if pnum == 0:
+            raise IOError("No parameter available to modify")
+
         r = random.randint(0, pnum - 1)
 
         key = None
         count = 0
         for i in idrange:
             if r < i:
-                key = self.identifier[count]
+                key = identifier[count]
                 break
             count += 1
 
@@ -119,6 +139,12 @@ class MetaModel():
         return self.targetDataSet
     
     def Run(self):
+        # The parameter of the fitted models are computed from the
+        # current output of the upstream models
+        for key in self.fittedModels:
+            self.models[key].Update()
+            if not self.models[key].FitWeights(self.targetDataSet):
+                raise IOError("Unable to fit the parameter of model " + key)
         return self.models[self.lastModelInPipeline].Update()
     
     def GetXMLRepresentation(self, xml):
@@ -135,7 +161,7 @@ class MetaModel():
     def WriteParameter(self, fileName):
         root = vtkXMLDataElement()
         self.GetXMLRepresentation(root)
-        root.PrintXML(fileName)
+        vtkTAG2EAbstractModelParameter.WriteXMLFile(fileName, root)
     
     def GetModelAssessmentFactor(self):
         """The assessment factor of the metamodel is the 
@@ -122,8 +122,11 @@ def _RothCEquilibrium(Inputs, ResidualsInput, Years, RothCParameter=None,
     RothC.AddCPoolsToOutputOn()
     RothC.SetNullValue(NullValue)
     
+    # The join filter share the structure and arrays of the first input
     dc1 = vtkTAG2EDataSetJoinFilter()
+    dc1.ReferenceModeOn()
     dc2 = vtkTAG2EDataSetJoinFilter()
+    dc2.ReferenceModeOn()
     
     # We need to distribute the residuals equally over the year
     res = vtkPolyData()
@@ -38,7 +38,8 @@ from libvtkGRASSBridgeIOPython import *
 from libvtkGRASSBridgeCommonPython import *
 
 def RothCModelRun(mapmatrix, pools, clayContent, outputName=None, baseName=None,
-        RothCParameter=None, NullValue=-99999, overwrite=False):
+        RothCParameter=None, NullValue=-99999, overwrite=False,
+        checkpoint=None, resume=None):
     """!Run the RothC model using space time raster datasets
 
        @param: mapmatrix - A two dimensional matrix taht contains the sampled
@@ -48,6 +49,11 @@ def RothCModelRun(mapmatrix, pools, clayContent, outputName=None, baseName=None,
        @param: clayContent - The name of the raster map with clay content in [%]
        @param: outputName - The name of the output space time raster dataset
        @param: basename - The name of the
+       @param: checkpoint - The name of a binary file to store the C pools
+               and the number of computed time steps after the run
+       @param: resume - The name of a binary checkpoint file to read the C
+               pools from, the time steps that were already computed are
+               skipped and the pools argument is ignored
     """
     # Check the temporal type
     first = mapmatrix[0][0]["granule"]
@@ -79,33 +85,33 @@ def RothCModelRun(mapmatrix, pools, clayContent, outputName=None, baseName=None,
     clayReader.SetDataName("Clay")
     clayReader.SetLineLengths(lineLengths)
 
-    # Initiate the models and connect them
-    # Compute potential evapo-transpiration
-    ETpot = vtkTAG2ETurcETPotModel()
-    ETpot.SetNullValue(NullValue)
-
-    # Soil moisture computation
-    SoilMoisture = vtkTAG2ERothCWaterBudgetModel()
-    SoilMoisture.SetNullValue(NullValue)
-
-    # RothC model computation
+    # Initiate the model
     if not RothCParameter or RothCParameter == None:
         print("Create default RothCModelParameter")
         RothCParameter = vtkTAG2ERothCModelParameter()
 
-    RothC = vtkTAG2ERothCModel()
+    # The potential evapo-transpiration, the soil moisture and the
+    # RothC model are computed in a single step
+    RothC = vtkTAG2ERothCFusedModel()
     RothC.SetModelParameter(RothCParameter)
     RothC.AddCPoolsToOutputOn()
     RothC.EquilibriumRunOff()
     RothC.SetNullValue(NullValue)
 
-    # Some dataset join filter
-    dc1 = vtkTAG2EDataSetJoinFilter()
-    dc2 = vtkTAG2EDataSetJoinFilter()
+    # Continue a former run using the stored C pools
+    start = 0
+    if resume:
+        if not RothC.LoadCPools(resume):
+            raise IOError("Unable to read the checkpoint file <%s>" % resume)
+        start = RothC.GetCPoolsTimeStep()
+        print "Resume the computation at time step ", start
+
+    # The dataset join filter shares the structure and arrays of the first input
     join = vtkTAG2EDataSetJoinFilter()
+    join.ReferenceModeOn()
 
     # This is the iterator over the time series
-    for j in range(len(mapmatrix[0])):
+    for j in range(start, len(mapmatrix[0])):
 
         print "Run model ", j
 
@@ -189,28 +195,15 @@ def RothCModelRun(mapmatrix, pools, clayContent, outputName=None, baseName=None,
 
         print "Read granule", granule.get_name()
 
-        dc1.RemoveAllInputs()
-        dc2.RemoveAllInputs()
-
-        ETpot.SetInputConnection(join.GetOutputPort())
         """!ATTENTION WE NEED TO COMPUTE THE CORRECT NUMBER OF DAYS HERE"""
         days = tgis.time_delta_to_relative_time(end - start)
-        ETpot.SetTimeInterval(days)
+        RothC.SetTimeInterval(days)
 
-        # Soil moisture input
-        dc1.AddInputConnection(ETpot.GetOutputPort())
-        dc1.AddInputConnection(join.GetOutputPort())
-
-        SoilMoisture.SetInputConnection(dc1.GetOutputPort())
-
-        # ETpot input
-        dc2.AddInputConnection(join.GetOutputPort())
-        dc2.AddInputConnection(SoilMoisture.GetOutputPort())
         # The pools must be added in the first iteration
-        if j == 0:
-            dc2.AddInput(pools)
+        if j == 0 and not resume:
+            join.AddInput(pools)
 
-        RothC.SetInputConnection(dc2.GetOutputPort())
+        RothC.SetInputConnection(join.GetOutputPort())
         RothC.Update()
 
         if outputName != None and baseName != None:
@@ -249,6 +242,11 @@ def RothCModelRun(mapmatrix, pools, clayContent, outputName=None, baseName=None,
             # the space time raster dataset
             outMapList.append(map)
 
+    # Store the C pools to continue the computation later on
+    if checkpoint:
+        if not RothC.SaveCPools(checkpoint, len(mapmatrix[0])):
+            raise IOError("Unable to write the checkpoint file <%s>" % checkpoint)
+
     if outputName != None and baseName != None:
         # Execute all SQL state,ents in a single transaction
         dbif.execute_transaction(sqlStatements)